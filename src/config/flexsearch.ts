@@ -1,13 +1,9 @@
 import { FlexSearchConfig, FlexSearchOptions } from '@app-types/configTypes';
-export const FLEXSEARCH_CONFIG: FlexSearchConfig = {
-  tokenize: 'forward',
-  cache: 100,
-  resolution: 9,
-  threshold: 1,
-  depth: 1,
-  bidirectional: false,
-  suggest: false
-};
+// Shared with the pipeline's prebuilt-index builder (scripts/build_flexsearch_index.js)
+import flexsearchConfig from './flexsearch.config.json';
+
+export const FLEXSEARCH_CONFIG: FlexSearchConfig =
+  flexsearchConfig as FlexSearchConfig;
 
 export const FLEXSEARCH_SEARCH_OPTIONS: FlexSearchOptions = {
   bool: 'and',
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Address normalization engine for search indexing
+
+standardize_address() turns raw situs addresses into the
+"Street, City, ST 12345" form used in every pipeline output. Patterns are
+compiled once, street types are a module-level lookup table, standardized
+street words are memoized, and whole results are memoized in an LRU keyed on
+the raw arguments, since parcels repeat the same street, city and ZIP
+fragments heavily. Output is identical to the original per-call version.
+
+Batch APIs:
+  standardize_batch(args_list)  # list of standardize_address arg tuples (or None)
+  standardize_series(series, default_city=..., default_zip=...)
+
+standardize_series factorizes the inputs so each distinct
+(address, city, state, zip) combination is normalized once, then broadcasts
+the results back to the Series index. Defaults may be scalars or Series
+aligned with the addresses.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+MEMO_SIZE = 1 << 18
+WORD_MEMO_SIZE = 1 << 16
+
+_REPEATED_SEPARATORS = re.compile(r'[.,]+(?=[.,])')
+_STATE_ZIP = re.compile(r"\b([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\b\s*$")
+
+STREET_TYPES = {
+    "STREET": "St.", "ST": "St.", "AVENUE": "Ave.", "AVE": "Ave.",
+    "ROAD": "Rd.", "RD": "Rd.", "DRIVE": "Dr.", "DR": "Dr.",
+    "LANE": "Ln.", "LN": "Ln.", "COURT": "Ct.", "CT": "Ct.",
+    "BOULEVARD": "Blvd.", "BLVD": "Blvd."
+}
+
+SAINT_LOUIS_NAMES = ("ST LOUIS", "SAINT LOUIS")
+
+# Street words (house numbers, names, types) repeat across parcels
+_WORD_MEMO = {}
+
+
+def _street_word(word: str) -> str:
+    standardized = _WORD_MEMO.get(word)
+    if standardized is None:
+        standardized = STREET_TYPES.get(word.upper().rstrip('.,')) or word.title()
+        if len(_WORD_MEMO) < WORD_MEMO_SIZE:
+            _WORD_MEMO[word] = standardized
+    return standardized
+
+
+def _standardize(full_address_str: str, default_city, default_state, default_zip) -> str:
+    # str.split() splits on exactly the characters re's \s matches, so
+    # ' '.join(s.split()) equals re.sub(r'\s+', ' ', s).strip()
+    address_str = " ".join(full_address_str.split())
+    if not address_str:
+        return ""
+
+    # Basic standardization
+    if ",," in address_str or ".," in address_str or ",." in address_str or ".." in address_str:
+        address_str = _REPEATED_SEPARATORS.sub(',', address_str)
+    address_str = address_str.replace(';', ',')
+
+    # Whitespace around commas is stripped from the parts, so the original
+    # ", " respacing and " ;" handling do not change them
+    parts = [p for p in (p.strip() for p in address_str.split(',')) if p]
+    if not parts:
+        return ""
+
+    street_part = parts[0]
+    city_part = parts[1] if len(parts) > 1 else default_city
+    state_zip_part = parts[2] if len(parts) > 2 else f"{default_state} {default_zip}"
+
+    # Street type standardization
+    street_standardized = " ".join([_street_word(word) for word in street_part.split()])
+
+    # City standardization
+    if city_part.upper() in SAINT_LOUIS_NAMES:
+        city_standardized = "St. Louis"
+    else:
+        city_standardized = city_part.title()
+
+    # State/ZIP extraction
+    state_zip_match = _STATE_ZIP.search(state_zip_part)
+    if state_zip_match:
+        state_standardized = state_zip_match.group(1).upper()
+        zip_standardized = state_zip_match.group(2)
+    else:
+        state_standardized = default_state
+        zip_standardized = default_zip
+
+    final_address = f"{street_standardized}, {city_standardized}, {state_standardized} {zip_standardized}"
+    return " ".join(final_address.split())
+
+
+_standardize_memo = lru_cache(maxsize=MEMO_SIZE)(_standardize)
+
+
+def standardize_address(full_address_str, default_city="Unknown City", default_state="MO", default_zip="63102") -> str:
+    """Standardize address format for consistent search indexing"""
+    if not full_address_str or not isinstance(full_address_str, str):
+        return ""
+    try:
+        return _standardize_memo(full_address_str, default_city, default_state, default_zip)
+    except TypeError:
+        # Unhashable defaults cannot be memoized
+        return _standardize(full_address_str, default_city, default_state, default_zip)
+
+
+def standardize_batch(address_args: Sequence[Optional[Tuple]]) -> list:
+    """Standardize many addresses; each entry is standardize_address's positional args or None"""
+    return [standardize_address(*args) if args else "" for args in address_args]
+
+
+def standardize_series(addresses: pd.Series, default_city="Unknown City", default_state="MO",
+                       default_zip="63102") -> pd.Series:
+    """Standardize a Series of raw addresses, normalizing each distinct input once
+
+    Args:
+        addresses: Raw address strings (non-strings standardize to "")
+        default_city, default_state, default_zip: Scalars or Series aligned with addresses
+
+    Returns:
+        Series of standardized addresses with the input's index
+    """
+    def column(value):
+        if isinstance(value, pd.Series):
+            return value.reindex(addresses.index).tolist()
+        return [value] * len(addresses)
+
+    keys = pd.Series(list(zip(
+        addresses.tolist(), column(default_city), column(default_state), column(default_zip)
+    )), dtype=object)
+    codes, uniques = pd.factorize(keys)
+    values = np.array([standardize_address(*key) for key in uniques], dtype=object)
+    return pd.Series(values[codes] if len(codes) else [], index=addresses.index, dtype=object, name=addresses.name)
+
+
+def clear_memo():
+    _standardize_memo.cache_clear()
+    _WORD_MEMO.clear()
+
+
+def memo_info():
+    return _standardize_memo.cache_info()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Compress-on-write for pipeline artifacts
+
+A CompressedTee is a writable binary stream that writes the raw bytes to disk
+and feeds the same blocks to one or more compressors in a single pass, so a
+finished multi-hundred-MB JSON file never has to be read back to compress it.
+
+Codecs:
+- gzip   (always written; parcelMetadata.ts fetches *.json.gz). Blocks are
+          deflated in parallel on a thread pool, pigz-style: each block is
+          primed with the previous block's last 32 KiB as dictionary and
+          sync-flushed, so the concatenation is one valid gzip member.
+- zstd   (optional sidecar, needs `zstandard`; multi-threaded in libzstd)
+- brotli (optional sidecar, needs `brotli`; streamed on its own thread)
+
+Sidecars are pre-built variants (*.json.zst, *.json.br) of the same content
+for CDN content negotiation.
+"""
+
+import io
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CODEC_EXTENSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+    "brotli": ".br"
+}
+
+BLOCK_SIZE = 1 << 20
+DEFLATE_WINDOW = 1 << 15
+
+
+def _deflate_block(data: bytes, level: int, zdict: bytes, last: bool) -> tuple:
+    """Raw-deflate one block; returns (compressed bytes, seconds spent)"""
+    started = time.perf_counter()
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    out = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return out, time.perf_counter() - started
+
+
+class _ParallelGzipWriter:
+    """Gzip member assembled from blocks deflated concurrently on a thread pool"""
+
+    def __init__(self, fileobj, level: int, executor: ThreadPoolExecutor, max_pending: int):
+        self.fileobj = fileobj
+        self.level = level
+        self.executor = executor
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.crc = 0
+        self.size = 0
+        self.previous_tail = b""
+        self.seconds = 0.0
+        # Fixed header with mtime 0 so identical content yields identical bytes
+        self.fileobj.write(b"\x1f\x8b\x08\x00" + struct.pack("<I", 0) + b"\x00\xff")
+
+    def _drain(self, keep: int):
+        while len(self.pending) > keep:
+            out, seconds = self.pending.popleft().result()
+            self.fileobj.write(out)
+            self.seconds += seconds
+
+    def write_block(self, data: bytes, last: bool = False):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self.pending.append(self.executor.submit(_deflate_block, data, self.level, self.previous_tail, last))
+        self.previous_tail = (self.previous_tail + data)[-DEFLATE_WINDOW:]
+        self._drain(self.max_pending)
+
+    def close(self):
+        self.write_block(b"", last=True)
+        self._drain(0)
+        self.fileobj.write(struct.pack("<II", self.crc & 0xffffffff, self.size & 0xffffffff))
+
+
+class _ThreadedStreamWriter:
+    """Feed blocks to a streaming compressor on a dedicated thread"""
+
+    def __init__(self, compress, finish):
+        self.compress = compress
+        self.finish = finish
+        self.seconds = 0.0
+        self.error = None
+        self.blocks = queue.Queue(maxsize=4)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            block = self.blocks.get()
+            if block is None:
+                break
+            if self.error is None:
+                try:
+                    started = time.perf_counter()
+                    self.compress(block)
+                    self.seconds += time.perf_counter() - started
+                except Exception as e:
+                    self.error = e
+        if self.error is None:
+            started = time.perf_counter()
+            self.finish()
+            self.seconds += time.perf_counter() - started
+
+    def write_block(self, data: bytes):
+        self.blocks.put(data)
+
+    def close(self):
+        self.blocks.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class CompressionSettings:
+    """Codec configuration shared by the compress-on-write tee and the file fallback"""
+
+    def __init__(self, gzip_level: int = 6, sidecars: Optional[List[str]] = None,
+                 zstd_level: int = 10, brotli_quality: int = 9, workers: int = 4):
+        self.gzip_level = gzip_level
+        self.sidecars = list(sidecars or [])
+        self.zstd_level = zstd_level
+        self.brotli_quality = brotli_quality
+        self.workers = max(1, workers)
+        self.results: Dict[Path, Dict[str, Any]] = {}
+
+        for codec in self.sidecars:
+            if codec not in ("zstd", "brotli"):
+                raise ValueError(f"Unknown sidecar codec: {codec}")
+            if codec == "zstd" and zstandard is None:
+                raise ImportError("zstd sidecars require the 'zstandard' package")
+            if codec == "brotli" and brotli is None:
+                raise ImportError("brotli sidecars require the 'brotli' package")
+
+    @property
+    def codecs(self) -> List[str]:
+        return ["gzip"] + [codec for codec in self.sidecars if codec != "gzip"]
+
+    def targets(self, raw_path: Path, out_dir: Path) -> Dict[str, Path]:
+        """Compressed output path per codec"""
+        return {codec: out_dir / f"{raw_path.name}{CODEC_EXTENSIONS[codec]}" for codec in self.codecs}
+
+    def open_tee(self, raw_path: Path, out_dir: Path) -> "CompressedTee":
+        """Writable stream that produces raw_path plus every compressed variant"""
+        return CompressedTee(raw_path, self.targets(raw_path, out_dir), self)
+
+    def adopt(self, raw_path: Path, out_dir: Path) -> Dict[str, Any]:
+        """Record the existing compressed variants of raw_path as its result (nothing is recompressed)"""
+        self.results[raw_path] = {
+            "raw_bytes": raw_path.stat().st_size,
+            "wall_seconds": 0.0,
+            "reused": True,
+            "outputs": {
+                codec: {"path": path, "bytes": path.stat().st_size, "cpu_seconds": 0.0}
+                for codec, path in self.targets(raw_path, out_dir).items()
+            }
+        }
+        return self.results[raw_path]
+
+    def compress_file(self, raw_path: Path, out_dir: Path) -> Dict[str, Any]:
+        """Compress an existing file (fallback when it was not written through a tee)"""
+        tee = CompressedTee(None, self.targets(raw_path, out_dir), self, source_path=raw_path)
+        with open(raw_path, 'rb') as f_in:
+            while True:
+                block = f_in.read(BLOCK_SIZE)
+                if not block:
+                    break
+                tee.write(block)
+        tee.close()
+        return self.results[raw_path]
+
+
+class CompressedTee(io.RawIOBase):
+    """Write raw bytes to disk and to every configured compressor in one pass"""
+
+    def __init__(self, raw_path: Optional[Path], targets: Dict[str, Path], settings: CompressionSettings,
+                 source_path: Optional[Path] = None):
+        super().__init__()
+        self.settings = settings
+        self.source_path = source_path or raw_path
+        self.targets = targets
+        self.raw_file = open(raw_path, 'wb') if raw_path is not None else None
+        self.buffer = bytearray()
+        self.raw_bytes = 0
+        self.started = time.perf_counter()
+
+        self.files = {codec: open(path, 'wb') for codec, path in targets.items()}
+        self.executor = ThreadPoolExecutor(max_workers=settings.workers)
+        self.writers = {}
+        for codec, fileobj in self.files.items():
+            if codec == "gzip":
+                self.writers[codec] = _ParallelGzipWriter(
+                    fileobj, settings.gzip_level, self.executor, max_pending=settings.workers * 2
+                )
+            elif codec == "zstd":
+                compressor = zstandard.ZstdCompressor(level=settings.zstd_level, threads=settings.workers)
+                stream = compressor.stream_writer(fileobj, closefd=False)
+                self.writers[codec] = _ThreadedStreamWriter(stream.write, stream.close)
+            elif codec == "brotli":
+                compressor = brotli.Compressor(quality=settings.brotli_quality)
+                self.writers[codec] = _ThreadedStreamWriter(
+                    lambda block, c=compressor, f=fileobj: f.write(c.process(block)),
+                    lambda c=compressor, f=fileobj: f.write(c.finish())
+                )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer += data
+        while len(self.buffer) >= BLOCK_SIZE:
+            self._emit(bytes(self.buffer[:BLOCK_SIZE]))
+            del self.buffer[:BLOCK_SIZE]
+        return len(data)
+
+    def _emit(self, block: bytes):
+        if self.raw_file is not None:
+            self.raw_file.write(block)
+        self.raw_bytes += len(block)
+        for writer in self.writers.values():
+            writer.write_block(block)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.buffer:
+                self._emit(bytes(self.buffer))
+                self.buffer.clear()
+            for writer in self.writers.values():
+                writer.close()
+        finally:
+            self.executor.shutdown(wait=True)
+            for fileobj in self.files.values():
+                fileobj.close()
+            if self.raw_file is not None:
+                self.raw_file.close()
+            super().close()
+
+        elapsed = time.perf_counter() - self.started
+        self.settings.results[self.source_path] = {
+            "raw_bytes": self.raw_bytes,
+            "wall_seconds": elapsed,
+            "outputs": {
+                codec: {
+                    "path": self.targets[codec],
+                    "bytes": self.targets[codec].stat().st_size,
+                    "cpu_seconds": writer.seconds
+                }
+                for codec, writer in self.writers.items()
+            }
+        }
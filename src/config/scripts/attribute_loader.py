@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Column-projected, typed loading of region source files
+
+The region processor only reads the columns named in a region's field
+mapping (regions.json "fields"), so attribute loading is planned per file:
+
+  shapefile  mapped columns present in its schema, read through pyogrio
+  dbf/csv    only the mapped columns the files before it do not already
+             provide (the left side of each merge keeps the unsuffixed
+             column); a join file that adds none is not read at all
+
+Schemas come from pyogrio.read_info / the CSV header, so planning reads no
+rows. DBF tables are read by pyogrio without geometry (through Arrow when
+pyarrow is installed); CSVs use pandas with usecols.
+
+Join files are collapsed to one row per parcel id before they are merged
+onto the shapefile (collapse_to_parcels), so the parcel geometry is joined
+exactly once. Aggregation policy: the first row per parcel id in file order
+is kept, matching the first-row-after-merge deduplication it replaces; the
+number of rows per parcel (e.g. apartment units in the city CSV) is
+reported in the join stats.
+
+Declared dtypes (regions.json "dtypes", by column name):
+  category  low-cardinality codes; applied only to columns without missing
+            values, so missing values keep their original representation
+  float32   applied only when every value survives the round trip to
+            float32 unchanged; otherwise the column stays float64
+  str       string values
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+
+USE_ARROW = importlib.util.find_spec("pyarrow") is not None
+DTYPES = ("category", "float32", "str")
+
+
+def mapped_columns(fields: Dict[str, Any]) -> List[str]:
+    """Every column name in a field mapping, in mapping order"""
+    columns = []
+    for value in fields.values():
+        names = value.values() if isinstance(value, dict) else [value]
+        columns.extend(name for name in names if name and name not in columns)
+    return columns
+
+
+def file_columns(path: Path, kind: str) -> List[str]:
+    """Column names of a source file without reading its rows"""
+    if kind == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    return list(pyogrio.read_info(path)["fields"])
+
+
+def plan_columns(files: Dict[str, Path], joins: List[str], wanted: List[str], key_column: str) -> Dict[str, List[str]]:
+    """Columns to read from the shapefile and each join file
+
+    Returns:
+        {"shp": [...], kind: [...] per join}; join lists include the key column
+        and are empty when the file adds no wanted column
+    """
+    wanted = set(wanted)
+    shapefile_columns = file_columns(files["shp"], "shp")
+    plan = {"shp": [column for column in shapefile_columns if column in wanted]}
+    present = set(shapefile_columns)
+    for kind in joins:
+        columns = file_columns(files[kind], kind)
+        added = [column for column in columns if column in wanted and column not in present and column != key_column]
+        plan[kind] = [key_column] + added if added else []
+        present.update(columns)
+    return plan
+
+
+def read_shapefile(path: Path, columns: List[str], dtypes: Optional[Dict[str, str]] = None) -> gpd.GeoDataFrame:
+    gdf = gpd.read_file(path, columns=columns, engine="pyogrio", use_arrow=USE_ARROW)
+    return apply_dtypes(gdf, dtypes)
+
+
+def read_table(path: Path, kind: str, columns: List[str], dtypes: Optional[Dict[str, str]] = None,
+               encoding: str = "latin1") -> pd.DataFrame:
+    """Read the given columns of a DBF or CSV attribute table"""
+    if kind == "csv":
+        table = pd.read_csv(path, usecols=columns, low_memory=False)[columns]
+    else:
+        table = pyogrio.read_dataframe(
+            path, columns=columns, read_geometry=False, encoding=encoding, use_arrow=USE_ARROW
+        )
+    return apply_dtypes(table, dtypes)
+
+
+def apply_dtypes(frame: pd.DataFrame, dtypes: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Apply declared dtypes in place where they keep every value unchanged"""
+    for column, dtype in (dtypes or {}).items():
+        if column not in frame.columns:
+            continue
+        series = frame[column]
+        if dtype == "category":
+            if not series.isna().any():
+                frame[column] = series.astype("category")
+        elif dtype == "float32":
+            if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+                values = series.to_numpy(dtype=np.float64)
+                narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                    frame[column] = pd.Series(narrowed, index=frame.index)
+        elif dtype == "str":
+            frame[column] = series.astype(str)
+        else:
+            raise ValueError(f"Unsupported dtype {dtype!r} for {column} (supported: {', '.join(DTYPES)})")
+    return frame
+
+
+def collapse_to_parcels(frame: pd.DataFrame, key_column: str) -> tuple:
+    """Keep the first row per parcel id
+
+    Returns:
+        (collapsed frame, {"rows", "parcels", "duplicate_rows", "multi_row_parcels", "max_rows_per_parcel"})
+    """
+    duplicated = frame[key_column].duplicated(keep='first').to_numpy()
+    # Extra rows per parcel id, counted over the duplicates only
+    extra = frame.loc[duplicated, key_column].value_counts(sort=False)
+    collapsed = frame[~duplicated] if len(extra) else frame
+    stats = {
+        "rows": len(frame),
+        "parcels": len(collapsed),
+        "duplicate_rows": int(duplicated.sum()),
+        "multi_row_parcels": len(extra),
+        "max_rows_per_parcel": int(extra.max()) + 1 if len(extra) else min(len(frame), 1),
+    }
+    return collapsed, stats
+
+
+def frame_memory_mb(frame: pd.DataFrame) -> float:
+    """Deep memory usage of a frame's attribute columns in MB"""
+    columns = [column for column in frame.columns if not isinstance(frame[column].dtype, gpd.array.GeometryDtype)]
+    return frame[columns].memory_usage(deep=True, index=False).sum() / (1024 * 1024)
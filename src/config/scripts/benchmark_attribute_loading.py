@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: column-projected, typed attribute loading vs full-schema loading
+
+Writes the synthetic City/County datasets, then loads each region's source
+files (shapefile + DBF/CSV joins, merge, one row per parcel id) in its own
+process with:
+  legacy     every column: geopandas read_file, dbfread for the DBF and
+             pandas read_csv (the loader before attribute_loader.py)
+  projected  only the mapped columns, planned per file, with the registry
+             dtypes (attribute_loader.py)
+
+Reports per region and variant the load time, peak RSS above RSS at the
+start of the load (stage_profiler.py) and the deep memory of the merged
+attribute columns. The mapped columns of both merged frames are compared
+value by value.
+
+Usage:
+  python3 benchmark_attribute_loading.py [--parcels=200000] [--report=bench.json]
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from attribute_loader import frame_memory_mb, mapped_columns, plan_columns, read_shapefile, read_table
+from region_registry import load_regions
+from stage_profiler import StageProfiler
+from synthetic_shapefiles import write_datasets
+
+try:
+    from dbfread import DBF
+except ImportError:
+    DBF = None
+
+VARIANTS = ("legacy", "projected")
+
+
+def legacy_load(spec, files: dict) -> gpd.GeoDataFrame:
+    """Full-schema load and merge as the region processor did it originally"""
+    gdf = gpd.read_file(files["shp"])
+    key_column = spec.fields["parcel_id"]
+    gdf[key_column] = gdf[key_column].astype(str)
+    for kind in spec.joins:
+        if kind == "dbf":
+            table = pd.DataFrame(iter(DBF(files[kind], load=True, encoding='latin1')))
+        else:
+            table = pd.read_csv(files[kind], low_memory=False)
+        table[key_column] = table[key_column].astype(str)
+        gdf = gdf.merge(table, on=key_column, how="left", suffixes=('', f'_{kind}'))
+    return gdf.drop_duplicates(subset=[key_column], keep='first')
+
+
+def projected_load(spec, files: dict) -> gpd.GeoDataFrame:
+    """Mapped columns only, with the registry dtypes"""
+    key_column = spec.fields["parcel_id"]
+    columns = plan_columns(files, spec.joins, mapped_columns(spec.fields), key_column)
+    gdf = read_shapefile(files["shp"], columns["shp"], spec.dtypes)
+    gdf[key_column] = gdf[key_column].astype(str)
+    for kind in spec.joins:
+        if not columns[kind]:
+            continue
+        table = read_table(files[kind], kind, columns[kind], spec.dtypes)
+        table[key_column] = table[key_column].astype(str)
+        gdf = gdf.merge(table, on=key_column, how="left", suffixes=('', f'_{kind}'))
+    return gdf.drop_duplicates(subset=[key_column], keep='first')
+
+
+def _digest(gdf: pd.DataFrame, columns: list) -> str:
+    """Hash of the mapped column values, independent of their dtype"""
+    digest = hashlib.sha256()
+    for column in columns:
+        if column not in gdf.columns:
+            continue
+        series = gdf[column]
+        digest.update(column.encode())
+        if pd.api.types.is_numeric_dtype(series):
+            digest.update(series.to_numpy(dtype=np.float64).tobytes())
+        else:
+            values = series.astype(object).where(series.notna(), None).tolist()
+            digest.update(json.dumps(values, default=str).encode())
+    return digest.hexdigest()
+
+
+def _run_variant(name: str, source_root: str, region_key: str, queue):
+    spec = next(region for region in load_regions() if region.key == region_key)
+    files = spec.file_paths(Path(source_root))
+    profiler = StageProfiler()
+    with profiler.stage(name):
+        gdf = legacy_load(spec, files) if name == "legacy" else projected_load(spec, files)
+    stage = profiler.stages[0]
+    queue.put({
+        "seconds": stage["wall_seconds"],
+        "peak_rss_delta_mb": stage["peak_rss_delta_mb"],
+        "attribute_memory_mb": frame_memory_mb(gdf),
+        "columns": len(gdf.columns) - 1,
+        "rows": len(gdf),
+        "digest": _digest(gdf, mapped_columns(spec.fields)),
+    })
+
+
+def run_benchmark(count: int, seed: int = 7) -> dict:
+    context = multiprocessing.get_context("spawn")
+    variants = VARIANTS if DBF is not None else VARIANTS[1:]
+    regions = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        written = write_datasets(Path(tmp), count, seed=seed)
+        for spec in load_regions():
+            results = {}
+            for name in variants:
+                queue = context.Queue()
+                process = context.Process(target=_run_variant, args=(name, tmp, spec.key, queue))
+                process.start()
+                results[name] = queue.get()
+                process.join()
+            digests = {result.pop("digest") for result in results.values()}
+            regions[spec.key] = {
+                "parcels": written[spec.key],
+                "identical_outputs": len(digests) == 1,
+                "variants": results,
+            }
+    return {"parcels": count, "regions": regions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark column-projected attribute loading")
+    parser.add_argument("--parcels", type=int, default=200000, help="Total synthetic parcels (city + county)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    if DBF is None:
+        print("⚠️ dbfread not installed; skipping the legacy variant")
+    report = run_benchmark(args.parcels, args.seed)
+    identical = all(region["identical_outputs"] for region in report["regions"].values())
+    for key, region in report["regions"].items():
+        print(f"📊 {key} attribute loading on {region['parcels']:,} parcels")
+        for name, result in region["variants"].items():
+            print(f"   {name:<10} {result['seconds']:>8.3f} s  peak +{result['peak_rss_delta_mb']:>8.1f} MB  "
+                  f"attributes {result['attribute_memory_mb']:>8.1f} MB  ({result['columns']} columns)")
+        print(f"{'✅' if region['identical_outputs'] else '❌'} Mapped columns "
+              f"{'identical' if region['identical_outputs'] else 'differ'}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
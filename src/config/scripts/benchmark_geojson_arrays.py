@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: vectorized GeoJSON extraction vs per-geometry extract_parcel_geometry
+
+Generates synthetic WGS84 parcels around St. Louis (rectangles, many-vertex
+polygons, courtyards with holes and multi-part lots), checks that every
+extracted geometry is identical to the scalar extractor, and times both.
+
+Usage:
+  python3 benchmark_geojson_arrays.py [--parcels=200000] [--report=bench.json]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import MultiPolygon, Polygon
+
+from geojson_arrays import extract_geojson
+from ingest_shapes import ShapefileProcessor
+
+
+def synthetic_parcels(count: int, seed: int = 7) -> np.ndarray:
+    """WGS84 Polygon/MultiPolygon parcels with realistic vertex counts"""
+    rng = np.random.default_rng(seed)
+    lngs = rng.uniform(-90.6, -90.0, size=count)
+    lats = rng.uniform(38.4, 38.8, size=count)
+    sizes = rng.uniform(0.0001, 0.0008, size=count)
+    vertices = rng.integers(4, 24, size=count)
+
+    parcels = np.empty(count, dtype=object)
+    for i in range(count):
+        x, y, size = lngs[i], lats[i], sizes[i]
+        angles = np.sort(rng.uniform(0, 2 * np.pi, size=vertices[i]))
+        shell = np.column_stack([x + size * np.cos(angles), y + size * np.sin(angles)])
+        if i % 13 == 0:
+            parcels[i] = MultiPolygon([Polygon(shell), Polygon(shell + [size * 3, 0])])
+        elif i % 7 == 0:
+            hole = [(x - size / 4, y - size / 4), (x + size / 4, y - size / 4), (x, y + size / 4)]
+            parcels[i] = Polygon(shell, [hole])
+        else:
+            parcels[i] = Polygon(shell)
+    return parcels
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(count: int) -> dict:
+    parcels = synthetic_parcels(count)
+    processor = ShapefileProcessor(Path(tempfile.gettempdir()), "small")
+
+    scalar, scalar_seconds = timed(
+        lambda: [processor.extract_parcel_geometry(geometry, already_transformed=True) for geometry in parcels]
+    )
+    vectorized, vectorized_seconds = timed(lambda: extract_geojson(parcels))
+
+    return {
+        "parcels": count,
+        "vertices": int(sum(len(ring) for geojson in scalar if geojson for ring in _rings(geojson))),
+        "mismatches": sum(a != b for a, b in zip(scalar, vectorized)),
+        "seconds": {
+            "scalar": scalar_seconds,
+            "vectorized": vectorized_seconds
+        }
+    }
+
+
+def _rings(geojson: dict) -> list:
+    if geojson["type"] == "Polygon":
+        return geojson["coordinates"]
+    return [ring for polygon in geojson["coordinates"] for ring in polygon]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized GeoJSON extraction")
+    parser.add_argument("--parcels", type=int, default=200000)
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.parcels)
+    seconds = report["seconds"]
+    print(f"📊 Geometry extraction on {report['parcels']:,} parcels ({report['vertices']:,} vertices)")
+    for name, value in seconds.items():
+        speedup = seconds["scalar"] / value if value else float("inf")
+        print(f"   {name:<12} {value:>8.3f} s  {report['parcels'] / value:>12,.0f} parcels/s  {speedup:>6.1f}x")
+    print(f"{'✅' if not report['mismatches'] else '❌'} {report['mismatches']} geometries differ from extract_parcel_geometry")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if not report["mismatches"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: full-population vectorized geometry checks vs the scalar validator
+
+Projects synthetic parcels (synthetic_shapefiles.py) to WGS84, extracts them
+the way the pipeline does, and breaks a known number of geometries (open
+rings, shifted bboxes). Then times:
+  sampled_20      the old deep check of 20 random parcels (scalar validate_* methods)
+  scalar_full     the scalar checks on every parcel
+  vectorized      geometry_checks.check_geometries on every parcel
+
+and confirms the vectorized counts find exactly the broken geometries.
+
+Usage:
+  python3 benchmark_geometry_validation.py [--parcels=400000] [--report=bench.json]
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+
+from geojson_arrays import extract_geojson
+from geometry_checks import check_geometries
+from synthetic_shapefiles import parcel_geometries
+from validate_geometries import GeometryValidator
+
+BROKEN_SHARE = 0.001
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def synthetic_geometries(count: int, seed: int = 7) -> tuple:
+    """Pipeline-shaped WGS84 GeoJSON plus how many were broken per check"""
+    shapes = gpd.GeoSeries(parcel_geometries(count, np.random.default_rng(seed)), crs="EPSG:26915")
+    geometries = extract_geojson(shapes.to_crs("EPSG:4326"))
+    # Opened by repeating the second-to-last point: same bbox, same vertex count
+    polygons = [
+        i for i, geometry in enumerate(geometries)
+        if geometry["type"] == "Polygon" and geometry["coordinates"][0][-2] != geometry["coordinates"][0][0]
+    ]
+    broken = max(1, int(count * BROKEN_SHARE))
+    for i in polygons[:broken]:
+        exterior = geometries[i]["coordinates"][0]
+        exterior[-1] = list(exterior[-2])
+    for i in polygons[-broken:]:
+        geometries[i]["bbox"][2] += 0.01
+    return geometries, {"ring_closure": broken, "bbox_mismatch": broken}
+
+
+def scalar_check(validator: GeometryValidator, geometries: list) -> int:
+    """Invalid geometries by the scalar validate_* methods (one polygon's rings at a time)"""
+    invalid = 0
+    for geometry in geometries:
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        coordinate_issues = any(validator.validate_coordinate_precision(rings)["issues"] for rings in polygons)
+        invalid += bool(coordinate_issues or not validator.validate_polygon_topology(geometry)["valid"]
+                        or not validator.validate_bounding_box(geometry)["valid"])
+    return invalid
+
+
+def run_benchmark(count: int) -> dict:
+    geometries, broken = synthetic_geometries(count)
+    parcel_ids = [f"P{i}" for i in range(count)]
+    validator = GeometryValidator(Path("."))
+
+    sample = random.Random(7).sample(geometries, min(20, count))
+    _, sampled_seconds = timed(lambda: scalar_check(validator, sample))
+    scalar_invalid, scalar_seconds = timed(lambda: scalar_check(validator, geometries))
+    stats, vectorized_seconds = timed(
+        lambda: check_geometries(parcel_ids, geometries, validator.reference_bounds["county"])
+    )
+
+    return {
+        "parcels": count,
+        "points": stats["points"],
+        "broken": broken,
+        "failures": stats["failures"],
+        "invalid": {"scalar_full": scalar_invalid, "vectorized": stats["geometries"] - stats["valid"]},
+        "exact": all(stats["failures"][check] == expected for check, expected in broken.items())
+        and stats["geometries"] - stats["valid"] == scalar_invalid,
+        "seconds": {
+            "sampled_20": sampled_seconds,
+            "scalar_full": scalar_seconds,
+            "vectorized": vectorized_seconds
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-population geometry validation")
+    parser.add_argument("--parcels", type=int, default=400000)
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.parcels)
+    seconds = report["seconds"]
+    print(f"📊 Geometry validation on {report['parcels']:,} parcels ({report['points']:,} points)")
+    for name, value in seconds.items():
+        speedup = seconds["scalar_full"] / value if value else float("inf")
+        print(f"   {name:<12} {value:>8.3f} s  {speedup:>8.1f}x vs scalar_full")
+    print(f"   failures: {', '.join(f'{check}={count}' for check, count in report['failures'].items() if count)}")
+    print(f"{'✅' if report['exact'] else '❌'} Vectorized counts {'match' if report['exact'] else 'differ from'} "
+          f"the broken geometries and the scalar checks")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if report["exact"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Benchmark: offline ingest pipeline on synthetic City/County shapefiles
+
+For each size, synthetic_shapefiles.py writes a City + County dataset with
+the real schemas (shapefile + DBF + basic-info CSV), then a fresh process
+runs the pipeline on it with --dataset-size=large semantics:
+
+  step 1  process regional data (read, merge, project, build records)
+  step 2  create intermediate files
+  step 3  compress intermediate files
+  step 5  create document files
+
+Uploads (steps 4 and 6) and the Node index prebuild (5b) are skipped, so the
+run needs no network or node_modules. Every stage and sub-phase comes from
+the pipeline's StageProfiler, the same names as in the run report.
+
+Baselines: --save-baseline writes the per-stage records/sec and peak RSS
+delta; --compare checks a run against a saved baseline and exits 1 when a
+step or sub-phase is slower or uses more memory than --tolerance allows.
+Baselines are machine-specific; keep them next to the machine that made them.
+
+Usage:
+  python3 benchmark_ingest.py [--sizes 10000 100000 1000000] [--workers=1]
+                              [--data-dir=DIR] [--save-baseline=base.json]
+                              [--compare=base.json] [--tolerance=0.25] [--report=bench.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import queue as queue_module
+import shutil
+import tempfile
+from pathlib import Path
+
+from synthetic_shapefiles import write_datasets
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# Stages timed by run_pipeline; with their sub-phases these make up the baseline
+PIPELINE_STEPS = [
+    "step_1_process_regional_data",
+    "step_2_create_intermediate_files",
+    "step_3_compress_intermediate_files",
+    "step_5_create_document_files",
+]
+REGION_PHASES = [
+    f"{region}.{phase}"
+    for region, phases in (
+        ("city", ("read_file", "read_csv", "merge", "project", "build_records")),
+        ("county", ("read_file", "project", "build_records")),
+    )
+    for phase in phases
+]
+BASELINE_STAGES = PIPELINE_STEPS + REGION_PHASES
+
+# Stages shorter than this are too noisy to compare
+MIN_COMPARE_SECONDS = 0.25
+# Peak growth below this is allocator noise
+PEAK_SLACK_MB = 16.0
+
+
+def run_offline_pipeline(source_root: Path, work_dir: Path, workers: int = 1) -> dict:
+    """Run steps 1, 2, 3 and 5 of the pipeline on source_root and return the run report"""
+    from ingest_shapes import DocumentModePipeline
+
+    pipeline = DocumentModePipeline(
+        dataset_size="large",
+        workers=workers,
+        source_root=source_root,
+        data_dir=work_dir / "data",
+        temp_dir=work_dir / "temp",
+        run_report=work_dir / "run-report.json"
+    )
+    profiler = pipeline.profiler
+    processor = pipeline.shapefile_processor
+    profiler.start()
+    try:
+        with profiler.stage("step_1_process_regional_data") as stage:
+            if workers > 1:
+                region_records, region_geometry = pipeline._process_regions_in_parallel()
+            else:
+                region_records, region_geometry = {}, {}
+                for region in pipeline.regions:
+                    region_records[region.key], region_geometry[region.key] = processor.process_region(region)
+            parcels = stage.records = sum(len(records) for records in region_records.values())
+        with profiler.stage("step_2_create_intermediate_files", records=parcels):
+            intermediate_files = pipeline.step_2_create_intermediate_files(region_records, region_geometry)
+        del region_geometry
+        with profiler.stage("step_3_compress_intermediate_files") as stage:
+            stage.records = len(pipeline.step_3_compress_intermediate_files(intermediate_files))
+        with profiler.stage("step_5_create_document_files", records=parcels):
+            pipeline.step_5_create_document_files(region_records)
+    finally:
+        profiler.stop()
+    return profiler.report(
+        workers=workers,
+        city_parcels=len(region_records.get("city", [])),
+        county_parcels=len(region_records.get("county", [])),
+        join_stats=processor.join_stats,
+        errors=pipeline.stats["errors"]
+    )
+
+
+def _run_size(parcels: int, workers: int, data_dir: str, seed: int, verbose: bool, queue):
+    root = Path(data_dir) / f"parcels-{parcels}"
+    source_root = root / "source"
+    marker = root / "dataset.json"
+    if not marker.exists() or json.loads(marker.read_text()).get("seed") != seed:
+        shutil.rmtree(source_root, ignore_errors=True)
+        written = write_datasets(source_root, parcels, seed)
+        marker.write_text(json.dumps({**written, "seed": seed}))
+    work_dir = root / "run"
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        report = run_offline_pipeline(source_root, work_dir, workers)
+    report["parcels"] = parcels
+    queue.put(report)
+
+
+def run_benchmark(sizes: list, workers: int = 1, data_dir: Path = None, seed: int = 7,
+                  verbose: bool = False) -> dict:
+    """Generate and ingest each size in its own process
+
+    Datasets are reused from data_dir when present; without data_dir a
+    temporary directory is used and removed afterwards.
+    """
+    context = multiprocessing.get_context("spawn")
+    temporary = data_dir is None
+    data_dir = Path(tempfile.mkdtemp(prefix="ingest-bench-")) if temporary else Path(data_dir)
+    runs = []
+    try:
+        for parcels in sizes:
+            queue = context.Queue()
+            process = context.Process(
+                target=_run_size, args=(parcels, workers, str(data_dir), seed, verbose, queue)
+            )
+            process.start()
+            report = _wait_for_report(process, queue)
+            process.join()
+            runs.append(_summarize(report) if report else _failed_run(parcels, process.exitcode))
+    finally:
+        if temporary:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return {"workers": workers, "seed": seed, "runs": runs}
+
+
+def _wait_for_report(process, queue):
+    """The child's report, or None when it exits without one (e.g. killed for running out of memory)"""
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except queue_module.Empty:
+            if not process.is_alive():
+                try:
+                    return queue.get(timeout=1)
+                except queue_module.Empty:
+                    return None
+
+
+def _failed_run(parcels: int, exitcode) -> dict:
+    return {
+        "parcels": parcels,
+        "city_parcels": 0,
+        "county_parcels": 0,
+        "wall_seconds": None,
+        "peak_rss_mb": None,
+        "errors": [f"Run process exited with code {exitcode} before reporting"],
+        "stages": {},
+    }
+
+
+def _summarize(report: dict) -> dict:
+    """Keep the baseline stages (first occurrence of each) from a run report"""
+    stages = {}
+    for stage in report["stages"]:
+        if stage["name"] in BASELINE_STAGES and stage["name"] not in stages:
+            stages[stage["name"]] = {
+                key: stage[key]
+                for key in ("wall_seconds", "cpu_seconds", "records", "records_per_second", "peak_rss_delta_mb")
+            }
+    return {
+        "parcels": report["parcels"],
+        "city_parcels": report["city_parcels"],
+        "county_parcels": report["county_parcels"],
+        "wall_seconds": report["wall_seconds"],
+        "peak_rss_mb": report["peak_rss_mb"],
+        "errors": report["errors"],
+        "stages": stages,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """Regressions of results against a saved baseline
+
+    A stage regresses when its records/sec (or, without a record count, its
+    wall time) is worse than the baseline by more than `tolerance`, or its
+    peak RSS delta grows by more than `tolerance` plus PEAK_SLACK_MB.
+    Sizes or stages missing on either side are skipped.
+
+    Returns:
+        One message per regression
+    """
+    baseline_runs = {run["parcels"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        expected_run = baseline_runs.get(run["parcels"])
+        if expected_run is None:
+            continue
+        for name, stage in run["stages"].items():
+            expected = expected_run["stages"].get(name)
+            if expected is None or expected["wall_seconds"] < MIN_COMPARE_SECONDS:
+                continue
+            label = f"{run['parcels']:,} parcels {name}"
+            if stage["records_per_second"] and expected["records_per_second"]:
+                if stage["records_per_second"] < expected["records_per_second"] * (1 - tolerance):
+                    regressions.append(
+                        f"{label}: {stage['records_per_second']:,.0f} rec/s vs "
+                        f"baseline {expected['records_per_second']:,.0f} rec/s"
+                    )
+            elif stage["wall_seconds"] > expected["wall_seconds"] * (1 + tolerance):
+                regressions.append(
+                    f"{label}: {stage['wall_seconds']:.2f} s vs baseline {expected['wall_seconds']:.2f} s"
+                )
+            allowed_peak = expected["peak_rss_delta_mb"] * (1 + tolerance) + PEAK_SLACK_MB
+            if stage["peak_rss_delta_mb"] > allowed_peak:
+                regressions.append(
+                    f"{label}: peak +{stage['peak_rss_delta_mb']:.1f} MB vs "
+                    f"baseline +{expected['peak_rss_delta_mb']:.1f} MB"
+                )
+    return regressions
+
+
+def _print_results(results: dict):
+    for run in results["runs"]:
+        if run["wall_seconds"] is None:
+            print(f"📊 {run['parcels']:,} parcels: no report")
+            for error in run["errors"]:
+                print(f"   ❌ {error}")
+            continue
+        print(f"📊 {run['parcels']:,} parcels ({run['city_parcels']:,} city, {run['county_parcels']:,} county), "
+              f"{results['workers']} worker(s): {run['wall_seconds']:.2f} s, peak RSS {run['peak_rss_mb']:.0f} MB")
+        for name in BASELINE_STAGES:
+            stage = run["stages"].get(name)
+            if stage is None:
+                continue
+            indent = "  " if name in REGION_PHASES else ""
+            rate = f"{stage['records_per_second']:>12,.0f} rec/s" if stage["records_per_second"] else " " * 18
+            print(f"   {indent}{name:<{36 - len(indent)}} {stage['wall_seconds']:>8.2f} s {rate}"
+                  f"  peak +{stage['peak_rss_delta_mb']:>7.1f} MB")
+        for error in run["errors"]:
+            print(f"   ❌ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the offline ingest pipeline on synthetic shapefiles")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Total parcels per run")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--data-dir", type=Path, help="Keep generated datasets here and reuse them across runs")
+    parser.add_argument("--save-baseline", type=Path, help="Write the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Fail on regressions against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown / peak growth (0.25 = 25%%)")
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.workers, args.data_dir, args.seed, args.verbose)
+    _print_results(results)
+
+    for path in (args.report, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"📝 Results written to {path}")
+
+    failed = any(run["errors"] for run in results["runs"])
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        if not regressions:
+            print(f"✅ No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
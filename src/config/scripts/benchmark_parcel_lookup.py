@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: STRtree point-in-parcel lookups vs a linear scan
+
+Writes the adjacent parcel grid of benchmark_parcel_topology.py as a
+.json.gz geometry artifact, builds a ParcelLookup from it, and times:
+  build           streaming the artifact and indexing its parcels
+  load_sidecar    reloading the built lookup from its .lookup.npz sidecar
+  single_point    one locate() call (median and 99th percentile)
+  batch           locate_many() over a batch of points
+  linear_scan     shapely.intersects against every parcel, per point
+
+and confirms the lookups agree with the linear scan and the reloaded sidecar.
+
+Usage:
+  python3 benchmark_parcel_lookup.py [--parcels=400000] [--points=100000] [--report=bench.json]
+"""
+
+import argparse
+import gzip
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from benchmark_parcel_topology import tiled_parcels
+from parcel_lookup import ParcelLookup, lookup_file
+
+SINGLE_POINTS = 2000
+LINEAR_SCAN_POINTS = 50
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(count: int, points: int) -> dict:
+    geometries, _ = tiled_parcels(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench-parcel_geometry.json.gz"
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump({"geometries": {f"P{i}": g for i, g in enumerate(geometries)}}, f, separators=(',', ':'))
+        lookup, build_seconds = timed(lambda: ParcelLookup.from_file(path))
+        lookup.save(lookup_file(path))
+        reloaded, load_seconds = timed(lambda: ParcelLookup.for_artifact(path))
+
+    # Points over the whole extent, including the empty strip between the grid and its sliver row
+    lng_min, lat_min, lng_max, lat_max = shapely.total_bounds(lookup.shapes)
+    rng = np.random.default_rng(7)
+    lats = rng.uniform(lat_min, lat_max, points)
+    lngs = rng.uniform(lng_min, lng_max, points)
+
+    single = []
+    for lat, lng in zip(lats[:SINGLE_POINTS].tolist(), lngs[:SINGLE_POINTS].tolist()):
+        started = time.perf_counter()
+        lookup.locate(lat, lng)
+        single.append(time.perf_counter() - started)
+    found, batch_seconds = timed(lambda: lookup.locate_many(lats, lngs))
+
+    def linear_scan():
+        return [
+            next((lookup.parcel_ids[i] for i in np.flatnonzero(shapely.intersects(lookup.shapes, shapely.Point(lng, lat)))), None)
+            for lat, lng in zip(lats[:LINEAR_SCAN_POINTS].tolist(), lngs[:LINEAR_SCAN_POINTS].tolist())
+        ]
+    scanned, scan_seconds = timed(linear_scan)
+
+    return {
+        "parcels": len(lookup),
+        "points": points,
+        "found": sum(parcel_id is not None for parcel_id in found),
+        "exact": scanned == found[:LINEAR_SCAN_POINTS] and reloaded.locate_many(lats, lngs) == found,
+        "seconds": {
+            "build": build_seconds,
+            "load_sidecar": load_seconds,
+            "single_point_median": float(np.median(single)),
+            "single_point_p99": float(np.percentile(single, 99)),
+            "batch": batch_seconds,
+            "batch_per_point": batch_seconds / points,
+            "linear_scan_per_point": scan_seconds / LINEAR_SCAN_POINTS,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark point-in-parcel lookups")
+    parser.add_argument("--parcels", type=int, default=400000)
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--report", type=str, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.parcels, args.points)
+    seconds = report["seconds"]
+    print(f"📊 Point-in-parcel lookups over {report['parcels']:,} parcels "
+          f"({report['found']:,}/{report['points']:,} points on a parcel)")
+    for name in ("build", "load_sidecar"):
+        print(f"   {name:<22} {seconds[name]:>10.3f} s")
+    for name in ("single_point_median", "single_point_p99", "batch_per_point", "linear_scan_per_point"):
+        print(f"   {name:<22} {seconds[name] * 1e6:>10.1f} µs")
+    print(f"   {'batch':<22} {seconds['batch']:>10.3f} s")
+    print(f"{'✅' if report['exact'] else '❌'} Lookups {'match' if report['exact'] else 'differ from'} the linear scan and the sidecar")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if report["exact"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
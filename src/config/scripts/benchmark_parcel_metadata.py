@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark parcel metadata formats: {region}-parcel_metadata.json.gz vs .bin
+
+Measures file size, full-load time and peak Python memory (tracemalloc), and
+single-parcel lookup latency for the gzipped JSON file and the binary column
+file written by parcel_columns.py.
+
+Usage:
+  python3 benchmark_parcel_metadata.py [--input=stl_city-parcel_metadata.json.gz] [--parcels=100000]
+                                       [--lookups=1000] [--report=bench.json]
+
+Without --input, a synthetic region with --parcels records is generated.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+from parcel_columns import ParcelColumnReader, write_parcel_columns
+
+
+def synthetic_metadata(count: int, seed: int = 7) -> Dict[str, Any]:
+    """parcel_metadata.json-shaped payload with city-style ids"""
+    rng = random.Random(seed)
+    owners = [f"OWNER {i} LLC" for i in range(2000)]
+    parcels = {}
+    for i in range(count):
+        parcel_id = str(10010000000 + i * 7)
+        land = round(rng.uniform(1500, 40000), 2)
+        parcels[parcel_id] = {
+            "id": parcel_id,
+            "primary_full_address": f"{rng.randint(1, 9999)} {rng.choice(['MAIN', 'OAK', 'GRAVOIS', 'ARSENAL'])} ST, St. Louis, MO 631{rng.randint(0, 99):02d}",
+            "latitude": round(rng.uniform(38.5, 38.8), 6),
+            "longitude": round(rng.uniform(-90.4, -90.1), 6),
+            "region": "St. Louis City",
+            "calc": {
+                "landarea_sqft": land,
+                "building_sqft": round(land * rng.uniform(0, 0.5), 2),
+                "estimated_landscapable_area_sqft": round(land * 0.6, 2),
+                "property_type": "unknown"
+            },
+            "owner": {"name": rng.choice(owners)},
+            "assessment": {"total": rng.randint(0, 500000)},
+            "affluence_score": rng.choice([0, 25, 50, 75, 100]),
+            "commercial_multiplier": 1.0,
+            "maintenance_multiplier": 1.0,
+            "combined_multiplier": 1.0,
+            "pricing_tier": "standard"
+        }
+    return {"parcels": parcels, "metadata": {"region": "St. Louis City", "total_parcels": count}}
+
+
+def measure(func, *args):
+    """Run func(*args) once; returns (result, seconds, peak traced bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_benchmark(json_gz_path: Path, work_dir: Path, lookups: int) -> Dict[str, Any]:
+    def load_json():
+        with gzip.open(json_gz_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    data, json_load_seconds, json_peak = measure(load_json)
+    parcels = data["parcels"]
+    bin_path = work_dir / json_gz_path.name.replace(".json.gz", ".bin")
+
+    _, write_seconds, _ = measure(write_parcel_columns, bin_path, parcels.values(), data.get("metadata"))
+
+    def load_columns():
+        with ParcelColumnReader(bin_path) as reader:
+            return reader.load_columns()
+
+    _, bin_load_seconds, bin_peak = measure(load_columns)
+
+    sample = random.Random(11).sample(list(parcels), min(lookups, len(parcels)))
+    with ParcelColumnReader(bin_path) as reader:
+        started = time.perf_counter()
+        for parcel_id in sample:
+            reader.get(parcel_id)
+        bin_lookup_ms = (time.perf_counter() - started) / max(1, len(sample)) * 1000
+
+    count = len(parcels)
+    del data, parcels
+
+    return {
+        "parcels": count,
+        "json_gz": {
+            "bytes": json_gz_path.stat().st_size,
+            "load_seconds": json_load_seconds,
+            "peak_bytes": json_peak,
+            # A JSON lookup needs the whole file parsed first
+            "lookup_ms": json_load_seconds * 1000
+        },
+        "binary": {
+            "bytes": bin_path.stat().st_size,
+            "write_seconds": write_seconds,
+            "load_seconds": bin_load_seconds,
+            "peak_bytes": bin_peak,
+            "lookup_ms": bin_lookup_ms
+        }
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"📊 Parcel metadata formats ({report['parcels']:,} parcels)")
+    print(f"{'format':<10}{'size':>14}{'full load':>12}{'peak mem':>14}{'lookup':>14}")
+    for name in ("json_gz", "binary"):
+        row = report[name]
+        print(f"{name:<10}{row['bytes'] / 1024 / 1024:>11.2f} MB{row['load_seconds']:>10.3f} s"
+              f"{row['peak_bytes'] / 1024 / 1024:>11.1f} MB{row['lookup_ms']:>11.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parcel metadata JSON.gz against the binary column file")
+    parser.add_argument("--input", type=Path, help="Existing {region}-parcel_metadata.json.gz")
+    parser.add_argument("--parcels", type=int, default=100000, help="Synthetic parcel count when --input is omitted")
+    parser.add_argument("--lookups", type=int, default=1000, help="Random single-parcel lookups to time")
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        json_gz_path = args.input
+        if json_gz_path is None:
+            json_gz_path = work_dir / "synthetic-parcel_metadata.json.gz"
+            with gzip.open(json_gz_path, 'wt', encoding='utf-8') as f:
+                json.dump(synthetic_metadata(args.parcels), f, separators=(',', ':'))
+
+        report = run_benchmark(json_gz_path, work_dir, args.lookups)
+
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
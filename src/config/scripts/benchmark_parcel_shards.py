@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark parcel-id sharded metadata
+
+For each shard count, writes gzipped shards for a synthetic city + county
+dataset and reports the shard size distribution and cold single-parcel lookup
+latency (read manifest entry, gunzip + parse one shard) against loading the
+whole region file.
+
+Usage:
+  python3 benchmark_parcel_shards.py [--city-parcels=130000] [--county-parcels=400000]
+                                     [--shards 16 64 256] [--lookups=200] [--report=bench.json]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from artifact_compression import CompressionSettings
+from benchmark_parcel_metadata import synthetic_metadata
+from parcel_shards import region_for_parcel_id, shard_file_name, shard_for_parcel_id, write_metadata_shards
+
+
+def synthetic_entries(city_parcels: int, county_parcels: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """(source region prefix, parcel_metadata entry) pairs"""
+    entries = [("stl_city", entry) for entry in synthetic_metadata(city_parcels)["parcels"].values()]
+    for i, entry in enumerate(synthetic_metadata(county_parcels, seed=11)["parcels"].values()):
+        # County locators look like 18K230049
+        entry["id"] = f"{i % 40 + 10:02d}{'ABCDEFGHJK'[i % 10]}{i:06d}"
+        entry["region"] = "St. Louis County"
+        entries.append(("stl_county", entry))
+    return entries
+
+
+def timed_load(path: Path) -> float:
+    started = time.perf_counter()
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        json.load(f)
+    return time.perf_counter() - started
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def benchmark_shard_count(entries, shard_count: int, lookups: int, work_dir: Path) -> Dict[str, Any]:
+    out_dir = work_dir / f"shards-{shard_count}"
+    out_dir.mkdir()
+    settings = CompressionSettings()
+    started = time.perf_counter()
+    manifest, _ = write_metadata_shards(
+        out_dir, entries, shard_count, "benchmark", opener=lambda path: settings.open_tee(path, out_dir)
+    )
+    write_seconds = time.perf_counter() - started
+
+    sizes = [
+        (out_dir / f"{shard['file']}.gz").stat().st_size
+        for region in manifest["regions"].values() for shard in region["shards"]
+    ]
+
+    latencies = []
+    for _, entry in random.Random(3).sample(entries, min(lookups, len(entries))):
+        parcel_id = entry["id"]
+        shard = shard_for_parcel_id(parcel_id, shard_count)
+        path = out_dir / f"{shard_file_name(region_for_parcel_id(parcel_id), shard)}.gz"
+        latencies.append(timed_load(path) * 1000)
+
+    return {
+        "shard_count": shard_count,
+        "write_seconds": write_seconds,
+        "gzip_bytes": {
+            "min": min(sizes),
+            "median": statistics.median(sizes),
+            "p95": percentile(sizes, 0.95),
+            "max": max(sizes)
+        },
+        "lookup_ms": {
+            "median": statistics.median(latencies),
+            "p95": percentile(latencies, 0.95)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parcel-id sharded metadata")
+    parser.add_argument("--city-parcels", type=int, default=130000)
+    parser.add_argument("--county-parcels", type=int, default=400000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[16, 64, 256], help="Shard counts to compare")
+    parser.add_argument("--lookups", type=int, default=200, help="Cold lookups to time per shard count")
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.city_parcels, args.county_parcels)
+    report = {"parcels": len(entries), "whole_region": {}, "sharded": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+
+        # Baseline: one file per region, as parcelMetadata.ts fetches today
+        for region in ("stl_city", "stl_county"):
+            path = work_dir / f"{region}-parcel_metadata.json.gz"
+            parcels = {entry["id"]: entry for _, entry in entries if region_for_parcel_id(entry["id"]) == region}
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump({"parcels": parcels, "metadata": {}}, f, separators=(',', ':'))
+            report["whole_region"][region] = {"gzip_bytes": path.stat().st_size, "lookup_ms": timed_load(path) * 1000}
+
+        for shard_count in args.shards:
+            report["sharded"].append(benchmark_shard_count(entries, shard_count, args.lookups, work_dir))
+
+    print(f"📊 Parcel metadata shards ({report['parcels']:,} parcels)")
+    for region, row in report["whole_region"].items():
+        print(f"   {region:<12} whole file: {row['gzip_bytes'] / 1024:>10,.0f} KB, cold lookup {row['lookup_ms']:>8.1f} ms")
+    print(f"{'shards':>8}{'min KB':>10}{'median KB':>11}{'p95 KB':>10}{'max KB':>10}{'lookup p50':>12}{'lookup p95':>12}")
+    for row in report["sharded"]:
+        sizes = row["gzip_bytes"]
+        print(f"{row['shard_count']:>8}{sizes['min'] / 1024:>10.0f}{sizes['median'] / 1024:>11.0f}"
+              f"{sizes['p95'] / 1024:>10.0f}{sizes['max'] / 1024:>10.0f}"
+              f"{row['lookup_ms']['median']:>9.1f} ms{row['lookup_ms']['p95']:>9.1f} ms")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: spatial-index topology pass vs all-pairs comparison
+
+Builds a county-sized grid of adjacent parcels (every parcel shares its
+edges with its neighbours, as assessor parcels do), projects it to WGS84 and
+extracts it the way the pipeline does. Then injects a known number of
+duplicated parcels, parcels shifted half a cell onto four neighbours and
+thin sliver strips, and times parcel_topology's index build and check.
+
+The all-pairs baseline runs shapely.intersects on every pair of a sample
+and is scaled by (n / sample)², since it grows quadratically.
+
+Usage:
+  python3 benchmark_parcel_topology.py [--parcels=400000] [--report=bench.json]
+"""
+
+import argparse
+import json
+import time
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from geojson_arrays import extract_geojson
+from geometry_checks import GeometryArrays
+from parcel_topology import ParcelIndex, parcel_shapes
+from synthetic_shapefiles import ORIGIN
+
+CELL_METERS = 20.0
+INJECTED_SHARE = 0.0005
+SLIVER_DEGREES = (0.0004, 0.000004)  # about 35 m x 0.45 m
+ALL_PAIRS_SAMPLE = 2000
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def tiled_parcels(count: int) -> tuple:
+    """WGS84 GeoJSON of an adjacent parcel grid plus injected problems, and the expected findings"""
+    columns = max(2, int(np.ceil(np.sqrt(count))))
+    xs = ORIGIN[0] + np.arange(columns + 1) * CELL_METERS
+    ys = ORIGIN[1] + np.arange(count // columns + 2) * CELL_METERS
+    index = np.arange(count)
+    column, row = index % columns, index // columns
+    tiles = shapely.box(xs[column], ys[row], xs[column + 1], ys[row + 1])
+
+    # Injected parcels far apart: duplicates of tiles, tiles shifted half a cell onto 4 neighbours
+    injected = max(1, int(count * INJECTED_SHARE))
+    spacing = count // (2 * injected)
+    interior = [i for i in range(0, count, spacing)
+                if column[i] < columns - 1 and i + columns < count - columns][:2 * injected]
+    duplicated, shifted = interior[0::2], interior[1::2]
+    half = CELL_METERS / 2
+    extra = [tiles[i] for i in duplicated] + [
+        shapely.box(xs[column[i]] + half, ys[row[i]] + half, xs[column[i] + 1] + half, ys[row[i] + 1] + half)
+        for i in shifted
+    ]
+    projected = gpd.GeoSeries(np.concatenate([tiles, extra]), crs="EPSG:26915").to_crs("EPSG:4326")
+    geometries = extract_geojson(projected)
+
+    # Slivers above the grid, written at full GeoJSON precision
+    north = float(projected.total_bounds[3]) + 0.001
+    west = float(projected.total_bounds[0])
+    for i in range(len(shifted)):
+        lng, lat = round(west + i * 0.001, 6), north
+        east, top = round(lng + SLIVER_DEGREES[0], 6), round(lat + SLIVER_DEGREES[1], 6)
+        geometries.append({"type": "Polygon", "coordinates": [[[lng, lat], [east, lat], [east, top], [lng, top], [lng, lat]]],
+                           "bbox": [lng, lat, east, top]})
+
+    expected = {"duplicates": len(duplicated), "overlaps": 4 * len(shifted), "slivers": len(shifted)}
+    return geometries, expected
+
+
+def all_pairs_seconds(shapes: np.ndarray, sample: int) -> float:
+    """Seconds for shapely.intersects on every pair of a sample of parcels"""
+    sample = shapes[:sample]
+    started = time.perf_counter()
+    for i in range(len(sample) - 1):
+        shapely.intersects(sample[i], sample[i + 1:])
+    return time.perf_counter() - started
+
+
+def run_benchmark(count: int) -> dict:
+    geometries, expected = tiled_parcels(count)
+    parcel_ids = [f"P{i}" for i in range(len(geometries))]
+
+    arrays, flatten_seconds = timed(lambda: GeometryArrays(geometries))
+    index = ParcelIndex()
+    _, index_seconds = timed(lambda: index.add(parcel_ids, arrays))
+    report, check_seconds = timed(lambda: index.check())
+
+    sample = min(ALL_PAIRS_SAMPLE, len(geometries))
+    sample_seconds = all_pairs_seconds(parcel_shapes(arrays)[1], sample)
+    return {
+        "parcels": len(geometries),
+        "expected": expected,
+        "found": {kind: report[kind] for kind in ("duplicates", "overlaps", "slivers", "invalid")},
+        "candidate_pairs": report["candidate_pairs"],
+        "exact": all(report[kind] == value for kind, value in expected.items()) and report["invalid"] == 0,
+        "seconds": {
+            "flatten": flatten_seconds,
+            "index": index_seconds,
+            "check": check_seconds,
+            "all_pairs_sample": sample_seconds,
+            "all_pairs_estimate": sample_seconds * (len(geometries) / sample) ** 2,
+        },
+        "all_pairs_sample": sample,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the spatial-index parcel topology pass")
+    parser.add_argument("--parcels", type=int, default=400000)
+    parser.add_argument("--report", type=str, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.parcels)
+    seconds = report["seconds"]
+    print(f"📊 Parcel topology on {report['parcels']:,} adjacent parcels ({report['candidate_pairs']:,} candidate pairs)")
+    for name in ("flatten", "index", "check"):
+        print(f"   {name:<18} {seconds[name]:>10.3f} s")
+    print(f"   {'all_pairs_sample':<18} {seconds['all_pairs_sample']:>10.3f} s  ({report['all_pairs_sample']:,} parcels)")
+    print(f"   {'all_pairs_estimate':<18} {seconds['all_pairs_estimate']:>10.0f} s  "
+          f"({seconds['all_pairs_estimate'] / (seconds['index'] + seconds['check']):,.0f}x the indexed pass)")
+    print(f"   found: {', '.join(f'{kind}={count}' for kind, count in report['found'].items())}")
+    print(f"{'✅' if report['exact'] else '❌'} Findings {'match' if report['exact'] else 'differ from'} "
+          f"the injected problems")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if report["exact"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
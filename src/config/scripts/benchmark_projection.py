@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass projection plan vs the original copy + double to_crs chain
+
+Builds a synthetic region GeoDataFrame in the county's source CRS
+(EPSG:26916) with merged-frame-sized attribute columns, then runs each variant in its own
+process and reports per step:
+  - wall time
+  - peak RSS above the process baseline (ru_maxrss high-water mark, so GEOS
+    allocations are included; tracemalloc would miss them)
+
+Outputs (landarea, WGS84 geometry, centroids) are compared for exact equality.
+
+Usage:
+  python3 benchmark_projection.py [--parcels=200000] [--limit=5000] [--report=bench.json]
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from projection_plan import project_region
+
+SOURCE_EPSG = 26916
+ATTRIBUTE_COLUMNS = 40
+
+
+def legacy_project_region(gdf: gpd.GeoDataFrame, timings=None, limit: int = None) -> tuple:
+    """Original processor flow: copy, UTM for area/centroids, copy -> WGS84, centroid frame -> WGS84"""
+    step = _Steps(timings)
+    gdf_original = gdf.copy()
+    step("copy")
+    gdf = gdf.to_crs(epsg=26915)
+    gdf["landarea"] = gdf.geometry.area * 10.7639
+    step("project_utm_area")
+    if limit:
+        gdf = gdf.head(limit)
+        gdf_original = gdf_original.head(limit)
+    if gdf_original.crs and gdf_original.crs.to_epsg() != 4326:
+        gdf_wgs84 = gdf_original.to_crs(epsg=4326)
+    else:
+        gdf_wgs84 = gdf_original.copy()
+    step("project_wgs84")
+    centroids_utm = gdf.geometry.centroid
+    centroids_gdf = gpd.GeoDataFrame({'geometry': centroids_utm}, crs=gdf.crs)
+    centroids = centroids_gdf.to_crs(epsg=4326).geometry
+    step("centroids")
+    return gdf, gdf_wgs84, centroids, gdf_original
+
+
+def synthetic_region(count: int, seed: int = 7) -> gpd.GeoDataFrame:
+    """Parcels in EPSG:26916 around St. Louis with 8-24 vertex shells and attribute columns"""
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(200000, 250000, size=count)
+    ys = rng.uniform(4265000, 4300000, size=count)
+    sizes = rng.uniform(8, 60, size=count)
+    vertices = rng.integers(8, 24, size=count)
+    polygons = []
+    for x, y, size, n in zip(xs, ys, sizes, vertices):
+        angles = np.sort(rng.uniform(0, 2 * np.pi, size=n))
+        polygons.append(shapely.polygons(np.column_stack([x + size * np.cos(angles), y + size * np.sin(angles)])))
+    attributes = {
+        "LOCATOR": [f"{i:011d}" for i in range(count)],
+        "OWNER_NAME": [f"OWNER {i % 5000}" for i in range(count)],
+        "PROP_ADD": [f"{i % 9999} MAIN ST" for i in range(count)],
+    }
+    # Merged city frames carry dozens of DBF/CSV columns
+    for column in range(ATTRIBUTE_COLUMNS):
+        attributes[f"VALUE_{column}"] = rng.uniform(0, 900000, size=count)
+    return gpd.GeoDataFrame(attributes, geometry=polygons, crs=SOURCE_EPSG)
+
+
+class _Steps:
+    """Record wall time and peak RSS since the last call under a step name"""
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.started = time.perf_counter()
+
+    def __call__(self, name: str):
+        if self.timings is not None:
+            self.timings.append((name, time.perf_counter() - self.started, _max_rss_mb()))
+        self.started = time.perf_counter()
+
+
+def _max_rss_mb() -> float:
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _digest(gdf, gdf_wgs84, centroids) -> str:
+    digest = hashlib.sha256(gdf["landarea"].to_numpy().tobytes())
+    for geometries in (gdf_wgs84.geometry.array, centroids.array):
+        for blob in shapely.to_wkb(np.asarray(geometries)).tolist():
+            digest.update(blob or b"")
+    return digest.hexdigest()
+
+
+def _run_variant(name: str, count: int, limit, queue):
+    gdf = synthetic_region(count)
+    baseline = _max_rss_mb()
+    timings = []
+    started = time.perf_counter()
+    if name == "legacy":
+        gdf, gdf_wgs84, centroids, _ = legacy_project_region(gdf, timings, limit)
+    else:
+        step = _Steps(timings)
+        if limit:
+            gdf = gdf.head(limit)
+        gdf, gdf_wgs84, centroids = project_region(gdf)
+        step("project_region")
+    total = time.perf_counter() - started
+    queue.put({
+        "seconds": total,
+        "peak_rss_delta_mb": _max_rss_mb() - baseline,
+        "steps": [
+            {"step": step, "seconds": seconds, "peak_rss_delta_mb": rss - baseline}
+            for step, seconds, rss in timings
+        ],
+        "digest": _digest(gdf, gdf_wgs84, centroids)
+    })
+
+
+def run_benchmark(count: int, limit: int = None) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in ("legacy", "projection_plan"):
+        queue = context.Queue()
+        process = context.Process(target=_run_variant, args=(name, count, limit, queue))
+        process.start()
+        results[name] = queue.get()
+        process.join()
+
+    digests = [result.pop("digest") for result in results.values()]
+    return {
+        "parcels": count,
+        "limit": limit,
+        "identical_outputs": digests[0] == digests[1],
+        "variants": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass projection plan")
+    parser.add_argument("--parcels", type=int, default=200000)
+    parser.add_argument("--limit", type=int, help="Keep only the first N parcels, like --dataset-size=small/medium")
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.parcels, args.limit)
+    limited = f" (limit {report['limit']:,})" if report["limit"] else ""
+    print(f"📊 Region projection on {report['parcels']:,} parcels{limited}")
+    for name, result in report["variants"].items():
+        print(f"   {name:<16} {result['seconds']:>8.3f} s  peak +{result['peak_rss_delta_mb']:>8.1f} MB")
+        for step in result["steps"]:
+            print(f"     {step['step']:<18} {step['seconds']:>8.3f} s  peak +{step['peak_rss_delta_mb']:>8.1f} MB")
+    print(f"{'✅' if report['identical_outputs'] else '❌'} Outputs {'identical' if report['identical_outputs'] else 'differ'}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if report["identical_outputs"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
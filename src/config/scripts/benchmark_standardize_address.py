@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: address normalization engine vs the original per-call implementation
+
+Generates a synthetic city/county-style address set (repeated street names,
+ZIPs and multi-parcel addresses, messy spacing and punctuation), checks that
+every output is identical to the original implementation, and times:
+  - legacy         original standardize_address (regexes and street table per call)
+  - cold engine    address_normalizer.standardize_batch with an empty memo
+  - warm engine    the same batch again (memo populated)
+  - series         address_normalizer.standardize_series on a pandas Series
+
+Usage:
+  python3 benchmark_standardize_address.py [--addresses=500000] [--report=bench.json]
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import address_normalizer
+
+STREET_NAMES = [
+    "Kingshighway", "Grand", "Gravois", "Arsenal", "Chippewa", "Delmar", "Lindell", "Manchester",
+    "Olive", "Natural Bridge", "Page", "Jefferson", "Broadway", "Florissant", "Hampton", "Watson",
+    "Lemay Ferry", "New Halls Ferry", "Big Bend", "Clayton", "Ladue", "Mason", "Telegraph", "Tesson Ferry"
+] + [f"Oak {i}" for i in range(150)] + [f"Maple Ridge {i}" for i in range(150)]
+STREET_TYPES = ["ST", "STREET", "AVE", "Avenue", "BLVD", "RD", "DR.", "LN", "CT", "PKWY", "PL", "WAY"]
+DIRECTIONS = ["", "", "", "N ", "S ", "E ", "W "]
+MUNICIPALITIES = ["St. Louis", "ST LOUIS", "Saint Louis", "FLORISSANT", "Kirkwood", "Webster Groves",
+                  "Unincorporated", "University City", "Chesterfield", "Ballwin"]
+
+
+def legacy_standardize_address(full_address_str, default_city="Unknown City", default_state="MO", default_zip="63102"):
+    """Original ShapefileProcessor.standardize_address, kept as the parity and speed baseline"""
+    if not full_address_str or not isinstance(full_address_str, str):
+        return ""
+
+    address_str = full_address_str.strip()
+    if not address_str:
+        return ""
+
+    address_str = re.sub(r'\s+', ' ', address_str)
+    address_str = re.sub(r'[.,]+(?=[.,])', ',', address_str)
+    address_str = address_str.replace(' ;', ',').replace(';', ',')
+    address_str = re.sub(r'\s*\,\s*', ', ', address_str)
+
+    parts = [p.strip() for p in address_str.split(',') if p.strip()]
+    if not parts:
+        return ""
+
+    street_part = parts[0]
+    city_part = parts[1] if len(parts) > 1 else default_city
+    state_zip_part = parts[2] if len(parts) > 2 else f"{default_state} {default_zip}"
+
+    street_types = {
+        "STREET": "St.", "ST": "St.", "AVENUE": "Ave.", "AVE": "Ave.",
+        "ROAD": "Rd.", "RD": "Rd.", "DRIVE": "Dr.", "DR": "Dr.",
+        "LANE": "Ln.", "LN": "Ln.", "COURT": "Ct.", "CT": "Ct.",
+        "BOULEVARD": "Blvd.", "BLVD": "Blvd."
+    }
+
+    words = street_part.split()
+    standardized_words = []
+    for word in words:
+        upper_word = word.upper().rstrip('.,')
+        if upper_word in street_types:
+            standardized_words.append(street_types[upper_word])
+        else:
+            standardized_words.append(word.title())
+
+    street_standardized = " ".join(standardized_words)
+
+    if city_part.upper() in ["ST LOUIS", "SAINT LOUIS"]:
+        city_standardized = "St. Louis"
+    else:
+        city_standardized = city_part.title()
+
+    state_zip_match = re.search(r"\b([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\b\s*$", state_zip_part)
+    if state_zip_match:
+        state_standardized = state_zip_match.group(1).upper()
+        zip_standardized = state_zip_match.group(2)
+    else:
+        state_standardized = default_state
+        zip_standardized = default_zip
+
+    final_address = f"{street_standardized}, {city_standardized}, {state_standardized} {zip_standardized}"
+    return re.sub(r'\s+', ' ', final_address).strip()
+
+
+def synthetic_address_args(count: int, seed: int = 7) -> list:
+    """standardize_address argument tuples shaped like _region_addresses builds them"""
+    rng = random.Random(seed)
+    args = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.02:
+            args.append(None)
+            continue
+        if roll < 0.17 and args and args[-1] is not None:
+            # Multi-parcel sites (condos, split lots) repeat the previous address
+            args.append(args[-1])
+            continue
+
+        street = f"{rng.randint(1, 9999)} {rng.choice(DIRECTIONS)}{rng.choice(STREET_NAMES)} {rng.choice(STREET_TYPES)}"
+        if rng.random() < 0.1:
+            street = street.replace(" ", "  ", 1) + " ,"
+        zip_code = f"63{rng.randint(101, 146)}"
+        if rng.random() < 0.5:
+            args.append((f"{street}, St. Louis, MO {zip_code}", "St. Louis", "MO", "63102"))
+        else:
+            city = rng.choice(MUNICIPALITIES)
+            zip_to_use = zip_code if rng.random() < 0.95 else "63105"
+            separator = "; " if rng.random() < 0.05 else ", "
+            args.append((f"{street}{separator}{city}, MO {zip_to_use}", city, "MO", zip_to_use))
+    return args
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def run_benchmark(count: int) -> dict:
+    address_args = synthetic_address_args(count)
+    distinct = len({args for args in address_args if args})
+
+    legacy, legacy_seconds = timed(lambda: [legacy_standardize_address(*args) if args else "" for args in address_args])
+
+    address_normalizer.clear_memo()
+    cold, cold_seconds = timed(lambda: address_normalizer.standardize_batch(address_args))
+    warm, warm_seconds = timed(lambda: address_normalizer.standardize_batch(address_args))
+
+    frame = pd.DataFrame([args or (None, None, None, None) for args in address_args],
+                         columns=["address", "city", "state", "zip"])
+    address_normalizer.clear_memo()
+    series, series_seconds = timed(lambda: address_normalizer.standardize_series(
+        frame["address"], frame["city"], frame["state"], frame["zip"]
+    ))
+
+    mismatches = sum(a != b for a, b in zip(legacy, cold)) + sum(a != b for a, b in zip(legacy, warm))
+    series_outputs = ["" if args is None else value for args, value in zip(address_args, series.tolist())]
+    mismatches += sum(a != b for a, b in zip(legacy, series_outputs))
+
+    return {
+        "addresses": count,
+        "distinct_inputs": distinct,
+        "mismatches": mismatches,
+        "seconds": {
+            "legacy": legacy_seconds,
+            "engine_cold": cold_seconds,
+            "engine_warm": warm_seconds,
+            "series": series_seconds
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the address normalization engine")
+    parser.add_argument("--addresses", type=int, default=500000)
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.addresses)
+    seconds = report["seconds"]
+    print(f"📊 standardize_address on {report['addresses']:,} addresses ({report['distinct_inputs']:,} distinct)")
+    for name, value in seconds.items():
+        speedup = seconds["legacy"] / value if value else float("inf")
+        print(f"   {name:<12} {value:>8.3f} s  {report['addresses'] / value:>12,.0f} addr/s  {speedup:>6.1f}x")
+    print(f"{'✅' if not report['mismatches'] else '❌'} {report['mismatches']} outputs differ from the original implementation")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if not report["mismatches"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
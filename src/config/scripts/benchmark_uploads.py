@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled uploads through one persistent worker vs one process per file
+
+Uploads a batch of files to the local stand-in blob server (blob_standin.py),
+with a simulated per-request latency, in three ways:
+  per_process  one `blob_standin.py --upload` process per file, sequentially
+               (the shape of the old one-`node upload_blob.js`-per-file loop)
+  pooled_1     one persistent worker, one file at a time
+  pooled_N     one persistent worker, N files in flight (--concurrency)
+
+Python worker startup is cheaper than Node startup plus SDK auth, so the
+per-process overhead measured here is a lower bound. Reports total time and
+per-file throughput for each mode.
+
+Usage:
+  python3 benchmark_uploads.py [--files=12] [--size-mb=4] [--latency=0.2] [--concurrency=4] [--report=bench.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from blob_standin import StandInBlobServer
+from upload_pool import UploadPool, UploadWorker
+
+STANDIN = str(Path(__file__).parent / "blob_standin.py")
+
+
+def per_process_uploads(server_url: str, jobs: list) -> list:
+    results = []
+    for local_path, remote_path in jobs:
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, STANDIN, "--upload", server_url, str(local_path), remote_path],
+                                   capture_output=True, text=True)
+        seconds = time.perf_counter() - started
+        size = local_path.stat().st_size
+        results.append({"local": str(local_path), "success": completed.returncode == 0, "bytes": size,
+                        "seconds": seconds, "mb_per_second": size / (1024 * 1024) / seconds})
+    return results
+
+
+def pooled_uploads(server_url: str, jobs: list, concurrency: int) -> list:
+    with UploadWorker([sys.executable, STANDIN, "--serve", server_url]) as worker:
+        return UploadPool(worker, concurrency=concurrency).upload_all(jobs)
+
+
+def run_benchmark(files: int, size_mb: float, latency: float, concurrency: int) -> dict:
+    modes = {}
+    with tempfile.TemporaryDirectory() as tmp, StandInBlobServer(latency=latency) as server:
+        jobs = []
+        for i in range(files):
+            path = Path(tmp) / f"artifact-{i:02d}.json.gz"
+            path.write_bytes(bytes([i % 256]) * int(size_mb * 1024 * 1024))
+            jobs.append((path, f"cdn/{path.name}"))
+
+        for name, upload in (
+            ("per_process", lambda: per_process_uploads(server.url, jobs)),
+            ("pooled_1", lambda: pooled_uploads(server.url, jobs, 1)),
+            (f"pooled_{concurrency}", lambda: pooled_uploads(server.url, jobs, concurrency)),
+        ):
+            server.blobs.clear()
+            started = time.perf_counter()
+            results = upload()
+            seconds = time.perf_counter() - started
+            intact = all(server.blobs.get(remote) == local.read_bytes() for local, remote in jobs)
+            modes[name] = {
+                "seconds": seconds,
+                "mb_per_second": files * size_mb / seconds,
+                "uploaded": sum(result["success"] for result in results),
+                "intact": intact,
+                "files": [
+                    {"file": Path(result["local"]).name, "seconds": result["seconds"],
+                     "mb_per_second": result["mb_per_second"]}
+                    for result in results
+                ],
+            }
+    return {"files": files, "size_mb": size_mb, "latency": latency, "concurrency": concurrency, "modes": modes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled uploads against a stand-in blob server")
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per upload request")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--report", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.files, args.size_mb, args.latency, args.concurrency)
+    print(f"📊 {report['files']} files × {report['size_mb']:g} MB, {report['latency']:g} s simulated latency")
+    for name, mode in report["modes"].items():
+        rates = [entry["mb_per_second"] for entry in mode["files"] if entry["mb_per_second"]]
+        per_file = sum(rates) / len(rates) if rates else 0.0
+        print(f"   {name:<12} {mode['seconds']:>7.2f} s  {mode['mb_per_second']:>7.2f} MB/s overall  "
+              f"{per_file:>7.2f} MB/s per file  {mode['uploaded']}/{report['files']} uploaded")
+    intact = all(mode["intact"] and mode["uploaded"] == report["files"] for mode in report["modes"].values())
+    print(f"{'✅' if intact else '❌'} Stored blobs {'match' if intact else 'do not match'} the local files")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if intact else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
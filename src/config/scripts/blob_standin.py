@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the blob store, for testing and benchmarking uploads offline
+
+StandInBlobServer is a threaded HTTP server that keeps blobs in memory. It
+answers the blob API's upload shape, `PUT /?pathname=<path>` with the file
+body, with {"url", "pathname", "size"}, and serves stored blobs on
+`GET /<path>`. For failure and latency tests it can reject the first N
+uploads of each path with a 503 and delay every upload.
+
+Running this module with --serve is a JSON-lines upload worker with the same
+protocol as `upload_blob.js --serve` (upload_worker.js) that PUTs to a
+stand-in server. UploadPool can drive it like the Node worker:
+
+  python3 blob_standin.py --serve http://127.0.0.1:8123
+  python3 blob_standin.py --upload http://127.0.0.1:8123 local.json.gz cdn/local.json.gz
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+WORKER_THREADS = 8
+
+
+class StandInBlobServer:
+    """In-memory blob store on 127.0.0.1 with optional 503s and latency"""
+
+    def __init__(self, fail_first: int = 0, latency: float = 0.0):
+        self.fail_first = fail_first
+        self.latency = latency
+        self.blobs: Dict[str, bytes] = {}
+        self.attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInBlobServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInBlobServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_PUT(self):
+                pathname = parse_qs(urlparse(self.path).query).get("pathname", [""])[0]
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not pathname:
+                    return self._reply(400, {"error": "missing pathname"})
+                with store._lock:
+                    attempt = store.attempts[pathname] = store.attempts.get(pathname, 0) + 1
+                if store.latency:
+                    time.sleep(store.latency)
+                if attempt <= store.fail_first:
+                    return self._reply(503, {"error": "service unavailable"})
+                with store._lock:
+                    store.blobs[pathname] = body
+                self._reply(200, {"url": f"{store.url}/{pathname}", "pathname": pathname, "size": len(body)})
+
+            def do_GET(self):
+                blob = store.blobs.get(urlparse(self.path).path.lstrip("/"))
+                if blob is None:
+                    return self._reply(404, {"error": "not found"})
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(blob)))
+                self.end_headers()
+                self.wfile.write(blob)
+
+            def _reply(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def put_file(server_url: str, local_path: str, remote_path: str) -> dict:
+    """Upload one file to a stand-in server; raises on HTTP errors"""
+    data = Path(local_path).read_bytes()
+    request = urllib.request.Request(
+        f"{server_url}/?pathname={remote_path}", data=data, method="PUT",
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def serve(server_url: str):
+    """JSON-lines worker loop: one job per stdin line, one result per stdout line"""
+    write_lock = threading.Lock()
+
+    def run(job: dict):
+        try:
+            response = {**put_file(server_url, job["local"], job["remote"]), "id": job["id"], "success": True}
+        except (OSError, urllib.error.URLError, ValueError) as e:
+            response = {"id": job["id"], "success": False, "error": str(e)}
+        with write_lock:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=WORKER_THREADS) as pool:
+        for line in sys.stdin:
+            if line.strip():
+                pool.submit(run, json.loads(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in blob store upload worker")
+    parser.add_argument("--serve", metavar="URL", help="Run the JSON-lines upload worker against a stand-in server")
+    parser.add_argument("--upload", nargs=3, metavar=("URL", "LOCAL", "REMOTE"), help="Upload one file and exit")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+    if args.upload:
+        try:
+            print(json.dumps({**put_file(*args.upload), "success": True}))
+            return 0
+        except (OSError, urllib.error.URLError) as e:
+            print(f"❌ Upload failed: {e}", file=sys.stderr)
+            return 1
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env node
+
+/**
+ * Build a prebuilt FlexSearch index from a {region}-document.json file.
+ *
+ * The index is built exactly as loadAddressIndex.ts does in the browser
+ * (new Index(FLEXSEARCH_CONFIG), add(id, full_address) per document), then
+ * exported key by key. The output file is what importPrebuiltIndex() turns
+ * back into a FlexSearchIndexBundle:
+ *
+ *   { version, region, config, index: { <export key>: <data> }, addressData, metadata }
+ *
+ * The index config is src/config/flexsearch.config.json, the same file
+ * flexsearch.ts exports as FLEXSEARCH_CONFIG, so tokenization cannot drift
+ * from the client. Runs entirely offline.
+ *
+ * Usage:
+ *   node build_flexsearch_index.js <documents.json> <output.json> <region> [generated_at]
+ *
+ * generated_at (the pipeline passes its content-derived build time) keeps the
+ * output byte-identical while the documents are unchanged; default: now.
+ *
+ * The last stdout line is a JSON summary (sizes and build/import timings).
+ */
+
+import * as flexsearch from 'flexsearch';
+import { readFileSync, writeFileSync, statSync } from 'fs';
+import path from 'path';
+import { performance } from 'perf_hooks';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const Index = flexsearch.Index || flexsearch.default?.Index;
+
+const CONFIG_FILE = path.join(__dirname, '..', 'flexsearch.config.json');
+const SAMPLE_QUERIES = 25;
+
+function loadFlexSearchConfig() {
+  return JSON.parse(readFileSync(CONFIG_FILE, 'utf-8'));
+}
+
+function buildIndex(config, documents) {
+  const index = new Index(config);
+  const addressData = {};
+  for (const document of documents) {
+    addressData[document.id] = document.full_address;
+    index.add(document.id, document.full_address);
+  }
+  return { index, addressData };
+}
+
+async function exportIndex(index) {
+  const exported = {};
+  await index.export((key, data) => {
+    exported[key] = data;
+  });
+  return exported;
+}
+
+function importIndex(config, exported) {
+  const index = new Index(config);
+  for (const [key, data] of Object.entries(exported)) {
+    index.import(key, data);
+  }
+  return index;
+}
+
+function sampleQueries(documents) {
+  const step = Math.max(1, Math.floor(documents.length / SAMPLE_QUERIES));
+  const queries = [];
+  for (let i = 0; i < documents.length && queries.length < SAMPLE_QUERIES; i += step) {
+    // First two words, e.g. "1234 main", like a user typing an address
+    queries.push(documents[i].full_address.toLowerCase().split(/\s+/).slice(0, 2).join(' '));
+  }
+  return queries;
+}
+
+async function main() {
+  const [documentsPath, outputPath, region, generatedAt] = process.argv.slice(2);
+  if (!documentsPath || !outputPath || !region) {
+    console.error(
+      'Usage: node build_flexsearch_index.js <documents.json> <output.json> <region> [generated_at]'
+    );
+    process.exit(1);
+  }
+
+  const config = loadFlexSearchConfig();
+  const documentsText = readFileSync(documentsPath, 'utf-8');
+
+  // What every browser does today: parse the documents and build the index
+  let started = performance.now();
+  const documents = JSON.parse(documentsText);
+  const { index, addressData } = buildIndex(config, documents);
+  const buildMs = performance.now() - started;
+
+  started = performance.now();
+  const exported = await exportIndex(index);
+  const exportMs = performance.now() - started;
+
+  const bundle = {
+    version: 1,
+    region,
+    config,
+    index: exported,
+    addressData,
+    metadata: {
+      generated_at: generatedAt || new Date().toISOString(),
+      documents: documents.length,
+      export_keys: Object.keys(exported).length
+    }
+  };
+  const serialized = JSON.stringify(bundle);
+  writeFileSync(outputPath, serialized);
+
+  // What a browser would do with the prebuilt file: parse it and import
+  started = performance.now();
+  const parsed = JSON.parse(serialized);
+  const imported = importIndex(parsed.config, parsed.index);
+  const importMs = performance.now() - started;
+
+  // The imported index must answer like the freshly built one
+  const mismatches = sampleQueries(documents).filter((query) => {
+    const expected = index.search(query, { bool: 'and', limit: 5 });
+    const actual = imported.search(query, { bool: 'and', limit: 5 });
+    return JSON.stringify(expected) !== JSON.stringify(actual);
+  });
+
+  console.log(`✅ Prebuilt ${region} index: ${documents.length} documents, ${Object.keys(exported).length} export keys`);
+  console.log(
+    JSON.stringify({
+      success: mismatches.length === 0,
+      region,
+      documents: documents.length,
+      bytes: statSync(outputPath).size,
+      source_bytes: statSync(documentsPath).size,
+      build_ms: buildMs,
+      export_ms: exportMs,
+      import_ms: importMs,
+      mismatched_queries: mismatches
+    })
+  );
+}
+
+main().catch((error) => {
+  console.log(JSON.stringify({ success: false, error: error.message }));
+  process.exit(1);
+});
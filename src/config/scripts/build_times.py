@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Content-derived build times for pipeline artifacts
+
+Every artifact the pipeline writes records a build_time (generated_at for
+latest.json). Stamping it with the time of the run made every artifact's
+bytes, and so its upload hash, differ on every build. A BuildTimes stamps an
+artifact with the time its content last changed instead. Writers feed a
+content digest of what they write (streaming_json's digest option), and the
+previous run's build time is reused while that digest stays the same.
+
+The digests and build times are kept in {data_dir}/build-times.json:
+
+  {"version": 1, "artifacts": {
+      "stl_city-parcel_metadata.json": {"digest": "...", "build_time": "2025-07-11T17:01:15.949892"}}}
+
+Every artifact whose content changed in one run gets that run's timestamp.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BUILD_TIMES_NAME = "build-times.json"
+BUILD_TIMES_VERSION = 1
+
+
+def content_digest(data: bytes = b""):
+    """Digest for BuildTimes.resolve (a hashlib object; feed it with update)"""
+    return hashlib.blake2b(data, digest_size=16)
+
+
+def json_digest(value: Any):
+    """Digest of a JSON-serializable value, independent of dict key order"""
+    return content_digest(json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+class BuildTimes:
+    """Build time per artifact name, carried over while its content digest is unchanged"""
+
+    def __init__(self, path: Path, now: Optional[str] = None):
+        self.path = Path(path)
+        self.now = now or datetime.now().isoformat()
+        self.artifacts: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get("version") == BUILD_TIMES_VERSION:
+                self.artifacts = stored.get("artifacts", {})
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def resolve(self, name: str, digest: str) -> str:
+        """The artifact's build time: the previous one when digest matches, otherwise this run's"""
+        entry = self.artifacts.get(name)
+        if entry is None or entry.get("digest") != digest:
+            entry = self.artifacts[name] = {"digest": digest, "build_time": self.now}
+        return entry["build_time"]
+
+    def get(self, name: str) -> str:
+        """Build time last resolved for name (this run's when it was never resolved)"""
+        return self.artifacts.get(name, {}).get("build_time", self.now)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({"version": BUILD_TIMES_VERSION, "artifacts": self.artifacts}, f, indent=2)
+        os.replace(partial, self.path)
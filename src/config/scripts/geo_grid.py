@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Lat/lng grid for geo-sharded search documents
+
+Mirrors GeographicSharding in loadAddressIndex.ts: cells are GRID_SIZE degrees
+wide starting at the south-west corner of GRID_BOUNDS, and a point belongs to
+grid_{floor((lat - south) / size)}_{floor((lng - west) / size)}. The same
+double arithmetic runs on both sides, so a client computing its grid id from
+the user's location picks the file the pipeline wrote the nearby records to.
+
+Each record lands in exactly one cell; the GeoGrid bounds written to
+latest.json are the exact cell edges (no overlap band), so neighbouring cells
+never duplicate a record. Clients load the center cell plus neighbours.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+GRID_BOUNDS = {
+    "north": 38.8,
+    "south": 38.4,
+    "east": -90.0,
+    "west": -90.6
+}
+GRID_SIZE = 0.05
+
+
+def grid_indices(latitude, longitude) -> Optional[Tuple[int, int]]:
+    """Cell indices for a point, or None when the coordinates are not finite numbers"""
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(latitude) and math.isfinite(longitude)):
+        return None
+    return (
+        math.floor((latitude - GRID_BOUNDS["south"]) / GRID_SIZE),
+        math.floor((longitude - GRID_BOUNDS["west"]) / GRID_SIZE)
+    )
+
+
+def grid_id(lat_index: int, lng_index: int) -> str:
+    return f"grid_{lat_index}_{lng_index}"
+
+
+def grid_bounds(lat_index: int, lng_index: int) -> Dict[str, float]:
+    south = GRID_BOUNDS["south"] + lat_index * GRID_SIZE
+    west = GRID_BOUNDS["west"] + lng_index * GRID_SIZE
+    return {
+        "north": round(south + GRID_SIZE, 6),
+        "south": round(south, 6),
+        "east": round(west + GRID_SIZE, 6),
+        "west": round(west, 6)
+    }
+
+
+def grid_entry(lat_index: int, lng_index: int) -> Dict[str, Any]:
+    """GeoGrid-shaped manifest entry (id, bounds, center)"""
+    bounds = grid_bounds(lat_index, lng_index)
+    return {
+        "id": grid_id(lat_index, lng_index),
+        "bounds": bounds,
+        "center": {
+            "lat": round((bounds["north"] + bounds["south"]) / 2, 6),
+            "lng": round((bounds["east"] + bounds["west"]) / 2, 6)
+        }
+    }
+
+
+def bucket_by_grid(records: Iterable[Dict[str, Any]]) -> Tuple[Dict[Tuple[int, int], List[Dict[str, Any]]], int]:
+    """Group records by grid cell, keeping input order within each cell
+
+    Returns:
+        (cells ordered by (lat_index, lng_index), count of records without usable coordinates)
+    """
+    cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    unplaced = 0
+    for record in records:
+        indices = grid_indices(record.get("latitude"), record.get("longitude"))
+        if indices is None:
+            unplaced += 1
+            continue
+        cells.setdefault(indices, []).append(record)
+    return dict(sorted(cells.items())), unplaced
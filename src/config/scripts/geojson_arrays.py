@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Vectorized Polygon/MultiPolygon -> GeoJSON extraction
+
+Batch counterpart of ShapefileProcessor.extract_parcel_geometry. Coordinates
+for a whole batch come out of shapely.to_ragged_array as one array, are
+rounded with NumPy, converted to Python lists once, and sliced back into
+rings / polygons / multipolygons using the offset arrays.
+
+Rounding must match Python's round(x, 5) exactly. np.round computes
+rint(x * 1e5) / 1e5; that picks the same integer as round() unless x * 1e5 is
+within floating-point error of a .5 boundary, so only those (rare)
+near-ties are re-rounded with round().
+
+Anything the vectorized path does not cover exactly (Z coordinates, empty
+rings or parts) goes through the scalar fallback, so output matches the
+per-geometry extractor.
+
+The cyclic garbage collector is paused while the nested lists are built:
+they cannot form cycles, and millions of fresh containers otherwise trigger
+repeated full collections that cost more than the extraction itself.
+"""
+
+import gc
+from typing import Callable, List, Optional
+
+import numpy as np
+import shapely
+
+BATCH_SIZE = 65536
+
+# Relative slack around a .5 fraction treated as a possible tie
+TIE_TOLERANCE = 1e-12
+
+POLYGON = 3
+MULTIPOLYGON = 6
+
+
+def round_like_builtin(values: np.ndarray, decimals: int) -> np.ndarray:
+    """np.round with results identical to Python's round(value, decimals)"""
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    scaled = values * (10.0 ** decimals)
+    with np.errstate(invalid="ignore"):
+        distance = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+        suspect = np.flatnonzero(distance <= np.maximum(1e-9, np.abs(scaled) * TIE_TOLERANCE))
+    if len(suspect):
+        flat_values = values.reshape(-1)
+        flat_rounded = rounded.reshape(-1)
+        for i in suspect.tolist():
+            flat_rounded[i] = round(float(flat_values[i]), decimals)
+    return rounded
+
+
+def _spans(offsets: np.ndarray) -> list:
+    bounds = offsets.tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _extract_batch(geometries: np.ndarray, multi: np.ndarray, decimals: int) -> List[Optional[dict]]:
+    geometry_type, coords, offsets = shapely.to_ragged_array(geometries)
+    if geometry_type == shapely.GeometryType.POLYGON:
+        ring_offsets, polygon_offsets = offsets
+        part_offsets = np.arange(len(geometries) + 1)
+    else:
+        ring_offsets, polygon_offsets, part_offsets = offsets
+
+    points = round_like_builtin(coords, decimals).tolist()
+    rings = [points[start:stop] for start, stop in _spans(ring_offsets)]
+    polygons = [rings[start:stop] for start, stop in _spans(polygon_offsets)]
+    bboxes = round_like_builtin(shapely.bounds(geometries), decimals).tolist()
+
+    results = []
+    for j, (start, stop) in enumerate(_spans(part_offsets)):
+        if multi[j]:
+            results.append({"type": "MultiPolygon", "coordinates": polygons[start:stop], "bbox": bboxes[j]})
+        else:
+            results.append({"type": "Polygon", "coordinates": polygons[start], "bbox": bboxes[j]})
+    return results
+
+
+def extract_geojson(
+    geometries,
+    decimals: int = 5,
+    fallback: Optional[Callable] = None,
+    batch_size: int = BATCH_SIZE
+) -> List[Optional[dict]]:
+    """GeoJSON dicts (with bbox) for an array of Polygon/MultiPolygon geometries
+
+    Args:
+        geometries: GeoSeries, GeometryArray or array-like of shapely geometries
+        decimals: Coordinate precision
+        fallback: Scalar extractor for geometries the vectorized path skips
+            (Z coordinates, empty rings or parts); they become None without one
+        batch_size: Geometries per to_ragged_array call, bounding peak memory
+
+    Returns:
+        One dict or None per input geometry (None for missing, empty and
+        non-polygonal geometries)
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    results: List[Optional[dict]] = [None] * len(geometries)
+    if not len(geometries):
+        return results
+
+    type_ids = shapely.get_type_id(geometries)
+    polygonal = ((type_ids == POLYGON) | (type_ids == MULTIPOLYGON)) & ~shapely.is_empty(geometries)
+    scalar = polygonal & shapely.has_z(geometries)
+
+    # Empty rings or parts are left to the scalar extractor
+    candidates = np.flatnonzero(polygonal & ~scalar)
+    if len(candidates):
+        rings = shapely.get_rings(geometries[candidates], return_index=True)
+        empty_ring = shapely.is_empty(rings[0])
+        if empty_ring.any():
+            scalar[candidates[np.unique(rings[1][empty_ring])]] = True
+        parts = shapely.get_parts(geometries[candidates], return_index=True)
+        empty_part = shapely.is_empty(parts[0])
+        if empty_part.any():
+            scalar[candidates[np.unique(parts[1][empty_part])]] = True
+
+    vector = np.flatnonzero(polygonal & ~scalar)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for start in range(0, len(vector), batch_size):
+            batch = vector[start:start + batch_size]
+            extracted = _extract_batch(geometries[batch], type_ids[batch] == MULTIPOLYGON, decimals)
+            for i, geojson in zip(batch.tolist(), extracted):
+                results[i] = geojson
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if fallback is not None:
+        for i in np.flatnonzero(scalar).tolist():
+            results[i] = fallback(geometries[i])
+    return results
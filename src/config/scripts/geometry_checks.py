@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Vectorized full-population checks for parcel GeoJSON geometry
+
+Batch counterpart of GeometryValidator's per-geometry checks
+(validate_coordinate_precision, validate_polygon_topology,
+validate_bounding_box, validate_regional_bounds). Every geometry of a batch
+is flattened once into one (points, 2) coordinate array plus offset arrays:
+
+  ring_offsets      ring i spans coords[ring_offsets[i]:ring_offsets[i + 1]]
+  ring_geometry     geometry index of each ring
+  ring_polygon      polygon index of each ring (first ring of a polygon is its shell)
+  polygon_geometry  geometry index of each polygon
+
+and every check then runs as one NumPy expression over all points, rings or
+geometries. Results are exact per-check failure counts (parcels failing each
+check), not sampled rates, and are plain dicts of counts so batches, files
+and regions can be combined with merge_stats.
+
+Checks, counted per parcel:
+  missing           null geometry
+  type              not a Polygon/MultiPolygon, or malformed coordinates
+  point_format      a point that is not [lng, lat]
+  coordinate_range  |lng| > 180 or |lat| > 90
+  empty_polygon     a polygon without rings
+  vertex_count      a ring with fewer than 4 points
+  ring_closure      a ring whose first and last points differ
+  bbox              bbox missing, not 4 numbers, or min >= max
+  bbox_mismatch     stored bbox off the coordinate bounds by more than 1e-5
+  precision         coordinates with more than 6 decimals (reported, not failing)
+
+Closure and vertex counts are checked on every ring, holes included.
+Regional bounds use the stored bbox, like validate_regional_bounds.
+"""
+
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+CHECKS = [
+    "missing", "type", "point_format", "coordinate_range", "empty_polygon",
+    "vertex_count", "ring_closure", "bbox", "bbox_mismatch", "precision",
+]
+# Reported but not counted against validity (matches the sampled validator)
+INFORMATIONAL_CHECKS = {"precision"}
+
+CHECK_MESSAGES = {
+    "missing": "geometry is null",
+    "type": "not a Polygon/MultiPolygon with nested coordinate lists",
+    "point_format": "point is not [lng, lat]",
+    "coordinate_range": "coordinates out of valid range",
+    "empty_polygon": "polygon has no rings",
+    "vertex_count": "ring has fewer than 4 points",
+    "ring_closure": "ring is not closed (first and last points differ)",
+    "bbox": "missing or invalid bbox",
+    "bbox_mismatch": "bbox does not match the coordinate bounds",
+    "precision": "coordinates with more than 6 decimal places",
+}
+
+BBOX_TOLERANCE = 1e-5
+MAX_PRECISION_DECIMALS = 6
+MIN_RING_POINTS = 4
+MAX_EXAMPLES = 10
+MAX_BOUNDS_EXAMPLES = 5
+
+
+class GeometryArrays:
+    """A batch of GeoJSON geometries flattened into coordinate and offset arrays"""
+
+    def __init__(self, geometries: Sequence[Optional[Dict[str, Any]]]):
+        count = len(geometries)
+        self.count = count
+        self.missing = np.zeros(count, dtype=bool)
+        self.bad_type = np.zeros(count, dtype=bool)
+        self.empty_polygons = np.zeros(count, dtype=bool)
+        self.bbox = np.full((count, 4), np.nan)
+
+        rings: List[list] = []
+        ring_geometry: List[int] = []
+        polygon_rings: List[int] = []
+        polygon_geometry: List[int] = []
+        bbox_rows, bbox_index = [], []
+        for index, geometry in enumerate(geometries):
+            if geometry is None:
+                self.missing[index] = True
+                continue
+            try:
+                geometry_type = geometry["type"]
+                coordinates = geometry["coordinates"]
+                polygons = [coordinates] if geometry_type == "Polygon" else \
+                    coordinates if geometry_type == "MultiPolygon" else None
+                if polygons is None:
+                    raise TypeError(geometry_type)
+                geometry_rings = []
+                for polygon in polygons:
+                    if not polygon:
+                        self.empty_polygons[index] = True
+                    for ring in polygon:
+                        if not isinstance(ring, list) or (ring and not isinstance(ring[0], list)):
+                            raise TypeError("ring")
+                        geometry_rings.append(ring)
+            except (KeyError, TypeError):
+                self.bad_type[index] = True
+                continue
+            rings.extend(geometry_rings)
+            ring_geometry.extend([index] * len(geometry_rings))
+            polygon_rings.extend(len(polygon) for polygon in polygons)
+            polygon_geometry.extend([index] * len(polygons))
+            bbox = geometry.get("bbox")
+            if isinstance(bbox, list) and len(bbox) == 4:
+                bbox_rows.append(bbox)
+                bbox_index.append(index)
+        self._fill_bbox(bbox_rows, bbox_index)
+
+        self.ring_lengths = np.fromiter(map(len, rings), dtype=np.intp, count=len(rings))
+        self.ring_offsets = np.zeros(len(rings) + 1, dtype=np.intp)
+        np.cumsum(self.ring_lengths, out=self.ring_offsets[1:])
+        self.ring_geometry = np.array(ring_geometry, dtype=np.intp)
+        self.polygon_geometry = np.array(polygon_geometry, dtype=np.intp)
+        self.ring_polygon = np.repeat(np.arange(len(polygon_rings)), polygon_rings)
+        self.point_geometry = np.repeat(self.ring_geometry, self.ring_lengths)
+        self.coords, self.bad_points = self._flatten(rings, int(self.ring_offsets[-1]))
+
+    def _fill_bbox(self, rows: List[list], index: List[int]):
+        try:
+            self.bbox[index] = np.array(rows, dtype=np.float64).reshape(len(rows), 4)
+        except (TypeError, ValueError):
+            # Non-numeric entries: leave those bboxes missing
+            for row, position in zip(rows, index):
+                try:
+                    self.bbox[position] = row
+                except (TypeError, ValueError):
+                    pass
+
+    @staticmethod
+    def _flatten(rings: List[list], points: int) -> tuple:
+        """(points, 2) float coordinates plus a mask of malformed points (NaN there)"""
+        try:
+            point_lengths = np.fromiter(map(len, chain.from_iterable(rings)), dtype=np.intp, count=points)
+            if (point_lengths == 2).all():
+                values = np.fromiter(chain.from_iterable(chain.from_iterable(rings)), dtype=np.float64, count=2 * points)
+                return values.reshape(points, 2), np.zeros(points, dtype=bool)
+        except (TypeError, ValueError):
+            pass
+
+        # Slow path: non-numeric values or points that are not [lng, lat]
+        coords = np.full((points, 2), np.nan)
+        bad_points = np.zeros(points, dtype=bool)
+        for i, point in enumerate(chain.from_iterable(rings)):
+            try:
+                if len(point) == 2:
+                    coords[i] = point
+                    continue
+            except (TypeError, ValueError):
+                pass
+            bad_points[i] = True
+        return coords, bad_points
+
+
+def _per_geometry(count: int, geometry_index: np.ndarray, flags: np.ndarray) -> np.ndarray:
+    """Geometries with at least one flagged ring or point"""
+    failed = np.zeros(count, dtype=bool)
+    failed[geometry_index[flags]] = True
+    return failed
+
+
+def structural_failures(arrays: GeometryArrays) -> Dict[str, np.ndarray]:
+    """Per-geometry masks of the checks that make a geometry unusable as a polygon
+
+    Every check except bbox, bbox_mismatch and precision; geometries passing
+    all of them can be built as shapely polygons (see parcel_topology.py).
+    """
+    count = arrays.count
+    coords = arrays.coords
+    ring_starts, ring_ends = arrays.ring_offsets[:-1], arrays.ring_offsets[1:]
+    ring_lengths = arrays.ring_lengths
+
+    with np.errstate(invalid="ignore"):
+        out_of_range = (np.abs(coords[:, 0]) > 180) | (np.abs(coords[:, 1]) > 90)
+
+    nonempty = ring_lengths > 0
+    closed = np.zeros(len(ring_lengths), dtype=bool)
+    closed[nonempty] = (coords[ring_starts[nonempty]] == coords[ring_ends[nonempty] - 1]).all(axis=1)
+
+    return {
+        "missing": arrays.missing,
+        "type": arrays.bad_type,
+        "point_format": _per_geometry(count, arrays.point_geometry, arrays.bad_points),
+        "coordinate_range": _per_geometry(count, arrays.point_geometry, out_of_range),
+        "empty_polygon": arrays.empty_polygons,
+        "vertex_count": _per_geometry(count, arrays.ring_geometry, ring_lengths < MIN_RING_POINTS),
+        "ring_closure": _per_geometry(count, arrays.ring_geometry, ~closed),
+    }
+
+
+def check_geometries(parcel_ids: Sequence[str], geometries: Sequence[Optional[Dict[str, Any]]],
+                     reference_bounds: Optional[Dict[str, float]] = None,
+                     arrays: Optional[GeometryArrays] = None) -> Dict[str, Any]:
+    """Run every check over a batch; returns mergeable stats (see merge_stats)
+
+    arrays: the batch already flattened, when the caller needs it too
+    """
+    arrays = arrays if arrays is not None else GeometryArrays(geometries)
+    count = arrays.count
+    coords = arrays.coords
+    lng, lat = coords[:, 0], coords[:, 1]
+    point_geometry = arrays.point_geometry
+
+    with np.errstate(invalid="ignore"):
+        imprecise = np.round(coords, MAX_PRECISION_DECIMALS) != coords
+    imprecise &= ~np.isnan(coords)
+
+    failures = structural_failures(arrays)
+    failures["precision"] = _per_geometry(count, point_geometry, imprecise.any(axis=1))
+
+    # Stored bbox against the actual coordinate bounds of each geometry
+    bbox = arrays.bbox
+    has_bbox = ~np.isnan(bbox).any(axis=1)
+    failures["bbox"] = ~(arrays.missing | arrays.bad_type) & \
+        ~(has_bbox & (bbox[:, 0] < bbox[:, 2]) & (bbox[:, 1] < bbox[:, 3]))
+    actual = np.full((count, 4), np.nan)
+    point_counts = np.bincount(point_geometry, minlength=count)
+    with_points = np.flatnonzero(point_counts)
+    if len(with_points):
+        starts = np.concatenate(([0], np.cumsum(point_counts)[:-1]))[with_points]
+        for column, (values, reduce) in enumerate(((lng, np.fmin), (lat, np.fmin), (lng, np.fmax), (lat, np.fmax))):
+            actual[with_points, column] = reduce.reduceat(values, starts)
+    with np.errstate(invalid="ignore"):
+        failures["bbox_mismatch"] = has_bbox & (np.abs(bbox - actual) > BBOX_TOLERANCE).any(axis=1)
+
+    invalid = np.zeros(count, dtype=bool)
+    for check, failed in failures.items():
+        if check not in INFORMATIONAL_CHECKS:
+            invalid |= failed
+
+    stats = {
+        "geometries": count,
+        "valid": int(count - invalid.sum()),
+        "points": int(len(coords)),
+        "rings": int(len(arrays.ring_lengths)),
+        "failures": {check: int(failures[check].sum()) for check in CHECKS},
+        "precision_values": int(imprecise.sum()),
+        "lng_range": _range(lng),
+        "lat_range": _range(lat),
+        "examples": [],
+        "within_bounds": 0,
+        "out_of_bounds": 0,
+        "bounds_examples": [],
+    }
+    for check in CHECKS:
+        for index in np.flatnonzero(failures[check])[:MAX_EXAMPLES - len(stats["examples"])].tolist():
+            stats["examples"].append(f"Parcel {parcel_ids[index]}: {CHECK_MESSAGES[check]}")
+
+    if reference_bounds is not None:
+        outside = has_bbox & (
+            (bbox[:, 2] < reference_bounds["lng_min"]) | (bbox[:, 0] > reference_bounds["lng_max"]) |
+            (bbox[:, 3] < reference_bounds["lat_min"]) | (bbox[:, 1] > reference_bounds["lat_max"])
+        )
+        stats["out_of_bounds"] = int(outside.sum())
+        stats["within_bounds"] = int(has_bbox.sum()) - stats["out_of_bounds"]
+        stats["bounds_examples"] = [
+            f"Parcel {parcel_ids[index]} outside bounds: {bbox[index].tolist()}"
+            for index in np.flatnonzero(outside)[:MAX_BOUNDS_EXAMPLES].tolist()
+        ]
+    return stats
+
+
+def _range(values: np.ndarray) -> Optional[List[float]]:
+    finite = values[~np.isnan(values)]
+    return [float(finite.min()), float(finite.max())] if len(finite) else None
+
+
+def empty_stats() -> Dict[str, Any]:
+    """Identity for merge_stats"""
+    return check_geometries([], [], {"lng_min": 0, "lng_max": 0, "lat_min": 0, "lat_max": 0})
+
+
+def merge_stats(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the stats of two batches (associative, so batches can be reduced in any grouping)"""
+    merged = {key: left[key] + right[key]
+              for key in ("geometries", "valid", "points", "rings", "precision_values", "within_bounds", "out_of_bounds")}
+    merged["failures"] = {check: left["failures"][check] + right["failures"][check] for check in CHECKS}
+    for key in ("lng_range", "lat_range"):
+        ranges = [value for value in (left[key], right[key]) if value is not None]
+        merged[key] = [min(r[0] for r in ranges), max(r[1] for r in ranges)] if ranges else None
+    merged["examples"] = (left["examples"] + right["examples"])[:MAX_EXAMPLES]
+    merged["bounds_examples"] = (left["bounds_examples"] + right["bounds_examples"])[:MAX_BOUNDS_EXAMPLES]
+    return merged
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Incremental ingest support for the Document Mode pipeline
+
+Keeps a content hash per parcel (source attributes plus geometry WKB) and the
+regional statistics of the last full rebuild in {region}-parcel_hashes.json next
+to the intermediate files. On the next run only parcels whose hash changed, or
+that were added, are recomputed; unchanged parcels are carried over from the
+previous {region}-parcel_metadata.json and {region}-parcel_geometry.json, and
+removed parcels drop out. The document files are regenerated from the patched
+records. A region with no changed, added or removed parcels keeps its previous
+intermediate and compressed files as they are (unchanged).
+
+A region falls back to a full rebuild when there is no usable previous build
+or when calculate_regional_stats shifts beyond the configured tolerance, since
+every parcel's affluence score and pricing depend on those statistics. The
+shift is measured against the full rebuild that carried-over parcels were
+priced with, so small shifts across incremental runs cannot compound.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Default processor region keys -> intermediate file prefixes (the pipeline passes the registry's)
+REGION_FILE_PREFIX = {
+    "city": "stl_city",
+    "county": "stl_county"
+}
+
+# Regional statistics that feed per-parcel pricing
+TRACKED_STATS = ["median_assessment", "mean_assessment", "percentile_75", "percentile_25"]
+
+
+class IncrementalIngest:
+    """Track per-parcel content hashes between pipeline runs"""
+
+    def __init__(self, data_dir: Path, dataset_size: str, stats_tolerance: float = 0.01,
+                 prefixes: Optional[Dict[str, str]] = None):
+        self.data_dir = data_dir
+        self.dataset_size = dataset_size
+        self.stats_tolerance = stats_tolerance
+        self.prefixes = dict(prefixes or REGION_FILE_PREFIX)
+        self.plans: Dict[str, Dict[str, Any]] = {}
+
+    def manifest_path(self, region: str) -> Path:
+        return self.data_dir / f"{self.prefixes[region]}-parcel_hashes.json"
+
+    def output_path(self, region: str, kind: str) -> Path:
+        return self.data_dir / f"{self.prefixes[region]}-{kind}.json"
+
+    @staticmethod
+    def compute_hashes(frame: pd.DataFrame) -> List[str]:
+        """Content hash per row from every source attribute plus the geometry WKB"""
+        geometry_column = frame.geometry.name
+        attributes = frame.drop(columns=[geometry_column, "landarea"], errors="ignore")
+        attributes = attributes.reindex(columns=sorted(attributes.columns, key=str))
+        attribute_hashes = pd.util.hash_pandas_object(attributes, index=False).to_numpy(dtype=np.uint64)
+        wkb = shapely.to_wkb(np.asarray(frame.geometry, dtype=object)).tolist()
+
+        return [
+            hashlib.blake2b((blob or b"") + attribute_hash.tobytes(), digest_size=16).hexdigest()
+            for blob, attribute_hash in zip(wkb, attribute_hashes)
+        ]
+
+    def _load_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _stats_shift(self, previous: Dict[str, Any], current: Dict[str, Any]) -> float:
+        """Largest relative change across the tracked regional statistics"""
+        shifts = []
+        for key in TRACKED_STATS:
+            old, new = float(previous.get(key, 0)), float(current.get(key, 0))
+            shifts.append(abs(new - old) / max(abs(old), 1.0))
+        return max(shifts)
+
+    def plan(self, region: str, parcel_ids: List[str], frame: pd.DataFrame, regional_stats: Dict[str, Any]) -> np.ndarray:
+        """Decide which rows to recompute; returns a boolean mask over parcel_ids"""
+        hashes = self.compute_hashes(frame)
+        current_stats = {key: float(regional_stats[key]) for key in TRACKED_STATS}
+        plan = {
+            "parcel_ids": parcel_ids,
+            "hashes": dict(zip(parcel_ids, hashes)),
+            "regional_stats": current_stats,
+            "full": True
+        }
+        self.plans[region] = plan
+        recompute_all = np.ones(len(parcel_ids), dtype=bool)
+
+        previous = self._load_json(self.manifest_path(region))
+        if not previous or previous.get("dataset_size") != self.dataset_size:
+            print(f"♻️ Incremental {region}: no matching previous build, running full rebuild")
+            return recompute_all
+
+        if not all(self.output_path(region, kind).exists() for kind in ("parcel_metadata", "parcel_geometry")):
+            print(f"♻️ Incremental {region}: previous outputs missing, running full rebuild")
+            return recompute_all
+
+        shift = self._stats_shift(previous.get("regional_stats", {}), current_stats)
+        if shift > self.stats_tolerance:
+            print(f"♻️ Incremental {region}: regional stats shifted {shift:.2%} "
+                  f"(tolerance {self.stats_tolerance:.2%}), running full rebuild")
+            return recompute_all
+
+        previous_hashes = previous.get("parcels", {})
+        recompute = np.array(
+            [previous_hashes.get(parcel_id) != parcel_hash for parcel_id, parcel_hash in zip(parcel_ids, hashes)],
+            dtype=bool
+        )
+        added = sum(1 for parcel_id in plan["hashes"] if parcel_id not in previous_hashes)
+        removed = sum(1 for parcel_id in previous_hashes if parcel_id not in plan["hashes"])
+        changed = int(recompute.sum()) - added
+
+        plan["full"] = False
+        plan["recompute"] = recompute
+        plan["changes"] = changed + added + removed
+        # Carried-over parcels were priced with the last full rebuild's stats; keep them as the baseline
+        plan["regional_stats"] = previous["regional_stats"]
+        print(f"♻️ Incremental {region}: {changed:,} changed, {added:,} added, {removed:,} removed, "
+              f"{len(parcel_ids) - int(recompute.sum()):,} unchanged")
+        return recompute
+
+    def unchanged(self, region: str) -> bool:
+        """Whether the region's planned build is identical to the previous one"""
+        plan = self.plans.get(region)
+        return plan is not None and not plan.get("full", True) and plan.get("changes") == 0
+
+    @staticmethod
+    def record_from_metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a processor record from a parcel_metadata.json entry"""
+        return {
+            "id": entry["id"],
+            "full_address": entry["primary_full_address"],
+            "latitude": entry["latitude"],
+            "longitude": entry["longitude"],
+            "region": entry["region"],
+            "original_parcel_id": entry["id"],
+            "calc": entry["calc"],
+            "owner": entry["owner"],
+            "assessment": entry["assessment"],
+            "affluence_score": entry.get("affluence_score", 50),
+            "commercial_multiplier": entry.get("commercial_multiplier", 1.0),
+            "maintenance_multiplier": entry.get("maintenance_multiplier", 1.0),
+            "combined_multiplier": entry.get("combined_multiplier", 1.0),
+            "pricing_tier": entry.get("pricing_tier", "standard")
+        }
+
+    def merge(self, region: str, records: List[Dict[str, Any]], geometry_data: Dict[str, Any]) -> tuple:
+        """Patch recomputed records into the previous build, in current parcel order
+
+        Parcel ids that occur more than once in the source collapse to a
+        single record here, matching how the metadata file is keyed.
+        """
+        plan = self.plans.get(region)
+        if plan is None or plan["full"]:
+            return records, geometry_data
+
+        previous_metadata = (self._load_json(self.output_path(region, "parcel_metadata")) or {}).get("parcels", {})
+        previous_geometry = (self._load_json(self.output_path(region, "parcel_geometry")) or {}).get("geometries", {})
+        new_records = {record["id"]: record for record in records}
+
+        merged_records = []
+        merged_geometry = {}
+        seen = set()
+        for parcel_id, recompute in zip(plan["parcel_ids"], plan["recompute"].tolist()):
+            if parcel_id in seen:
+                continue
+            seen.add(parcel_id)
+
+            if recompute:
+                merged_geometry[parcel_id] = geometry_data.get(parcel_id)
+                if parcel_id in new_records:
+                    merged_records.append(new_records[parcel_id])
+            else:
+                merged_geometry[parcel_id] = previous_geometry.get(parcel_id)
+                if parcel_id in previous_metadata:
+                    merged_records.append(self.record_from_metadata(previous_metadata[parcel_id]))
+
+        return merged_records, merged_geometry
+
+    def save_manifests(self):
+        """Persist hashes, and the regional stats of the last full rebuild, once the intermediate files are written"""
+        for region, plan in self.plans.items():
+            with open(self.manifest_path(region), 'w', encoding='utf-8') as f:
+                json.dump({
+                    "dataset_size": self.dataset_size,
+                    "regional_stats": plan["regional_stats"],
+                    "parcels": plan["hashes"]
+                }, f, separators=(',', ':'))
+            print(f"✅ Saved {self.manifest_path(region).name}: {len(plan['hashes']):,} parcel hashes")
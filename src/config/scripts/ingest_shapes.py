@@ -5,98 +5,98 @@ Document Mode Ingest Pipeline - Clean Implementation
 Robust Document Mode Pipeline:
 1. Processes real shapefiles from regional directories
 2. Creates regional intermediate files for landscape calculations ({region}-address_index.json, {region}-parcel_metadata.json, {region}-parcel_geometry.json) in data/tmp/raw/
-3. Compresses regional parcel metadata and geometry files for efficient storage ({region}-parcel_metadata.json, {region}-parcel_geometry.json) in data/tmp/cdn/
+3. Compresses regional parcel metadata and geometry files for efficient storage ({region}-parcel_metadata.json, {region}-parcel_geometry.json) in data/tmp/cdn/,
+   next to a seekable binary column file ({region}-parcel_metadata.bin)
 4. Uploads compressed intermediate files to /cdn/ for cold storage
-5. Creates minimal document.json files for FlexSearch Document Mode (hot search) in /public/search/
+5. Creates minimal document.json files for FlexSearch Document Mode (hot search) in /public/search/,
+   plus one {region}-document-grid_{lat}_{lng}.json per lat/lng grid cell listed in latest.json
 6. Cleans up temporary files
 
 Directory contract:
-- Input: /src/data/saint_louis_city/shapefiles/, /src/data/saint_louis_county/shapefiles/
+- Input: one source directory per region declared in regions.json (region_registry.py),
+  relative to --source-root (default /src/data): saint_louis_city/shapefiles/, saint_louis_county/shapefiles/
 - Temp: /src/config/scripts/temp/raw/, /src/config/scripts/temp/cdn/
 - Output: /public/search/ (FlexSearch document mode), /cdn/ (compressed metadata/geometry)
 
 Usage:
   python3 ingest_shapes_document_mode.py [--dataset-size=small|medium|large] [--version=_suffix]
+                                         [--workers=N] [--incremental [--stats-tolerance=0.01]]
+                                         [--metadata-shards=N]
+                                         [--run-report=path.json] [--profile] [--tracemalloc]
+                                         [--source-root=DIR] [--regions-file=regions.json] [--region=KEY ...]
+                                         [--resume | --from-step=N]
+
+Every run writes a JSON run report (stage_profiler.py) with wall time, CPU
+time, peak RSS delta and records/sec for each step and sub-phase.
+
+Completed steps are checkpointed in the temp directory (pipeline_checkpoint.py);
+after a failure, --resume continues at the first step that did not complete.
 """
 
 import os
 import sys
 import re
 import json
-import gzip
 import shutil
 import subprocess
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 import pandas as pd
-import geopandas as gpd
+import shapely
 from shapely.geometry import Point
-from dbfread import DBF
 import numpy as np
 
+from incremental_ingest import IncrementalIngest
+from streaming_json import write_json_envelope, write_json_array
+from build_times import BUILD_TIMES_NAME, BuildTimes, content_digest, json_digest
+from artifact_compression import CompressionSettings
+from parcel_columns import write_parcel_columns
+from parcel_shards import SHARD_MANIFEST_NAME, is_shard_file, shard_file_name, write_metadata_shards
+from geo_grid import bucket_by_grid, grid_entry
+from address_normalizer import standardize_address, standardize_batch
+from geojson_arrays import extract_geojson
+from projection_plan import project_region
+from stage_profiler import StageProfiler
+from region_registry import DEFAULT_SOURCE_ROOT, RegionSpec, load_regions, select_regions
+from upload_pool import (
+    DEFAULT_CONCURRENCY, DEFAULT_RETRIES, WORKER_COMMANDS, UploadPool, UploadWorker, print_upload_summary
+)
+from upload_manifest import MANIFEST_NAME, UploadManifest, list_remote_paths
+from pipeline_checkpoint import STEPS, CheckpointError, PipelineCheckpoint, source_fingerprint
+from attribute_loader import collapse_to_parcels, mapped_columns, plan_columns, read_shapefile, read_table
+
 class ShapefileProcessor:
     """Process shapefiles and extract parcel data"""
     
-    def __init__(self, temp_raw_dir: Path, dataset_size: str = "small"):
+    def __init__(self, temp_raw_dir: Path, dataset_size: str = "small", workers: int = 1,
+                 source_root: Optional[Path] = None, regions: Optional[List[RegionSpec]] = None):
         self.temp_raw_dir = temp_raw_dir
+        self.source_root = Path(source_root) if source_root else DEFAULT_SOURCE_ROOT
         self.dataset_size = dataset_size
         self.limit_records = self._get_record_limit()
         
-        # Field mappings from original
-        self.field_mappings = {
-            "city": {
-                "assessment": {
-                    "total": "ASMTTOTAL",
-                    "land": "ASMTLAND",
-                    "improvement": "ASMTIMPROV"
-                },
-                "building": {
-                    "area": "BDG1AREA",
-                    "year": "BDG1YEAR"
-                },
-                "owner": {
-                    "name": "OWNERNAME",
-                    "name2": "OWNERNAME2",
-                    "address": "OWNERADDR",
-                    "city": "OWNERCITY",
-                    "state": "OWNERSTATE",
-                    "zip": "OWNERZIP"
-                },
-                "address": {
-                    "number": "LowAddrNum",
-                    "street_primary": "SITEADDR",
-                    "zip": "ZIP"
-                },
-                "parcel_id": "HANDLE"
-            },
-            "county": {
-                "assessment": {
-                    "total": "TOTAPVAL",
-                    "land": "LAND_VAL",
-                    "improvement": "IMPROV_VAL"
-                },
-                "building": {
-                    "area": "RESQFT",
-                    "year": "YEAR_BUILT"
-                },
-                "owner": {
-                    "name": "OWNER_NAME",
-                    "tenure": "TENURE",
-                    "state": "OWN_STATE"
-                },
-                "address": {
-                    "full": "PROP_ADD",
-                    "number": "PROP_ADRNU",
-                    "zip": "PROP_ZIP",
-                    "municipality": "MUNICIPALI"
-                },
-                "property_class": "PROPCLASS",
-                "parcel_id": "LOCATOR"
-            }
-        }
+        # Parallel ingest: the pipeline attaches a shared process pool when workers > 1
+        self.workers = max(1, workers)
+        self.executor = None
+        
+        # Stage timings; the pipeline attaches its run-wide profiler
+        self.profiler = StageProfiler()
+        
+        # Incremental ingest: the pipeline attaches an IncrementalIngest when enabled
+        self.incremental = None
+        
+        # Source files, field mappings, CRS and classifier per region (regions.json)
+        self.regions = {region.key: region for region in (regions if regions is not None else load_regions())}
+        self.field_mappings = {key: region.fields for key, region in self.regions.items()}
+        
+        # Dedup/join stats per region from _join_attribute_files, written into the run report
+        self.join_stats: Dict[str, Dict[str, Any]] = {}
         
     def _get_record_limit(self) -> Optional[int]:
         """Get the record limit based on dataset size"""
@@ -126,64 +126,8 @@ class ShapefileProcessor:
             return default
     
     def standardize_address(self, full_address_str, default_city="Unknown City", default_state="MO", default_zip="63102"):
-        """Standardize address format for consistent search indexing"""
-        if not full_address_str or not isinstance(full_address_str, str):
-            return ""
-            
-        address_str = full_address_str.strip()
-        if not address_str:
-            return ""
-            
-        # Basic standardization
-        address_str = re.sub(r'\s+', ' ', address_str)
-        address_str = re.sub(r'[.,]+(?=[.,])', ',', address_str)
-        address_str = address_str.replace(' ;', ',').replace(';', ',')
-        address_str = re.sub(r'\s*\,\s*', ', ', address_str)
-        
-        parts = [p.strip() for p in address_str.split(',') if p.strip()]
-        if not parts:
-            return ""
-            
-        street_part = parts[0]
-        city_part = parts[1] if len(parts) > 1 else default_city
-        state_zip_part = parts[2] if len(parts) > 2 else f"{default_state} {default_zip}"
-        
-        # Street type standardization
-        street_types = {
-            "STREET": "St.", "ST": "St.", "AVENUE": "Ave.", "AVE": "Ave.",
-            "ROAD": "Rd.", "RD": "Rd.", "DRIVE": "Dr.", "DR": "Dr.",
-            "LANE": "Ln.", "LN": "Ln.", "COURT": "Ct.", "CT": "Ct.",
-            "BOULEVARD": "Blvd.", "BLVD": "Blvd."
-        }
-        
-        words = street_part.split()
-        standardized_words = []
-        for word in words:
-            upper_word = word.upper().rstrip('.,')
-            if upper_word in street_types:
-                standardized_words.append(street_types[upper_word])
-            else:
-                standardized_words.append(word.title())
-        
-        street_standardized = " ".join(standardized_words)
-        
-        # City standardization
-        if city_part.upper() in ["ST LOUIS", "SAINT LOUIS"]:
-            city_standardized = "St. Louis"
-        else:
-            city_standardized = city_part.title()
-            
-        # State/ZIP extraction
-        state_zip_match = re.search(r"\b([A-Za-z]{2})\s+(\d{5}(?:-\d{4})?)\b\s*$", state_zip_part)
-        if state_zip_match:
-            state_standardized = state_zip_match.group(1).upper()
-            zip_standardized = state_zip_match.group(2)
-        else:
-            state_standardized = default_state
-            zip_standardized = default_zip
-            
-        final_address = f"{street_standardized}, {city_standardized}, {state_standardized} {zip_standardized}"
-        return re.sub(r'\s+', ' ', final_address).strip()
+        """Standardize address format for consistent search indexing (memoized, see address_normalizer)"""
+        return standardize_address(full_address_str, default_city, default_state, default_zip)
     
     def calculate_landscapable_area(self, land_area, building_sqft, property_type):
         """Calculate estimated landscapable area"""
@@ -218,28 +162,15 @@ class ShapefileProcessor:
         return round(landscapable, 2)
     
     def classify_property(self, property_class_code, region="city"):
-        """Classify property type based on property class code"""
+        """Classify property type based on property class code (rules from the region registry)"""
         if property_class_code is None:
             return "unknown"
         code = str(property_class_code).strip().upper()
         
-        if region == "city":
-            if code.startswith("A"): return "residential"
-            if code.startswith("B"): return "residential"
-            if code.startswith("C"): return "commercial"
-            if code.startswith("D"): return "industrial"
-            if code.startswith("E"): return "exempt"
-            if code.startswith("F"): return "agricultural"
-            return "other"
-        elif region == "county":
-            if code == "R" or code.startswith("RES"): return "residential"
-            if code == "C" or code.startswith("COM"): return "commercial"
-            if code == "I" or code.startswith("IND"): return "industrial"
-            if code == "A" or code.startswith("AGR"): return "agricultural"
-            if code == "E" or code.startswith("EX"): return "exempt"
-            return "other"
-        
-        return "unknown"
+        spec = self.regions.get(region)
+        if spec is None:
+            return "unknown"
+        return spec.classify(code)
     
     def extract_parcel_geometry(self, geometry, already_transformed=False):
         """Extract parcel geometry as simplified GeoJSON
@@ -301,377 +232,118 @@ class ShapefileProcessor:
             
         return None
     
-    def process_city_data(self) -> tuple:
-        """Process St. Louis City shapefile data with enhanced calculations"""
-        print("🌆 Processing St. Louis City shapefiles...")
-        
-        # Use actual shapefile directory, not temp directory
-        base_dir = Path("/Users/duebelbytes/Sites/land-estimator/src/data/saint_louis_city/shapefiles")
-        required_files = {
-            "shp": base_dir / "prcl.shp",
-            "dbf": base_dir / "prcl.dbf",
-            "csv": base_dir / "parcels-basic-info.csv"
-        }
+    def process_region(self, region) -> tuple:
+        """Process one registry region's shapefile data with enhanced calculations
+        
+        Args:
+            region: Region key or RegionSpec
+            
+        Returns:
+            (records, geometry by parcel id); both empty when source files are missing or unreadable
+        """
+        spec = region if isinstance(region, RegionSpec) else self.regions[region]
+        key = spec.key
+        print(f"🗺️ Processing {spec.name} shapefiles...")
+        
+        base_dir = spec.source_path(self.source_root)
+        required_files = spec.file_paths(self.source_root)
         
         missing_files = [name for name, path in required_files.items() if not path.exists()]
         if missing_files:
-            print(f"❌ Missing city files: {missing_files}")
+            print(f"❌ Missing {key} files: {missing_files}")
             print(f"📂 Looking in: {base_dir}")
             return [], {}
             
         try:
+            # Only mapped columns are read; join files only for columns the shapefile lacks
+            columns = plan_columns(required_files, spec.joins, mapped_columns(spec.fields), spec.fields["parcel_id"])
+            
             # Load shapefile
-            gdf = gpd.read_file(required_files["shp"])
-            print(f"📊 Loaded {len(gdf)} parcels from city shapefile")
+            with self.profiler.stage(f"{key}.read_file") as stage:
+                gdf = read_shapefile(required_files["shp"], columns["shp"], spec.dtypes)
+                stage.records = len(gdf)
+            print(f"📊 Loaded {len(gdf)} parcels from {key} shapefile ({len(columns['shp'])} mapped columns)")
             
             # Set CRS if missing
             if gdf.crs is None:
-                gdf = gdf.set_crs(epsg=2815)  # Missouri State Plane East
-                
-            # Store original geometry for centroid calculation
-            gdf_original = gdf.copy()
-            
-            # Transform for area calculation
-            gdf = gdf.to_crs(epsg=26915)  # UTM Zone 15N
-            gdf["landarea"] = gdf.geometry.area * 10.7639  # Convert to sq ft
-            
-            # Load DBF data
-            df_dbf = pd.DataFrame(iter(DBF(required_files["dbf"], load=True, encoding='latin1')))
-            
-            # Load CSV data (contains address and other parcel info)
-            df_csv = pd.read_csv(required_files["csv"], low_memory=False)
-            print(f"📊 Loaded CSV with {len(df_csv)} records")
-            
-            # Merge data using HANDLE as key
-            parcel_id_field = self.field_mappings["city"]["parcel_id"]
-            gdf[parcel_id_field] = gdf[parcel_id_field].astype(str)
-            df_dbf[parcel_id_field] = df_dbf[parcel_id_field].astype(str)
-            df_csv[parcel_id_field] = df_csv[parcel_id_field].astype(str)
-            
-            # First merge with DBF, then with CSV
-            gdf = gdf.merge(df_dbf, on=parcel_id_field, how="left", suffixes=('', '_dbf'))
-            gdf = gdf.merge(df_csv, on=parcel_id_field, how="left", suffixes=('', '_csv'))
+                gdf = gdf.set_crs(epsg=spec.crs)
             
-            # Remove duplicates caused by multiple CSV records per parcel (e.g., apartment units)
-            # Keep the first occurrence for each unique HANDLE (parcel geometry)
-            initial_count = len(gdf)
-            gdf = gdf.drop_duplicates(subset=[parcel_id_field], keep='first')
-            dedup_count = len(gdf)
-            
-            print(f"📊 Merged data: {initial_count} records -> {dedup_count} unique parcels ({initial_count - dedup_count} duplicates removed)")
+            if any(columns[kind] for kind in spec.joins):
+                gdf = self._join_attribute_files(gdf, spec, required_files, columns)
             
         except Exception as e:
-            print(f"❌ Error loading city data: {e}")
+            print(f"❌ Error loading {key} data: {e}")
             return [], {}
         
         # Apply record limit
         if self.limit_records:
             gdf = gdf.head(self.limit_records)
-            gdf_original = gdf_original.head(self.limit_records)
             print(f"📊 Limited to {len(gdf)} records for {self.dataset_size} dataset")
         
-        # PERFORMANCE OPTIMIZATION: Batch transform all geometries to WGS84 at once
-        print("🔄 Batch transforming city geometries to WGS84...")
-        if gdf_original.crs and gdf_original.crs.to_epsg() != 4326:
-            gdf_wgs84 = gdf_original.to_crs(epsg=4326)
-        else:
-            gdf_wgs84 = gdf_original.copy()
-        
-        # Batch calculate centroids in projected CRS for accuracy, then transform to WGS84
-        print("🎯 Calculating centroids...")
-        if gdf.crs and gdf.crs.to_epsg() != 4326:
-            # Use UTM projection for accurate centroid calculation
-            centroids_utm = gdf.geometry.centroid
-            centroids_gdf = gpd.GeoDataFrame({'geometry': centroids_utm}, crs=gdf.crs)
-            centroids_wgs84 = centroids_gdf.to_crs(epsg=4326)
-            centroids = centroids_wgs84.geometry
-        else:
-            # Already in WGS84, but warn about accuracy
-            centroids = gdf_wgs84.geometry.centroid
-        
-        print(f"⚙️ Processing {len(gdf)} city parcels...")
-        results = []
-        geometry_data = {}
+        # One projection pass: UTM for area and centroids, WGS84 for output geometry
+        print(f"🔄 Projecting {key} geometries (UTM area/centroids, WGS84 output)...")
+        with self.profiler.stage(f"{key}.project", records=len(gdf)):
+            gdf, gdf_wgs84, centroids = project_region(gdf)
         
-        # First pass: collect all data for regional statistics
-        temp_results = []
-        for idx, (_, row) in enumerate(gdf.iterrows()):
-            parcel_id = str(row.get(parcel_id_field, "")).strip()
-            if not parcel_id:
-                continue
-                
-            # Get assessment data
-            assessment_total = self.safe_to_numeric(self.get_field_value(row, "city", "assessment", "total"), 0)
-            assessment_land = self.safe_to_numeric(self.get_field_value(row, "city", "assessment", "land"), 0)
-            assessment_improvement = self.safe_to_numeric(self.get_field_value(row, "city", "assessment", "improvement"), 0)
-            
-            temp_results.append({
-                'parcel_id': parcel_id,
-                'row': row,
-                'idx': idx,
-                'assessment': {
-                    'total': assessment_total,
-                    'land': assessment_land,
-                    'improvement': assessment_improvement
-                }
-            })
-        
-        # Calculate regional statistics
-        print("📊 Calculating regional statistics...")
-        regional_stats = self.calculate_regional_stats(temp_results, "city")
-        
-        # Second pass: process with enhanced calculations
-        for temp_record in temp_results:
-            idx = temp_record['idx']
-            row = temp_record['row']
-            parcel_id = temp_record['parcel_id']
-            
-            if idx % 5000 == 0 and idx > 0:
-                print(f"   ⚙️ Processed {idx:,}/{len(temp_results):,} city parcels...")
-            
-            # Use pre-transformed geometry and centroid
-            wgs84_geom = gdf_wgs84.iloc[idx].geometry
-            geometry_data[parcel_id] = self.extract_parcel_geometry(wgs84_geom, already_transformed=True)
-            centroid = centroids.iloc[idx]
-            lat, lng = centroid.y, centroid.x
-            
-            # Address processing (existing code)
-            raw_street_address = self.get_field_value(row, "city", "address", "street_primary", "")
-            full_street_address = str(raw_street_address).strip()
-            zip_code_raw = str(self.get_field_value(row, "city", "address", "zip", "")).strip()
-            zip_code_raw = re.sub(r"\.0$", "", zip_code_raw)
-            
-            if not full_street_address or full_street_address.lower() in ['nan', 'none', 'null']:
-                continue
-                
-            raw_full_address = f"{full_street_address}, St. Louis, MO {zip_code_raw}"
-            standardized_address = self.standardize_address(raw_full_address, default_city="St. Louis")
-            
-            if not standardized_address:
-                continue
-            
-            # Enhanced property calculations
-            land_area = self.safe_to_numeric(row.get("landarea"), 0)
-            building_sqft = self.safe_to_numeric(self.get_field_value(row, "city", "building", "area"), 0)
-            building_year = self.safe_to_numeric(self.get_field_value(row, "city", "building", "year"), 0)
-            
-            prop_class_code = self.get_field_value(row, "city", "property_class", None)
-            property_type = self.classify_property(prop_class_code, "city")
-            
-            # Advanced landscapable area calculation
-            landscaping_analysis = self.calculate_advanced_landscapable_area(
-                land_area, building_sqft, property_type, temp_record['assessment']
-            )
-            
-            # Create base record
-            base_record = {
-                "id": parcel_id,
-                "full_address": standardized_address,
-                "latitude": round(lat, 6),
-                "longitude": round(lng, 6),
-                "region": "St. Louis City",
-                "original_parcel_id": parcel_id,
-                "calc": {
-                    "landarea_sqft": land_area,
-                    "building_sqft": building_sqft,
-                    "building_year": building_year,
-                    "estimated_landscapable_area_sqft": landscaping_analysis['landscapable_area'],
-                    "property_type": property_type,
-                    "confidence_score": landscaping_analysis['confidence_score'],
-                    "landscaping_difficulty": landscaping_analysis['landscaping_difficulty']  # Change from 'difficulty'
-                },
-                "owner": {
-                    "name": self.get_field_value(row, "city", "owner", "name", ""),
-                    "name2": self.get_field_value(row, "city", "owner", "name2", ""),
-                    "address": self.get_field_value(row, "city", "owner", "address", "")
-                },
-                "assessment": temp_record['assessment']
-            }
-            
-            # Add enhanced pricing calculations
-            pricing_components = self.calculate_pricing_components(base_record, regional_stats)
-            base_record.update(pricing_components)
-            
-            results.append(base_record)
+        print(f"⚙️ Processing {len(gdf)} {key} parcels...")
+        with self.profiler.stage(f"{key}.build_records", records=len(gdf)):
+            results, geometry_data = self.build_region_records(gdf, gdf_wgs84, centroids, key)
         
-        print(f"✅ Processed {len(results)} city records with enhanced calculations")
+        print(f"✅ Processed {len(results)} {key} records with enhanced calculations")
         return results, geometry_data
     
-    def process_county_data(self) -> tuple:
-        """Process St. Louis County shapefile data with enhanced calculations"""
-        print("🏘️ Processing St. Louis County shapefiles...")
-        
-        # Use actual shapefile directory, not temp directory
-        base_dir = Path("/Users/duebelbytes/Sites/land-estimator/src/data/saint_louis_county/shapefiles")
-        required_files = {
-            "shp": base_dir / "Parcels_Current.shp",
-            "dbf": base_dir / "Parcels_Current.dbf"
-        }
-        
-        missing_files = [name for name, path in required_files.items() if not path.exists()]
-        if missing_files:
-            print(f"❌ Missing county files: {missing_files}")
-            print(f"📂 Looking in: {base_dir}")
-            return [], {}
-            
-        try:
-            # Load shapefile
-            gdf = gpd.read_file(required_files["shp"])
-            print(f"📊 Loaded {len(gdf)} parcels from county shapefile")
-            
-            # Set CRS if missing
-            if gdf.crs is None:
-                gdf = gdf.set_crs(epsg=26916)  # Missouri State Plane
-                
-            # Store original geometry for centroid calculation
-            gdf_original = gdf.copy()
-                
-            # Transform and calculate area
-            gdf = gdf.to_crs(epsg=26915)
-            gdf["landarea"] = gdf.geometry.area * 10.7639
-            
-        except Exception as e:
-            print(f"❌ Error loading county data: {e}")
-            return [], {}
-        
-        if self.limit_records:
-            gdf = gdf.head(self.limit_records)
-            gdf_original = gdf_original.head(self.limit_records)
-            print(f"📊 Limited to {len(gdf)} records for {self.dataset_size} dataset")
-        
-        # PERFORMANCE OPTIMIZATION: Batch transform all geometries to WGS84 at once
-        print("🔄 Batch transforming county geometries to WGS84...")
-        if gdf_original.crs and gdf_original.crs.to_epsg() != 4326:
-            gdf_wgs84 = gdf_original.to_crs(epsg=4326)
-        else:
-            gdf_wgs84 = gdf_original.copy()
-        
-        # Batch calculate centroids in projected CRS for accuracy, then transform to WGS84
-        print("🎯 Calculating centroids...")
-        if gdf.crs and gdf.crs.to_epsg() != 4326:
-            # Use UTM projection for accurate centroid calculation
-            centroids_utm = gdf.geometry.centroid
-            centroids_gdf = gpd.GeoDataFrame({'geometry': centroids_utm}, crs=gdf.crs)
-            centroids_wgs84 = centroids_gdf.to_crs(epsg=4326)
-            centroids = centroids_wgs84.geometry
-        else:
-            # Already in WGS84, but warn about accuracy
-            centroids = gdf_wgs84.geometry.centroid
-        
-        print(f"⚙️ Processing {len(gdf)} county parcels...")
-        results = []
-        geometry_data = {}
-        parcel_id_field = self.field_mappings["county"]["parcel_id"]
-        
-        # First pass: collect all data for regional statistics
-        temp_results = []
-        for idx, (_, row) in enumerate(gdf.iterrows()):
-            parcel_id = str(row.get(parcel_id_field, "")).strip()
-            if not parcel_id:
-                continue
-                
-            # Get assessment data
-            assessment_total = self.safe_to_numeric(self.get_field_value(row, "county", "assessment", "total"), 0)
-            assessment_land = self.safe_to_numeric(self.get_field_value(row, "county", "assessment", "land"), 0)
-            assessment_improvement = self.safe_to_numeric(self.get_field_value(row, "county", "assessment", "improvement"), 0)
-            
-            temp_results.append({
-                'parcel_id': parcel_id,
-                'row': row,
-                'idx': idx,
-                'assessment': {
-                    'total': assessment_total,
-                    'land': assessment_land,
-                    'improvement': assessment_improvement
-                }
-            })
-    
-        # Calculate regional statistics
-        print("📊 Calculating regional statistics...")
-        regional_stats = self.calculate_regional_stats(temp_results, "county")
-        
-        # Second pass: process with enhanced calculations
-        for temp_record in temp_results:
-            idx = temp_record['idx']
-            row = temp_record['row']
-            parcel_id = temp_record['parcel_id']
-            
-            if idx % 5000 == 0 and idx > 0:
-                print(f"   ⚙️ Processed {idx:,}/{len(temp_results):,} county parcels...")
-            
-            # Use pre-transformed geometry and centroid
-            wgs84_geom = gdf_wgs84.iloc[idx].geometry
-            geometry_data[parcel_id] = self.extract_parcel_geometry(wgs84_geom, already_transformed=True)
-            centroid = centroids.iloc[idx]
-            lat, lng = centroid.y, centroid.x
-            
-            # Address processing (existing code)
-            raw_address = str(self.get_field_value(row, "county", "address", "full", "")).strip()
-            raw_zip = str(self.get_field_value(row, "county", "address", "zip", "")).strip()
-            raw_municipality = str(self.get_field_value(row, "county", "address", "municipality", "")).strip().title()
-            
-            if not raw_address or raw_address.lower() in ['nan', 'none', 'null']:
-                continue
-                
-            city_to_use = raw_municipality or "St. Louis County"
-            if city_to_use.upper() == "UNINCORPORATED":
-                city_to_use = "St. Louis County (Unincorporated)"
-                
-            zip_to_use = raw_zip if raw_zip and len(raw_zip) == 5 else "63105"
-                
-            full_address_for_std = f"{raw_address}, {city_to_use}, MO {zip_to_use}"
-            standardized_address = self.standardize_address(
-                full_address_for_std, default_city=city_to_use, default_state="MO", default_zip=zip_to_use
-            )
-            
-            if not standardized_address:
+    def _join_attribute_files(self, gdf, spec: RegionSpec, files: Dict[str, Path], columns: Dict[str, List[str]]):
+        """Merge the region's DBF/CSV attribute files onto the shapefile by parcel id
+        
+        Only the planned columns of each file are read; a file that adds no
+        mapped column is skipped. Each file, and the shapefile itself, is
+        collapsed to its first row per parcel id before the merge (e.g. the
+        apartment units of the city CSV), so geometry is joined once,
+        one-to-one. Dedup/join stats are kept in self.join_stats[key].
+        """
+        key = spec.key
+        tables = []
+        for kind in spec.joins:
+            if not columns[kind]:
+                print(f"⏭️ Skipping {files[kind].name}: no mapped columns beyond the ones already loaded")
                 continue
-            
-            # Enhanced property calculations
-            land_area = self.safe_to_numeric(row.get("landarea"), 0)
-            building_sqft = self.safe_to_numeric(self.get_field_value(row, "county", "building", "area"), 0)
-            building_year = self.safe_to_numeric(self.get_field_value(row, "county", "building", "year"), 0)
-            
-            prop_class_code = self.get_field_value(row, "county", "property_class", None)
-            property_type = self.classify_property(prop_class_code, "county")
-            
-            # Advanced landscapable area calculation
-            landscaping_analysis = self.calculate_advanced_landscapable_area(
-                land_area, building_sqft, property_type, temp_record['assessment']
-            )
-            
-            # Create base record
-            base_record = {
-                "id": parcel_id,
-                "full_address": standardized_address,
-                "latitude": round(lat, 6),
-                "longitude": round(lng, 6),
-                "region": raw_municipality.title() if raw_municipality else "St. Louis County",
-                "original_parcel_id": parcel_id,
-                "calc": {
-                    "landarea_sqft": land_area,
-                    "building_sqft": building_sqft,
-                    "building_year": building_year,
-                    "estimated_landscapable_area_sqft": landscaping_analysis['landscapable_area'],
-                    "property_type": property_type,
-                    "confidence_score": landscaping_analysis['confidence_score'],
-                    "landscaping_difficulty": landscaping_analysis['landscaping_difficulty']  # Change from 'difficulty'
-                },
-                "owner": {
-                    "name": self.get_field_value(row, "county", "owner", "name", ""),
-                    "tenure": self.get_field_value(row, "county", "owner", "tenure", "")
-                },
-                "assessment": temp_record['assessment']
-            }
-            
-            # Add enhanced pricing calculations
-            pricing_components = self.calculate_pricing_components(base_record, regional_stats)
-            base_record.update(pricing_components)
-            
-            results.append(base_record)
-        
-        print(f"✅ Processed {len(results)} county records with enhanced calculations")
-        return results, geometry_data
+            with self.profiler.stage(f"{key}.read_{kind}") as stage:
+                table = read_table(files[kind], kind, columns[kind], spec.dtypes)
+                stage.records = len(table)
+            print(f"📊 Loaded {kind.upper()} with {len(table)} records ({len(columns[kind]) - 1} mapped columns)")
+            tables.append((kind, table))
+        
+        parcel_id_field = spec.fields["parcel_id"]
+        gdf[parcel_id_field] = gdf[parcel_id_field].astype(str)
+        for _, table in tables:
+            table[parcel_id_field] = table[parcel_id_field].astype(str)
+        
+        # Collapse every side to one row per parcel id, then merge in registry order
+        with self.profiler.stage(f"{key}.merge") as stage:
+            gdf, shapefile_stats = collapse_to_parcels(gdf, parcel_id_field)
+            stats = {"shapefile": shapefile_stats, "joins": {}}
+            for kind, table in tables:
+                table, join_stats = collapse_to_parcels(table, parcel_id_field)
+                # Both sides are unique by parcel id: one output row per parcel
+                gdf = gdf.merge(table, on=parcel_id_field, how="left", suffixes=('', f'_{kind}'), indicator="_join")
+                matched = int((gdf.pop("_join") == "both").sum())
+                join_stats.update({
+                    "matched_parcels": matched,
+                    "unmatched_parcels": len(gdf) - matched,
+                    "orphan_parcels": join_stats["parcels"] - matched,
+                })
+                stats["joins"][kind] = join_stats
+            stats["parcels"] = stage.records = len(gdf)
+        self.join_stats[key] = stats
+        
+        for kind, join_stats in stats["joins"].items():
+            print(f"📊 {kind.upper()}: {join_stats['rows']} rows -> {join_stats['parcels']} parcels "
+                  f"({join_stats['duplicate_rows']} duplicate rows, up to {join_stats['max_rows_per_parcel']} per parcel); "
+                  f"{join_stats['matched_parcels']} matched, {join_stats['unmatched_parcels']} parcels without a row, "
+                  f"{join_stats['orphan_parcels']} rows without a parcel")
+        print(f"📊 Merged data: {shapefile_stats['rows']} shapefile records -> {len(gdf)} unique parcels "
+              f"({shapefile_stats['duplicate_rows']} duplicates removed)")
+        return gdf
     
     def calculate_regional_stats(self, all_data, region):
         """Calculate regional statistics for affluence scoring"""
@@ -817,27 +489,554 @@ class ShapefileProcessor:
             return 'value'
         else:
             return 'economy'
-    
+
+    # ------------------------------------------------------------------
+    # Columnar record engine
+    #
+    # Column-at-a-time equivalents of the per-row helpers above. Every
+    # method mirrors its scalar counterpart exactly, including Python's
+    # min/max/round semantics (NaN comparisons, int vs float results), so
+    # the records serialize byte-for-byte the same as the row-wise path.
+    # ------------------------------------------------------------------
+
+    def _resolve_field_name(self, region, category, field=None):
+        """Resolve a mapped column name the same way get_field_value does"""
+        try:
+            return self.field_mappings[region][category][field]
+        except (KeyError, TypeError):
+            return None
+
+    def get_field_column(self, df, region, category, field=None, default=None) -> list:
+        """Get a mapped column as a list of Python values (default when unmapped or missing)"""
+        field_name = self._resolve_field_name(region, category, field)
+        if field_name is None or field_name not in df.columns:
+            return [default] * len(df)
+        return df[field_name].tolist()
+
+    def safe_to_numeric_column(self, series, default=0) -> pd.Series:
+        """Vectorized safe_to_numeric over a column
+
+        Numeric columns pass through untouched (NaN stays NaN); object
+        columns fall back to the scalar conversion so mixed inputs keep
+        their exact per-value semantics.
+        """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return series
+        return pd.Series(
+            [self.safe_to_numeric(value, default) for value in series.tolist()],
+            index=series.index, dtype=object
+        )
+
+    def _numeric_field_column(self, df, region, category, field=None, default=0) -> pd.Series:
+        """Coerced numeric column for a mapped field (default when unmapped or missing)"""
+        field_name = self._resolve_field_name(region, category, field)
+        if field_name is None or field_name not in df.columns:
+            return pd.Series([default] * len(df), index=df.index)
+        return self.safe_to_numeric_column(df[field_name], default)
+
+    @staticmethod
+    def _as_float_array(values) -> np.ndarray:
+        """Float64 view of a coerced numeric column for arithmetic"""
+        return np.asarray(pd.to_numeric(pd.Series(values), errors="coerce"), dtype=np.float64)
+
+    def classify_property_column(self, property_class_codes: list, region="city") -> np.ndarray:
+        """Vectorized classify_property"""
+        spec = self.regions.get(region)
+        if spec is None:
+            return np.full(len(property_class_codes), "unknown", dtype=object)
+
+        missing = np.array([code is None for code in property_class_codes], dtype=bool)
+        code = pd.Series([str(code).strip().upper() for code in property_class_codes], dtype=object)
+        property_types = spec.classify_column(code)
+        property_types[missing] = "unknown"
+        return property_types
+
+    def calculate_advanced_landscapable_area_columns(self, land_area, building_sqft, property_type, assessment_total) -> Dict[str, list]:
+        """Vectorized calculate_advanced_landscapable_area (and calculate_landscapable_area)"""
+        land = self._as_float_array(land_area)
+        building = self._as_float_array(building_sqft)
+        total = self._as_float_array(assessment_total)
+        property_type = np.asarray(property_type, dtype=object)
+        no_land = land <= 0
+        has_building = building > 0
+
+        # Hardscape estimate; Python's min(a, b) keeps a unless b < a
+        ratio = 0.15 + (building / 20000)
+        ratio = np.where(0.25 < ratio, 0.25, ratio)
+        hardscape = np.where(has_building, (building * ratio) + 300, land * 0.05)
+        hardscape = np.where(land * 0.6 < hardscape, land * 0.6, hardscape)
+
+        # max(0, x) yields the int 0 unless x > 0
+        landscapable = land - building - hardscape
+        int_zero = ~(landscapable > 0)
+        landscapable = np.where(int_zero, 0.0, landscapable)
+
+        is_commercial = property_type == "commercial"
+        is_industrial = property_type == "industrial"
+        landscapable = np.where(is_commercial, landscapable * 0.6, landscapable)
+        landscapable = np.where(is_industrial, landscapable * 0.3, landscapable)
+        int_zero &= ~(is_commercial | is_industrial)
+
+        residential = (property_type == "residential") & has_building
+        min_landscapable = building * 0.2
+        raise_to_min = residential & (min_landscapable > landscapable)
+        landscapable = np.where(raise_to_min, min_landscapable, landscapable)
+        int_zero &= ~raise_to_min
+        cap = land * 0.9
+        lower_to_cap = residential & (cap < landscapable)
+        landscapable = np.where(lower_to_cap, cap, landscapable)
+        int_zero &= ~lower_to_cap
+
+        confidence = np.full(len(land), 0.7)
+        confidence = np.where(has_building, confidence + 0.2, confidence)
+        confidence = np.where(total > 0, confidence + 0.1, confidence)
+        confidence = np.where(confidence < 1.0, confidence, 1.0)
+
+        difficulty = np.select(
+            [property_type == "industrial", property_type == "commercial", land > 43560, land < 5000],
+            ["high", "moderate", "low", "high"],
+            default="moderate"
+        ).astype(object)
+        difficulty[no_land] = "unknown"
+
+        landscapable_values = [
+            0 if (empty or zero) else round(value, 2)
+            for empty, zero, value in zip(no_land.tolist(), int_zero.tolist(), landscapable.tolist())
+        ]
+        confidence_values = [0 if empty else value for empty, value in zip(no_land.tolist(), confidence.tolist())]
+
+        return {
+            'landscapable_area': landscapable_values,
+            'confidence_score': confidence_values,
+            'landscaping_difficulty': difficulty.tolist()
+        }
+
+    def calculate_regional_stats_columns(self, assessment_total, total_parcels: int) -> Dict[str, Any]:
+        """Vectorized calculate_regional_stats over an assessment total column"""
+        totals = self._as_float_array(assessment_total)
+        assessments = totals[totals > 0]
+
+        if not len(assessments):
+            return {
+                'median_assessment': 150000,
+                'mean_assessment': 175000,
+                'percentile_75': 250000,
+                'percentile_25': 100000,
+                'total_parcels': total_parcels
+            }
+
+        return {
+            'median_assessment': np.median(assessments),
+            'mean_assessment': np.mean(assessments),
+            'percentile_75': np.percentile(assessments, 75),
+            'percentile_25': np.percentile(assessments, 25),
+            'total_parcels': total_parcels
+        }
+
+    def calculate_pricing_components_columns(self, assessment_total, assessment_land, property_type, regional_stats) -> Dict[str, list]:
+        """Vectorized calculate_pricing_components"""
+        total = self._as_float_array(assessment_total)
+        land = self._as_float_array(assessment_land)
+        property_type = np.asarray(property_type, dtype=object)
+
+        # Affluence score; `not total or total <= 0` keeps the integer baseline
+        baseline = total <= 0
+        regional_median = regional_stats.get('median_assessment', 150000)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rank = (total / regional_median) * 50
+            rank = np.where(rank < 100, rank, 100.0)
+            land_ratio = land / total
+        rank = np.where((land > 0) & (land_ratio > 0.4), rank * 1.2, rank)
+
+        affluence_values = []
+        for is_baseline, value in zip(baseline.tolist(), rank.tolist()):
+            if is_baseline:
+                affluence_values.append(50)
+                continue
+            value = round(value, 1)
+            if not value > 0:
+                value = 0
+            elif not value < 100:
+                value = 100
+            affluence_values.append(value)
+        affluence = np.asarray(affluence_values, dtype=np.float64)
+
+        commercial_multiplier = np.select(
+            [
+                property_type == "commercial",
+                property_type == "industrial",
+                property_type == "agricultural",
+                (property_type == "residential") & (total > 500000),
+            ],
+            [0.85, 0.75, 0.90, 0.90],
+            default=1.0
+        )
+        base_multiplier = np.select(
+            [property_type == "residential", property_type == "commercial",
+             property_type == "industrial", property_type == "agricultural"],
+            [1.0, 0.8, 0.6, 0.7],
+            default=1.0
+        )
+        affluence_multiplier = 0.8 + (affluence / 100) * 0.4
+        maintenance_multiplier = base_multiplier * affluence_multiplier
+        combined_multiplier = commercial_multiplier * (0.8 + (affluence / 100) * 0.4)
+
+        pricing_tier = np.select(
+            [
+                (affluence >= 80) | (total >= 400000),
+                (affluence >= 60) | (total >= 200000),
+                (affluence >= 40) | (total >= 100000),
+            ],
+            ['premium', 'standard', 'value'],
+            default='economy'
+        ).astype(object)
+
+        return {
+            'affluence_score': affluence_values,
+            'commercial_multiplier': commercial_multiplier.tolist(),
+            'maintenance_multiplier': maintenance_multiplier.tolist(),
+            'combined_multiplier': combined_multiplier.tolist(),
+            'pricing_tier': pricing_tier.tolist()
+        }
+
+    def _region_addresses(self, gdf, region) -> tuple:
+        """Standardized address and region label per row ("" marks a skipped row)"""
+        spec = self.regions[region]
+        if spec.addresses["format"] == "municipality":
+            address_args, region_names = self._municipality_address_args(gdf, spec)
+        else:
+            address_args, region_names = self._street_address_args(gdf, spec)
+        return self.standardize_addresses(address_args), region_names
+
+    def _street_address_args(self, gdf, spec: RegionSpec) -> tuple:
+        """Street + ZIP columns in one city, e.g. St. Louis City's SITEADDR / ZIP"""
+        config = spec.addresses
+        city, state = config.get("city", spec.name), config.get("state", "MO")
+        default_zip = config.get("default_zip", "63102")
+        label = config.get("label", spec.name)
+        address_args = []
+        region_names = []
+
+        streets = self.get_field_column(gdf, spec.key, "address", "street_primary", "")
+        zips = self.get_field_column(gdf, spec.key, "address", "zip", "")
+        for raw_street_address, raw_zip in zip(streets, zips):
+            full_street_address = str(raw_street_address).strip()
+            zip_code_raw = re.sub(r"\.0$", "", str(raw_zip).strip())
+            region_names.append(label)
+            if not full_street_address or full_street_address.lower() in ['nan', 'none', 'null']:
+                address_args.append(None)
+                continue
+            raw_full_address = f"{full_street_address}, {city}, {state} {zip_code_raw}"
+            address_args.append((raw_full_address, city, state, default_zip))
+
+        return address_args, region_names
+
+    def _municipality_address_args(self, gdf, spec: RegionSpec) -> tuple:
+        """Full address + ZIP + municipality columns, e.g. St. Louis County's PROP_ADD / PROP_ZIP / MUNICIPALI"""
+        config = spec.addresses
+        fallback_city = config.get("fallback_city", spec.name)
+        unincorporated_city = config.get("unincorporated_city", f"{fallback_city} (Unincorporated)")
+        state = config.get("state", "MO")
+        default_zip = config.get("default_zip", "63105")
+        address_args = []
+        region_names = []
+
+        full_addresses = self.get_field_column(gdf, spec.key, "address", "full", "")
+        zips = self.get_field_column(gdf, spec.key, "address", "zip", "")
+        municipalities = self.get_field_column(gdf, spec.key, "address", "municipality", "")
+        for raw_address, raw_zip, raw_municipality in zip(full_addresses, zips, municipalities):
+            raw_address = str(raw_address).strip()
+            raw_zip = str(raw_zip).strip()
+            raw_municipality = str(raw_municipality).strip().title()
+            region_names.append(raw_municipality.title() if raw_municipality else fallback_city)
+            if not raw_address or raw_address.lower() in ['nan', 'none', 'null']:
+                address_args.append(None)
+                continue
+
+            city_to_use = raw_municipality or fallback_city
+            if city_to_use.upper() == "UNINCORPORATED":
+                city_to_use = unincorporated_city
+            zip_to_use = raw_zip if raw_zip and len(raw_zip) == 5 else default_zip
+
+            full_address_for_std = f"{raw_address}, {city_to_use}, {state} {zip_to_use}"
+            address_args.append((full_address_for_std, city_to_use, state, zip_to_use))
+
+        return address_args, region_names
+
+    def standardize_addresses(self, address_args: list) -> list:
+        """Standardize many addresses; each entry is standardize_address's positional args or None"""
+        if self._use_pool(len(address_args)):
+            return self._map_chunks(_standardize_address_chunk, [
+                (address_args[start:stop],) for start, stop in self._chunk_bounds(len(address_args))
+            ])
+        return standardize_batch(address_args)
+
+    def extract_parcel_geometries(self, geometries) -> list:
+        """Extract GeoJSON for a WGS84 GeoSeries, fanning out to the worker pool when enabled
+
+        Each batch is extracted column-wise by geojson_arrays.extract_geojson;
+        output matches extract_parcel_geometry per geometry. Workers receive
+        the geometries as one WKB buffer in shared memory rather than a
+        pickled GeoDataFrame.
+        """
+        if not self._use_pool(len(geometries)):
+            return extract_geojson(geometries, fallback=self._extract_scalar_geometry)
+
+        wkb, offsets = _pack_wkb(geometries)
+        with SharedArray(wkb) as shared_wkb, SharedArray(offsets) as shared_offsets:
+            return self._map_chunks(_extract_geometry_chunk, [
+                (shared_wkb.descriptor, shared_offsets.descriptor, start, stop)
+                for start, stop in self._chunk_bounds(len(geometries))
+            ])
+
+    def _extract_scalar_geometry(self, geometry):
+        return self.extract_parcel_geometry(geometry, already_transformed=True)
+
+    def _use_pool(self, count: int) -> bool:
+        return self.executor is not None and self.workers > 1 and count >= MIN_PARALLEL_CHUNK
+
+    def _chunk_bounds(self, count: int) -> list:
+        """Split `count` rows into contiguous chunks, a few per worker for load balancing"""
+        chunk_size = max(MIN_PARALLEL_CHUNK, -(-count // (self.workers * 4)))
+        return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+    def _map_chunks(self, func, chunk_args: list) -> list:
+        """Run func over chunk argument tuples on the pool and concatenate results in order"""
+        futures = [self.executor.submit(func, *args) for args in chunk_args]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _region_owners(self, gdf, region) -> list:
+        """Owner sub-records per row with the region's registry owner fields"""
+        fields = self.regions[region].owner
+        columns = [self.get_field_column(gdf, region, "owner", field, "") for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+    def build_region_records(self, gdf, gdf_wgs84, centroids, region: str) -> tuple:
+        """Build parcel records and geometry for a whole region column-at-a-time
+
+        Args:
+            gdf: Merged, projected GeoDataFrame with a `landarea` column
+            gdf_wgs84: Positionally aligned WGS84 GeoDataFrame for output geometry
+            centroids: Positionally aligned WGS84 centroid GeoSeries
+            region: Registry region key ("city", "county", ...)
+        """
+        parcel_id_field = self.field_mappings[region]["parcel_id"]
+        parcel_ids = [
+            str(value).strip()
+            for value in (gdf[parcel_id_field].tolist() if parcel_id_field in gdf.columns else [""] * len(gdf))
+        ]
+
+        # Rows without a parcel id are dropped before anything else
+        positions = np.array([i for i, parcel_id in enumerate(parcel_ids) if parcel_id], dtype=np.intp)
+        frame = gdf.iloc[positions]
+        parcel_ids = [parcel_ids[i] for i in positions]
+
+        assessment_total = self._numeric_field_column(frame, region, "assessment", "total")
+        assessment_land = self._numeric_field_column(frame, region, "assessment", "land")
+        assessment_improvement = self._numeric_field_column(frame, region, "assessment", "improvement")
+
+        print("📊 Calculating regional statistics...")
+        regional_stats = self.calculate_regional_stats_columns(assessment_total, len(frame))
+
+        # Incremental mode: stats stay global, but only changed/added parcels are recomputed
+        if self.incremental is not None:
+            recompute = self.incremental.plan(region, parcel_ids, frame, regional_stats)
+            positions = positions[recompute]
+            frame = frame[recompute]
+            parcel_ids = [parcel_id for parcel_id, kept in zip(parcel_ids, recompute.tolist()) if kept]
+            assessment_total = assessment_total[recompute]
+            assessment_land = assessment_land[recompute]
+            assessment_improvement = assessment_improvement[recompute]
+
+        with self.profiler.stage(f"{region}.extract_geometry", records=len(positions)):
+            geometry_data = dict(zip(parcel_ids, self.extract_parcel_geometries(gdf_wgs84.geometry.iloc[positions])))
+
+        with self.profiler.stage(f"{region}.addresses", records=len(frame)):
+            addresses, region_names = self._region_addresses(frame, region)
+        keep = np.array([bool(address) for address in addresses], dtype=bool)
+
+        land_area = (
+            self.safe_to_numeric_column(frame["landarea"])
+            if "landarea" in frame.columns else pd.Series([0] * len(frame), index=frame.index)
+        )
+        building_sqft = self._numeric_field_column(frame, region, "building", "area")
+        building_year = self._numeric_field_column(frame, region, "building", "year")
+        property_type = self.classify_property_column(
+            self.get_field_column(frame, region, "property_class", None), region
+        )
+
+        landscaping = self.calculate_advanced_landscapable_area_columns(
+            land_area, building_sqft, property_type, assessment_total
+        )
+        pricing = self.calculate_pricing_components_columns(
+            assessment_total, assessment_land, property_type, regional_stats
+        )
+
+        centroid_points = centroids.iloc[positions]
+        latitudes = [round(value, 6) for value in centroid_points.y.tolist()]
+        longitudes = [round(value, 6) for value in centroid_points.x.tolist()]
+        owners = self._region_owners(frame, region)
+
+        columns = zip(
+            parcel_ids, addresses, latitudes, longitudes, region_names,
+            land_area.tolist(), building_sqft.tolist(), building_year.tolist(),
+            landscaping['landscapable_area'], property_type.tolist(),
+            landscaping['confidence_score'], landscaping['landscaping_difficulty'],
+            owners, assessment_total.tolist(), assessment_land.tolist(), assessment_improvement.tolist(),
+            pricing['affluence_score'], pricing['commercial_multiplier'], pricing['maintenance_multiplier'],
+            pricing['combined_multiplier'], pricing['pricing_tier'], keep.tolist()
+        )
+
+        results = []
+        for (parcel_id, address, lat, lng, region_name, land, building, year,
+             landscapable, ptype, confidence, difficulty, owner, total, land_value, improvement,
+             affluence, commercial, maintenance, combined, tier, kept) in columns:
+            if not kept:
+                continue
+            results.append({
+                "id": parcel_id,
+                "full_address": address,
+                "latitude": lat,
+                "longitude": lng,
+                "region": region_name,
+                "original_parcel_id": parcel_id,
+                "calc": {
+                    "landarea_sqft": land,
+                    "building_sqft": building,
+                    "building_year": year,
+                    "estimated_landscapable_area_sqft": landscapable,
+                    "property_type": ptype,
+                    "confidence_score": confidence,
+                    "landscaping_difficulty": difficulty
+                },
+                "owner": owner,
+                "assessment": {
+                    'total': total,
+                    'land': land_value,
+                    'improvement': improvement
+                },
+                'affluence_score': affluence,
+                'commercial_multiplier': commercial,
+                'maintenance_multiplier': maintenance,
+                'combined_multiplier': combined,
+                'pricing_tier': tier
+            })
+
+        if self.incremental is not None:
+            return self.incremental.merge(region, results, geometry_data)
+        return results, geometry_data
+
+# ----------------------------------------------------------------------
+# Parallel chunk workers
+#
+# Module-level so they can be pickled into a ProcessPoolExecutor. Large
+# read-only inputs are handed over through shared memory; only chunk
+# bounds and small per-chunk argument lists cross the process boundary.
+# ----------------------------------------------------------------------
+
+MIN_PARALLEL_CHUNK = 2000
+
+_worker_processor = None
+
+
+def _get_worker_processor() -> ShapefileProcessor:
+    """Stateless processor instance reused by every task in a worker process"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = ShapefileProcessor(Path(tempfile.gettempdir()))
+    return _worker_processor
+
+
+class SharedArray:
+    """Context manager placing a NumPy array in shared memory for pool workers"""
+
+    def __init__(self, array: np.ndarray):
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)[:] = array
+        self.descriptor = (self._shm.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._shm.close()
+        self._shm.unlink()
+
+    @staticmethod
+    def read(descriptor, start: int = None, stop: int = None) -> np.ndarray:
+        """Copy a slice of a shared array out of shared memory"""
+        name, shape, dtype = descriptor
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            data = view[start:stop].copy()
+            del view
+        finally:
+            shm.close()
+        return data
+
+
+def _pack_wkb(geometries) -> tuple:
+    """Serialize geometries into one WKB byte buffer plus row offsets (missing rows are empty)"""
+    blobs = [blob or b"" for blob in shapely.to_wkb(np.asarray(geometries, dtype=object)).tolist()]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    return np.frombuffer(b"".join(blobs), dtype=np.uint8), offsets
+
+
+def _extract_geometry_chunk(wkb_descriptor, offsets_descriptor, start: int, stop: int) -> list:
+    offsets = SharedArray.read(offsets_descriptor, start, stop + 1)
+    wkb = SharedArray.read(wkb_descriptor, offsets[0], offsets[-1]).tobytes()
+    offsets -= offsets[0]
+    blobs = [wkb[offsets[i]:offsets[i + 1]] or None for i in range(len(offsets) - 1)]
+    processor = _get_worker_processor()
+    return extract_geojson(shapely.from_wkb(blobs), fallback=processor._extract_scalar_geometry)
+
+
+def _standardize_address_chunk(address_args: list) -> list:
+    return standardize_batch(address_args)
+
+
 class DocumentModePipeline:
     """Document Mode Pipeline - Clean Implementation"""
     
-    def __init__(self, dataset_size: str = "small", version: str = ""):
+    def __init__(self, dataset_size: str = "small", version: str = "", workers: int = 1,
+                 incremental: bool = False, stats_tolerance: float = 0.01,
+                 compression: Optional[CompressionSettings] = None, metadata_shards: int = 0,
+                 profiler: Optional[StageProfiler] = None, run_report: Optional[Path] = None,
+                 source_root: Optional[Path] = None, data_dir: Optional[Path] = None,
+                 temp_dir: Optional[Path] = None, regions_file: Optional[Path] = None,
+                 regions: Optional[List[str]] = None, upload_concurrency: int = DEFAULT_CONCURRENCY,
+                 upload_retries: int = DEFAULT_RETRIES, hashed_paths: bool = True, stable_aliases: bool = True,
+                 force_upload: bool = False, resume: bool = False, from_step: Optional[str] = None):
         self.dataset_size = dataset_size
         self.version_suffix = f"_{version}" if version else ""
+        self.workers = max(1, workers)
         
         self.project_root = Path(__file__).parent.parent.parent.parent
         self.scripts_dir = Path(__file__).parent
         
         # Persistent data directories (not cleaned up) - under /src/data
-        self.data_dir = self.project_root / "src" / "data" / "tmp"
+        self.data_dir = Path(data_dir) if data_dir else self.project_root / "src" / "data" / "tmp"
         self.temp_raw_dir = self.data_dir / "raw"
         self.temp_cdn_dir = self.data_dir / "cdn"
         
+        # Regions to ingest: the registry (regions.json or --regions-file), optionally narrowed by key
+        registry = load_regions(regions_file)
+        self.regions = select_regions(registry, regions)
+        self.partial_run = len(self.regions) < len(registry)
+        # Independently scheduled region runs get their own temp dir and run report
+        run_name = "-".join(region.key for region in self.regions) if self.partial_run else ""
+        
         # Temporary directory for document files (cleaned up)
-        self.temp_dir = self.scripts_dir / "temp"
+        self.temp_dir = Path(temp_dir) if temp_dir else self.scripts_dir / "temp" / run_name
         
-        # Clean up any existing temp directories
-        if self.temp_dir.exists():
+        # Clean up any existing temp directories, unless resuming from their checkpoint
+        resuming = resume or from_step is not None
+        if self.temp_dir.exists() and not resuming:
             shutil.rmtree(self.temp_dir)
         
         # Create directories
@@ -846,7 +1045,53 @@ class DocumentModePipeline:
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize shapefile processor
-        self.shapefile_processor = ShapefileProcessor(self.temp_raw_dir, dataset_size)
+        self.shapefile_processor = ShapefileProcessor(
+            self.temp_raw_dir, dataset_size, self.workers, source_root, self.regions
+        )
+        self.incremental = IncrementalIngest(
+            self.temp_raw_dir, dataset_size, stats_tolerance, {region.key: region.prefix for region in self.regions}
+        ) if incremental else None
+        self.shapefile_processor.incremental = self.incremental
+        self.profiler = profiler or StageProfiler()
+        self.shapefile_processor.profiler = self.profiler
+        self.run_report = Path(run_report) if run_report else \
+            self.data_dir / (f"run-report-{run_name}.json" if run_name else "run-report.json")
+        self.compression = compression or CompressionSettings()
+        self.metadata_shards = max(0, metadata_shards)
+        
+        # Uploads: one persistent worker per target, bounded concurrency, retries with backoff
+        self.upload_concurrency = max(1, upload_concurrency)
+        self.upload_retries = max(0, upload_retries)
+        self.upload_commands = dict(WORKER_COMMANDS)
+        
+        # Content-addressed uploads: unchanged artifacts are skipped, changed blobs get hashed paths
+        self.upload_manifest = UploadManifest(self.data_dir / MANIFEST_NAME)
+        self.remote_lister = lambda target, prefix: list_remote_paths(target, prefix, self.project_root)
+        self.hashed_paths = hashed_paths
+        self.stable_aliases = stable_aliases
+        self.force_upload = force_upload
+        # Artifacts carry the time their content last changed, so unchanged ones keep identical bytes
+        self.build_times = BuildTimes(self.data_dir / BUILD_TIMES_NAME)
+        
+        # Step checkpoints, tied to the settings and source files that shape the artifacts
+        self.checkpoint = PipelineCheckpoint(self.temp_dir, {
+            "dataset_size": dataset_size,
+            "version": self.version_suffix,
+            "regions": [region.key for region in self.regions],
+            "incremental": incremental,
+            "stats_tolerance": stats_tolerance,
+            "metadata_shards": self.metadata_shards,
+            "compression": [self.compression.gzip_level, list(self.compression.codecs)],
+            "sources": source_fingerprint(
+                region.source_path(self.shapefile_processor.source_root) for region in self.regions
+            ),
+        })
+        self.start_step = STEPS[0]
+        if resuming:
+            if not self.checkpoint.load():
+                print("⚠️ No checkpoint from a run with these settings and sources")
+            # Raises CheckpointError when from_step needs steps that never completed
+            self.start_step = self.checkpoint.resume_step(from_step)
         
         # Stats tracking
         self.stats = {
@@ -854,16 +1099,29 @@ class DocumentModePipeline:
             "dataset_size": dataset_size,
             "files_created": [],
             "files_uploaded": [],
+            "files_skipped": [],
             "errors": []
         }
         
         print(f"🚀 Document Mode Pipeline initialized")
         print(f"📊 Dataset size: {dataset_size}")
+        print(f"🧵 Workers: {self.workers}")
+        print(f"♻️ Incremental: {'on' if incremental else 'off'}")
+        print(f"🗜️ Compression: gzip level {self.compression.gzip_level}, codecs {', '.join(self.compression.codecs)}")
+        print(f"🧩 Metadata shards: {self.metadata_shards or 'off'}")
+        print(f"🗺️ Regions: {', '.join(region.key for region in self.regions)}")
+        print(f"⏱️ Run report: {self.run_report}")
         print(f"📂 Data directory: {self.data_dir}")
         print(f"📂 Temp directory: {self.temp_dir}")
+        if self.start_step != STEPS[0]:
+            print(f"⏩ Resuming at {self.start_step}")
     
     def step_1_process_regional_data(self):
-        """Step 1: Process regional shapefile data"""
+        """Step 1: Process regional shapefile data
+        
+        Returns:
+            (records by region key, geometry by region key), in registry order
+        """
         print("\n" + "="*60)
         print("1️⃣ PROCESSING REGIONAL SHAPEFILE DATA")
         print("="*60)
@@ -872,202 +1130,358 @@ class DocumentModePipeline:
         self._copy_local_shapefiles()
         
         # Process data
-        city_data, city_geometry = self.shapefile_processor.process_city_data()
-        county_data, county_geometry = self.shapefile_processor.process_county_data()
+        if self.workers > 1:
+            return self._process_regions_in_parallel()
+        
+        region_records, region_geometry = {}, {}
+        for region in self.regions:
+            region_records[region.key], region_geometry[region.key] = self.shapefile_processor.process_region(region)
+        
+        return region_records, region_geometry
+    
+    def _process_regions_in_parallel(self):
+        """Run every region concurrently, sharing one process pool for parcel chunks
+        
+        Region loading, projection and the vectorized calculations (including
+        calculate_regional_stats over the whole region) run in one thread per
+        region; per-parcel geometry extraction and address standardization
+        are split into chunks across the pool.
+        """
+        print(f"🧵 Processing {len(self.regions)} regions concurrently with {self.workers} workers")
+        processor = self.shapefile_processor
+        region_records, region_geometry = {}, {}
         
-        return city_data, county_data, city_geometry, county_geometry
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            processor.executor = pool
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, len(self.regions))) as threads:
+                    futures = [(region.key, threads.submit(processor.process_region, region)) for region in self.regions]
+                    for key, future in futures:
+                        region_records[key], region_geometry[key] = future.result()
+            finally:
+                processor.executor = None
+        
+        return region_records, region_geometry
     
-    def step_2_create_intermediate_files(self, city_data, county_data, city_geometry, county_geometry):
-        """Step 2: Create regional intermediate files for landscape calculations"""
+    def step_2_create_intermediate_files(self, region_records, region_geometry):
+        """Step 2: Create regional intermediate files for landscape calculations
+        
+        Files are streamed one entry at a time from the processor records, so
+        no second in-memory copy of a region is built for serialization.
+        Metadata and geometry files are compressed on write into the CDN dir.
+        Regions an incremental run found unchanged keep their previous files.
+        """
         print("\n" + "="*60)
         print("2️⃣ CREATING INTERMEDIATE FILES FOR LANDSCAPE CALCULATIONS")
         print("="*60)
         
         intermediate_files = []
+        regions = [
+            (region.prefix, region.name, region_records.get(region.key), region_geometry.get(region.key))
+            for region in self.regions
+        ]
+        kept = {}
+        for region in self.regions:
+            files = self._unchanged_region_files(region)
+            if files is not None:
+                kept[region.prefix] = files
+                print(f"♻️ Keeping {region.prefix} intermediate files: no parcel changed since the previous build")
         
         # Create regional address index files
-        if city_data:
-            city_address_index = [
-                {
-                    "display_name": record["full_address"],
-                    "parcel_id": record["id"],
-                    "region": record["region"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"]
-                }
-                for record in city_data
-            ]
-            
-            city_address_file = self.temp_raw_dir / "stl_city-address_index.json"
-            with open(city_address_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "addresses": city_address_index,
-                    "metadata": {
-                        "region": "St. Louis City",
-                        "total_addresses": len(city_address_index),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(city_address_file)
-            print(f"✅ Created stl_city-address_index.json: {len(city_address_index)} addresses")
-        
-        if county_data:
-            county_address_index = [
-                {
-                    "display_name": record["full_address"],
-                    "parcel_id": record["id"],
-                    "region": record["region"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"]
-                }
-                for record in county_data
-            ]
-            
-            county_address_file = self.temp_raw_dir / "stl_county-address_index.json"
-            with open(county_address_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "addresses": county_address_index,
-                    "metadata": {
-                        "region": "St. Louis County",
-                        "total_addresses": len(county_address_index),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(county_address_file)
-            print(f"✅ Created stl_county-address_index.json: {len(county_address_index)} addresses")
+        for prefix, region_name, data, _ in regions:
+            if prefix in kept:
+                intermediate_files.append(kept[prefix]["address_index"])
+                continue
+            if not data:
+                continue
+            address_file = self.temp_raw_dir / f"{prefix}-address_index.json"
+            digest = content_digest()
+            with self.profiler.stage(f"write {address_file.name}") as stage:
+                count = write_json_envelope(
+                    address_file, "addresses", (self._address_index_entry(record) for record in data),
+                    lambda total: {
+                        "region": region_name,
+                        "total_addresses": total,
+                        "build_time": self.build_times.resolve(address_file.name, digest.hexdigest())
+                    },
+                    keyed=False,
+                    digest=digest
+                )
+                stage.records, stage.bytes = count, address_file.stat().st_size
+            intermediate_files.append(address_file)
+            print(f"✅ Created {address_file.name}: {count} addresses")
         
         # Create regional parcel metadata files
-        if city_data:
-            city_metadata = {
-                record["original_parcel_id"]: {
-                    "id": record["original_parcel_id"],
-                    "primary_full_address": record["full_address"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"],
-                    "region": record["region"],
-                    "calc": record["calc"],
-                    "owner": record["owner"],
-                    "assessment": record["assessment"],
-                    "affluence_score": record.get("affluence_score", 50),
-                    "commercial_multiplier": record.get("commercial_multiplier", 1.0),
-                    "maintenance_multiplier": record.get("maintenance_multiplier", 1.0),
-                    "combined_multiplier": record.get("combined_multiplier", 1.0),
-                    "pricing_tier": record.get("pricing_tier", "standard")
-                }
-                for record in city_data
-            }
-            
-            city_metadata_file = self.temp_raw_dir / "stl_city-parcel_metadata.json"
-            with open(city_metadata_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "parcels": city_metadata,
-                    "metadata": {
-                        "region": "St. Louis City",
-                        "total_parcels": len(city_metadata),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(city_metadata_file)
-            print(f"✅ Created stl_city-parcel_metadata.json: {len(city_metadata)} parcels")
-        
-        if county_data:
-            county_metadata = {
-                record["original_parcel_id"]: {
-                    "id": record["original_parcel_id"],
-                    "primary_full_address": record["full_address"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"],
-                    "region": record["region"],
-                    "calc": record["calc"],
-                    "owner": record["owner"],
-                    "assessment": record["assessment"],
-                    # Add enhanced pricing data for county too
-                    "affluence_score": record.get("affluence_score", 50),
-                    "commercial_multiplier": record.get("commercial_multiplier", 1.0),
-                    "maintenance_multiplier": record.get("maintenance_multiplier", 1.0),
-                    "combined_multiplier": record.get("combined_multiplier", 1.0),
-                    "pricing_tier": record.get("pricing_tier", "standard")
-                }
-                for record in county_data
-            }
-            
-            county_metadata_file = self.temp_raw_dir / "stl_county-parcel_metadata.json"
-            with open(county_metadata_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "parcels": county_metadata,
-                    "metadata": {
-                        "region": "St. Louis County",
-                        "total_parcels": len(county_metadata),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(county_metadata_file)
-            print(f"✅ Created stl_county-parcel_metadata.json: {len(county_metadata)} parcels")
+        for prefix, region_name, data, _ in regions:
+            if prefix in kept:
+                intermediate_files.extend([kept[prefix]["parcel_metadata"], kept[prefix]["parcel_columns"]])
+                continue
+            if not data:
+                continue
+            metadata_file = self.temp_raw_dir / f"{prefix}-parcel_metadata.json"
+            digest = content_digest()
+            # Includes compress-on-write of the .gz / sidecars
+            with self.profiler.stage(f"write {metadata_file.name}") as stage:
+                count = write_json_envelope(
+                    metadata_file, "parcels",
+                    ((record["original_parcel_id"], self._parcel_metadata_entry(record)) for record in data),
+                    lambda total: {
+                        "region": region_name,
+                        "total_parcels": total,
+                        "build_time": self.build_times.resolve(metadata_file.name, digest.hexdigest())
+                    },
+                    opener=self._compressed_opener,
+                    digest=digest
+                )
+                stage.records, stage.bytes = count, metadata_file.stat().st_size
+            intermediate_files.append(metadata_file)
+            print(f"✅ Created {metadata_file.name}: {count} parcels")
+            
+            # Seekable columnar companion with the fields parcelMetadata.ts reads, same entries and build time
+            columns_file = self.temp_cdn_dir / f"{prefix}-parcel_metadata.bin"
+            with self.profiler.stage(f"write {columns_file.name}") as stage:
+                rows = write_parcel_columns(
+                    columns_file, (self._parcel_metadata_entry(record) for record in data),
+                    {"region": region_name, "build_time": self.build_times.get(metadata_file.name)}
+                )
+                stage.records, stage.bytes = rows, columns_file.stat().st_size
+            intermediate_files.append(columns_file)
+            print(f"✅ Created {columns_file.name}: {rows} parcels, {columns_file.stat().st_size:,} bytes")
+        
+        # Optional parcel-id shards so a cold lookup fetches one small file. Shards and
+        # their manifest span every region, so runs over a subset of regions leave them as they are
+        kept_shards = None
+        if self.metadata_shards and not self.partial_run and len(kept) == len(regions):
+            kept_shards = self._unchanged_shard_files(list(kept))
+        if self.metadata_shards and self.partial_run:
+            print("⚠️ Skipping metadata shards: they are only rebuilt by runs over every region")
+        elif kept_shards is not None:
+            print(f"♻️ Keeping {len(kept_shards) - 1} metadata shards: no parcel changed since the previous build")
+            intermediate_files.extend(kept_shards)
+        elif self.metadata_shards:
+            with self.profiler.stage("write metadata shards") as stage:
+                shard_files = self._write_metadata_shards(regions)
+                stage.records = len(shard_files)
+            intermediate_files.extend(shard_files)
         
         # Create regional parcel geometry files
-        if city_geometry:
-            city_geometry_file = self.temp_raw_dir / "stl_city-parcel_geometry.json"
-            with open(city_geometry_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "geometries": city_geometry,
-                    "metadata": {
-                        "region": "St. Louis City",
-                        "total_geometries": len(city_geometry),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(city_geometry_file)
-            print(f"✅ Created stl_city-parcel_geometry.json: {len(city_geometry)} geometries")
-        
-        if county_geometry:
-            county_geometry_file = self.temp_raw_dir / "stl_county-parcel_geometry.json"
-            with open(county_geometry_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "geometries": county_geometry,
-                    "metadata": {
-                        "region": "St. Louis County",
-                        "total_geometries": len(county_geometry),
-                        "build_time": datetime.now().isoformat()
-                    }
-                }, f, separators=(',', ':'))
-            
-            intermediate_files.append(county_geometry_file)
-            print(f"✅ Created stl_county-parcel_geometry.json: {len(county_geometry)} geometries")
+        for prefix, region_name, _, geometry in regions:
+            if prefix in kept:
+                intermediate_files.append(kept[prefix]["parcel_geometry"])
+                continue
+            if not geometry:
+                continue
+            geometry_file = self.temp_raw_dir / f"{prefix}-parcel_geometry.json"
+            digest = content_digest()
+            with self.profiler.stage(f"write {geometry_file.name}") as stage:
+                count = write_json_envelope(
+                    geometry_file, "geometries", geometry.items(),
+                    lambda total: {
+                        "region": region_name,
+                        "total_geometries": total,
+                        "build_time": self.build_times.resolve(geometry_file.name, digest.hexdigest())
+                    },
+                    opener=self._compressed_opener,
+                    digest=digest
+                )
+                stage.records, stage.bytes = count, geometry_file.stat().st_size
+            intermediate_files.append(geometry_file)
+            print(f"✅ Created {geometry_file.name}: {count} geometries")
+        
+        # Hashes describe the files just written, so they are saved only now
+        if self.incremental is not None:
+            self.incremental.save_manifests()
+        self.build_times.save()
         
         return intermediate_files
     
+    def _unchanged_region_files(self, region: RegionSpec) -> Optional[Dict[str, Path]]:
+        """The previous step 2 files of a region whose incremental plan has no changes
+        
+        Only when every file (with its compressed variants) exists and was
+        written before the region's hash manifest, i.e. by a completed step 2.
+        Their compressed variants are adopted so step 3 does not recompress them.
+        """
+        if self.incremental is None or not self.incremental.unchanged(region.key):
+            return None
+        files = {
+            "address_index": self.temp_raw_dir / f"{region.prefix}-address_index.json",
+            "parcel_metadata": self.temp_raw_dir / f"{region.prefix}-parcel_metadata.json",
+            "parcel_columns": self.temp_cdn_dir / f"{region.prefix}-parcel_metadata.bin",
+            "parcel_geometry": self.temp_raw_dir / f"{region.prefix}-parcel_geometry.json",
+        }
+        compressed = [path for kind in ("parcel_metadata", "parcel_geometry")
+                      for path in self.compression.targets(files[kind], self.temp_cdn_dir).values()]
+        if not self._written_before(list(files.values()) + compressed, self.incremental.manifest_path(region.key)):
+            return None
+        for kind in ("parcel_metadata", "parcel_geometry"):
+            self.compression.adopt(files[kind], self.temp_cdn_dir)
+        return files
+    
+    def _unchanged_shard_files(self, prefixes: List[str]) -> Optional[List[Path]]:
+        """The previous metadata shards (raw files, then the shard manifest) when they match this run's layout"""
+        manifest_file = self.temp_cdn_dir / SHARD_MANIFEST_NAME
+        try:
+            with open(manifest_file, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("shard_count") != self.metadata_shards or list(manifest.get("regions", {})) != prefixes:
+            return None
+        
+        shard_files = [self.temp_raw_dir / shard_file_name(prefix, shard)
+                       for prefix in prefixes for shard in range(self.metadata_shards)]
+        compressed = [path for shard_file in shard_files
+                      for path in self.compression.targets(shard_file, self.temp_cdn_dir).values()]
+        manifests = [self.incremental.manifest_path(region.key) for region in self.regions]
+        if not all(self._written_before(shard_files + compressed + [manifest_file], path) for path in manifests):
+            return None
+        for shard_file in shard_files:
+            self.compression.adopt(shard_file, self.temp_cdn_dir)
+        return shard_files + [manifest_file]
+    
+    @staticmethod
+    def _written_before(paths: List[Path], reference: Path) -> bool:
+        """Whether every path exists and is no newer than reference"""
+        try:
+            written = reference.stat().st_mtime
+            return all(path.stat().st_mtime <= written for path in paths)
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _address_index_entry(record):
+        return {
+            "display_name": record["full_address"],
+            "parcel_id": record["id"],
+            "region": record["region"],
+            "latitude": record["latitude"],
+            "longitude": record["longitude"]
+        }
+    
+    @staticmethod
+    def _parcel_metadata_entry(record):
+        return {
+            "id": record["original_parcel_id"],
+            "primary_full_address": record["full_address"],
+            "latitude": record["latitude"],
+            "longitude": record["longitude"],
+            "region": record["region"],
+            "calc": record["calc"],
+            "owner": record["owner"],
+            "assessment": record["assessment"],
+            "affluence_score": record.get("affluence_score", 50),
+            "commercial_multiplier": record.get("commercial_multiplier", 1.0),
+            "maintenance_multiplier": record.get("maintenance_multiplier", 1.0),
+            "combined_multiplier": record.get("combined_multiplier", 1.0),
+            "pricing_tier": record.get("pricing_tier", "standard")
+        }
+    
+    @staticmethod
+    def _document_entry(record):
+        return {
+            "id": record["id"],
+            "full_address": record["full_address"],
+            "latitude": record["latitude"],
+            "longitude": record["longitude"],
+            "region": record["region"]
+        }
+    
+    def _write_metadata_shards(self, regions):
+        """Write parcel-id sharded metadata plus the shard manifest; returns the files"""
+        manifest, shard_files = write_metadata_shards(
+            self.temp_raw_dir,
+            ((prefix, self._parcel_metadata_entry(record)) for prefix, _, data, _ in regions for record in data or []),
+            self.metadata_shards,
+            self.build_times.now,
+            opener=self._compressed_opener,
+            regions={prefix: region_name for prefix, region_name, _, _ in regions},
+            stamp=self.build_times.resolve
+        )
+        
+        # Point the manifest at the compressed shards clients actually fetch
+        sizes = []
+        for region in manifest["regions"].values():
+            for shard in region["shards"]:
+                gzip_output = self.compression.results[self.temp_raw_dir / shard["file"]]["outputs"]["gzip"]
+                shard["file"] = gzip_output["path"].name
+                shard["bytes"] = gzip_output["bytes"]
+                sizes.append(gzip_output["bytes"])
+        
+        manifest_file = self.temp_cdn_dir / SHARD_MANIFEST_NAME
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        sizes.sort()
+        print(f"✅ Created {len(shard_files)} metadata shards ({self.metadata_shards} per region): "
+              f"{sizes[0]:,}-{sizes[-1]:,} bytes gzipped, median {sizes[len(sizes) // 2]:,}")
+        if manifest["relocated_parcels"]:
+            print(f"   ↪️ {manifest['relocated_parcels']} parcels sharded under the region their id maps to")
+        return shard_files + [manifest_file]
+    
+    def _compressed_opener(self, raw_path: Path):
+        """Stream factory that tees a raw intermediate file into its compressed variants"""
+        return self.compression.open_tee(raw_path, self.temp_cdn_dir)
+    
     def step_3_compress_intermediate_files(self, intermediate_files):
-        """Step 3: Compress parcel metadata and geometry files for cold storage"""
+        """Step 3: Compress parcel metadata and geometry files for cold storage
+        
+        Step 2 already compressed these files while writing them; this step
+        reports the results and only compresses files that were not teed.
+        """
         print("\n" + "="*60)
         print("3️⃣ COMPRESSING INTERMEDIATE FILES FOR COLD STORAGE")
         print("="*60)
         
         compressed_files = []
+        shard_results = []
+        shard_prefixes = [region.prefix for region in self.regions]
         
         for file_path in intermediate_files:
+            # Files written straight to the CDN dir (binary columns, shard manifest) ship as-is
+            if file_path.parent == self.temp_cdn_dir:
+                compressed_files.append(file_path)
+                print(f"📦 Keeping {file_path.name} as written")
+                continue
+            
+            # Shards were compressed on write (unless step 2 ran in an earlier, resumed run);
+            # summarize them instead of one line each
+            if is_shard_file(file_path, shard_prefixes):
+                result = self.compression.results.get(file_path) or \
+                    self.compression.compress_file(file_path, self.temp_cdn_dir)
+                compressed_files.extend(output["path"] for output in result["outputs"].values())
+                shard_results.append(result)
+                continue
+            
             # Only compress metadata and geometry files, not address index
             if "parcel_metadata" in file_path.name or "parcel_geometry" in file_path.name:
-                compressed_path = self.temp_cdn_dir / f"{file_path.name}.gz"
-                
-                print(f"🗜️ Compressing {file_path.name} -> {compressed_path.name}")
-                
-                with open(file_path, 'rb') as f_in:
-                    with gzip.open(compressed_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                
-                compressed_files.append(compressed_path)
-                
-                # Get compression stats
-                original_size = file_path.stat().st_size
-                compressed_size = compressed_path.stat().st_size
-                ratio = (1 - compressed_size / original_size) * 100
+                result = self.compression.results.get(file_path)
+                if result is None:
+                    print(f"🗜️ Compressing {file_path.name} -> {', '.join(self.compression.codecs)}")
+                    with self.profiler.stage(f"compress {file_path.name}") as stage:
+                        result = self.compression.compress_file(file_path, self.temp_cdn_dir)
+                        stage.bytes = result["raw_bytes"]
+                if result.get("reused"):
+                    compressed_files.extend(output["path"] for output in result["outputs"].values())
+                    print(f"♻️ Keeping {file_path.name} [{', '.join(result['outputs'])}] from the previous build")
+                    continue
                 
-                print(f"✅ Compressed {file_path.name}: {original_size:,} -> {compressed_size:,} bytes ({ratio:.1f}% reduction)")
+                original_size = result["raw_bytes"]
+                raw_mb = original_size / (1024 * 1024)
+                for codec, output in result["outputs"].items():
+                    compressed_files.append(output["path"])
+                    ratio = (1 - output["bytes"] / original_size) * 100 if original_size else 0
+                    throughput = raw_mb / output["cpu_seconds"] if output["cpu_seconds"] else float("inf")
+                    print(f"✅ Compressed {file_path.name} [{codec}]: {original_size:,} -> {output['bytes']:,} bytes "
+                          f"({ratio:.1f}% reduction, {throughput:.1f} MB/s)")
+                print(f"   ⏱️ {file_path.name}: {raw_mb / result['wall_seconds']:.1f} MB/s end-to-end write"
+                      if result["wall_seconds"] else f"   ⏱️ {file_path.name}: written")
+        
+        if shard_results:
+            raw_bytes = sum(result["raw_bytes"] for result in shard_results)
+            gzip_bytes = sum(result["outputs"]["gzip"]["bytes"] for result in shard_results)
+            verb = "Kept" if all(result.get("reused") for result in shard_results) else "Compressed"
+            print(f"✅ {verb} {len(shard_results)} metadata shards: {raw_bytes:,} -> {gzip_bytes:,} bytes")
         
         return compressed_files
     
@@ -1083,99 +1497,137 @@ class DocumentModePipeline:
         
         upload_success = True
         
-        for file_path in compressed_files:
-            blob_path = f"cdn/{file_path.name}"
-            print(f"📤 Uploading {file_path.name} to {blob_path}")
-            
-            try:
-                # Use upload_blob.js script, run from project root
-                result = subprocess.run([
-                    "node", 
-                    str(Path("src/config/scripts/upload_blob.js")), 
-                    str(file_path), 
-                    blob_path
-                ], capture_output=True, text=True, check=True, cwd=str(self.project_root))
-                
-                self.stats["files_uploaded"].append(blob_path)
-                print(f"✅ Uploaded {blob_path}")
-                
-            except subprocess.CalledProcessError as e:
-                print(f"❌ Failed to upload {file_path.name}: {e.stderr}")
-                self.stats["errors"].append(f"Upload failed: {file_path.name}")
+        print(f"📤 Uploading {len(compressed_files)} files to cdn/ "
+              f"({self.upload_concurrency} at a time, up to {self.upload_retries} retries)")
+        artifacts = self._upload("blob", [(file_path, f"cdn/{file_path.name}") for file_path in compressed_files],
+                                 hashed=self.hashed_paths)
+        
+        for artifact in artifacts:
+            if not artifact["success"]:
+                print(f"❌ Failed to upload {Path(artifact['local']).name}: {artifact['error']}")
+                self.stats["errors"].append(f"Upload failed: {Path(artifact['local']).name}")
                 upload_success = False
         
+        # Publish the hash -> path map so clients can fetch the immutable hashed paths
+        if any(artifact["uploads"] and artifact["success"] for artifact in artifacts):
+            manifest_file = self.temp_cdn_dir / MANIFEST_NAME
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(self.upload_manifest.document("blob"), f, indent=2)
+            with UploadWorker(self.upload_commands["blob"], cwd=self.project_root) as worker:
+                pool = UploadPool(worker, retries=self.upload_retries, profiler=self.profiler)
+                result = pool.upload_one(manifest_file, f"cdn/{MANIFEST_NAME}")
+            if result["success"]:
+                self.stats["files_uploaded"].append(result["remote"])
+            else:
+                print(f"⚠️ Could not publish cdn/{MANIFEST_NAME}: {result['error']}")
+        
         return upload_success
     
-    def step_5_create_document_files(self, city_data, county_data):
-        """Step 5: Create minimal document.json files for FlexSearch Document Mode"""
+    def _upload(self, target: str, jobs: List[tuple], hashed: bool = False) -> List[Dict[str, Any]]:
+        """Upload changed artifacts through one pooled worker; unchanged ones are skipped
+        
+        An artifact is unchanged when its content hash matches the local upload
+        manifest and the remote listing still has its paths (upload_manifest.py).
+        Prints per-file throughput and returns one artifact per job with
+        "success", "error" and the (local, remote) "uploads" made.
+        """
+        started = datetime.now()
+        prefixes = sorted({remote.rpartition("/")[0] + "/" for _, remote in jobs})
+        listings = [self.remote_lister(target, prefix) for prefix in prefixes]
+        remote_paths = None if any(listing is None for listing in listings) else set().union(*listings)
+        if remote_paths is None and not self.force_upload:
+            print(f"⚠️ Could not list {target} {', '.join(prefixes)}; uploading every file")
+        artifacts = self.upload_manifest.plan(target, jobs, remote_paths, hashed=hashed,
+                                              aliases=self.stable_aliases, force=self.force_upload)
+        
+        skipped = [artifact for artifact in artifacts if artifact["skip"]]
+        self.stats["files_skipped"].extend(artifact["remote"] for artifact in skipped)
+        if skipped:
+            print(f"⏭️ {len(skipped)} unchanged files skipped ({sum(a['bytes'] for a in skipped) / (1024 * 1024):.2f} MB)")
+        
+        uploads = [job for artifact in artifacts for job in artifact["uploads"]]
+        with UploadWorker(self.upload_commands[target], cwd=self.project_root) as worker:
+            pool = UploadPool(worker, self.upload_concurrency, self.upload_retries, profiler=self.profiler)
+            results = {result["remote"]: result for result in pool.upload_all(uploads)}
+        print_upload_summary(list(results.values()), (datetime.now() - started).total_seconds())
+        
+        for artifact in artifacts:
+            failed = [results[remote] for _, remote in artifact["uploads"] if not results[remote]["success"]]
+            artifact["success"] = not failed
+            artifact["error"] = failed[0]["error"] if failed else None
+            self.stats["files_uploaded"].extend(
+                remote for _, remote in artifact["uploads"] if results[remote]["success"]
+            )
+            if artifact["uploads"] and not failed:
+                self.upload_manifest.record(target, artifact)
+        self.upload_manifest.save()
+        return artifacts
+    
+    def step_5_create_document_files(self, region_records):
+        """Step 5: Create minimal document.json files for FlexSearch Document Mode
+        
+        Besides the flat region file, records are bucketed into lat/lng grid
+        cells (geo_grid.py) with one document file per cell, so clients can
+        load only the cells near the user.
+        """
         print("\n" + "="*60)
         print("5️⃣ CREATING DOCUMENT FILES FOR HOT SEARCH")
         print("="*60)
         
         document_files = []
+        region_grids = {}
         
-        # Create city document file
-        if city_data:
-            city_doc_data = [
-                {
-                    "id": record["id"],
-                    "full_address": record["full_address"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"],
-                    "region": record["region"]
-                }
-                for record in city_data
-            ]
-            
-            city_doc_file = self.temp_dir / "stl_city-document.json"
-            with open(city_doc_file, 'w', encoding='utf-8') as f:
-                json.dump(city_doc_data, f, separators=(',', ':'))
-            
-            document_files.append(city_doc_file)
-            print(f"✅ Created stl_city-document.json: {len(city_doc_data)} addresses")
-        
-        # Create county document file
-        if county_data:
-            county_doc_data = [
-                {
-                    "id": record["id"],
-                    "full_address": record["full_address"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"],
-                    "region": record["region"]
-                }
-                for record in county_data
-            ]
-            
-            county_doc_file = self.temp_dir / "stl_county-document.json"
-            with open(county_doc_file, 'w', encoding='utf-8') as f:
-                json.dump(county_doc_data, f, separators=(',', ':'))
-            
-            document_files.append(county_doc_file)
-            print(f"✅ Created stl_county-document.json: {len(county_doc_data)} addresses")
+        for region in self.regions:
+            prefix, data = region.prefix, region_records.get(region.key)
+            if not data:
+                continue
+            doc_file = self.temp_dir / f"{prefix}-document.json"
+            with self.profiler.stage(f"write {doc_file.name}") as stage:
+                count = write_json_array(doc_file, (self._document_entry(record) for record in data))
+                stage.records, stage.bytes = count, doc_file.stat().st_size
+            
+            document_files.append(doc_file)
+            print(f"✅ Created {doc_file.name}: {count} addresses")
+            
+            # Geo-grid shards of the same documents
+            with self.profiler.stage(f"write {prefix} grid files", records=len(data)):
+                cells, unplaced = bucket_by_grid(data)
+                grids = []
+                for (lat_index, lng_index), records in cells.items():
+                    grid = grid_entry(lat_index, lng_index)
+                    grid_file = self.temp_dir / f"{prefix}-document-{grid['id']}.json"
+                    grid["document_file"] = grid_file.name
+                    grid["documents"] = write_json_array(grid_file, (self._document_entry(record) for record in records))
+                    grids.append(grid)
+                    document_files.append(grid_file)
+            region_grids[prefix] = grids
+            
+            sizes = sorted(grid["documents"] for grid in grids)
+            if sizes:
+                print(f"✅ Created {len(grids)} {prefix} grid files: {sizes[0]}-{sizes[-1]} addresses per cell, "
+                      f"median {sizes[len(sizes) // 2]}")
+            if unplaced:
+                print(f"⚠️ {unplaced} {prefix} addresses without coordinates are only in {doc_file.name}")
         
         # Create latest.json manifest
         if document_files:
-            regions_array = []
-            if city_data:
-                regions_array.append({
-                    "region": "stl_city",
-                    "version": "1.0.0",
-                    "document_file": "stl_city-document.json",
-                    "lookup_file": "stl_city-document.json"  # Same file for Document Mode
-                })
-            if county_data:
-                regions_array.append({
-                    "region": "stl_county", 
+            regions_array = [
+                {
+                    "region": prefix,
                     "version": "1.0.0",
-                    "document_file": "stl_county-document.json",
-                    "lookup_file": "stl_county-document.json"  # Same file for Document Mode
-                })
+                    "document_file": f"{prefix}-document.json",
+                    "grids": grids,
+                    "lookup_file": f"{prefix}-document.json"  # Same file for Document Mode
+                }
+                for prefix, grids in region_grids.items()
+            ]
+            if self.partial_run:
+                regions_array.extend(self._published_region_entries(exclude=set(region_grids)))
             
             latest_data = {
                 "regions": regions_array,
                 "metadata": {
-                    "generated_at": datetime.now().isoformat(),
+                    "generated_at": self.build_times.resolve("latest.json", json_digest(regions_array).hexdigest()),
                     "version": "1.0.0",
                     "total_regions": len(regions_array),
                     "source": "Document Mode Pipeline"
@@ -1187,10 +1639,114 @@ class DocumentModePipeline:
                 json.dump(latest_data, f, indent=2)
             
             document_files.append(latest_file)
+            self.build_times.save()
             print(f"✅ Created latest.json manifest")
         
         return document_files
     
+    def _published_region_entries(self, exclude: set) -> list:
+        """latest.json entries of regions not rebuilt by this run, from the published manifest"""
+        published = self.project_root / "public" / "search" / "latest.json"
+        try:
+            with open(published, encoding='utf-8') as f:
+                entries = json.load(f).get("regions", [])
+        except (OSError, ValueError):
+            return []
+        kept = [entry for entry in entries if entry.get("region") not in exclude]
+        if kept:
+            print(f"📋 Keeping published latest.json entries for {', '.join(entry['region'] for entry in kept)}")
+        return kept
+    
+    def step_5b_prebuild_search_indexes(self, document_files):
+        """Step 5b: Prebuild exported FlexSearch indexes for the region document files
+        
+        Runs build_flexsearch_index.js locally (no network) and records each
+        index in latest.json as the region's index_file. A region whose index
+        cannot be built keeps only its document file, which clients index
+        themselves as before.
+        
+        Returns:
+            document_files with the index files added, latest.json last
+        """
+        print("\n" + "="*60)
+        print("🔎 PREBUILDING FLEXSEARCH INDEXES")
+        print("="*60)
+        
+        index_files = {}
+        for prefix in (region.prefix for region in self.regions):
+            doc_file = self.temp_dir / f"{prefix}-document.json"
+            if doc_file not in document_files:
+                continue
+            index_file = self.temp_dir / f"{prefix}-flexsearch.json"
+            
+            try:
+                with self.profiler.stage(f"index {prefix}") as stage:
+                    stage.bytes = doc_file.stat().st_size
+                    result = subprocess.run([
+                        "node",
+                        str(self.scripts_dir / "build_flexsearch_index.js"),
+                        str(doc_file),
+                        str(index_file),
+                        prefix,
+                        self.build_times.get("latest.json")
+                    ], capture_output=True, text=True, timeout=1800, cwd=str(self.project_root))
+            except FileNotFoundError:
+                print(f"⚠️ Skipping prebuilt {prefix} index: node not installed")
+                continue
+            except (OSError, subprocess.TimeoutExpired) as e:
+                print(f"⚠️ Skipping prebuilt {prefix} index: {e}")
+                continue
+            
+            summary = self._index_builder_summary(result)
+            if not summary.get("success"):
+                reason = summary.get("error") or f"imported index differs on {summary.get('mismatched_queries')}"
+                print(f"⚠️ Skipping prebuilt {prefix} index: {reason}")
+                continue
+            
+            speedup = summary["build_ms"] / summary["import_ms"] if summary["import_ms"] else float("inf")
+            print(f"✅ Created {index_file.name}: {summary['bytes']:,} bytes "
+                  f"(documents {summary['source_bytes']:,} bytes, {summary['documents']} addresses)")
+            print(f"   ⏱️ parse + build {summary['build_ms']:,.0f} ms vs parse + import {summary['import_ms']:,.0f} ms "
+                  f"({speedup:.1f}x)")
+            index_files[prefix] = index_file
+        
+        latest_file = self.temp_dir / "latest.json"
+        if index_files and latest_file.exists():
+            with open(latest_file, 'r', encoding='utf-8') as f:
+                latest_data = json.load(f)
+            for region in latest_data["regions"]:
+                if region["region"] in index_files:
+                    region["index_file"] = index_files[region["region"]].name
+            with open(latest_file, 'w', encoding='utf-8') as f:
+                json.dump(latest_data, f, indent=2)
+            print("✅ Added index files to latest.json")
+        
+        # Keep latest.json last so it is published after the files it points to
+        others = [path for path in document_files if path != latest_file]
+        tail = [latest_file] if latest_file in document_files else []
+        return others + list(index_files.values()) + tail
+    
+    @staticmethod
+    def _index_builder_summary(result) -> Dict[str, Any]:
+        """The JSON summary build_flexsearch_index.js prints last, or why there is none"""
+        lines = result.stdout.strip().splitlines()
+        if lines:
+            try:
+                summary = json.loads(lines[-1])
+                if result.returncode == 0 or not summary.get("success"):
+                    return summary
+            except json.JSONDecodeError:
+                pass
+        
+        # The script died before printing a summary (e.g. its imports failed)
+        stderr = [line.strip() for line in result.stderr.splitlines() if line.strip()]
+        if any("ERR_MODULE_NOT_FOUND" in line and "'flexsearch'" in line for line in stderr):
+            reason = "flexsearch not installed"
+        else:
+            errors = [line for line in stderr if "Error" in line]
+            reason = (errors or stderr or [f"index builder exited with code {result.returncode}"])[0][:300]
+        return {"success": False, "error": reason}
+    
     def step_6_upload_document_files(self, document_files):
         """Step 6: Upload document files to public/search/ for hot search"""
         print("\n" + "="*60)
@@ -1206,6 +1762,7 @@ class DocumentModePipeline:
         public_search_dir.mkdir(parents=True, exist_ok=True)
         
         upload_success = True
+        copied_files = []
         
         for file_path in document_files:
             # Copy to public/search/
@@ -1215,44 +1772,20 @@ class DocumentModePipeline:
             try:
                 shutil.copy2(file_path, dest_path)
                 print(f"✅ Copied {file_path.name} to public/search/")
-                
-                # Also upload to Firebase for backup
-                try:
-                    result = subprocess.run([
-                        "node", 
-                        str(Path("src/config/scripts/upload_firebase.js")), 
-                        "upload",
-                        str(file_path), 
-                        f"search/{file_path.name}"
-                    ], capture_output=True, text=True, timeout=600, cwd=str(self.project_root))
-                    
-                    if result.returncode == 0:
-                        # Parse the JSON output to check if upload actually succeeded
-                        try:
-                            output_data = json.loads(result.stdout.split('\n')[-2])  # Last line before empty
-                            if output_data.get('success', False):
-                                print(f"✅ Uploaded {file_path.name} to Firebase backup")
-                            else:
-                                print(f"⚠️ Firebase upload failed for {file_path.name}: {output_data.get('error', 'Unknown error')}")
-                        except (json.JSONDecodeError, IndexError):
-                            # Fallback to checking return code only
-                            print(f"✅ Uploaded {file_path.name} to Firebase backup")
-                    else:
-                        print(f"⚠️ Firebase upload failed for {file_path.name}")
-                        print(f"   stdout: {result.stdout}")
-                        print(f"   stderr: {result.stderr}")
-                    
-                except subprocess.TimeoutExpired:
-                    print(f"⚠️ Firebase upload timed out for {file_path.name} (10 minutes)")
-                except subprocess.CalledProcessError as e:
-                    print(f"⚠️ Firebase upload failed for {file_path.name}: {e.stderr}")
-                    # Don't fail the pipeline for Firebase issues
-                    
+                copied_files.append(file_path)
             except Exception as e:
                 print(f"❌ Failed to copy {file_path.name}: {e}")
                 self.stats["errors"].append(f"Copy failed: {file_path.name}")
                 upload_success = False
         
+        # Also upload to Firebase for backup; Firebase issues don't fail the pipeline
+        if copied_files:
+            print(f"📤 Uploading {len(copied_files)} files to Firebase backup ({self.upload_concurrency} at a time)")
+            artifacts = self._upload("firebase", [(file_path, f"search/{file_path.name}") for file_path in copied_files])
+            for artifact in artifacts:
+                if not artifact["success"]:
+                    print(f"⚠️ Firebase upload failed for {Path(artifact['local']).name}: {artifact['error']}")
+        
         return upload_success
     
     def step_7_cleanup(self):
@@ -1278,60 +1811,118 @@ class DocumentModePipeline:
         """Copy local shapefiles to temp directory for processing"""
         print("📁 Copying local shapefiles to temp directory...")
         
-        local_shapefiles_dir = self.project_root / "src" / "data"
-        
-        # Copy city shapefiles
-        city_local = local_shapefiles_dir / "saint_louis_city" / "shapefiles"
-        city_temp = self.temp_raw_dir / "shapefiles" / "saint-louis-city"
-        
-        if city_local.exists():
-            city_temp.mkdir(parents=True, exist_ok=True)
-            for file_path in city_local.glob("*"):
-                if file_path.is_file():
-                    shutil.copy2(file_path, city_temp / file_path.name)
-            print(f"✅ Copied city shapefiles to {city_temp}")
-        
-        # Copy county shapefiles
-        county_local = local_shapefiles_dir / "saint_louis_county" / "shapefiles"
-        county_temp = self.temp_raw_dir / "shapefiles" / "saint-louis-county"
-        
-        if county_local.exists():
-            county_temp.mkdir(parents=True, exist_ok=True)
-            for file_path in county_local.glob("*"):
-                if file_path.is_file():
-                    shutil.copy2(file_path, county_temp / file_path.name)
-            print(f"✅ Copied county shapefiles to {county_temp}")
+        source_root = self.shapefile_processor.source_root
+        for region in self.regions:
+            region_local = region.source_path(source_root)
+            region_temp = self.temp_raw_dir / "shapefiles" / region.prefix
+            
+            if region_local.exists():
+                region_temp.mkdir(parents=True, exist_ok=True)
+                for file_path in region_local.glob("*"):
+                    if file_path.is_file():
+                        shutil.copy2(file_path, region_temp / file_path.name)
+                print(f"✅ Copied {region.key} shapefiles to {region_temp}")
     
     def run_pipeline(self):
-        """Run the complete Document Mode pipeline"""
+        """Run the complete Document Mode pipeline
+        
+        Each step that succeeds is checkpointed; steps before self.start_step
+        (a resumed run) are restored from their checkpoint instead of run.
+        """
         print("🚀 Starting Document Mode Pipeline")
         print("="*60)
         
+        profiler = self.profiler
+        checkpoint = self.checkpoint
+        pending = set(STEPS[STEPS.index(self.start_step):])
+        checkpoint.discard_from(self.start_step)
+        profiler.start()
         try:
             # Step 1: Process regional data
-            city_data, county_data, city_geometry, county_geometry = self.step_1_process_regional_data()
+            if "step_1_process_regional_data" in pending:
+                with profiler.stage("step_1_process_regional_data") as stage:
+                    region_records, region_geometry = self.step_1_process_regional_data()
+                    parcels = stage.records = sum(len(records) for records in region_records.values())
+                with profiler.stage("checkpoint step_1_process_regional_data", records=parcels):
+                    self._checkpoint_regional_data(region_records, region_geometry)
+            else:
+                with profiler.stage("restore step_1_process_regional_data") as stage:
+                    region_records, region_geometry = self._restore_regional_data(
+                        geometry="step_2_create_intermediate_files" in pending
+                    )
+                    parcels = stage.records = sum(len(records) for records in region_records.values())
             
             # Step 2: Create intermediate files
-            intermediate_files = self.step_2_create_intermediate_files(
-                city_data, county_data, city_geometry, county_geometry
-            )
+            if "step_2_create_intermediate_files" in pending:
+                with profiler.stage("step_2_create_intermediate_files", records=parcels):
+                    intermediate_files = self.step_2_create_intermediate_files(region_records, region_geometry)
+                self._checkpoint_step("step_2_create_intermediate_files", intermediate_files)
+            else:
+                intermediate_files = self._restore_step("step_2_create_intermediate_files")
+            self.stats["files_created"].extend(str(path) for path in intermediate_files)
+            
+            # Geometry is only needed for the intermediate files; release it early
+            del region_geometry
             
             # Step 3: Compress intermediate files
-            compressed_files = self.step_3_compress_intermediate_files(intermediate_files)
+            if "step_3_compress_intermediate_files" in pending:
+                with profiler.stage("step_3_compress_intermediate_files") as stage:
+                    compressed_files = self.step_3_compress_intermediate_files(intermediate_files)
+                    stage.records = len(compressed_files)
+                self._checkpoint_step("step_3_compress_intermediate_files", compressed_files)
+            else:
+                compressed_files = self._restore_step("step_3_compress_intermediate_files")
+            self.stats["files_created"].extend(
+                str(path) for path in compressed_files if str(path) not in self.stats["files_created"]
+            )
             
             # Step 4: Upload compressed files to CDN
-            upload_success = self.step_4_upload_compressed_files(compressed_files)
+            upload_success = True
+            if "step_4_upload_compressed_files" in pending:
+                with profiler.stage("step_4_upload_compressed_files", records=len(compressed_files)):
+                    upload_success = self.step_4_upload_compressed_files(compressed_files)
+                if upload_success:
+                    self._checkpoint_step("step_4_upload_compressed_files")
+            else:
+                self._restore_step("step_4_upload_compressed_files")
             
             # Step 5: Create document files
-            document_files = self.step_5_create_document_files(city_data, county_data)
+            if "step_5_create_document_files" in pending:
+                with profiler.stage("step_5_create_document_files", records=parcels):
+                    document_files = self.step_5_create_document_files(region_records)
+                self._checkpoint_step("step_5_create_document_files", document_files)
+            else:
+                document_files = self._restore_step("step_5_create_document_files")
+            
+            # Step 5b: Prebuild FlexSearch indexes from the document files
+            if "step_5b_prebuild_search_indexes" in pending:
+                with profiler.stage("step_5b_prebuild_search_indexes"):
+                    document_files = self.step_5b_prebuild_search_indexes(document_files)
+                self._checkpoint_step("step_5b_prebuild_search_indexes", document_files)
+            else:
+                document_files = self._restore_step("step_5b_prebuild_search_indexes")
+            self.stats["files_created"].extend(str(path) for path in document_files)
             
             # Step 6: Upload document files to public/search
-            doc_upload_success = self.step_6_upload_document_files(document_files)
+            doc_upload_success = True
+            if "step_6_upload_document_files" in pending:
+                with profiler.stage("step_6_upload_document_files", records=len(document_files)):
+                    doc_upload_success = self.step_6_upload_document_files(document_files)
+                if doc_upload_success:
+                    self._checkpoint_step("step_6_upload_document_files")
+            else:
+                self._restore_step("step_6_upload_document_files")
             
-            # Step 7: Cleanup
-            cleanup_success = self.step_7_cleanup()
+            # Step 7: Cleanup, unless a failed upload should be retried with --resume
+            if upload_success and doc_upload_success:
+                with profiler.stage("step_7_cleanup"):
+                    cleanup_success = self.step_7_cleanup()
+            else:
+                print(f"\n💾 Keeping {self.temp_dir} so --resume can retry the failed uploads")
+                cleanup_success = True
             
             # Final report
+            profiler.stop()
             self.generate_report()
             
             success = upload_success and doc_upload_success and cleanup_success
@@ -1339,9 +1930,62 @@ class DocumentModePipeline:
             
         except Exception as e:
             print(f"\n❌ Pipeline failed: {e}")
+            print(f"💾 Completed steps are checkpointed in {self.temp_dir}; rerun with --resume to continue")
             self.stats["errors"].append(f"Pipeline failure: {e}")
+            profiler.stop()
+            self.write_run_report()
             return False
     
+    def _checkpoint_step(self, step: str, outputs: List[Path] = ()):
+        self.checkpoint.mark(step, outputs, seconds=self.profiler.stages[-1]["wall_seconds"])
+    
+    def _restore_step(self, step: str) -> List[Path]:
+        """Outputs of a step completed by an earlier run"""
+        print(f"⏭️ {step}: restored from checkpoint ({self.checkpoint.steps[step]['completed_at']})")
+        return self.checkpoint.outputs(step)
+    
+    def _checkpoint_regional_data(self, region_records, region_geometry):
+        """Persist step 1's in-memory results, plus the state later steps report or save"""
+        seconds = self.profiler.stages[-1]["wall_seconds"]
+        files = [self.checkpoint.save_artifact(f"{key}-records", records) for key, records in region_records.items()]
+        files += [self.checkpoint.save_artifact(f"{key}-geometry", geometry) for key, geometry in region_geometry.items()]
+        if self.incremental is not None:
+            files.append(self.checkpoint.save_artifact("incremental-hashes", {
+                region: {"hashes": plan["hashes"], "regional_stats": plan["regional_stats"]}
+                for region, plan in self.incremental.plans.items()
+            }))
+        self.checkpoint.mark("step_1_process_regional_data", files, seconds=seconds,
+                             join_stats=self.shapefile_processor.join_stats)
+    
+    def _restore_regional_data(self, geometry: bool) -> tuple:
+        """Step 1's records (and geometry, when step 2 still has to run) from the checkpoint"""
+        self._restore_step("step_1_process_regional_data")
+        checkpoint = self.checkpoint
+        keys = [region.key for region in self.regions]
+        region_records = {key: checkpoint.load_artifact(f"{key}-records") for key in keys}
+        region_geometry = {key: checkpoint.load_artifact(f"{key}-geometry") for key in keys} if geometry else {}
+        self.shapefile_processor.join_stats = checkpoint.result("step_1_process_regional_data").get("join_stats", {})
+        if self.incremental is not None:
+            self.incremental.plans = checkpoint.load_artifact("incremental-hashes")
+        return region_records, region_geometry
+    
+    def write_run_report(self) -> Optional[Path]:
+        """Write the machine-readable JSON run report (stage timings, memory, optional profiles)"""
+        try:
+            return self.profiler.write_report(
+                self.run_report,
+                dataset_size=self.stats["dataset_size"],
+                workers=self.workers,
+                files_created=self.stats["files_created"],
+                files_uploaded=self.stats["files_uploaded"],
+                files_skipped=self.stats["files_skipped"],
+                errors=self.stats["errors"],
+                join_stats=self.shapefile_processor.join_stats
+            )
+        except OSError as e:
+            print(f"⚠️ Could not write run report: {e}")
+            return None
+    
     def generate_report(self):
         """Generate final pipeline report"""
         print("\n" + "="*60)
@@ -1354,6 +1998,13 @@ class DocumentModePipeline:
         print(f"📊 Dataset size: {self.stats['dataset_size']}")
         print(f"📁 Files created: {len(self.stats['files_created'])}")
         print(f"📤 Files uploaded: {len(self.stats['files_uploaded'])}")
+        print(f"⏭️ Files skipped (unchanged): {len(self.stats['files_skipped'])}")
+        
+        print("\n⏱️ Stage timings:")
+        self.profiler.print_summary()
+        report_path = self.write_run_report()
+        if report_path:
+            print(f"📝 Run report written to {report_path}")
         
         if self.stats["errors"]:
             print(f"\n❌ Errors encountered: {len(self.stats['errors'])}")
@@ -1380,6 +2031,120 @@ def main():
         default="",
         help="Version suffix for uploaded files"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for parallel ingest (1 = serial)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompute only parcels whose content hash changed since the previous build"
+    )
+    parser.add_argument(
+        "--stats-tolerance",
+        type=float,
+        default=0.01,
+        help="Relative regional stats shift that forces a full rebuild in incremental mode"
+    )
+    parser.add_argument(
+        "--gzip-level",
+        type=int,
+        default=6,
+        choices=range(1, 10),
+        metavar="1-9",
+        help="Gzip compression level for .json.gz artifacts"
+    )
+    parser.add_argument(
+        "--sidecar",
+        action="append",
+        choices=["zstd", "brotli"],
+        default=[],
+        help="Also pre-build a .zst or .br variant of each compressed artifact (repeatable)"
+    )
+    parser.add_argument(
+        "--compression-threads",
+        type=int,
+        default=4,
+        help="Threads for block-parallel compression"
+    )
+    parser.add_argument(
+        "--metadata-shards",
+        type=int,
+        default=0,
+        help="Also split parcel metadata into N parcel-id shards per region (0 = off)"
+    )
+    parser.add_argument(
+        "--run-report",
+        type=Path,
+        help="Path of the JSON run report (default: src/data/tmp/run-report.json)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture a cProfile of the run (top functions in the run report, full stats in <run-report>.prof)"
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Track Python heap peaks per stage and the top allocation sites (slows the run)"
+    )
+    parser.add_argument(
+        "--source-root",
+        type=Path,
+        help="Root the registry's region source_dir paths are relative to (default: src/data)"
+    )
+    parser.add_argument(
+        "--regions-file",
+        type=Path,
+        help="Region registry (JSON or YAML) declaring source files, fields, CRS and classifier (default: regions.json)"
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        dest="regions",
+        help="Only process this region key or prefix (repeatable); other regions keep their published files"
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Files uploaded at a time through each persistent uploader worker"
+    )
+    parser.add_argument(
+        "--upload-retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Retries per file for failed or timed-out uploads (exponential backoff)"
+    )
+    parser.add_argument(
+        "--no-hashed-paths",
+        action="store_false",
+        dest="hashed_paths",
+        help="Upload changed CDN files only to their stable paths, not to content-hashed paths"
+    )
+    parser.add_argument(
+        "--hashed-paths-only",
+        action="store_false",
+        dest="stable_aliases",
+        help="Upload changed CDN files only to their content-hashed paths (clients resolve cdn/upload-manifest.json)"
+    )
+    parser.add_argument(
+        "--force-upload",
+        action="store_true",
+        help="Upload every artifact even when its content hash is unchanged"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the previous run with the same settings at the first step that did not complete"
+    )
+    parser.add_argument(
+        "--from-step",
+        help="Re-run from this step (1, 2, 3, 4, 5, 5b, 6, 7), restoring earlier steps from their checkpoints"
+    )
     
     args = parser.parse_args()
     
@@ -1387,9 +2152,38 @@ def main():
     print("="*50)
     print(f"📊 Dataset size: {args.dataset_size}")
     print(f"📦 Version: {args.version or 'default'}")
+    print(f"🧵 Workers: {args.workers}")
     print("="*50)
     
-    pipeline = DocumentModePipeline(dataset_size=args.dataset_size, version=args.version)
+    try:
+        pipeline = DocumentModePipeline(
+            dataset_size=args.dataset_size,
+            version=args.version,
+            workers=args.workers,
+            incremental=args.incremental,
+            stats_tolerance=args.stats_tolerance,
+            compression=CompressionSettings(
+                gzip_level=args.gzip_level,
+                sidecars=args.sidecar,
+                workers=args.compression_threads
+            ),
+            metadata_shards=args.metadata_shards,
+            profiler=StageProfiler(cprofile=args.profile, tracemalloc=args.tracemalloc),
+            run_report=args.run_report,
+            source_root=args.source_root,
+            regions_file=args.regions_file,
+            regions=args.regions,
+            upload_concurrency=args.upload_concurrency,
+            upload_retries=args.upload_retries,
+            hashed_paths=args.hashed_paths,
+            stable_aliases=args.stable_aliases,
+            force_upload=args.force_upload,
+            resume=args.resume,
+            from_step=args.from_step
+        )
+    except CheckpointError as e:
+        print(f"❌ {e}")
+        return 1
     success = pipeline.run_pipeline()
     
     return 0 if success else 1
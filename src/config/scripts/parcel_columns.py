@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Binary columnar parcel metadata ({region}-parcel_metadata.bin)
+
+A compact companion to {region}-parcel_metadata.json.gz carrying only the
+fields transformRawParcelData (parcelMetadata.ts) reads. Rows are sorted by
+parcel id, so a reader can binary-search one parcel with a handful of small
+seeks instead of downloading and parsing the whole region.
+
+Layout (little-endian):
+  8 bytes   magic b"PCLMETA1"
+  4 bytes   u32 directory length D
+  D bytes   UTF-8 JSON directory: row count, column offsets/dtypes,
+            string table offsets, region metadata
+  ...       8-byte aligned sections:
+            - one contiguous array per column (f8 numbers, u4 string refs)
+            - string table: u8 offsets[count + 1] and a UTF-8 blob
+
+String columns hold an index into the deduplicated string table;
+0xFFFFFFFF marks null (e.g. a missing owner name). Numbers keep NaN.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+MAGIC = b"PCLMETA1"
+FORMAT_VERSION = 1
+NULL_STRING = 0xFFFFFFFF
+
+# (column, record path) for every field transformRawParcelData uses
+STRING_COLUMNS = [
+    ("id", ("id",)),
+    ("primary_full_address", ("primary_full_address",)),
+    ("region", ("region",)),
+    ("property_type", ("calc", "property_type")),
+    ("owner_name", ("owner", "name")),
+]
+NUMBER_COLUMNS = [
+    ("latitude", ("latitude",)),
+    ("longitude", ("longitude",)),
+    ("landarea_sqft", ("calc", "landarea_sqft")),
+    ("building_sqft", ("calc", "building_sqft")),
+    ("estimated_landscapable_area_sqft", ("calc", "estimated_landscapable_area_sqft")),
+    ("affluence_score", ("affluence_score",)),
+]
+
+
+def _lookup(entry: Dict[str, Any], path: tuple):
+    value = entry
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _as_number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def write_parcel_columns(path: Path, entries: Iterable[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None) -> int:
+    """Write parcel_metadata entries (the values of the "parcels" object) as a columnar file
+
+    Duplicate ids keep the last entry, like the JSON object they mirror.
+    Returns the number of rows written.
+    """
+    strings: Dict[str, int] = {}
+    string_values: List[str] = []
+
+    def intern(value) -> int:
+        if not isinstance(value, str):
+            return NULL_STRING
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(string_values)
+            string_values.append(value)
+        return index
+
+    rows: Dict[str, tuple] = {}
+    for entry in entries:
+        parcel_id = str(entry["id"])
+        rows[parcel_id] = (
+            [intern(_lookup(entry, column_path)) for _, column_path in STRING_COLUMNS[1:]],
+            [_as_number(_lookup(entry, column_path)) for _, column_path in NUMBER_COLUMNS]
+        )
+
+    ordered_ids = sorted(rows)
+    count = len(ordered_ids)
+    columns: Dict[str, np.ndarray] = {"id": np.array([intern(parcel_id) for parcel_id in ordered_ids], dtype="<u4")}
+    string_refs = np.array([rows[parcel_id][0] for parcel_id in ordered_ids], dtype="<u4").reshape(count, len(STRING_COLUMNS) - 1)
+    numbers = np.array([rows[parcel_id][1] for parcel_id in ordered_ids], dtype="<f8").reshape(count, len(NUMBER_COLUMNS))
+    for i, (name, _) in enumerate(STRING_COLUMNS[1:]):
+        columns[name] = np.ascontiguousarray(string_refs[:, i])
+    for i, (name, _) in enumerate(NUMBER_COLUMNS):
+        columns[name] = np.ascontiguousarray(numbers[:, i])
+
+    encoded = [value.encode("utf-8") for value in string_values]
+    string_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(blob) for blob in encoded], out=string_offsets[1:])
+    blob = b"".join(encoded)
+
+    # Sections follow the directory; offsets are resolved in a second pass
+    sections = [(name, array.tobytes()) for name, array in columns.items()]
+    sections.append(("__string_offsets", string_offsets.tobytes()))
+    sections.append(("__string_blob", blob))
+
+    def build_directory(offsets: Dict[str, int]) -> bytes:
+        directory = {
+            "version": FORMAT_VERSION,
+            "rows": count,
+            "columns": {
+                name: {"offset": offsets.get(name, 0), "dtype": array.dtype.str}
+                for name, array in columns.items()
+            },
+            "strings": {
+                "count": len(encoded),
+                "offsets": offsets.get("__string_offsets", 0),
+                "blob": offsets.get("__string_blob", 0),
+                "blob_length": len(blob)
+            },
+            "metadata": metadata or {}
+        }
+        return json.dumps(directory, separators=(',', ':')).encode("utf-8")
+
+    def layout(directory_length: int) -> Dict[str, int]:
+        position = len(MAGIC) + 4 + directory_length
+        offsets = {}
+        for name, data in sections:
+            position += -position % 8
+            offsets[name] = position
+            position += len(data)
+        return offsets
+
+    # Directory size depends on the offsets it contains; iterate to a fixed point
+    directory = build_directory({})
+    while True:
+        offsets = layout(len(directory))
+        candidate = build_directory(offsets)
+        if len(candidate) == len(directory):
+            directory = candidate
+            break
+        directory = candidate
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(directory)))
+        f.write(directory)
+        for name, data in sections:
+            f.write(b"\x00" * (offsets[name] - f.tell()))
+            f.write(data)
+
+    return count
+
+
+class ParcelColumnReader:
+    """Random-access reader for {region}-parcel_metadata.bin
+
+    get() binary-searches the sorted id column with small seeks and reads one
+    row; load_columns() maps every column for bulk access.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.file = open(self.path, 'rb')
+        magic = self.file.read(len(MAGIC))
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError(f"Not a parcel column file: {self.path}")
+        (directory_length,) = struct.unpack("<I", self.file.read(4))
+        self.directory = json.loads(self.file.read(directory_length))
+        if self.directory.get("version") != FORMAT_VERSION:
+            self.file.close()
+            raise ValueError(f"Unsupported parcel column version: {self.directory.get('version')}")
+        self.rows = self.directory["rows"]
+        self.metadata = self.directory.get("metadata", {})
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _read_value(self, column: str, row: int):
+        spec = self.directory["columns"][column]
+        dtype = np.dtype(spec["dtype"])
+        self.file.seek(spec["offset"] + row * dtype.itemsize)
+        return np.frombuffer(self.file.read(dtype.itemsize), dtype=dtype)[0]
+
+    def _read_string(self, index: int) -> Optional[str]:
+        if index == NULL_STRING:
+            return None
+        strings = self.directory["strings"]
+        self.file.seek(strings["offsets"] + index * 8)
+        start, end = struct.unpack("<QQ", self.file.read(16))
+        self.file.seek(strings["blob"] + start)
+        return self.file.read(end - start).decode("utf-8")
+
+    def _find_row(self, parcel_id: str) -> Optional[int]:
+        low, high = 0, self.rows
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._read_string(int(self._read_value("id", middle)))
+            if candidate < parcel_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.rows and self._read_string(int(self._read_value("id", low))) == parcel_id:
+            return low
+        return None
+
+    def _row_entry(self, row: int) -> Dict[str, Any]:
+        strings = {name: self._read_string(int(self._read_value(name, row))) for name, _ in STRING_COLUMNS}
+        numbers = {name: float(self._read_value(name, row)) for name, _ in NUMBER_COLUMNS}
+        return {
+            "id": strings["id"],
+            "primary_full_address": strings["primary_full_address"],
+            "latitude": numbers["latitude"],
+            "longitude": numbers["longitude"],
+            "region": strings["region"],
+            "calc": {
+                "landarea_sqft": numbers["landarea_sqft"],
+                "building_sqft": numbers["building_sqft"],
+                "estimated_landscapable_area_sqft": numbers["estimated_landscapable_area_sqft"],
+                "property_type": strings["property_type"]
+            },
+            "owner": {"name": strings["owner_name"]},
+            "affluence_score": numbers["affluence_score"]
+        }
+
+    def get(self, parcel_id: str) -> Optional[Dict[str, Any]]:
+        """Look up one parcel in the RawParcelData shape, or None"""
+        row = self._find_row(str(parcel_id))
+        return self._row_entry(row) if row is not None else None
+
+    def load_columns(self) -> Dict[str, Any]:
+        """Memory-map every column; string columns are decoded to Python lists"""
+        mapped = np.memmap(self.path, dtype=np.uint8, mode="r")
+        strings = self.directory["strings"]
+        offsets = np.frombuffer(mapped, dtype="<u8", count=strings["count"] + 1, offset=strings["offsets"])
+        blob = mapped[strings["blob"]:strings["blob"] + strings["blob_length"]].tobytes()
+        table = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(strings["count"])]
+
+        columns = {}
+        for name, spec in self.directory["columns"].items():
+            values = np.frombuffer(mapped, dtype=np.dtype(spec["dtype"]), count=self.rows, offset=spec["offset"])
+            if name in dict(STRING_COLUMNS):
+                columns[name] = [table[index] if index != NULL_STRING else None for index in values.tolist()]
+            else:
+                columns[name] = values
+        return columns
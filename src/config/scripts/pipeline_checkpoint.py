@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Step checkpoints for resumable Document Mode pipeline runs
+
+After each pipeline step succeeds, its outputs are recorded in
+{temp_dir}/checkpoint.json:
+
+  {"version": 1, "fingerprint": {...}, "steps": {
+      "step_2_create_intermediate_files": {
+          "completed_at": "...", "seconds": 12.3, "outputs": ["/.../stl_city-address_index.json", ...]}}}
+
+Step 1 only produces in-memory results, so the parcel records and geometry
+of every region (plus the incremental hashes step 2 saves) are pickled under
+{temp_dir}/checkpoints/; pickle round-trips the records exactly and is about
+15x faster to write than JSON. Only this pipeline reads them back, from its
+own temp dir. The later steps' artifacts are the intermediate, compressed and
+document files they already write.
+
+A resumed run (`--resume`) starts at the first step without a checkpoint
+whose outputs all still exist and re-runs every step after it; `--from-step`
+picks the step explicitly, provided every earlier step has a checkpoint.
+Checkpoints are tied to a fingerprint of the run's settings and source files,
+so a run with different settings or changed shapefiles starts over.
+"""
+
+import json
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_VERSION = 1
+ARTIFACTS_DIR = "checkpoints"
+
+# Pipeline steps in run order
+STEPS = [
+    "step_1_process_regional_data",
+    "step_2_create_intermediate_files",
+    "step_3_compress_intermediate_files",
+    "step_4_upload_compressed_files",
+    "step_5_create_document_files",
+    "step_5b_prebuild_search_indexes",
+    "step_6_upload_document_files",
+    "step_7_cleanup",
+]
+
+
+class CheckpointError(ValueError):
+    """A requested resume point that the checkpoint cannot serve"""
+
+
+def step_name(value: str) -> str:
+    """Full step name from "4", "5b", "step_4" or the full name"""
+    value = str(value).strip().lower()
+    for step in STEPS:
+        number = step.split("_")[1]
+        if value in (step, number, f"step_{number}"):
+            return step
+    raise CheckpointError(f"Unknown step {value!r}; expected one of {', '.join(step.split('_')[1] for step in STEPS)}")
+
+
+def source_fingerprint(directories: Iterable[Path]) -> List[List[Any]]:
+    """Name, size and mtime of every file in the source directories"""
+    files = []
+    for directory in directories:
+        directory = Path(directory)
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            if path.is_file():
+                stat = path.stat()
+                files.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return files
+
+
+class PipelineCheckpoint:
+    """Completed steps of one pipeline run, with their persisted outputs"""
+
+    def __init__(self, directory: Path, fingerprint: Dict[str, Any]):
+        self.directory = Path(directory)
+        self.path = self.directory / CHECKPOINT_NAME
+        self.artifacts_dir = self.directory / ARTIFACTS_DIR
+        # Round-trip through JSON so it compares equal to a loaded fingerprint
+        self.fingerprint = json.loads(json.dumps(fingerprint, default=str))
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> bool:
+        """Load a previous run's checkpoint; False when missing or from another configuration"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("fingerprint") != self.fingerprint:
+            return False
+        self.steps = checkpoint.get("steps", {})
+        return True
+
+    def completed(self, step: str) -> bool:
+        entry = self.steps.get(step)
+        return entry is not None and all(Path(path).exists() for path in entry["outputs"])
+
+    def resume_step(self, from_step: Optional[str] = None) -> str:
+        """First step to run: from_step, or the first step without a usable checkpoint"""
+        if from_step is not None:
+            step = step_name(from_step)
+            missing = [earlier for earlier in STEPS[:STEPS.index(step)] if not self.completed(earlier)]
+            if missing:
+                raise CheckpointError(f"Cannot start at {step}: no checkpoint for {', '.join(missing)}")
+            return step
+        return next((step for step in STEPS if not self.completed(step)), STEPS[-1])
+
+    def outputs(self, step: str) -> List[Path]:
+        return [Path(path) for path in self.steps[step]["outputs"]]
+
+    def result(self, step: str) -> Dict[str, Any]:
+        return self.steps[step].get("result", {})
+
+    def mark(self, step: str, outputs: Iterable[Path] = (), seconds: Optional[float] = None, **result):
+        """Record a successful step and save the checkpoint"""
+        self.steps[step] = {
+            "completed_at": datetime.now().isoformat(),
+            "seconds": seconds,
+            "outputs": [str(path) for path in outputs],
+            "result": result,
+        }
+        self.save()
+
+    def discard_from(self, step: str):
+        """Forget step and every later step (they are about to run again)"""
+        for later in STEPS[STEPS.index(step):]:
+            self.steps.pop(later, None)
+        self.save()
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "steps": self.steps}, f, indent=2)
+        os.replace(partial, self.path)
+
+    def save_artifact(self, name: str, value: Any) -> Path:
+        """Pickle an artifact under the checkpoint directory; returns its file"""
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        path = self.artifacts_dir / f"{name}.pkl"
+        partial = path.with_name(path.name + ".tmp")
+        with open(partial, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        return path
+
+    def load_artifact(self, name: str) -> Any:
+        with open(self.artifacts_dir / f"{name}.pkl", 'rb') as f:
+            return pickle.load(f)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Single-pass CRS projection plan for region frames
+
+The region processors used to keep a full copy of the merged frame, project
+it to UTM for area and centroids, project the copy again to WGS84 for output
+geometry, and wrap the UTM centroids in a third GeoDataFrame to reproject
+them. project_region transforms the source coordinates into one buffer per
+target CRS and builds exactly one geometry array per CRS:
+
+  source CRS -> EPSG:26915  area (sq ft) and centroids, kept on the frame
+  source CRS -> EPSG:4326   output geometry
+  EPSG:26915 -> EPSG:4326   centroid points only
+
+Transforms use the same pyproj transformer GeoDataFrame.to_crs builds
+(always_xy), so every coordinate is bit-identical to the old to_crs chain.
+"""
+
+from typing import List, Optional
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+
+PROJECTED_EPSG = 26915  # UTM Zone 15N
+OUTPUT_EPSG = 4326
+SQ_FT_PER_SQ_M = 10.7639
+
+
+def transform_geometries(geometries: np.ndarray, transformers: List[Optional[Transformer]]) -> List[np.ndarray]:
+    """Transform one geometry array into several CRSs, one coordinate buffer per target
+
+    Each target's buffer is filled from the source geometries, transformed
+    in place and handed to set_coordinates, then released before the next
+    target, so no intermediate x/y tuples or stacked copies are held.
+
+    Args:
+        geometries: Object array of shapely geometries
+        transformers: One always_xy Transformer per target; None returns the input geometries
+
+    Returns:
+        One geometry array per transformer
+    """
+    has_z = shapely.has_z(geometries)
+    results = []
+    for transformer in transformers:
+        if transformer is None:
+            results.append(geometries)
+            continue
+        result = np.empty_like(geometries)
+        for mask, include_z in ((~has_z, False), (has_z, True)):
+            if not mask.any():
+                continue
+            subset = geometries[mask]
+            # Fortran order keeps each axis contiguous for the in-place transform
+            buffer = np.asfortranarray(shapely.get_coordinates(subset, include_z=include_z))
+            transformer.transform(*(buffer[:, axis] for axis in range(buffer.shape[1])), inplace=True)
+            result[mask] = shapely.set_coordinates(subset.copy(), buffer)
+            del buffer
+        results.append(result)
+    return results
+
+
+def project_region(gdf: gpd.GeoDataFrame, projected_epsg: int = PROJECTED_EPSG,
+                   output_epsg: int = OUTPUT_EPSG) -> tuple:
+    """Project a region frame for area/centroids and output geometry in one pass
+
+    The frame's geometry is replaced in place by its projected geometry and a
+    `landarea` column (sq ft) is added, so no second copy of the attributes is
+    kept.
+
+    Args:
+        gdf: Region GeoDataFrame with a CRS
+        projected_epsg: Metric CRS for area and centroids
+        output_epsg: CRS of output geometry and centroids
+
+    Returns:
+        (projected gdf, geometry-only output GeoDataFrame, output centroid GeoSeries),
+        positionally aligned
+    """
+    source_crs = gdf.crs
+    projected_crs = CRS.from_epsg(projected_epsg)
+    output_crs = CRS.from_epsg(output_epsg)
+
+    to_projected = None if source_crs.is_exact_same(projected_crs) else \
+        Transformer.from_crs(source_crs, projected_crs, always_xy=True)
+    # Output geometry is left untouched when the source already identifies as the output CRS
+    to_output = None if source_crs.to_epsg() == output_epsg else \
+        Transformer.from_crs(source_crs, output_crs, always_xy=True)
+
+    source = np.asarray(gdf.geometry.array)
+    projected, output = transform_geometries(source, [to_projected, to_output])
+    del source
+
+    gdf[gdf.geometry.name] = gpd.GeoSeries(projected, index=gdf.index, crs=projected_crs)
+    gdf["landarea"] = shapely.area(projected) * SQ_FT_PER_SQ_M
+
+    centroid_transformer = None if projected_crs.is_exact_same(output_crs) else \
+        Transformer.from_crs(projected_crs, output_crs, always_xy=True)
+    (centroids,) = transform_geometries(shapely.centroid(projected), [centroid_transformer])
+
+    output_gdf = gpd.GeoDataFrame(
+        geometry=gpd.GeoSeries(output, index=gdf.index, crs=output_crs if to_output else source_crs)
+    )
+    return gdf, output_gdf, gpd.GeoSeries(centroids, index=gdf.index, crs=output_crs)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Region registry for the ingest pipeline
+
+Every region the pipeline ingests is declared in regions.json (or a YAML
+file with the same structure, given with --regions-file):
+
+  key          Short region key used for stage names and incremental manifests ("city")
+  prefix       Output file prefix ("stl_city" -> stl_city-document.json)
+  name         Display name written into the intermediate files
+  source_dir   Directory of the source files, relative to the source root (or absolute)
+  files        Source files by kind; "shp" is required, every listed file must exist
+  joins        File kinds ("dbf", "csv") merged onto the shapefile by parcel id,
+               followed by one-row-per-parcel deduplication
+  crs          EPSG code assumed when the shapefile has no .prj
+  fields       Field mapping (assessment, building, owner, address, parcel_id, property_class);
+               only these columns are loaded from the source files
+  dtypes       Optional dtype per column ("category", "float32", "str"), see attribute_loader.py
+  classifier   Ordered rules {"type", "codes", "prefixes"} and a default property type
+  addresses    Address format ("street" or "municipality") and its defaults
+  owner        Owner fields copied into each record, in order
+  bounds       Optional WGS84 box {lat_min, lat_max, lng_min, lng_max} the region's parcels
+               fall in; validate_geometries reports parcels outside it
+
+Adding a neighboring county is a new entry in the registry; the generic
+ShapefileProcessor.process_region handles it with no code changes as long
+as it uses one of the address formats.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from attribute_loader import DTYPES
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_REGISTRY = Path(__file__).parent / "regions.json"
+# Default root holding each region's source_dir: /src/data
+DEFAULT_SOURCE_ROOT = Path(__file__).parent.parent.parent / "data"
+
+ADDRESS_FORMATS = ("street", "municipality")
+JOINABLE_FILES = ("dbf", "csv")
+BOUNDS_KEYS = ("lat_min", "lat_max", "lng_min", "lng_max")
+
+
+class RegionSpec:
+    """One region's source files, field mapping, CRS, classifier and address rules"""
+
+    def __init__(self, key: str, prefix: str, name: str, source_dir: str, files: Dict[str, str],
+                 crs: int, fields: Dict[str, Any], joins: Optional[List[str]] = None,
+                 classifier: Optional[Dict[str, Any]] = None, addresses: Optional[Dict[str, Any]] = None,
+                 owner: Optional[List[str]] = None, dtypes: Optional[Dict[str, str]] = None,
+                 bounds: Optional[Dict[str, float]] = None):
+        self.key = key
+        self.prefix = prefix
+        self.name = name
+        self.source_dir = source_dir
+        self.files = dict(files)
+        self.crs = int(crs)
+        self.fields = fields
+        self.joins = list(joins or [])
+        classifier = classifier or {}
+        self.rules = [
+            {"type": rule["type"], "codes": list(rule.get("codes", [])), "prefixes": list(rule.get("prefixes", []))}
+            for rule in classifier.get("rules", [])
+        ]
+        self.default_type = classifier.get("default", "other")
+        self.addresses = dict(addresses or {"format": "street"})
+        self.owner = list(owner or ["name"])
+        self.dtypes = dict(dtypes or {})
+        self.bounds = None
+
+        if "shp" not in self.files:
+            raise ValueError(f"Region {key}: 'files' needs a shapefile ('shp')")
+        if "parcel_id" not in self.fields:
+            raise ValueError(f"Region {key}: 'fields' needs a parcel_id column")
+        for kind in self.joins:
+            if kind not in JOINABLE_FILES or kind not in self.files:
+                raise ValueError(f"Region {key}: cannot join '{kind}' (joinable files: {', '.join(JOINABLE_FILES)})")
+        for column, dtype in self.dtypes.items():
+            if dtype not in DTYPES:
+                raise ValueError(f"Region {key}: unsupported dtype {dtype!r} for {column}")
+        if self.addresses.get("format") not in ADDRESS_FORMATS:
+            raise ValueError(f"Region {key}: unknown address format {self.addresses.get('format')!r}")
+        if bounds:
+            missing = [side for side in BOUNDS_KEYS if side not in bounds]
+            if missing:
+                raise ValueError(f"Region {key}: bounds need {', '.join(missing)}")
+            self.bounds = {side: float(bounds[side]) for side in BOUNDS_KEYS}
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "RegionSpec":
+        try:
+            return cls(**entry)
+        except TypeError as e:
+            raise ValueError(f"Invalid region entry {entry.get('key', '?')}: {e}") from e
+
+    def source_path(self, source_root: Path) -> Path:
+        return Path(source_root) / self.source_dir
+
+    def file_paths(self, source_root: Path) -> Dict[str, Path]:
+        base_dir = self.source_path(source_root)
+        return {kind: base_dir / name for kind, name in self.files.items()}
+
+    def classify(self, code: str) -> str:
+        """Property type of one normalized (stripped, upper-case) class code"""
+        for rule in self.rules:
+            if code in rule["codes"] or code.startswith(tuple(rule["prefixes"])):
+                return rule["type"]
+        return self.default_type
+
+    def classify_column(self, codes: pd.Series) -> np.ndarray:
+        """Vectorized classify over a Series of normalized class codes"""
+        conditions = []
+        for rule in self.rules:
+            condition = codes.isin(rule["codes"]).to_numpy(dtype=bool)
+            if rule["prefixes"]:
+                condition = condition | codes.str.startswith(tuple(rule["prefixes"])).to_numpy(dtype=bool)
+            conditions.append(condition)
+        if not conditions:
+            return np.full(len(codes), self.default_type, dtype=object)
+        return np.select(conditions, [rule["type"] for rule in self.rules], default=self.default_type).astype(object)
+
+
+def load_regions(path: Optional[Path] = None) -> List[RegionSpec]:
+    """Region specs from a JSON or YAML registry, in file order"""
+    path = Path(path) if path else DEFAULT_REGISTRY
+    with open(path, encoding='utf-8') as f:
+        if path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise ImportError("YAML region registries require the 'PyYAML' package")
+            registry = yaml.safe_load(f)
+        else:
+            registry = json.load(f)
+
+    regions = [RegionSpec.from_dict(entry) for entry in registry.get("regions", [])]
+    for attribute in ("key", "prefix"):
+        values = [getattr(region, attribute) for region in regions]
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate region {attribute}s in {path}: {', '.join(duplicates)}")
+    return regions
+
+
+def select_regions(regions: List[RegionSpec], keys: Optional[List[str]] = None) -> List[RegionSpec]:
+    """Registry regions whose key or prefix is in keys (all when keys is empty), in registry order"""
+    if not keys:
+        return list(regions)
+    known = {region.key for region in regions} | {region.prefix for region in regions}
+    unknown = [key for key in keys if key not in known]
+    if unknown:
+        raise ValueError(f"Unknown region(s): {', '.join(unknown)}")
+    return [region for region in regions if region.key in keys or region.prefix in keys]
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Stage timing and memory profiler for the ingest pipeline
+
+    profiler = StageProfiler()
+    with profiler.stage("city.read_file") as stage:
+        gdf = gpd.read_file(path)
+        stage.records = len(gdf)
+    profiler.write_report(path)
+
+Every stage records:
+  wall_seconds        perf_counter time
+  cpu_seconds         CPU time of this process (all threads)
+  child_cpu_seconds   CPU time of reaped child processes (node uploads, index builds)
+  rss_delta_mb        resident set size at the end minus at the start
+  peak_rss_delta_mb   highest RSS reached during the stage minus RSS at its start
+  records, records_per_second, bytes, mb_per_second (when the caller sets them)
+
+Stages nest per thread; each entry names its parent. Stages running
+concurrently in other threads (parallel regions) are measured on the same
+process-wide counters, so their CPU and memory figures overlap.
+
+Peak RSS: on Linux the kernel's high-water mark (VmHWM) is reset through
+/proc/self/clear_refs whenever a stage starts, after folding the current
+peak into every open stage, so each stage sees its own peak. Elsewhere the
+ru_maxrss high-water mark is used, and a stage only shows growth of the
+process-wide peak.
+
+Optional captures:
+  cprofile=True     cProfile of the thread that calls start(); top functions
+                    go into the report and full stats next to it (.prof)
+  tracemalloc=True  Python heap peak per stage (python_peak_mb) plus the top
+                    allocation sites
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc as tracemalloc_module
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def _read_rss() -> tuple:
+    """(current RSS, peak RSS) in bytes"""
+    try:
+        values = {}
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                key, value = line.split(":", 1)
+                values[key] = int(value.split()[0]) * 1024
+        return values["VmRSS"], values["VmHWM"]
+    except (OSError, KeyError, ValueError):
+        pass
+    if resource is None:
+        return 0, 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    peak = peak if sys.platform == "darwin" else peak * 1024
+    return peak, peak
+
+
+def _child_cpu() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class Stage:
+    """One measured pipeline step or sub-phase; callers may set records and bytes"""
+
+    def __init__(self, name: str, parent: Optional[str], records: Optional[int] = None):
+        self.name = name
+        self.parent = parent
+        self.records = records
+        self.bytes = None
+        self.thread = threading.current_thread().name
+        self.error = None
+        self.started_at = time.perf_counter()
+        self._cpu = time.process_time()
+        self._child_cpu = _child_cpu()
+        # Set by StageProfiler.stage once the peak counters are reset
+        self._rss = self._baseline = self._peak = 0
+        self._python_peak = 0
+        self.result = {}
+
+    def finish(self, run_started: float):
+        wall = time.perf_counter() - self.started_at
+        rss, _ = _read_rss()
+        self.result = {
+            "name": self.name,
+            "parent": self.parent,
+            "thread": self.thread,
+            "start_offset_seconds": self.started_at - run_started,
+            "wall_seconds": wall,
+            "cpu_seconds": time.process_time() - self._cpu,
+            "child_cpu_seconds": _child_cpu() - self._child_cpu,
+            "rss_delta_mb": (rss - self._rss) / MB,
+            "peak_rss_delta_mb": max(0, self._peak - self._baseline) / MB,
+            "records": self.records,
+            "records_per_second": self.records / wall if self.records is not None and wall > 0 else None,
+            "bytes": self.bytes,
+            "mb_per_second": self.bytes / MB / wall if self.bytes is not None and wall > 0 else None,
+        }
+        if tracemalloc_module.is_tracing():
+            self.result["python_peak_mb"] = self._python_peak / MB
+        if self.error:
+            self.result["error"] = self.error
+        return self.result
+
+
+class StageProfiler:
+    """Collects Stage measurements for one pipeline run"""
+
+    def __init__(self, cprofile: bool = False, tracemalloc: bool = False):
+        self.cprofile = cprofile
+        self.tracemalloc = tracemalloc
+        self.started_at = time.perf_counter()
+        self.started = datetime.now()
+        self.stages: List[Dict[str, Any]] = []
+        self._open: List[Stage] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profile = None
+        self._can_reset_peak = _PROC_CLEAR_REFS.exists()
+        self._allocations = []
+
+    def start(self):
+        """Begin the optional cProfile / tracemalloc captures"""
+        if self.tracemalloc and not tracemalloc_module.is_tracing():
+            tracemalloc_module.start()
+        if self.cprofile and self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """End the optional captures (their results stay available for the report)"""
+        if self._profile is not None:
+            self._profile.disable()
+        if tracemalloc_module.is_tracing() and self.tracemalloc:
+            snapshot = tracemalloc_module.take_snapshot()
+            self._allocations = [
+                {"location": str(stat.traceback), "size_mb": stat.size / MB, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            ]
+            tracemalloc_module.stop()
+
+    @contextmanager
+    def stage(self, name: str, records: Optional[int] = None):
+        """Measure the enclosed block as one stage"""
+        stack = self._stack()
+        stage = Stage(name, stack[-1].name if stack else None, records)
+        with self._lock:
+            self._fold_peaks()
+            self._open.append(stage)
+            self._reset_peaks()
+            # Without a reset the high-water mark at the start is the baseline
+            stage._rss, stage._baseline = _read_rss()
+            stage._peak = stage._baseline
+        stack.append(stage)
+        try:
+            yield stage
+        except BaseException as e:
+            stage.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            with self._lock:
+                self._fold_peaks()
+                self._open.remove(stage)
+                self.stages.append(stage.finish(self.started_at))
+
+    def _stack(self) -> List[Stage]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _fold_peaks(self):
+        """Fold the current high-water marks into every open stage"""
+        if not self._open:
+            return
+        _, peak = _read_rss()
+        python_peak = tracemalloc_module.get_traced_memory()[1] if tracemalloc_module.is_tracing() else 0
+        for stage in self._open:
+            stage._peak = max(stage._peak, peak)
+            stage._python_peak = max(stage._python_peak, python_peak)
+
+    def _reset_peaks(self):
+        if self._can_reset_peak:
+            try:
+                # "5" resets the peak RSS counter (VmHWM) of this process
+                _PROC_CLEAR_REFS.write_text("5")
+            except OSError:
+                self._can_reset_peak = False
+        if tracemalloc_module.is_tracing():
+            tracemalloc_module.reset_peak()
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> list:
+        """cProfile entries sorted by cumulative time"""
+        if self._profile is None:
+            return []
+        stats = pstats.Stats(self._profile).stats
+        entries = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{Path(filename).name}:{line}({function})",
+                "calls": calls,
+                "tottime": tottime,
+                "cumtime": cumtime
+            }
+            for (filename, line, function), (_, calls, tottime, cumtime, _) in entries
+        ]
+
+    def report(self, **metadata) -> Dict[str, Any]:
+        """Machine-readable run report: metadata, stages in start order and optional captures"""
+        _, peak = _read_rss()
+        report = {
+            "started_at": self.started.isoformat(),
+            "wall_seconds": time.perf_counter() - self.started_at,
+            "cpu_seconds": time.process_time(),
+            "peak_rss_mb": peak / MB,
+            **metadata,
+            "stages": sorted(self.stages, key=lambda stage: stage["start_offset_seconds"]),
+        }
+        if self.cprofile:
+            report["cprofile_top"] = self.top_functions()
+        if self.tracemalloc:
+            report["tracemalloc_top"] = self._allocations
+        return report
+
+    def write_report(self, path: Path, **metadata) -> Path:
+        """Write report() as JSON, plus the raw cProfile stats as <path>.prof when captured"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**metadata), f, indent=2, default=str)
+        if self._profile is not None:
+            self._profile.dump_stats(str(path.with_suffix(".prof")))
+        return path
+
+    def print_summary(self, max_depth: int = 1):
+        """Print top-level stages and their direct sub-phases"""
+        depths = {}
+        for stage in sorted(self.stages, key=lambda stage: stage["start_offset_seconds"]):
+            depth = depths[stage["name"]] = depths.get(stage["parent"], -1) + 1 if stage["parent"] else 0
+            if depth > max_depth:
+                continue
+            rate = f"  {stage['records_per_second']:>10,.0f} rec/s" if stage["records_per_second"] else ""
+            print(f"   {'  ' * depth}{stage['name']:<{40 - 2 * depth}} {stage['wall_seconds']:>8.2f} s wall "
+                  f"{stage['cpu_seconds']:>8.2f} s cpu  peak +{stage['peak_rss_delta_mb']:>7.1f} MB{rate}")
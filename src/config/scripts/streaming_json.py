@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON writers and readers for pipeline output files
+
+Write the pipeline's JSON files one entry at a time instead of building the
+whole structure in memory and calling json.dump on it. The bytes produced are
+identical to json.dump(..., separators=(',', ':')) on the equivalent
+in-memory structure, so readers such as parcelMetadata.ts are unaffected:
+
+  write_json_envelope(path, "parcels", pairs, metadata)
+      {"parcels":{"<id>":{...},...},"metadata":{...}}
+  write_json_envelope(path, "addresses", values, metadata, keyed=False)
+      {"addresses":[{...},...],"metadata":{...}}
+  write_json_array(path, values)
+      [{...},...]
+
+Items may come from a generator, so peak memory is one entry plus the file
+buffer. The metadata callable receives the final item count because the
+envelope writes "metadata" after the collection. An optional hashlib digest
+is fed the collection text as it is written, so the metadata callable can
+tell whether the entries changed since the last build (build_times.py).
+
+An optional opener returns the binary stream to write to instead of a plain
+file, e.g. artifact_compression's CompressedTee for compress-on-write.
+
+iter_json_envelope reads such an envelope back one collection entry at a
+time, from the raw file or its .gz, holding one read chunk plus one entry in
+memory instead of the json.load'ed whole:
+
+  for parcel_id, geometry in iter_json_envelope(path, "geometries"): ...
+
+Entries are decoded with json's C scanner (JSONDecoder.raw_decode) over a
+sliding text buffer. Any JSON envelope layout parses (whitespace, key order),
+not only the writers' own.
+
+iter_json_envelope_chunks splits a collection into raw JSON text of whole
+entries without decoding them, so other processes can decode and consume
+the chunks in parallel (iter_json_chunk). Entry boundaries are the
+collection's top-level commas, found with a vectorized bracket-depth and
+string scan over each buffer.
+"""
+
+import gc
+import gzip
+import io
+import json
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Compact separators, matching the pipeline's json.dump calls
+_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+WRITE_BUFFER_BYTES = 1 << 20
+READ_CHUNK_CHARS = 1 << 20
+# Raw collection text per iter_json_envelope_chunks chunk
+ENTRY_CHUNK_CHARS = 1 << 22
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _open_text(path: Path, opener: Optional[Callable[[Path], BinaryIO]]):
+    if opener is None:
+        return open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_BYTES)
+    return io.TextIOWrapper(io.BufferedWriter(opener(path), WRITE_BUFFER_BYTES), encoding='utf-8')
+
+
+def _write_items(f, items: Iterable, keyed: bool, digest=None) -> int:
+    """Write comma-separated collection items (and feed them to digest); returns the item count"""
+    encode = _ENCODER.encode
+    count = 0
+    for item in items:
+        if keyed:
+            key, value = item
+            text = f"{',' if count else ''}{encode(key)}:{encode(value)}"
+        else:
+            text = f"{',' if count else ''}{encode(item)}"
+        f.write(text)
+        if digest is not None:
+            digest.update(text.encode('utf-8'))
+        count += 1
+    return count
+
+
+def write_json_envelope(
+    path: Path,
+    collection: str,
+    items: Iterable,
+    metadata: Callable[[int], Dict[str, Any]],
+    keyed: bool = True,
+    opener: Optional[Callable[[Path], BinaryIO]] = None,
+    digest=None
+) -> int:
+    """Stream a {collection: ..., "metadata": ...} envelope to path
+
+    Args:
+        path: Output file
+        collection: Name of the collection key ("parcels", "geometries", "addresses")
+        items: (key, value) pairs when keyed, otherwise plain values
+        metadata: Called with the item count to build the trailing metadata object
+        keyed: Write the collection as an object (True) or an array (False)
+        opener: Optional factory for the binary output stream
+        digest: Optional hashlib object updated with the collection text
+            before metadata is called
+
+    Returns:
+        Number of items written. Duplicate keys are written as they come,
+        which JSON parsers resolve like dict assignment (last value wins).
+    """
+    with _open_text(path, opener) as f:
+        f.write('{')
+        f.write(_ENCODER.encode(collection))
+        f.write(':{' if keyed else ':[')
+        count = _write_items(f, items, keyed, digest)
+        f.write('},"metadata":' if keyed else '],"metadata":')
+        f.write(_ENCODER.encode(metadata(count)))
+        f.write('}')
+    return count
+
+
+def write_json_array(path: Path, items: Iterable, opener: Optional[Callable[[Path], BinaryIO]] = None) -> int:
+    """Stream a top-level JSON array to path; returns the item count"""
+    with _open_text(path, opener) as f:
+        f.write('[')
+        count = _write_items(f, items, keyed=False)
+        f.write(']')
+    return count
+
+
+class _Scanner:
+    """JSON tokens and values from a text stream, one read chunk at a time"""
+
+    def __init__(self, f, path: Path):
+        self.f = f
+        self.path = path
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(READ_CHUNK_CHARS)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"{self.path}: expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        while True:
+            self.peek()
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # A number ending at the buffer edge may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # At end of file the next pass returns the value or raises the real error
+            self._fill()
+
+    def items(self) -> Iterator:
+        keyed = self.peek() == "{"
+        self.expect("{" if keyed else "[")
+        closing = "}" if keyed else "]"
+        if self.peek() == closing:
+            self.pos += 1
+            return
+        while True:
+            if keyed:
+                key = self.value()
+                self.expect(":")
+                yield key, self.value()
+            else:
+                yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == closing:
+                return
+            if separator != ",":
+                raise ValueError(f"{self.path}: expected ',' or {closing!r}, found {separator or 'end of file'!r}")
+
+    def members(self) -> Iterator[str]:
+        """Keys of the object at the current position; read or skip each value before the next key"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"{self.path}: expected ',' or '}}', found {separator or 'end of file'!r}")
+
+    def chunks(self, size: int) -> Iterator[str]:
+        """Whole entries of the collection at the current position, re-bracketed, about size characters each"""
+        opening = self.peek()
+        if opening not in ("{", "["):
+            raise ValueError(f"{self.path}: expected an object or array, found {opening or 'end of file'!r}")
+        closing = "}" if opening == "{" else "]"
+        self.pos += 1
+        wanted = size
+        while True:
+            while len(self.buffer) - self.pos < wanted and self._fill():
+                pass
+            text = self.buffer[self.pos:]
+            separators, end = _top_level_structure(text)
+            if len(separators) and (end < 0 or end > size):
+                # Cut at the first entry boundary past size (or the last one in the buffer)
+                cut = int(separators[min(np.searchsorted(separators, size), len(separators) - 1)])
+                yield opening + text[:cut] + closing
+                self.pos += cut + 1
+                wanted = size
+            elif end >= 0:
+                if text[:end].strip():
+                    yield opening + text[:end] + closing
+                self.pos += end + 1
+                return
+            elif self.eof:
+                raise ValueError(f"{self.path}: collection is not closed")
+            else:
+                # One entry longer than the buffer
+                wanted = len(text) + READ_CHUNK_CHARS
+
+
+def _top_level_structure(text: str) -> Tuple[np.ndarray, int]:
+    """Offsets of the depth-0 commas in text and of the bracket closing its collection (-1 if not in text)
+
+    text starts inside a collection, between entries. Must be latin-1 text
+    (one character per byte), as iter_json_envelope_chunks reads it.
+    """
+    data = np.frombuffer(text.encode('latin-1'), dtype=np.uint8)
+    quotes = data == ord('"')
+    if (data == ord('\\')).any():
+        # A quote after an odd run of backslashes is escaped
+        for index in np.flatnonzero(quotes[1:] & (data[:-1] == ord('\\'))).tolist():
+            run = index
+            while run >= 0 and data[run] == ord('\\'):
+                run -= 1
+            if (index - run) % 2:
+                quotes[index + 1] = False
+    # Inside a string from its opening quote up to its closing one
+    outside = ~np.logical_xor.accumulate(quotes)
+    opens = ((data == ord('{')) | (data == ord('['))) & outside
+    closes = ((data == ord('}')) | (data == ord(']'))) & outside
+    depth = np.cumsum(opens.view(np.int8) - closes.view(np.int8), dtype=np.int16)
+    closed = depth < 0
+    end = int(closed.argmax()) if closed.any() else -1
+    separators = np.flatnonzero((data == ord(',')) & outside & (depth == 0))
+    if end >= 0:
+        separators = separators[separators < end]
+    return separators, end
+
+
+def open_json_text(path: Path, buffering: int = READ_CHUNK_CHARS, encoding: str = 'utf-8'):
+    """Text stream over a JSON file or its gzip-compressed variant (by the .gz suffix)"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(io.BufferedReader(gzip.open(path, 'rb'), buffering), encoding=encoding)
+    return open(path, encoding=encoding, buffering=buffering)
+
+
+@contextmanager
+def paused_gc():
+    """Pause the cyclic GC while decoding a large collection
+
+    Decoded JSON values cannot form reference cycles; with the GC on,
+    collections triggered while decoding rescan every live entry (2.5x slower
+    on parcel geometries).
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def iter_json_envelope(path: Path, collection: str) -> Iterator:
+    """Stream the entries of one collection of a {collection: ..., ...} envelope
+
+    Yields (key, value) pairs for an object collection and values for an
+    array collection, in file order (duplicate keys are yielded as they come).
+    Other top-level members, such as "metadata", are skipped.
+    """
+    with open_json_text(path) as f:
+        scanner = _Scanner(f, Path(path))
+        for key in scanner.members():
+            if key == collection:
+                yield from scanner.items()
+            else:
+                scanner.value()
+
+
+def iter_json_envelope_chunks(path: Path, collection: str, size: int = ENTRY_CHUNK_CHARS) -> Iterator[bytes]:
+    """Raw UTF-8 JSON of one collection of an envelope, whole entries at a time
+
+    Each chunk is an object (or array) holding about size bytes of
+    consecutive entries, for iter_json_chunk. Entries are not decoded here;
+    the file is read as latin-1 so offsets are bytes and any UTF-8 in it
+    passes through untouched. Members after the collection are not read.
+    """
+    with open_json_text(path, encoding='latin-1') as f:
+        scanner = _Scanner(f, Path(path))
+        for key in scanner.members():
+            if key == collection:
+                for chunk in scanner.chunks(size):
+                    yield chunk.encode('latin-1')
+                return
+            scanner.value()
+
+
+def iter_json_chunk(chunk: bytes) -> Iterator:
+    """Entries of one iter_json_envelope_chunks chunk, like iter_json_envelope yields them"""
+    return _Scanner(io.StringIO(chunk.decode('utf-8')), Path("<chunk>")).items()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Synthetic St. Louis City / County parcel datasets for offline benchmarks and tests
+
+Writes the same file layout and schemas the region processors read:
+
+  <root>/saint_louis_city/shapefiles/prcl.shp (+ .dbf/.shx/.prj)   EPSG:2815
+  <root>/saint_louis_city/shapefiles/parcels-basic-info.csv
+  <root>/saint_louis_county/shapefiles/Parcels_Current.shp (+ ...)  EPSG:26916
+
+Parcels are laid out on a jittered block grid around St. Louis. Shells have
+4 corners plus a geometric number of extra boundary vertices (median ~7,
+long tail up to MAX_VERTICES); about 1% have a courtyard hole and 3% are
+two-part MultiPolygons. Attributes follow the regions.json field mappings with
+lognormal assessments, repeated owners and street names, blank addresses,
+and (city) CSV rows repeated per HANDLE for multi-unit parcels, so the
+merge/dedup path does real work.
+
+Usage:
+  python3 synthetic_shapefiles.py --out=/tmp/stl-synthetic --parcels=100000 [--seed=7]
+"""
+
+import argparse
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+# Share of --parcels that goes to the city (roughly the real 130k / 400k split)
+CITY_SHARE = 0.25
+
+MAX_VERTICES = 150
+HOLE_SHARE = 0.01
+MULTIPART_SHARE = 0.03
+BLANK_ADDRESS_SHARE = 0.02
+MULTI_UNIT_SHARE = 0.06
+
+CELL_METERS = 40.0
+ORIGIN = (705000.0, 4265000.0)  # UTM 15N, south-west of St. Louis
+
+CITY_EPSG = 2815
+COUNTY_EPSG = 26916
+
+STREETS = [
+    "KINGSHIGHWAY", "GRAND", "GRAVOIS", "ARSENAL", "CHIPPEWA", "DELMAR", "LINDELL", "MANCHESTER",
+    "OLIVE", "NATURAL BRIDGE", "PAGE", "JEFFERSON", "BROADWAY", "FLORISSANT", "HAMPTON", "WATSON",
+    "LEMAY FERRY", "NEW HALLS FERRY", "BIG BEND", "CLAYTON", "LADUE", "MASON", "TELEGRAPH", "TESSON FERRY"
+] + [f"OAK {i}" for i in range(200)] + [f"MAPLE RIDGE {i}" for i in range(200)]
+STREET_TYPES = ["ST", "AVE", "BLVD", "RD", "DR", "LN", "CT", "PL", "WAY", "PKWY"]
+MUNICIPALITIES = ["FLORISSANT", "KIRKWOOD", "WEBSTER GROVES", "UNINCORPORATED", "UNIVERSITY CITY",
+                  "CHESTERFIELD", "BALLWIN", "CLAYTON", "LADUE", "CREVE COEUR", "FERGUSON", "AFFTON"]
+COUNTY_CLASSES = ["R", "R", "R", "R", "RES", "C", "COM", "I", "A", "E", "X"]
+CITY_LAND_USES = ["A", "A", "B", "C", "D", "E", "F"]
+
+
+def parcel_geometries(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Polygon/MultiPolygon parcels in EPSG:26915 with realistic vertex counts"""
+    columns = max(1, int(np.ceil(np.sqrt(count))))
+    index = np.arange(count)
+    x0 = ORIGIN[0] + (index % columns) * CELL_METERS + rng.uniform(0, 2, count)
+    y0 = ORIGIN[1] + (index // columns) * CELL_METERS + rng.uniform(0, 2, count)
+    multipart = rng.random(count) < MULTIPART_SHARE
+    width = np.where(multipart, rng.uniform(10, 20, count), rng.uniform(12, 36, count))
+    height = rng.uniform(12, 36, count)
+
+    # Shell vertices: 4 corners plus extra points along the perimeter, in perimeter order
+    extra = np.minimum(rng.geometric(0.22, count) - 1, MAX_VERTICES - 4)
+    perimeter = 2 * (width + height)
+    owner = np.concatenate([np.repeat(index, 4), np.repeat(index, extra)])
+    position = np.concatenate([
+        (np.stack([np.zeros(count), width, width + height, 2 * width + height], axis=1)).ravel(),
+        rng.random(extra.sum()) * np.repeat(perimeter, extra)
+    ])
+    order = np.lexsort((position, owner))
+    owner, position = owner[order], position[order]
+    w, h = width[owner], height[owner]
+    x = np.select(
+        [position <= w, position <= w + h, position <= 2 * w + h],
+        [position, w, w - (position - w - h)],
+        0.0
+    )
+    y = np.select(
+        [position <= w, position <= w + h, position <= 2 * w + h],
+        [0.0, position - w, h],
+        h - (position - 2 * w - h)
+    )
+    rings = shapely.linearrings(np.column_stack([x0[owner] + x, y0[owner] + y]), indices=owner)
+    parcels = shapely.polygons(rings)
+
+    for i in np.flatnonzero(rng.random(count) < HOLE_SHARE).tolist():
+        hole = shapely.box(x0[i] + width[i] * 0.4, y0[i] + height[i] * 0.4,
+                           x0[i] + width[i] * 0.6, y0[i] + height[i] * 0.6)
+        parcels[i] = shapely.Polygon(parcels[i].exterior, [hole.exterior])
+    for i in np.flatnonzero(multipart).tolist():
+        garage = shapely.box(x0[i] + 24, y0[i] + 2, x0[i] + 36, y0[i] + 10)
+        parcels[i] = shapely.MultiPolygon([parcels[i], garage])
+    return parcels
+
+
+def _owner_names(count: int, rng: np.random.Generator) -> list:
+    # Landlords and institutions own many parcels
+    owners = rng.zipf(1.6, count) % 50000
+    return [f"OWNER {owner} LLC" if owner % 7 == 0 else f"SMITH {owner}" for owner in owners.tolist()]
+
+
+def _street_addresses(count: int, rng: np.random.Generator) -> tuple:
+    numbers = rng.integers(1, 9999, count)
+    streets = rng.choice(len(STREETS), count)
+    types = rng.choice(len(STREET_TYPES), count)
+    addresses = [
+        f"{number} {STREETS[street]} {STREET_TYPES[kind]}"
+        for number, street, kind in zip(numbers.tolist(), streets.tolist(), types.tolist())
+    ]
+    for i in np.flatnonzero(rng.random(count) < BLANK_ADDRESS_SHARE).tolist():
+        addresses[i] = ""
+    return numbers, addresses
+
+
+def _assessments(count: int, rng: np.random.Generator) -> tuple:
+    total = np.round(rng.lognormal(11.6, 0.9, count), -2)
+    total[rng.random(count) < 0.04] = 0
+    land = np.round(total * rng.uniform(0.1, 0.4, count), -2)
+    return total, land, total - land
+
+
+def city_frames(count: int, seed: int = 7) -> tuple:
+    """(parcel GeoDataFrame in EPSG:2815, basic-info CSV DataFrame) with the city schema"""
+    rng = np.random.default_rng(seed)
+    handles = [f"{10000000000 + i * 7:011d}" for i in range(count)]
+    total, land, improvement = _assessments(count, rng)
+    owners = _owner_names(count, rng)
+    building = np.where(rng.random(count) < 0.15, 0, np.round(rng.lognormal(7.3, 0.5, count)))
+
+    parcels = gpd.GeoDataFrame({
+        "HANDLE": handles,
+        "PARCEL9": [handle[2:] for handle in handles],
+        "ASMTTOTAL": total,
+        "ASMTLAND": land,
+        "ASMTIMPROV": improvement,
+        "BDG1AREA": building,
+        "BDG1YEAR": rng.choice([0, 1895, 1910, 1925, 1948, 1964, 1988, 2004, 2019], count),
+        "OWNERNAME": owners,
+        "OWNERNAME2": np.where(rng.random(count) < 0.3, "ETAL", ""),
+        "OWNERADDR": [f"PO BOX {i % 9000}" for i in range(count)],
+        "OWNERCITY": "ST LOUIS",
+        "OWNERSTATE": "MO",
+        "OWNERZIP": [f"631{rng_zip:02d}" for rng_zip in rng.integers(1, 47, count).tolist()],
+        "NBRHD": rng.integers(1, 89, count),
+        "WARD": rng.integers(1, 15, count),
+        "LANDUSE": rng.choice(CITY_LAND_USES, count),
+        "ACRES": np.round(rng.uniform(0.02, 0.6, count), 4),
+    }, geometry=parcel_geometries(count, rng), crs=26915).to_crs(epsg=CITY_EPSG)
+
+    # Basic-info CSV: one row per unit, so multi-unit parcels repeat their HANDLE
+    units = np.where(rng.random(count) < MULTI_UNIT_SHARE, rng.integers(2, 7, count), 1)
+    rows = np.repeat(np.arange(count), units)
+    numbers, addresses = _street_addresses(count, rng)
+    zips = rng.integers(101, 147, count)
+    basic = pd.DataFrame({
+        "HANDLE": [handles[i] for i in rows.tolist()],
+        "SITEADDR": [addresses[i] for i in rows.tolist()],
+        "LowAddrNum": numbers[rows],
+        "ZIP": [f"63{zips[i]}" for i in rows.tolist()],
+        "Unit": np.concatenate([np.arange(n) for n in units.tolist()]),
+    })
+    for column in range(15):
+        basic[f"Info{column}"] = rng.integers(0, 1000, len(basic))
+    return parcels, basic
+
+
+def county_frame(count: int, seed: int = 7) -> gpd.GeoDataFrame:
+    """Parcel GeoDataFrame in EPSG:26916 with the county schema"""
+    rng = np.random.default_rng(seed + 1)
+    total, land, improvement = _assessments(count, rng)
+    numbers, addresses = _street_addresses(count, rng)
+    zips = rng.integers(5, 146, count)
+    letters = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+    return gpd.GeoDataFrame({
+        # Alphanumeric locators never look like city HANDLEs
+        "LOCATOR": [f"{i % 40:02d}{letters[i % 24]}{i:06d}" for i in range(count)],
+        "TOTAPVAL": total,
+        "LAND_VAL": land,
+        "IMPROV_VAL": improvement,
+        "RESQFT": np.where(rng.random(count) < 0.2, 0, np.round(rng.lognormal(7.4, 0.5, count))),
+        "YEAR_BUILT": rng.choice([0, 1925, 1952, 1964, 1978, 1995, 2006, 2021], count),
+        "OWNER_NAME": _owner_names(count, rng),
+        "TENURE": rng.choice(["OWNER", "RENTAL", ""], count),
+        "OWN_STATE": "MO",
+        "PROP_ADD": addresses,
+        "PROP_ADRNU": numbers,
+        "PROP_ZIP": [f"63{zip_code:03d}" for zip_code in zips.tolist()],
+        "MUNICIPALI": rng.choice(MUNICIPALITIES, count),
+        "PROPCLASS": rng.choice(COUNTY_CLASSES, count),
+    }, geometry=parcel_geometries(count, rng), crs=26915).to_crs(epsg=COUNTY_EPSG)
+
+
+def write_datasets(root: Path, parcels: int, seed: int = 7) -> dict:
+    """Write city and county datasets for `parcels` total parcels under root
+
+    Returns:
+        {"city": parcel count, "county": parcel count, "root": root}
+    """
+    root = Path(root)
+    city_count = max(1, int(parcels * CITY_SHARE))
+    county_count = max(1, parcels - city_count)
+
+    city_dir = root / "saint_louis_city" / "shapefiles"
+    county_dir = root / "saint_louis_county" / "shapefiles"
+    city_dir.mkdir(parents=True, exist_ok=True)
+    county_dir.mkdir(parents=True, exist_ok=True)
+
+    parcels_gdf, basic = city_frames(city_count, seed)
+    parcels_gdf.to_file(city_dir / "prcl.shp", engine="pyogrio")
+    basic.to_csv(city_dir / "parcels-basic-info.csv", index=False)
+    del parcels_gdf, basic
+
+    county_frame(county_count, seed).to_file(county_dir / "Parcels_Current.shp", engine="pyogrio")
+    return {"city": city_count, "county": county_count, "root": str(root)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic St. Louis parcel shapefiles")
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--parcels", type=int, default=100000, help="Total parcels (city + county)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    written = write_datasets(args.out, args.parcels, args.seed)
+    print(f"✅ Wrote {written['city']:,} city and {written['county']:,} county parcels under {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the address normalization engine
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import address_normalizer
+from address_normalizer import standardize_address, standardize_batch, standardize_series
+from benchmark_standardize_address import legacy_standardize_address, synthetic_address_args
+
+EDGE_CASES = [
+    ("1234 n kingshighway blvd., st louis, mo 63108", "St. Louis", "MO", "63102"),
+    ("  55  Main\tST ;; Kirkwood ; MO 63122  ", "Kirkwood", "MO", "63122"),
+    ("10 Elm Ct..,, , Saint   Louis,,MO 63104-1234", "St. Louis", "MO", "63102"),
+    ("1 Oak Ln , Florissant\x1c, mo 63031", "Florissant", "MO", "63031"),
+    ("7 WAY, UNINCORPORATED", "St. Louis County (Unincorporated)", "MO", "63105"),
+    ("9 ROAD", "Unknown City", "MO", "63102"),
+    ("ST, ST, ST", "St. Louis", "MO", "63102"),
+    (" , ; ., ", "St. Louis", "MO", "63102"),
+    ("123 main st, webster groves, missouri 63119", "Webster Groves", "MO", "63119"),
+    ("4 ÉCOLE dr., ville, mo 63101", "Ville", "MO", "63101"),
+    ("   ", "St. Louis", "MO", "63102"),
+    ("", "St. Louis", "MO", "63102"),
+    (None, "St. Louis", "MO", "63102"),
+    (float("nan"), "St. Louis", "MO", "63102"),
+    (12345, "St. Louis", "MO", "63102"),
+]
+
+
+class AddressNormalizerTest(unittest.TestCase):
+
+    def setUp(self):
+        address_normalizer.clear_memo()
+
+    def test_edge_cases_match_original(self):
+        for args in EDGE_CASES:
+            with self.subTest(address=args[0]):
+                self.assertEqual(standardize_address(*args), legacy_standardize_address(*args))
+
+    def test_synthetic_addresses_match_original(self):
+        address_args = synthetic_address_args(20000, seed=3)
+        expected = [legacy_standardize_address(*args) if args else "" for args in address_args]
+        self.assertEqual(standardize_batch(address_args), expected)
+        # Second pass is served from the memo
+        self.assertEqual(standardize_batch(address_args), expected)
+        self.assertGreater(address_normalizer.memo_info().hits, 0)
+
+    def test_unhashable_defaults_fall_back_to_uncached(self):
+        self.assertEqual(standardize_address("5 Main St", default_city="St. Louis", default_zip=["63102"]),
+                         legacy_standardize_address("5 Main St", default_city="St. Louis", default_zip=["63102"]))
+
+    def test_series_api(self):
+        frame = pd.DataFrame(
+            [args if isinstance(args[0], str) or args[0] is None else (np.nan,) + args[1:] for args in EDGE_CASES] * 3,
+            columns=["address", "city", "state", "zip"]
+        )
+        frame.index = frame.index * 10 + 5
+        result = standardize_series(frame["address"], frame["city"], frame["state"], frame["zip"])
+
+        self.assertEqual(list(result.index), list(frame.index))
+        expected = [legacy_standardize_address(*row) for row in frame.itertuples(index=False)]
+        self.assertEqual(result.tolist(), expected)
+
+        scalar = standardize_series(frame["address"], default_city="St. Louis")
+        self.assertEqual(scalar.tolist(), [legacy_standardize_address(a, "St. Louis") for a in frame["address"]])
+
+    def test_empty_series(self):
+        result = standardize_series(pd.Series([], dtype=object))
+        self.assertEqual(len(result), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
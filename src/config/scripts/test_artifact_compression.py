@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for compress-on-write artifact compression
+"""
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import artifact_compression
+from artifact_compression import CompressionSettings
+from streaming_json import write_json_envelope
+
+
+def sample_payload(size: int) -> bytes:
+    parts = []
+    i = 0
+    while sum(len(p) for p in parts) < size:
+        parts.append(f'"{10010000000 + i}":{{"latitude":38.{i % 997:06d},"pricing_tier":"value"}},'.encode())
+        i += 1
+    return b"".join(parts)[:size]
+
+
+class CompressedTeeTest(unittest.TestCase):
+    """Every codec output must decompress to exactly the raw file"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_through_tee(self, settings, payload, chunk=7919):
+        raw_path = self.dir / "stl_city-parcel_metadata.json"
+        tee = settings.open_tee(raw_path, self.dir)
+        for start in range(0, len(payload), chunk):
+            tee.write(payload[start:start + chunk])
+        tee.close()
+        return raw_path
+
+    def test_parallel_gzip_round_trips_across_blocks(self):
+        payload = sample_payload(300_000)
+        with mock.patch.object(artifact_compression, "BLOCK_SIZE", 64 * 1024):
+            for level in (1, 6, 9):
+                with self.subTest(level=level):
+                    settings = CompressionSettings(gzip_level=level, workers=3)
+                    raw_path = self.write_through_tee(settings, payload)
+                    self.assertEqual(raw_path.read_bytes(), payload)
+                    gz_path = self.dir / f"{raw_path.name}.gz"
+                    self.assertEqual(gzip.decompress(gz_path.read_bytes()), payload)
+
+                    result = settings.results[raw_path]
+                    self.assertEqual(result["raw_bytes"], len(payload))
+                    self.assertEqual(result["outputs"]["gzip"]["bytes"], gz_path.stat().st_size)
+
+    def test_identical_content_gives_identical_gzip_bytes(self):
+        payload = sample_payload(50_000)
+        settings = CompressionSettings()
+        first = (self.dir / f"{self.write_through_tee(settings, payload).name}.gz").read_bytes()
+        second = (self.dir / f"{self.write_through_tee(settings, payload).name}.gz").read_bytes()
+        self.assertEqual(first, second)
+
+    def test_empty_file(self):
+        settings = CompressionSettings()
+        raw_path = self.write_through_tee(settings, b"")
+        self.assertEqual(gzip.decompress((self.dir / f"{raw_path.name}.gz").read_bytes()), b"")
+
+    @unittest.skipIf(artifact_compression.zstandard is None, "zstandard not installed")
+    def test_zstd_sidecar(self):
+        payload = sample_payload(200_000)
+        raw_path = self.write_through_tee(CompressionSettings(sidecars=["zstd"]), payload)
+        compressed = (self.dir / f"{raw_path.name}.zst").read_bytes()
+        self.assertEqual(artifact_compression.zstandard.ZstdDecompressor().decompressobj().decompress(compressed), payload)
+
+    @unittest.skipIf(artifact_compression.brotli is None, "brotli not installed")
+    def test_brotli_sidecar(self):
+        payload = sample_payload(200_000)
+        raw_path = self.write_through_tee(CompressionSettings(sidecars=["brotli"], brotli_quality=5), payload)
+        compressed = (self.dir / f"{raw_path.name}.br").read_bytes()
+        self.assertEqual(artifact_compression.brotli.decompress(compressed), payload)
+
+    def test_compress_existing_file(self):
+        payload = sample_payload(120_000)
+        raw_path = self.dir / "stl_county-parcel_geometry.json"
+        raw_path.write_bytes(payload)
+        out_dir = self.dir / "cdn"
+        out_dir.mkdir()
+
+        result = CompressionSettings().compress_file(raw_path, out_dir)
+        self.assertEqual(raw_path.read_bytes(), payload)
+        self.assertEqual(gzip.decompress(result["outputs"]["gzip"]["path"].read_bytes()), payload)
+
+    def test_streaming_writer_tees_through_opener(self):
+        settings = CompressionSettings()
+        raw_path = self.dir / "stl_city-parcel_geometry.json"
+        geometries = {str(i): {"type": "Polygon", "bbox": [i, i, i + 1, i + 1]} for i in range(5000)}
+        write_json_envelope(
+            raw_path, "geometries", geometries.items(), lambda total: {"total_geometries": total},
+            opener=lambda path: settings.open_tee(path, self.dir)
+        )
+        raw = raw_path.read_bytes()
+        self.assertEqual(json.loads(raw)["metadata"]["total_geometries"], 5000)
+        self.assertEqual(gzip.decompress((self.dir / f"{raw_path.name}.gz").read_bytes()), raw)
+
+    def test_unknown_sidecar_rejected(self):
+        with self.assertRaises(ValueError):
+            CompressionSettings(sidecars=["lz4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
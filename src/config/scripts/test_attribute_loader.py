@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for column-projected, typed attribute loading and the one-row-per-parcel joins
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from attribute_loader import apply_dtypes, collapse_to_parcels, mapped_columns, plan_columns, read_table
+from benchmark_attribute_loading import DBF, _digest, legacy_load, projected_load
+from ingest_shapes import ShapefileProcessor
+from region_registry import RegionSpec, load_regions
+from synthetic_shapefiles import write_datasets
+
+
+class AttributeLoaderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmp.name)
+        write_datasets(cls.root, 300, seed=13)
+        cls.city, cls.county = load_regions()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_mapped_columns(self):
+        columns = mapped_columns(self.county.fields)
+        self.assertEqual(columns[:3], ["TOTAPVAL", "LAND_VAL", "IMPROV_VAL"])
+        self.assertIn("PROPCLASS", columns)
+        self.assertIn("LOCATOR", columns)
+        self.assertEqual(len(columns), len(set(columns)))
+
+    def test_plan_reads_only_missing_mapped_columns(self):
+        files = self.city.file_paths(self.root)
+        plan = plan_columns(files, self.city.joins, mapped_columns(self.city.fields), "HANDLE")
+        self.assertIn("ASMTTOTAL", plan["shp"])
+        self.assertNotIn("PARCEL9", plan["shp"])
+        # prcl.dbf is the shapefile's own table: nothing left to join from it
+        self.assertEqual(plan["dbf"], [])
+        self.assertEqual(plan["csv"], ["HANDLE", "SITEADDR", "LowAddrNum", "ZIP"])
+
+        table = read_table(files["csv"], "csv", plan["csv"])
+        self.assertEqual(list(table.columns), plan["csv"])
+
+    def test_dtypes_keep_values(self):
+        frame = pd.DataFrame({
+            "exact": [1.0, 2.5, np.nan],
+            "lossy": [0.1, 2.0, 3.0],
+            "codes": ["R", "C", "R"],
+            "gaps": pd.Series(["R", None, "C"], dtype=object),
+        })
+        apply_dtypes(frame, {"exact": "float32", "lossy": "float32", "codes": "category", "gaps": "category",
+                             "absent": "category"})
+        self.assertEqual(frame["exact"].dtype, np.float32)
+        self.assertEqual(frame["lossy"].dtype, np.float64)
+        self.assertIsInstance(frame["codes"].dtype, pd.CategoricalDtype)
+        self.assertEqual(frame["gaps"].dtype, object)
+
+        with self.assertRaises(ValueError):
+            apply_dtypes(frame, {"codes": "int8"})
+        entry = {"key": "x", "prefix": "x", "name": "X", "source_dir": "x", "files": {"shp": "x.shp"},
+                 "crs": 4326, "fields": {"parcel_id": "ID"}, "dtypes": {"ID": "int8"}}
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict(entry)
+
+    def test_collapse_keeps_first_row_per_parcel(self):
+        table = pd.DataFrame({"HANDLE": ["a", "b", "a", "c", "a", "b"], "Unit": range(6)})
+        collapsed, stats = collapse_to_parcels(table, "HANDLE")
+        self.assertEqual(collapsed["HANDLE"].tolist(), ["a", "b", "c"])
+        self.assertEqual(collapsed["Unit"].tolist(), [0, 1, 3])
+        self.assertEqual(stats, {"rows": 6, "parcels": 3, "duplicate_rows": 3, "multi_row_parcels": 2,
+                                 "max_rows_per_parcel": 3})
+        _, stats = collapse_to_parcels(table.iloc[:0], "HANDLE")
+        self.assertEqual((stats["parcels"], stats["max_rows_per_parcel"]), (0, 0))
+
+    def test_processor_join_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            processor = ShapefileProcessor(Path(tmp), dataset_size="large", source_root=self.root)
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.process_region("city")
+        stats = processor.join_stats["city"]
+        csv = stats["joins"]["csv"]
+        self.assertEqual(list(stats["joins"]), ["csv"])
+        self.assertGreater(csv["rows"], csv["parcels"])
+        self.assertEqual(csv["rows"] - csv["parcels"], csv["duplicate_rows"])
+        self.assertEqual(csv["matched_parcels"] + csv["unmatched_parcels"], stats["parcels"])
+        self.assertEqual(stats["parcels"], stats["shapefile"]["parcels"])
+
+    @unittest.skipIf(DBF is None, "dbfread not installed")
+    def test_projected_load_matches_full_schema_load(self):
+        for spec in (self.city, self.county):
+            with self.subTest(region=spec.key):
+                files = spec.file_paths(self.root)
+                legacy, projected = legacy_load(spec, files), projected_load(spec, files)
+                self.assertLessEqual(len(projected.columns), len(legacy.columns))
+                columns = mapped_columns(spec.fields)
+                self.assertEqual(_digest(projected, columns), _digest(legacy, columns))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for geo-grid sharded search documents
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from build_times import BuildTimes
+from geo_grid import bucket_by_grid, grid_entry, grid_id, grid_indices
+from ingest_shapes import DocumentModePipeline
+from region_registry import load_regions
+from stage_profiler import StageProfiler
+
+
+def document_record(parcel_id: str, latitude, longitude, region="St. Louis City") -> dict:
+    return {
+        "id": parcel_id,
+        "original_parcel_id": parcel_id,
+        "full_address": f"{parcel_id} MAIN ST",
+        "latitude": latitude,
+        "longitude": longitude,
+        "region": region
+    }
+
+
+class GeoGridTest(unittest.TestCase):
+
+    def test_grid_ids_match_geographic_sharding(self):
+        # Expected ids computed with GeographicSharding.getGridIdForLocation's arithmetic in Node
+        cases = {
+            (38.627, -90.1994): "grid_4_8",
+            (38.45, -90.55): "grid_1_0",
+            (38.4, -90.6): "grid_0_0",
+            (38.8, -90.0): "grid_7_11",
+            (38.35, -90.65): "grid_-1_-2",
+            (38.7, -90.25): "grid_6_6",
+        }
+        for (latitude, longitude), expected in cases.items():
+            with self.subTest(latitude=latitude, longitude=longitude):
+                self.assertEqual(grid_id(*grid_indices(latitude, longitude)), expected)
+
+    def test_non_finite_coordinates_are_unplaced(self):
+        for latitude, longitude in [(float("nan"), -90.2), (38.6, None), ("x", 1), (float("inf"), -90.2)]:
+            self.assertIsNone(grid_indices(latitude, longitude))
+
+    def test_grid_entry_shape(self):
+        self.assertEqual(grid_entry(4, 8), {
+            "id": "grid_4_8",
+            "bounds": {"north": 38.65, "south": 38.6, "east": -90.15, "west": -90.2},
+            "center": {"lat": 38.625, "lng": -90.175}
+        })
+
+    def test_bucket_by_grid_keeps_order_and_sorts_cells(self):
+        records = [
+            document_record("a", 38.7, -90.25),
+            document_record("b", 38.61, -90.19),
+            document_record("c", 38.71, -90.21),
+            document_record("d", None, None)
+        ]
+        cells, unplaced = bucket_by_grid(records)
+        self.assertEqual(unplaced, 1)
+        self.assertEqual(list(cells), [(4, 8), (6, 6), (6, 7)])
+        self.assertEqual([record["id"] for record in cells[(4, 8)]], ["b"])
+
+
+class GridDocumentFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pipeline = DocumentModePipeline.__new__(DocumentModePipeline)
+        self.pipeline.temp_dir = Path(self.tmp.name)
+        self.pipeline.profiler = StageProfiler()
+        self.pipeline.regions = load_regions()
+        self.pipeline.partial_run = False
+        self.pipeline.build_times = BuildTimes(Path(self.tmp.name) / "build-times.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_grid_files_partition_region_documents(self):
+        city = [document_record(str(10010000000 + i), 38.55 + (i % 9) * 0.021, -90.3 + (i % 13) * 0.017) for i in range(200)]
+        county = [document_record(f"18K{i:06d}", 38.5 + (i % 7) * 0.04, -90.5 + (i % 5) * 0.06, "St. Louis County")
+                  for i in range(150)]
+        county.append(document_record("18K999999", float("nan"), float("nan"), "St. Louis County"))
+
+        files = self.pipeline.step_5_create_document_files({"city": city, "county": county})
+        latest = json.loads((self.pipeline.temp_dir / "latest.json").read_text())
+        self.assertIn(self.pipeline.temp_dir / "latest.json", files)
+
+        for region, data in [("stl_city", city), ("stl_county", county)]:
+            entry = next(r for r in latest["regions"] if r["region"] == region)
+            flat = json.loads((self.pipeline.temp_dir / entry["document_file"]).read_text())
+            self.assertEqual(len(flat), len(data))
+
+            gridded = []
+            for grid in entry["grids"]:
+                documents = json.loads((self.pipeline.temp_dir / grid["document_file"]).read_text())
+                self.assertEqual(grid["documents"], len(documents))
+                for document in documents:
+                    self.assertEqual(grid_id(*grid_indices(document["latitude"], document["longitude"])), grid["id"])
+                    self.assertGreaterEqual(document["latitude"], grid["bounds"]["south"] - 1e-9)
+                    self.assertLess(document["latitude"], grid["bounds"]["north"] + 1e-9)
+                gridded.extend(documents)
+
+            placed = [document for document in flat if grid_indices(document["latitude"], document["longitude"])]
+            self.assertEqual(sorted(d["id"] for d in gridded), sorted(d["id"] for d in placed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized GeoJSON extraction
+"""
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Point, Polygon
+
+from benchmark_geojson_arrays import synthetic_parcels
+from geojson_arrays import extract_geojson, round_like_builtin
+from ingest_shapes import ShapefileProcessor
+
+
+class RoundLikeBuiltinTest(unittest.TestCase):
+
+    def test_random_values_match_round(self):
+        rng = np.random.default_rng(5)
+        values = np.concatenate([
+            rng.uniform(-90.6, -90.0, 50000),
+            rng.uniform(38.4, 38.8, 50000),
+            rng.uniform(-1e-4, 1e-4, 1000),
+            [0.0, -0.0, np.inf, -np.inf, 1e300, -1e300, 5e-324]
+        ])
+        self.assertEqual(round_like_builtin(values, 5).tolist(), [round(float(v), 5) for v in values])
+
+    def test_decimal_ties_match_round(self):
+        rng = random.Random(3)
+        # Six-decimal values ending in 5 sit on (or next to) a rounding boundary
+        values = [float(f"{rng.choice('-+')}{rng.randint(0, 90)}.{rng.randint(0, 99999):05d}5") for _ in range(50000)]
+        values += [0.000005, 0.000015, 2.675, 38.123455, -90.123455]
+        self.assertEqual(round_like_builtin(np.array(values), 5).tolist(), [round(v, 5) for v in values])
+
+    def test_nan_stays_nan(self):
+        self.assertTrue(np.isnan(round_like_builtin(np.array([np.nan]), 5)[0]))
+
+
+class ExtractGeojsonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = ShapefileProcessor(Path(tempfile.gettempdir()), "small")
+
+    def scalar(self, geometries):
+        return [self.processor.extract_parcel_geometry(geometry, already_transformed=True) for geometry in geometries]
+
+    def extract(self, geometries, **kwargs):
+        return extract_geojson(geometries, fallback=self.processor._extract_scalar_geometry, **kwargs)
+
+    def test_synthetic_parcels_match_scalar(self):
+        parcels = synthetic_parcels(3000, seed=11)
+        expected = self.scalar(parcels)
+        self.assertEqual(json.dumps(self.extract(parcels)), json.dumps(expected))
+        # Small batches slice the offsets at many boundaries
+        self.assertEqual(json.dumps(self.extract(parcels, batch_size=97)), json.dumps(expected))
+
+    def test_polygon_only_and_multipolygon_only_batches(self):
+        parcels = synthetic_parcels(500, seed=2)
+        types = shapely.get_type_id(parcels)
+        for type_id in (3, 6):
+            with self.subTest(type_id=type_id):
+                subset = parcels[types == type_id]
+                self.assertEqual(self.extract(subset), self.scalar(subset))
+
+    def test_edge_geometries_match_scalar(self):
+        shell = [(-90.2, 38.6), (-90.19999, 38.6), (-90.19999, 38.600005), (-90.2, 38.600005)]
+        geometries = [
+            None,
+            Polygon(),
+            MultiPolygon(),
+            Point(-90.2, 38.6),
+            Polygon(shell),
+            Polygon([(x, y, 150.123456) for x, y in shell]),
+            MultiPolygon([Polygon(shell), Polygon([(x + 1, y) for x, y in shell], [[(x + 1, y) for x, y in shell[:3]]])]),
+            shapely.from_wkt("MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), EMPTY)"),
+            shapely.from_wkt("POLYGON ((0 0, 1 0, 1 1, 0 0), EMPTY)"),
+        ]
+        self.assertEqual(self.extract(geometries), self.scalar(geometries))
+
+    def test_empty_input(self):
+        self.assertEqual(extract_geojson([]), [])
+
+    def test_without_fallback_unsupported_geometries_are_none(self):
+        geometries = [Polygon([(0, 0, 1), (1, 0, 1), (1, 1, 1)]), Polygon([(0, 0), (1, 0), (1, 1)])]
+        result = extract_geojson(geometries)
+        self.assertIsNone(result[0])
+        self.assertEqual(result[1]["type"], "Polygon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized geometry checks against GeometryValidator's scalar checks
+"""
+
+import contextlib
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+
+from geojson_arrays import extract_geojson
+from region_registry import DEFAULT_REGISTRY, RegionSpec, load_regions
+from geometry_checks import CHECKS, GeometryArrays, check_geometries, empty_stats, merge_stats
+from synthetic_shapefiles import parcel_geometries
+from validate_geometries import GeometryValidator, prefetch
+
+CITY_BOUNDS = {"lat_min": 38.53, "lat_max": 38.77, "lng_min": -90.32, "lng_max": -90.17}
+
+
+def square(lng: float, lat: float, size: float = 0.001) -> list:
+    east, north = round(lng + size, 5), round(lat + size, 5)
+    return [[lng, lat], [east, lat], [east, north], [lng, north], [lng, lat]]
+
+
+def polygon(*rings, bbox=None) -> dict:
+    points = [point for ring in rings for point in ring]
+    if bbox is None:
+        bbox = [min(p[0] for p in points), min(p[1] for p in points), max(p[0] for p in points), max(p[1] for p in points)]
+    return {"type": "Polygon", "coordinates": list(rings), "bbox": bbox}
+
+
+class GeometryChecksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.good = polygon(square(-90.2, 38.6))
+        self.broken = {
+            "open": polygon(square(-90.2, 38.6)[:-1]),
+            "short": polygon([[-90.2, 38.6], [-90.19, 38.61], [-90.2, 38.6]]),
+            "range": polygon(square(-190.0, 38.6)),
+            "precise": polygon(square(-90.2000001, 38.6)),
+            "no_bbox": {"type": "Polygon", "coordinates": [square(-90.2, 38.6)]},
+            "bad_bbox": polygon(square(-90.2, 38.6), bbox=[-90.19, 38.6, -90.2, 38.601]),
+            "shifted_bbox": polygon(square(-90.2, 38.6), bbox=[-90.21, 38.6, -90.199, 38.601]),
+            "outside": polygon(square(-91.5, 38.6)),
+            "point": {"type": "Point", "coordinates": [-90.2, 38.6], "bbox": [-90.2, 38.6, -90.2, 38.6]},
+            "null": None,
+            "three_d": polygon([[-90.2, 38.6, 1.0]] + square(-90.2, 38.6)[1:]),
+            "empty_part": {"type": "MultiPolygon", "coordinates": [[square(-90.2, 38.6)], []],
+                           "bbox": [-90.2, 38.6, -90.199, 38.601]},
+            "scalar_point": {"type": "Polygon", "coordinates": [square(-90.2, 38.6)[:4] + [-90.2]],
+                             "bbox": [-90.2, 38.6, -90.199, 38.601]},
+            "open_hole": polygon(square(-90.2, 38.6, 0.01), square(-90.195, 38.605)[:-1]),
+        }
+
+    def check(self, geometries: dict) -> dict:
+        return check_geometries(list(geometries), list(geometries.values()), CITY_BOUNDS)
+
+    def test_each_broken_geometry_fails_its_check(self):
+        expected = {
+            "open": {"ring_closure"}, "short": {"vertex_count"}, "range": {"coordinate_range"},
+            "precise": {"precision"}, "no_bbox": {"bbox"}, "bad_bbox": {"bbox", "bbox_mismatch"},
+            "shifted_bbox": {"bbox_mismatch"}, "outside": set(), "point": {"type"}, "null": {"missing"},
+            "three_d": {"point_format", "ring_closure"}, "empty_part": {"empty_polygon"},
+            "scalar_point": {"point_format", "ring_closure"}, "open_hole": {"ring_closure"},
+        }
+        for name, geometry in self.broken.items():
+            with self.subTest(name):
+                stats = self.check({"ok": self.good, name: geometry})
+                failed = {check for check in CHECKS if stats["failures"][check]}
+                self.assertEqual(failed, expected[name])
+                self.assertEqual(stats["valid"], 2 - bool(failed - {"precision"}))
+
+    def test_counts_match_scalar_checks_on_pipeline_geometry(self):
+        shapes = gpd.GeoSeries(parcel_geometries(2000, np.random.default_rng(3)), crs="EPSG:26915").to_crs("EPSG:4326")
+        geometries = extract_geojson(shapes)
+        # Break a known number of geometries in different ways
+        polygons = [i for i, geometry in enumerate(geometries) if geometry["type"] == "Polygon"]
+        for i in polygons[:60:3]:
+            geometries[i]["coordinates"][0] = geometries[i]["coordinates"][0][:-1]
+        for i in range(1, 40, 4):
+            geometries[i]["bbox"][2] += 0.01
+
+        validator = GeometryValidator(Path("."))
+        ids = [f"P{i}" for i in range(len(geometries))]
+        stats = check_geometries(ids, geometries, CITY_BOUNDS)
+
+        scalar_invalid = 0
+        for geometry in geometries:
+            # validate_coordinate_precision takes one polygon's rings (it reads MultiPolygon rings as points)
+            polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+            coordinate_issues = [issue for rings in polygons for issue in validator.validate_coordinate_precision(rings)["issues"]]
+            scalar_invalid += bool(coordinate_issues or not validator.validate_polygon_topology(geometry)["valid"]
+                                   or not validator.validate_bounding_box(geometry)["valid"])
+        self.assertEqual(stats["failures"]["ring_closure"], 20)
+        self.assertEqual(stats["failures"]["bbox_mismatch"], 10)
+        self.assertEqual(stats["geometries"] - stats["valid"], scalar_invalid)
+        self.assertEqual(stats["points"], sum(
+            len(ring) for g in geometries
+            for rings in (g["coordinates"] if g["type"] == "MultiPolygon" else [g["coordinates"]]) for ring in rings
+        ))
+
+        bounds = validator.validate_regional_bounds({"geometries": dict(zip(ids, geometries))}, "city")["stats"]
+        self.assertEqual((stats["within_bounds"], stats["out_of_bounds"]), (bounds["within_bounds"], bounds["out_of_bounds"]))
+
+    def test_merged_batches_match_one_pass(self):
+        geometries = dict(self.broken, ok=self.good)
+        names = list(geometries)
+        whole = self.check(geometries)
+        merged = empty_stats()
+        for start in range(0, len(names), 4):
+            merged = merge_stats(merged, self.check({name: geometries[name] for name in names[start:start + 4]}))
+        for key in ("geometries", "valid", "points", "rings", "failures", "lng_range", "lat_range",
+                    "within_bounds", "out_of_bounds", "precision_values"):
+            self.assertEqual(merged[key], whole[key], key)
+
+    def test_flattened_offsets(self):
+        arrays = GeometryArrays([polygon(square(-90.2, 38.6), square(-90.1, 38.6)), None, self.good])
+        self.assertEqual(arrays.ring_offsets.tolist(), [0, 5, 10, 15])
+        self.assertEqual(arrays.ring_geometry.tolist(), [0, 0, 2])
+        self.assertEqual(arrays.coords.shape, (15, 2))
+
+    def test_validator_reports_exact_counts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for prefix in ("stl_city", "stl_county"):
+                with open(Path(tmp) / f"{prefix}-parcel_geometry.json", 'w') as f:
+                    json.dump({"geometries": {"A": self.good, "B": self.broken["open"], "C": None}}, f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = GeometryValidator(Path(tmp)).run_full_validation()
+
+        self.assertEqual(results["city"]["checks"]["failures"]["ring_closure"], 1)
+        self.assertEqual(results["city"]["checks"]["failures"]["missing"], 1)
+        self.assertEqual(results["city"]["statistics"]["valid_geometries"], 1)
+        self.assertEqual(results["summary"]["overall_validity_rate"], 33.3)
+
+    def test_streamed_gzip_batches_match_one_pass(self):
+        geometries = dict(self.broken, ok=self.good)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Only the shipped .gz is present
+            with gzip.open(Path(tmp) / "stl_city-parcel_geometry.json.gz", 'wt', encoding='utf-8') as f:
+                json.dump({"geometries": geometries, "metadata": {"total_geometries": len(geometries)}}, f)
+            validator = GeometryValidator(Path(tmp), batch_size=4)
+            streamed = validator.validate_region_file("city")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertIsNone(validator.validate_region_file("county"))
+
+        whole = self.check(geometries)
+        for key in ("geometries", "valid", "points", "rings", "failures", "lng_range", "lat_range",
+                    "within_bounds", "out_of_bounds", "precision_values"):
+            self.assertEqual(streamed[key], whole[key], key)
+
+    def test_parallel_regions_match_serial(self):
+        geometries = dict(self.broken, ok=self.good)
+        # A third registered region without bounds
+        with open(DEFAULT_REGISTRY) as f:
+            county = json.load(f)["regions"][1]
+        regions = load_regions() + [RegionSpec.from_dict({**county, "key": "jefferson", "prefix": "jefferson", "bounds": None})]
+        with tempfile.TemporaryDirectory() as tmp:
+            for prefix in ("stl_city", "stl_county", "jefferson"):
+                with open(Path(tmp) / f"{prefix}-parcel_geometry.json", 'w') as f:
+                    json.dump({"geometries": geometries}, f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                serial = GeometryValidator(Path(tmp), regions=regions).run_full_validation()
+                # Chunks of a few entries, so every region is spread over the pool
+                validator = GeometryValidator(Path(tmp), workers=2, regions=regions, chunk_chars=300)
+                parallel = validator.run_full_validation()
+
+        for region in ("city", "county", "jefferson"):
+            # Examples are sampled chunk by chunk; everything else is exact
+            for key, value in serial[region]["checks"].items():
+                if key != "examples":
+                    self.assertEqual(parallel[region]["checks"][key], value, f"{region} {key}")
+            self.assertEqual(len(parallel[region]["checks"]["examples"]), len(serial[region]["checks"]["examples"]))
+            self.assertEqual(parallel[region]["topology"], serial[region]["topology"], region)
+        self.assertEqual(parallel["summary"], serial["summary"])
+        self.assertEqual(serial["summary"]["jefferson_validity_rate"], serial["summary"]["city_validity_rate"])
+        self.assertEqual(serial["jefferson"]["bounds"]["stats"]["out_of_bounds"], 0)
+        self.assertEqual(serial["city"]["bounds"]["stats"]["out_of_bounds"], 2)
+
+    def test_prefetch_reraises_reader_errors(self):
+        def broken_reader():
+            yield 1
+            raise ValueError("truncated file")
+
+        with self.assertRaisesRegex(ValueError, "truncated file"):
+            list(prefetch(broken_reader()))
+        self.assertEqual(list(prefetch(range(5), depth=1)), list(range(5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Tests for the Document Mode ingest pipeline
+
+Run with:
+  python3 -m unittest discover src/config/scripts 'test_*.py'
+"""
+
+import json
+import re
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import Polygon, MultiPolygon
+
+import ingest_shapes
+from ingest_shapes import ShapefileProcessor
+from incremental_ingest import IncrementalIngest
+from build_times import BuildTimes
+from stage_profiler import StageProfiler
+from region_registry import load_regions
+
+
+PROPERTY_TYPES = ["residential", "commercial", "industrial", "agricultural", "exempt", "other", "unknown"]
+
+
+def make_region_frames(region: str, count: int = 240, seed: int = 7):
+    """Build a synthetic projected parcel frame plus aligned WGS84 geometry and centroids"""
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for i in range(count):
+        x0 = 730000 + (i % 20) * 40.0
+        y0 = 4280000 + (i // 20) * 40.0
+        width = float(rng.uniform(5, 35))
+        height = float(rng.uniform(5, 35))
+        shell = [(x0, y0), (x0 + width, y0), (x0 + width, y0 + height), (x0, y0 + height)]
+        if i % 17 == 0:
+            polygons.append(MultiPolygon([Polygon(shell), Polygon([(x + 2 * width, y) for x, y in shell])]))
+        elif i % 11 == 0:
+            hole = [(x0 + 1, y0 + 1), (x0 + 2, y0 + 1), (x0 + 2, y0 + 2)]
+            polygons.append(Polygon(shell, [hole]))
+        else:
+            polygons.append(Polygon(shell))
+
+    totals = rng.choice([0, 45000.0, 90000.0, 150000.0, 260000.0, 420000.0, 650000.0, np.nan], size=count)
+    lands = rng.choice([0, 10000.0, 30000.0, 90000.0, 200000.0, np.nan], size=count)
+    building = rng.choice([0, 900.0, 1800.0, 4200.0, 25000.0, np.nan], size=count)
+    years = rng.choice([0, 1925, 1964, 2004], size=count)
+    streets = rng.choice(
+        ["1200 Market Street", "55 n kingshighway blvd.", "8 Oak Ave", "", "nan", "410  Lindell   Road", "7 Pine Ct"],
+        size=count
+    )
+
+    if region == "city":
+        attributes = {
+            "HANDLE": [f"{10000000000 + i}" if i % 23 else " " for i in range(count)],
+            "ASMTTOTAL": totals,
+            "ASMTLAND": lands,
+            "ASMTIMPROV": pd.Series([("abc" if i % 19 == 0 else float(i * 100)) for i in range(count)], dtype=object),
+            "BDG1AREA": building,
+            "BDG1YEAR": years,
+            "SITEADDR": streets,
+            "ZIP": rng.choice([63101.0, 63104.0, np.nan], size=count),
+            "OWNERNAME": rng.choice(["SMITH JOHN", "CITY OF ST LOUIS", None], size=count),
+            "OWNERNAME2": rng.choice(["", "JANE DOE"], size=count),
+            "OWNERADDR": rng.choice(["1 MAIN ST", None], size=count),
+        }
+        crs = "EPSG:26915"
+    else:
+        attributes = {
+            "LOCATOR": [f"{i:02d}K{i:06d}" for i in range(count)],
+            "TOTAPVAL": totals,
+            "LAND_VAL": lands,
+            "IMPROV_VAL": rng.choice([0, 12000, 80000], size=count),
+            "RESQFT": building,
+            "YEAR_BUILT": years,
+            "PROP_ADD": streets,
+            "PROP_ZIP": rng.choice(["63105", "6312", "", "63141"], size=count),
+            "MUNICIPALI": rng.choice(["CLAYTON", "UNINCORPORATED", "", "university city"], size=count),
+            "OWNER_NAME": rng.choice(["DOE JANE", None], size=count),
+            "TENURE": rng.choice(["OWNER", "RENTER", ""], size=count),
+            "PROPCLASS": rng.choice(["R", "C", "I", "EX", None], size=count),
+        }
+        crs = "EPSG:26915"
+
+    gdf = gpd.GeoDataFrame(attributes, geometry=polygons, crs=crs)
+    gdf["landarea"] = gdf.geometry.area * 10.7639
+    gdf_wgs84 = gdf.to_crs(epsg=4326)
+    centroids = gpd.GeoDataFrame({"geometry": gdf.geometry.centroid}, crs=gdf.crs).to_crs(epsg=4326).geometry
+    return gdf, gdf_wgs84, centroids
+
+
+def build_region_records_rowwise(processor: ShapefileProcessor, gdf, gdf_wgs84, centroids, region: str):
+    """Reference implementation: the original two-pass iterrows loop"""
+    parcel_id_field = processor.field_mappings[region]["parcel_id"]
+    temp_results = []
+    for idx, (_, row) in enumerate(gdf.iterrows()):
+        parcel_id = str(row.get(parcel_id_field, "")).strip()
+        if not parcel_id:
+            continue
+        temp_results.append({
+            'parcel_id': parcel_id,
+            'row': row,
+            'idx': idx,
+            'assessment': {
+                'total': processor.safe_to_numeric(processor.get_field_value(row, region, "assessment", "total"), 0),
+                'land': processor.safe_to_numeric(processor.get_field_value(row, region, "assessment", "land"), 0),
+                'improvement': processor.safe_to_numeric(processor.get_field_value(row, region, "assessment", "improvement"), 0)
+            }
+        })
+
+    regional_stats = processor.calculate_regional_stats(temp_results, region)
+    results = []
+    geometry_data = {}
+    for temp_record in temp_results:
+        idx = temp_record['idx']
+        row = temp_record['row']
+        parcel_id = temp_record['parcel_id']
+
+        geometry_data[parcel_id] = processor.extract_parcel_geometry(gdf_wgs84.iloc[idx].geometry, already_transformed=True)
+        centroid = centroids.iloc[idx]
+        lat, lng = centroid.y, centroid.x
+
+        if region == "city":
+            full_street_address = str(processor.get_field_value(row, "city", "address", "street_primary", "")).strip()
+            zip_code_raw = re.sub(r"\.0$", "", str(processor.get_field_value(row, "city", "address", "zip", "")).strip())
+            if not full_street_address or full_street_address.lower() in ['nan', 'none', 'null']:
+                continue
+            standardized_address = processor.standardize_address(
+                f"{full_street_address}, St. Louis, MO {zip_code_raw}", default_city="St. Louis"
+            )
+            region_name = "St. Louis City"
+            owner = {
+                "name": processor.get_field_value(row, "city", "owner", "name", ""),
+                "name2": processor.get_field_value(row, "city", "owner", "name2", ""),
+                "address": processor.get_field_value(row, "city", "owner", "address", "")
+            }
+        else:
+            raw_address = str(processor.get_field_value(row, "county", "address", "full", "")).strip()
+            raw_zip = str(processor.get_field_value(row, "county", "address", "zip", "")).strip()
+            raw_municipality = str(processor.get_field_value(row, "county", "address", "municipality", "")).strip().title()
+            if not raw_address or raw_address.lower() in ['nan', 'none', 'null']:
+                continue
+            city_to_use = raw_municipality or "St. Louis County"
+            if city_to_use.upper() == "UNINCORPORATED":
+                city_to_use = "St. Louis County (Unincorporated)"
+            zip_to_use = raw_zip if raw_zip and len(raw_zip) == 5 else "63105"
+            standardized_address = processor.standardize_address(
+                f"{raw_address}, {city_to_use}, MO {zip_to_use}",
+                default_city=city_to_use, default_state="MO", default_zip=zip_to_use
+            )
+            region_name = raw_municipality.title() if raw_municipality else "St. Louis County"
+            owner = {
+                "name": processor.get_field_value(row, "county", "owner", "name", ""),
+                "tenure": processor.get_field_value(row, "county", "owner", "tenure", "")
+            }
+
+        if not standardized_address:
+            continue
+
+        land_area = processor.safe_to_numeric(row.get("landarea"), 0)
+        building_sqft = processor.safe_to_numeric(processor.get_field_value(row, region, "building", "area"), 0)
+        building_year = processor.safe_to_numeric(processor.get_field_value(row, region, "building", "year"), 0)
+        property_type = processor.classify_property(processor.get_field_value(row, region, "property_class", None), region)
+        landscaping_analysis = processor.calculate_advanced_landscapable_area(
+            land_area, building_sqft, property_type, temp_record['assessment']
+        )
+
+        base_record = {
+            "id": parcel_id,
+            "full_address": standardized_address,
+            "latitude": round(lat, 6),
+            "longitude": round(lng, 6),
+            "region": region_name,
+            "original_parcel_id": parcel_id,
+            "calc": {
+                "landarea_sqft": land_area,
+                "building_sqft": building_sqft,
+                "building_year": building_year,
+                "estimated_landscapable_area_sqft": landscaping_analysis['landscapable_area'],
+                "property_type": property_type,
+                "confidence_score": landscaping_analysis['confidence_score'],
+                "landscaping_difficulty": landscaping_analysis['landscaping_difficulty']
+            },
+            "owner": owner,
+            "assessment": temp_record['assessment']
+        }
+        base_record.update(processor.calculate_pricing_components(base_record, regional_stats))
+        results.append(base_record)
+
+    return results, geometry_data
+
+
+class ColumnarEngineParityTest(unittest.TestCase):
+    """The columnar record engine must serialize byte-for-byte like the row-wise path"""
+
+    def setUp(self):
+        self.processor = ShapefileProcessor(Path(tempfile.gettempdir()), "small")
+
+    def assertSameJson(self, actual, expected):
+        self.assertEqual(
+            json.dumps(actual, separators=(',', ':')),
+            json.dumps(expected, separators=(',', ':'))
+        )
+
+    def test_region_records_match_rowwise(self):
+        for region in ("city", "county"):
+            with self.subTest(region=region):
+                gdf, gdf_wgs84, centroids = make_region_frames(region)
+                expected_records, expected_geometry = build_region_records_rowwise(
+                    self.processor, gdf, gdf_wgs84, centroids, region
+                )
+                records, geometry = self.processor.build_region_records(gdf, gdf_wgs84, centroids, region)
+
+                self.assertGreater(len(records), 0)
+                self.assertSameJson(records, expected_records)
+                self.assertSameJson(geometry, expected_geometry)
+
+    def test_calculations_match_scalar_helpers_for_every_property_type(self):
+        rng = np.random.default_rng(3)
+        count = 2000
+        land = rng.choice([-5.0, 0, 800.0, 4999.0, 5000.0, 12000.0, 43561.0, 250000.0, np.nan], size=count)
+        building = rng.choice([0, 1.0, 900.0, 3000.0, 60000.0, np.nan], size=count)
+        totals = rng.choice([0, -1.0, 1.0, 99000.0, 150000.0, 310000.0, 510000.0, 4e6, np.nan], size=count)
+        land_values = rng.choice([0, 1.0, 50000.0, 900000.0, np.nan], size=count)
+        property_type = rng.choice(PROPERTY_TYPES, size=count).astype(object)
+        stats = {'median_assessment': 137500.0}
+
+        landscaping = self.processor.calculate_advanced_landscapable_area_columns(
+            pd.Series(land), pd.Series(building), property_type, pd.Series(totals)
+        )
+        pricing = self.processor.calculate_pricing_components_columns(
+            pd.Series(totals), pd.Series(land_values), property_type, stats
+        )
+
+        for i in range(count):
+            expected = self.processor.calculate_advanced_landscapable_area(
+                land[i].item(), building[i].item(), property_type[i], {'total': totals[i].item()}
+            )
+            actual = {key: values[i] for key, values in landscaping.items()}
+            self.assertSameJson(actual, expected)
+
+            expected = self.processor.calculate_pricing_components({
+                'assessment': {'total': totals[i].item(), 'land': land_values[i].item()},
+                'calc': {'property_type': property_type[i]}
+            }, stats)
+            actual = {key: values[i] for key, values in pricing.items()}
+            self.assertSameJson(actual, expected)
+
+    def test_classify_property_column_matches_scalar(self):
+        codes = ["A1", "b", " c3 ", "D", "E", "F9", "Z", "R", "RES", "COM", "IND", "AGR", "EX", "C", None, np.nan, 5, ""]
+        for region in ("city", "county", "other"):
+            with self.subTest(region=region):
+                expected = [self.processor.classify_property(code, region) for code in codes]
+                self.assertEqual(self.processor.classify_property_column(codes, region).tolist(), expected)
+
+    def test_safe_to_numeric_column_keeps_scalar_semantics(self):
+        values = pd.Series([1, 2.5, None, "abc", np.nan, "7"], dtype=object)
+        expected = [self.processor.safe_to_numeric(value) for value in values.tolist()]
+        actual = self.processor.safe_to_numeric_column(values).tolist()
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            if isinstance(e, float) and np.isnan(e):
+                self.assertTrue(np.isnan(a))
+            else:
+                self.assertEqual(a, e)
+
+
+class ParallelIngestTest(unittest.TestCase):
+    """Chunked pool processing must produce the same records as the serial path"""
+
+    def test_pool_chunks_match_serial(self):
+        serial = ShapefileProcessor(Path(tempfile.gettempdir()), "small")
+        parallel = ShapefileProcessor(Path(tempfile.gettempdir()), "small", workers=2)
+
+        with mock.patch.object(ingest_shapes, "MIN_PARALLEL_CHUNK", 16), ProcessPoolExecutor(max_workers=2) as pool:
+            parallel.executor = pool
+            for region in ("city", "county"):
+                with self.subTest(region=region):
+                    frames = make_region_frames(region)
+                    self.assertTrue(parallel._use_pool(len(frames[0])))
+                    self.assertGreater(len(parallel._chunk_bounds(len(frames[0]))), 1)
+                    self.assertEqual(
+                        json.dumps(parallel.build_region_records(*frames, region)),
+                        json.dumps(serial.build_region_records(*frames, region))
+                    )
+
+
+class IncrementalIngestTest(unittest.TestCase):
+    """Incremental runs must patch the previous build into what a full rebuild produces"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_build(self, frames, region="city", tolerance=0.01):
+        processor = ShapefileProcessor(self.data_dir, "small")
+        processor.incremental = IncrementalIngest(self.data_dir, "small", tolerance)
+        records, geometry = processor.build_region_records(*frames, region)
+
+        # Same envelopes step_2_create_intermediate_files writes
+        with open(processor.incremental.output_path(region, "parcel_metadata"), "w") as f:
+            json.dump({"parcels": {
+                record["id"]: {
+                    "id": record["id"],
+                    "primary_full_address": record["full_address"],
+                    "latitude": record["latitude"],
+                    "longitude": record["longitude"],
+                    "region": record["region"],
+                    "calc": record["calc"],
+                    "owner": record["owner"],
+                    "assessment": record["assessment"],
+                    "affluence_score": record["affluence_score"],
+                    "commercial_multiplier": record["commercial_multiplier"],
+                    "maintenance_multiplier": record["maintenance_multiplier"],
+                    "combined_multiplier": record["combined_multiplier"],
+                    "pricing_tier": record["pricing_tier"]
+                } for record in records
+            }}, f)
+        with open(processor.incremental.output_path(region, "parcel_geometry"), "w") as f:
+            json.dump({"geometries": geometry}, f)
+        processor.incremental.save_manifests()
+        return processor.incremental.plans[region], records, geometry
+
+    def test_only_changed_parcels_are_recomputed(self):
+        gdf, gdf_wgs84, centroids = make_region_frames("city")
+        plan, _, _ = self.run_build((gdf, gdf_wgs84, centroids))
+        self.assertTrue(plan["full"])
+
+        # Edit addresses and drop a parcel that does not feed the regional stats
+        changed = gdf.copy()
+        changed.loc[changed.index[[3, 40, 41]], "SITEADDR"] = "999 Changed Street"
+        dropped = changed.index[changed["ASMTTOTAL"].isna() & (changed["HANDLE"] != " ")][0]
+        keep = changed.index != dropped
+        frames = (changed[keep], gdf_wgs84[keep], centroids[keep])
+
+        plan, records, geometry = self.run_build(frames)
+        self.assertFalse(plan["full"])
+        self.assertEqual(int(plan["recompute"].sum()), 3)
+
+        expected_records, expected_geometry = ShapefileProcessor(self.data_dir, "small").build_region_records(*frames, "city")
+        self.assertEqual(json.dumps(records), json.dumps(expected_records))
+        self.assertEqual(json.dumps(geometry), json.dumps(expected_geometry))
+
+    def test_regional_stats_shift_forces_full_rebuild(self):
+        gdf, gdf_wgs84, centroids = make_region_frames("city")
+        self.run_build((gdf, gdf_wgs84, centroids))
+
+        shifted = gdf.copy()
+        shifted["ASMTTOTAL"] = shifted["ASMTTOTAL"] * 1.5
+        plan, _, _ = self.run_build((shifted, gdf_wgs84, centroids))
+        self.assertTrue(plan["full"])
+
+    def test_small_stats_shifts_do_not_compound(self):
+        gdf, gdf_wgs84, centroids = make_region_frames("city")
+        self.run_build((gdf, gdf_wgs84, centroids))
+
+        # Each run moves the stats about 0.7% from the previous one, 1.4% from the full rebuild
+        for factor, full in ((1.007, False), (1.014, True)):
+            shifted = gdf.copy()
+            shifted["ASMTTOTAL"] = shifted["ASMTTOTAL"] * factor
+            plan, _, _ = self.run_build((shifted, gdf_wgs84, centroids))
+            self.assertEqual(plan["full"], full)
+
+
+class PrebuiltIndexStepTest(unittest.TestCase):
+    """Step 5b wiring around build_flexsearch_index.js"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pipeline = ingest_shapes.DocumentModePipeline.__new__(ingest_shapes.DocumentModePipeline)
+        self.pipeline.temp_dir = Path(self.tmp.name)
+        self.pipeline.profiler = StageProfiler()
+        self.pipeline.scripts_dir = Path(ingest_shapes.__file__).parent
+        self.pipeline.project_root = self.pipeline.scripts_dir.parent.parent.parent
+        self.pipeline.regions = load_regions()
+        self.pipeline.partial_run = False
+        self.pipeline.build_times = BuildTimes(Path(self.tmp.name) / "build-times.json")
+        records = [{"id": f"P{i}", "full_address": f"{i} MAIN ST", "latitude": 38.6, "longitude": -90.2,
+                    "region": "St. Louis City"} for i in range(3)]
+        self.document_files = self.pipeline.step_5_create_document_files({"city": records})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_index_files_are_listed_in_latest_json(self):
+        summary = {"success": True, "region": "stl_city", "documents": 3, "bytes": 900, "source_bytes": 300,
+                   "build_ms": 12.0, "import_ms": 3.0, "mismatched_queries": []}
+        completed = mock.Mock(returncode=0, stdout="✅ Prebuilt\n" + json.dumps(summary) + "\n", stderr="")
+        with mock.patch.object(ingest_shapes.subprocess, "run", return_value=completed) as run:
+            files = self.pipeline.step_5b_prebuild_search_indexes(self.document_files)
+
+        command = run.call_args.args[0]
+        self.assertEqual(Path(command[1]).name, "build_flexsearch_index.js")
+        self.assertEqual(command[2:], [str(self.pipeline.temp_dir / "stl_city-document.json"),
+                                       str(self.pipeline.temp_dir / "stl_city-flexsearch.json"), "stl_city",
+                                       self.pipeline.build_times.get("latest.json")])
+        self.assertEqual(files[-2:], [self.pipeline.temp_dir / "stl_city-flexsearch.json",
+                                      self.pipeline.temp_dir / "latest.json"])
+        latest = json.loads((self.pipeline.temp_dir / "latest.json").read_text())
+        self.assertEqual(latest["regions"][0]["index_file"], "stl_city-flexsearch.json")
+
+    def test_failed_build_keeps_document_mode(self):
+        stderr = ("node:internal/modules/esm/resolve:873\n  throw new ERR_MODULE_NOT_FOUND(packageName);\n\n"
+                  "Error [ERR_MODULE_NOT_FOUND]: Cannot find package 'flexsearch' imported from "
+                  "build_flexsearch_index.js\n    at packageResolve (node:internal/modules/esm/resolve:873:9)\n")
+        failed = mock.Mock(returncode=1, stdout="", stderr=stderr)
+        with mock.patch.object(ingest_shapes.subprocess, "run", return_value=failed), \
+                mock.patch("builtins.print") as printed:
+            files = self.pipeline.step_5b_prebuild_search_indexes(self.document_files)
+
+        self.assertEqual(files, self.document_files)
+        latest = json.loads((self.pipeline.temp_dir / "latest.json").read_text())
+        self.assertNotIn("index_file", latest["regions"][0])
+        printed.assert_any_call("⚠️ Skipping prebuilt stl_city index: flexsearch not installed")
+
+    def test_builder_failures_report_their_reason(self):
+        cases = [
+            (mock.Mock(returncode=1, stdout="", stderr="SyntaxError: Unexpected token\n    at parse\n"),
+             "SyntaxError: Unexpected token"),
+            (mock.Mock(returncode=137, stdout="", stderr=""), "index builder exited with code 137"),
+            (mock.Mock(returncode=1, stdout=json.dumps({"success": False, "error": "bad documents"}), stderr=""),
+             "bad documents"),
+        ]
+        for completed, reason in cases:
+            with self.subTest(reason=reason):
+                self.assertEqual(ingest_shapes.DocumentModePipeline._index_builder_summary(completed),
+                                 {"success": False, "error": reason})
+        with mock.patch.object(ingest_shapes.subprocess, "run", side_effect=FileNotFoundError("node")), \
+                mock.patch("builtins.print") as printed:
+            self.assertEqual(self.pipeline.step_5b_prebuild_search_indexes(self.document_files), self.document_files)
+        printed.assert_any_call("⚠️ Skipping prebuilt stl_city index: node not installed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary columnar parcel metadata format
+"""
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from parcel_columns import ParcelColumnReader, write_parcel_columns
+
+
+def metadata_entry(parcel_id, **overrides):
+    entry = {
+        "id": parcel_id,
+        "primary_full_address": f"{parcel_id[-3:]} MAIN ST, St. Louis, MO 63104",
+        "latitude": 38.6,
+        "longitude": -90.2,
+        "region": "St. Louis City",
+        "calc": {
+            "landarea_sqft": 4212.5,
+            "building_sqft": 1200,
+            "estimated_landscapable_area_sqft": 2410.25,
+            "property_type": "unknown"
+        },
+        "owner": {"name": "Café Ståhl"},
+        "assessment": {"total": 1000},
+        "affluence_score": 50,
+        "pricing_tier": "standard"
+    }
+    entry.update(overrides)
+    return entry
+
+
+class ParcelColumnsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "stl_city-parcel_metadata.bin"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup_returns_transform_fields(self):
+        ids = [str(10010000000 + i * 13) for i in range(500)] + ["18K230049", "21J510012"]
+        entries = [metadata_entry(parcel_id) for parcel_id in reversed(ids)]
+        self.assertEqual(write_parcel_columns(self.path, entries, {"region": "St. Louis City"}), len(ids))
+
+        with ParcelColumnReader(self.path) as reader:
+            self.assertEqual(len(reader), len(ids))
+            self.assertEqual(reader.metadata["region"], "St. Louis City")
+            for parcel_id in ids:
+                record = reader.get(parcel_id)
+                self.assertEqual(record["id"], parcel_id)
+                self.assertEqual(record["primary_full_address"], f"{parcel_id[-3:]} MAIN ST, St. Louis, MO 63104")
+                self.assertEqual(record["calc"], {
+                    "landarea_sqft": 4212.5,
+                    "building_sqft": 1200.0,
+                    "estimated_landscapable_area_sqft": 2410.25,
+                    "property_type": "unknown"
+                })
+                self.assertEqual(record["owner"], {"name": "Café Ståhl"})
+                self.assertEqual(record["affluence_score"], 50.0)
+            self.assertIsNone(reader.get("10010000001"))
+            self.assertIsNone(reader.get(""))
+
+    def test_missing_values(self):
+        entries = [
+            metadata_entry("1", owner={"name": float("nan")}, affluence_score=None),
+            metadata_entry("2", calc={"landarea_sqft": float("nan")}, owner={})
+        ]
+        write_parcel_columns(self.path, entries)
+        with ParcelColumnReader(self.path) as reader:
+            first = reader.get("1")
+            self.assertIsNone(first["owner"]["name"])
+            self.assertTrue(math.isnan(first["affluence_score"]))
+            second = reader.get("2")
+            self.assertTrue(math.isnan(second["calc"]["landarea_sqft"]))
+            self.assertIsNone(second["calc"]["property_type"])
+
+    def test_duplicate_ids_keep_last_entry(self):
+        write_parcel_columns(self.path, [metadata_entry("7", latitude=1.0), metadata_entry("7", latitude=2.0)])
+        with ParcelColumnReader(self.path) as reader:
+            self.assertEqual(len(reader), 1)
+            self.assertEqual(reader.get("7")["latitude"], 2.0)
+
+    def test_load_columns(self):
+        entries = [metadata_entry(str(i), latitude=float(i)) for i in (30, 4, 100)]
+        write_parcel_columns(self.path, entries)
+        with ParcelColumnReader(self.path) as reader:
+            columns = reader.load_columns()
+        self.assertEqual(columns["id"], ["100", "30", "4"])
+        self.assertEqual(columns["latitude"].tolist(), [100.0, 30.0, 4.0])
+        self.assertEqual(columns["owner_name"], ["Café Ståhl"] * 3)
+
+    def test_empty_and_invalid_files(self):
+        write_parcel_columns(self.path, [])
+        with ParcelColumnReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertIsNone(reader.get("1"))
+
+        self.path.write_bytes(b"{\"parcels\":{}}")
+        with self.assertRaises(ValueError):
+            ParcelColumnReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
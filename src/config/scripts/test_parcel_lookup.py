@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for point-in-parcel lookups and the validator's landmark checks
+"""
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import shapely
+
+from geometry_checks import GeometryArrays
+from parcel_lookup import ParcelLookup, locate_in_regions, lookup_file
+from parcel_topology import ParcelIndex
+from region_registry import load_regions, select_regions
+from test_geometry_checks import polygon, square
+from validate_geometries import GeometryValidator
+
+
+class ParcelLookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometries = {
+            "A": polygon(square(-90.2, 38.6)),
+            "B": polygon(square(-90.199, 38.6)),  # shares A's east edge
+            "C": polygon(square(-90.19, 38.6, 0.01), square(-90.185, 38.605)),  # courtyard with a hole
+            "M": {"type": "MultiPolygon", "coordinates": [[square(-90.17, 38.6)], [square(-90.16, 38.6)]]},
+            "open": polygon(square(-90.15, 38.6)[:-1]),
+            "null": None,
+        }
+        index = ParcelIndex()
+        index.add(list(self.geometries), GeometryArrays(list(self.geometries.values())))
+        self.lookup = ParcelLookup.from_index(index)
+
+    def test_locate(self):
+        self.assertEqual(self.lookup.locate(38.6005, -90.1995), "A")
+        self.assertEqual(self.lookup.locate(38.6005, -90.1985), "B")
+        self.assertEqual(self.lookup.locate(38.601, -90.189), "C")
+        self.assertIsNone(self.lookup.locate(38.6055, -90.1845))  # in C's hole
+        self.assertEqual(self.lookup.locate(38.6005, -90.1595), "M")  # second part
+        self.assertIsNone(self.lookup.locate(38.6005, -90.1495))  # the open ring is not indexed
+        self.assertIsNone(self.lookup.locate(38.7, -90.3))
+        self.assertEqual(len(self.lookup), 4)
+
+    def test_shared_edges_resolve_to_the_first_parcel(self):
+        self.assertEqual(self.lookup.locate(38.6005, -90.199), "A")
+        self.assertEqual(self.lookup.locate_many([38.6005], [-90.199]), ["A"])
+
+    def test_batches_match_single_lookups(self):
+        lats = [38.6005 + i * 0.0003 for i in range(40)]
+        lngs = [-90.2 + i * 0.001 for i in range(40)]
+        self.assertEqual(self.lookup.locate_many(lats, lngs),
+                         [self.lookup.locate(lat, lng) for lat, lng in zip(lats, lngs)])
+        self.assertEqual(self.lookup.locate_many([], []), [])
+        self.assertEqual(ParcelLookup([], ParcelIndex().shapes).locate_many([38.6], [-90.2]), [None])
+
+    def test_from_file_matches_from_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "stl_city-parcel_geometry.json.gz"
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump({"geometries": self.geometries, "metadata": {}}, f)
+            streamed = ParcelLookup.from_file(path, batch_size=2)
+        self.assertEqual(streamed.parcel_ids, self.lookup.parcel_ids)
+        self.assertEqual(streamed.locate(38.601, -90.189), "C")
+
+    def test_sidecar_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "stl_city-parcel_geometry.json"
+            with open(path, 'w') as f:
+                json.dump({"geometries": self.geometries}, f)
+            built = ParcelLookup.for_artifact(path)
+            self.assertTrue(lookup_file(path).exists())
+            self.assertEqual(lookup_file(path).name, "stl_city-parcel_geometry.lookup.npz")
+
+            loaded = ParcelLookup.load(lookup_file(path))
+            self.assertEqual(loaded.parcel_ids, built.parcel_ids)
+            self.assertTrue(shapely.equals(loaded.shapes, built.shapes).all())
+            self.assertEqual(loaded.locate(38.6055, -90.1845), None)
+
+            # A newer artifact is rebuilt instead of read from the stale sidecar
+            with open(path, 'w') as f:
+                json.dump({"geometries": {"N": self.geometries["A"]}}, f)
+            os.utime(path, (time.time() + 10, time.time() + 10))
+            self.assertEqual(ParcelLookup.for_artifact(path).parcel_ids, ["N"])
+            self.assertEqual(ParcelLookup.for_artifact(path).parcel_ids, ["N"])
+
+    def test_first_region_wins(self):
+        index = ParcelIndex()
+        index.add(["Z"], GeometryArrays([polygon(square(-90.2, 38.6))]))
+        other = ParcelLookup.from_index(index)
+        regions, parcel_ids = locate_in_regions({"city": self.lookup, "county": other},
+                                                [38.6005, 38.6005, 38.7], [-90.1995, -90.1985, -90.3])
+        self.assertEqual(regions, ["city", "city", None])
+        self.assertEqual(parcel_ids, ["A", "B", None])
+
+
+class LandmarkValidationTest(unittest.TestCase):
+
+    def run_validation(self, files: dict, regions=None) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            for prefix, geometries in files.items():
+                with open(Path(tmp) / f"{prefix}-parcel_geometry.json", 'w') as f:
+                    json.dump({"geometries": geometries}, f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return GeometryValidator(Path(tmp), regions=regions).run_full_validation()
+
+    def test_landmarks_resolve_to_parcels(self):
+        files = {
+            "stl_city": {"ARCH": polygon(square(-90.185, 38.624)), "PARK": polygon(square(-90.285, 38.636))},
+            "stl_county": {"AIRPORT": polygon(square(-90.371, 38.748))},
+        }
+        results = self.run_validation(files)
+        landmarks = results["landmarks"]
+        self.assertEqual((landmarks["gateway_arch"]["region"], landmarks["gateway_arch"]["parcel_id"]), ("city", "ARCH"))
+        self.assertEqual(landmarks["lambert_airport"]["parcel_id"], "AIRPORT")
+        self.assertEqual(landmarks["downtown_stl"]["status"], "missing")
+        self.assertEqual(landmarks["downtown_stl"]["expected_regions"], ["city", "county"])
+        self.assertEqual(results["summary"]["landmarks"], {"resolved": 3, "missing": 1, "not_covered": 0})
+        # Every geometry is valid, but a missing landmark needs a look
+        self.assertEqual(results["summary"]["overall_validity_rate"], 100.0)
+        self.assertEqual(results["summary"]["recommendation"], "REVIEW")
+
+        files["stl_city"]["DOWNTOWN"] = polygon(square(-90.2, 38.626))
+        self.assertEqual(self.run_validation(files)["summary"]["recommendation"], "PASS")
+
+    def test_landmarks_outside_validated_regions_are_not_required(self):
+        results = self.run_validation({"stl_city": {"ARCH": polygon(square(-90.185, 38.624))}},
+                                      select_regions(load_regions(), ["city"]))
+        self.assertEqual(results["landmarks"]["lambert_airport"]["status"], "not_covered")
+        self.assertEqual(results["summary"]["landmarks"], {"resolved": 1, "missing": 2, "not_covered": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for parcel-id sharded parcel metadata
+"""
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from artifact_compression import CompressionSettings
+from parcel_shards import (
+    fnv1a32, is_shard_file, region_for_parcel_id, region_names, shard_file_name, shard_for_parcel_id,
+    write_metadata_shards
+)
+
+
+def metadata_entry(parcel_id: str, region: str) -> dict:
+    return {"id": parcel_id, "primary_full_address": f"{parcel_id} MAIN ST", "region": region}
+
+
+def county_entry(parcel_id: str) -> tuple:
+    # County records are labelled with their municipality, not the region name
+    return "stl_county", metadata_entry(parcel_id, "Florissant")
+
+
+class ParcelShardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fnv1a32_reference_values(self):
+        self.assertEqual(fnv1a32(""), 0x811C9DC5)
+        self.assertEqual(fnv1a32("a"), 0xE40C292C)
+        self.assertEqual(fnv1a32("foobar"), 0xBF9CF968)
+
+    def test_region_rule_matches_determine_region_from_parcel_id(self):
+        cases = {
+            "10010000001": "stl_city",
+            "1": "stl_city",
+            "100100000012": "stl_county",
+            "18K230049": "stl_county",
+            "": "stl_county",
+            "１２３": "stl_county",
+            "123\n": "stl_county",
+        }
+        for parcel_id, region in cases.items():
+            with self.subTest(parcel_id=parcel_id):
+                self.assertEqual(region_for_parcel_id(parcel_id), region)
+
+    def test_every_parcel_lands_in_its_computed_shard(self):
+        entries = [("stl_city", metadata_entry(str(10010000000 + i * 7), "St. Louis City")) for i in range(300)]
+        entries += [county_entry(f"{i:02d}K{i * 31 % 999999:06d}") for i in range(300)]
+        # Numeric county id: sharded with the city, where determineRegionFromParcelId looks for it
+        entries.append(county_entry("123456789"))
+
+        settings = CompressionSettings()
+        manifest, paths = write_metadata_shards(
+            self.dir, entries, 8, "2025-07-11T17:01:15",
+            opener=lambda path: settings.open_tee(path, self.dir)
+        )
+
+        self.assertEqual(len(paths), 16)
+        self.assertTrue(all(is_shard_file(path) for path in paths))
+        self.assertEqual(manifest["relocated_parcels"], 1)
+        self.assertEqual(manifest["regions"]["stl_city"]["total_parcels"], 301)
+        self.assertEqual(manifest["regions"]["stl_county"]["total_parcels"], 300)
+
+        for _, entry in entries:
+            region = region_for_parcel_id(entry["id"])
+            shard_path = self.dir / f"{shard_file_name(region, shard_for_parcel_id(entry['id'], 8))}.gz"
+            with gzip.open(shard_path, "rt") as f:
+                shard = json.load(f)
+            self.assertEqual(shard["parcels"][entry["id"]], entry)
+            self.assertEqual(shard["metadata"]["shard_count"], 8)
+
+    def test_empty_shards_are_still_written(self):
+        manifest, paths = write_metadata_shards(self.dir, [("stl_city", metadata_entry("1", "St. Louis City"))], 4, "now")
+        self.assertTrue(all(path.exists() for path in paths))
+        counts = [shard["parcels"] for shard in manifest["regions"]["stl_county"]["shards"]]
+        self.assertEqual(counts, [0, 0, 0, 0])
+        self.assertEqual(json.loads(paths[-1].read_text())["parcels"], {})
+
+    def test_registered_regions_are_sharded_under_their_prefix(self):
+        regions = {**region_names(), "stl_jefferson": "Jefferson County"}
+        entries = [("stl_jefferson", metadata_entry("12345", "Jefferson County")), county_entry("18K230049")]
+        manifest, paths = write_metadata_shards(self.dir, entries, 2, "now", regions=regions)
+
+        self.assertEqual(list(manifest["regions"]), ["stl_city", "stl_county", "stl_jefferson"])
+        self.assertEqual(manifest["regions"]["stl_jefferson"]["total_parcels"], 1)
+        self.assertEqual(manifest["relocated_parcels"], 0)
+        self.assertTrue(all(is_shard_file(path, regions) for path in paths))
+        self.assertFalse(is_shard_file(paths[-1]))
+        self.assertFalse(is_shard_file(self.dir / "stl_city-parcel_metadata.json"))
+
+        with self.assertRaises(ValueError):
+            write_metadata_shards(self.dir, [("stl_franklin", metadata_entry("1", "Franklin County"))], 2, "now")
+
+    def test_shards_are_stamped_by_content(self):
+        times = {"stl_city-parcel_metadata-001.json": "2025-07-12T00:00:00"}
+        entries = [("stl_city", metadata_entry(str(10010000000 + i), "St. Louis City")) for i in range(20)]
+        manifest, paths = write_metadata_shards(self.dir, entries, 2, "unused",
+                                                stamp=lambda name, digest: times.get(name, "2025-07-11T00:00:00"))
+        build_times = {path.name: json.loads(path.read_text())["metadata"]["build_time"] for path in paths}
+        self.assertEqual(build_times["stl_city-parcel_metadata-001.json"], "2025-07-12T00:00:00")
+        self.assertEqual(build_times["stl_city-parcel_metadata-000.json"], "2025-07-11T00:00:00")
+        self.assertEqual(manifest["build_time"], "2025-07-12T00:00:00")
+
+    def test_invalid_shard_count(self):
+        with self.assertRaises(ValueError):
+            write_metadata_shards(self.dir, [], 0, "now")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the spatial-index overlap, duplicate and sliver checks
+"""
+
+import unittest
+
+import geopandas as gpd
+import shapely
+
+from geometry_checks import GeometryArrays
+from parcel_topology import ParcelIndex, check_topology
+from test_geometry_checks import polygon, square
+
+
+def strip(lng: float, lat: float, width: float = 0.001, height: float = 0.000005) -> list:
+    """A thin rectangle, about 87 m x 0.55 m at 0.001 x 0.000005 degrees"""
+    east, north = round(lng + width, 6), round(lat + height, 6)
+    return [[lng, lat], [east, lat], [east, north], [lng, north], [lng, lat]]
+
+
+class ParcelTopologyTest(unittest.TestCase):
+
+    def check(self, geometries: dict, **kwargs) -> dict:
+        return check_topology(list(geometries), list(geometries.values()), **kwargs)
+
+    def test_adjacent_parcels_are_clean(self):
+        # A 3x3 block sharing edges and corners
+        block = {f"{row}{column}": polygon(square(round(-90.2 + column * 0.001, 5), round(38.6 + row * 0.001, 5)))
+                 for row in range(3) for column in range(3)}
+        report = self.check(block)
+        self.assertEqual(report["parcels"], 9)
+        self.assertGreater(report["candidate_pairs"], 0)
+        for kind in ("invalid", "duplicates", "overlaps", "slivers"):
+            self.assertEqual(report[kind], 0, kind)
+
+    def test_duplicates_are_not_also_overlaps(self):
+        report = self.check({"A": polygon(square(-90.2, 38.6)), "B": polygon(square(-90.2, 38.6)),
+                             "C": polygon(square(-90.199, 38.6))})
+        self.assertEqual((report["duplicates"], report["overlaps"]), (1, 0))
+        self.assertEqual(report["examples"]["duplicates"], ["Parcels A and B: same geometry"])
+
+    def test_overlap_area_threshold(self):
+        # Shifted 0.00001 degrees east onto its neighbour: about 0.87 m x 111 m
+        geometries = {"A": polygon(square(-90.2, 38.6)), "B": polygon(square(-90.19901, 38.6))}
+        report = self.check(geometries)
+        self.assertEqual(report["overlaps"], 1)
+        self.assertAlmostEqual(report["overlap_area_m2"], 0.00001 * 0.001 * 0.7815 * 111195 ** 2, delta=1.0)
+        self.assertRegex(report["examples"]["overlaps"][0], r"^Parcels A and B overlap by 9\d\.\d m²$")
+        self.assertEqual(self.check(geometries, min_overlap_area=100.0)["overlaps"], 0)
+
+    def test_slivers(self):
+        report = self.check({"A": polygon(square(-90.2, 38.6)), "S": polygon(strip(-90.2, 38.61))})
+        self.assertEqual(report["slivers"], 1)
+        self.assertRegex(report["examples"]["slivers"][0], r"^Parcel S: sliver 0\.5\d m wide")
+
+    def test_invalid_polygons_are_reported_and_repaired(self):
+        bow_tie = [[-90.2, 38.6], [-90.199, 38.601], [-90.199, 38.6], [-90.2, 38.601], [-90.2, 38.6]]
+        report = self.check({"X": polygon(bow_tie), "A": polygon(square(-90.2, 38.6))})
+        self.assertEqual(report["invalid"], 1)
+        self.assertIn("Self-intersection", report["examples"]["invalid"][0])
+        # The repaired bow tie still overlaps the square it sits on
+        self.assertEqual(report["overlaps"], 1)
+
+    def test_holes_and_multipolygons(self):
+        courtyard = polygon(square(-90.2, 38.6, 0.01), square(-90.195, 38.605))
+        two_parts = {"type": "MultiPolygon", "coordinates": [[square(-90.18, 38.6)], [square(-90.17, 38.6)]]}
+        report = self.check({
+            "C": courtyard,
+            "H": polygon(square(-90.195, 38.605)),  # fills the hole exactly
+            "M": two_parts,
+            "O": polygon(square(-90.1695, 38.6)),  # overlaps the second part of M
+        })
+        self.assertEqual((report["parcels"], report["overlaps"], report["duplicates"]), (4, 1, 0))
+        self.assertIn("Parcels M and O", report["examples"]["overlaps"][0])
+
+    def test_structurally_broken_geometries_are_skipped(self):
+        report = self.check({"A": polygon(square(-90.2, 38.6)), "open": polygon(square(-90.2, 38.6)[:-1]),
+                             "null": None, "point": {"type": "Point", "coordinates": [-90.2, 38.6]}})
+        self.assertEqual((report["parcels"], report["duplicates"], report["overlaps"]), (1, 0, 0))
+
+    def test_empty_ring_at_end_of_batch(self):
+        # The empty ring starts at len(coords), past the last coordinate of the batch
+        for broken in ({"type": "Polygon", "coordinates": [[]]}, polygon(square(-90.19, 38.6), [])):
+            report = check_topology(["A", "B"], [polygon(square(-90.2, 38.6)), broken])
+            self.assertEqual((report["parcels"], report["duplicates"], report["overlaps"]), (1, 0, 0))
+
+    def test_area_and_perimeter_match_utm(self):
+        geometries = [polygon(square(-90.2, 38.6)), polygon(square(-90.3, 38.7, 0.002))]
+        index = ParcelIndex()
+        index.add(["A", "B"], GeometryArrays(geometries))
+        utm = gpd.GeoSeries([shapely.geometry.shape(g) for g in geometries], crs="EPSG:4326").to_crs("EPSG:26915")
+        for metric, expected in ((index.area, utm.area), (index.perimeter, utm.length)):
+            for value, reference in zip(metric.tolist(), expected.tolist()):
+                self.assertAlmostEqual(value / reference, 1.0, delta=0.002)
+
+    def test_merged_indexes_match_one_pass(self):
+        geometries = {
+            "A": polygon(square(-90.2, 38.6)), "B": polygon(square(-90.2, 38.6)), "C": polygon(square(-90.1995, 38.6)),
+            "S": polygon(strip(-90.2, 38.61)), "N": None, "D": polygon(square(-90.199, 38.6)),
+        }
+        names = list(geometries)
+        merged = ParcelIndex()
+        for start in range(0, len(names), 2):
+            batch = ParcelIndex()
+            batch.add(names[start:start + 2], GeometryArrays([geometries[name] for name in names[start:start + 2]]))
+            merged.merge(batch)
+        self.assertEqual(merged.check(), self.check(geometries))
+        self.assertEqual(len(merged), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
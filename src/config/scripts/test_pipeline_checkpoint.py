@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for step checkpoints and resumed pipeline runs
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from blob_standin import StandInBlobServer
+from ingest_shapes import DocumentModePipeline
+from pipeline_checkpoint import STEPS, CheckpointError, PipelineCheckpoint, step_name
+from synthetic_shapefiles import write_datasets
+
+STANDIN = str(Path(__file__).parent / "blob_standin.py")
+FAILING_WORKER = [sys.executable, "-c", "import sys; sys.exit(2)"]
+
+
+class PipelineCheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.output = self.root / "stl_city-address_index.json"
+        self.output.write_text("{}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_step_names(self):
+        self.assertEqual(step_name("4"), "step_4_upload_compressed_files")
+        self.assertEqual(step_name("5b"), "step_5b_prebuild_search_indexes")
+        self.assertEqual(step_name("step_2"), "step_2_create_intermediate_files")
+        self.assertEqual(step_name(STEPS[0]), STEPS[0])
+        with self.assertRaises(CheckpointError):
+            step_name("8")
+
+    def test_resume_at_first_incomplete_step(self):
+        checkpoint = PipelineCheckpoint(self.root, {"dataset_size": "small"})
+        self.assertEqual(checkpoint.resume_step(), STEPS[0])
+        checkpoint.mark(STEPS[0], [checkpoint.save_artifact("city-records", [{"id": "1", "calc": (1, 2)}])])
+        checkpoint.mark(STEPS[1], [self.output], seconds=1.5)
+
+        loaded = PipelineCheckpoint(self.root, {"dataset_size": "small"})
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.resume_step(), STEPS[2])
+        self.assertEqual(loaded.outputs(STEPS[1]), [self.output])
+        self.assertEqual(loaded.load_artifact("city-records"), [{"id": "1", "calc": (1, 2)}])
+
+        # A step whose outputs are gone has to run again
+        self.output.unlink()
+        self.assertEqual(loaded.resume_step(), STEPS[1])
+
+    def test_from_step_needs_earlier_checkpoints(self):
+        checkpoint = PipelineCheckpoint(self.root, {})
+        checkpoint.mark(STEPS[0])
+        self.assertEqual(checkpoint.resume_step("2"), STEPS[1])
+        self.assertEqual(checkpoint.resume_step("1"), STEPS[0])
+        with self.assertRaises(CheckpointError):
+            checkpoint.resume_step("3")
+
+        checkpoint.mark(STEPS[1], [self.output])
+        checkpoint.discard_from(STEPS[1])
+        self.assertEqual(list(checkpoint.steps), [STEPS[0]])
+
+    def test_other_configuration_is_not_loaded(self):
+        PipelineCheckpoint(self.root, {"dataset_size": "small", "sources": [["a.shp", 1, 2]]}).mark(STEPS[0])
+        self.assertFalse(PipelineCheckpoint(self.root, {"dataset_size": "small", "sources": [["a.shp", 1, 3]]}).load())
+        self.assertTrue(PipelineCheckpoint(self.root, {"dataset_size": "small", "sources": [("a.shp", 1, 2)]}).load())
+
+
+class ResumedPipelineTest(unittest.TestCase):
+    """A run whose CDN upload fails, resumed against the stand-in blob server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.source = Path(cls.tmp.name) / "source"
+        write_datasets(cls.source, 600)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.work = tempfile.TemporaryDirectory()
+        self.server = StandInBlobServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.work.cleanup()
+
+    def pipeline(self, blob_worker=None, **options) -> DocumentModePipeline:
+        root = Path(self.work.name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = DocumentModePipeline(
+                dataset_size="large", source_root=self.source, data_dir=root / "data", temp_dir=root / "temp",
+                upload_retries=0, **options
+            )
+        # Step 6 copies document files under project_root/public/search
+        pipeline.project_root = root
+        standin = [sys.executable, STANDIN, "--serve", self.server.url]
+        pipeline.upload_commands = {"blob": blob_worker or standin, "firebase": standin}
+        pipeline.remote_lister = lambda target, prefix: {path for path in self.server.blobs if path.startswith(prefix)}
+        return pipeline
+
+    def run_pipeline(self, pipeline: DocumentModePipeline) -> bool:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pipeline.run_pipeline()
+
+    def stage_names(self, pipeline: DocumentModePipeline) -> list:
+        return [stage["name"] for stage in pipeline.profiler.stages if stage["name"].split()[-1] in STEPS]
+
+    def test_failed_upload_resumes_without_reprocessing(self):
+        failed = self.pipeline(FAILING_WORKER)
+        self.assertFalse(self.run_pipeline(failed))
+        self.assertTrue(failed.checkpoint.path.exists())
+        self.assertNotIn("step_4_upload_compressed_files", failed.checkpoint.steps)
+        self.assertIn("step_6_upload_document_files", failed.checkpoint.steps)
+
+        resumed = self.pipeline(resume=True)
+        self.assertEqual(resumed.start_step, "step_4_upload_compressed_files")
+        resumed.step_1_process_regional_data = lambda: self.fail("step 1 re-ran")
+        self.assertTrue(self.run_pipeline(resumed))
+
+        self.assertEqual(self.stage_names(resumed), ["restore step_1_process_regional_data"] + STEPS[3:])
+        self.assertIn("cdn/stl_city-parcel_metadata.json.gz", self.server.blobs)
+        self.assertEqual(resumed.shapefile_processor.join_stats, failed.shapefile_processor.join_stats)
+        self.assertEqual(len(resumed.stats["files_created"]), len(failed.stats["files_created"]))
+        # A completed run cleans up its checkpoint with the temp dir
+        self.assertFalse(resumed.temp_dir.exists())
+
+    def test_from_step_rebuilds_intermediate_files_from_checkpoint(self):
+        self.run_pipeline(self.pipeline(FAILING_WORKER))
+        metadata = Path(self.work.name) / "data" / "raw" / "stl_county-parcel_metadata.json"
+        expected = metadata.read_text()
+        metadata.unlink()
+
+        rerun = self.pipeline(from_step="2")
+        self.assertTrue(self.run_pipeline(rerun))
+        self.assertEqual(self.stage_names(rerun)[:2],
+                         ["restore step_1_process_regional_data", "step_2_create_intermediate_files"])
+        self.assertEqual(metadata.read_text().split('"build_time"')[0], expected.split('"build_time"')[0])
+
+    def test_from_step_without_checkpoint_fails(self):
+        with self.assertRaises(CheckpointError):
+            self.pipeline(from_step="3")
+
+    def test_fresh_run_discards_old_checkpoint(self):
+        self.run_pipeline(self.pipeline(FAILING_WORKER))
+        fresh = self.pipeline()
+        self.assertEqual(fresh.start_step, STEPS[0])
+        self.assertFalse(fresh.checkpoint.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
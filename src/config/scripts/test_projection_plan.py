@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass projection plan
+"""
+
+import unittest
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from benchmark_projection import legacy_project_region, synthetic_region
+from projection_plan import project_region
+
+
+def wkb(geometries) -> list:
+    return shapely.to_wkb(np.asarray(geometries)).tolist()
+
+
+class ProjectRegionTest(unittest.TestCase):
+
+    def assertMatchesLegacy(self, gdf):
+        expected_gdf, expected_wgs84, expected_centroids, _ = legacy_project_region(gdf.copy())
+        actual_gdf, actual_wgs84, actual_centroids = project_region(gdf.copy())
+
+        self.assertEqual(actual_gdf.crs, expected_gdf.crs)
+        self.assertEqual(list(actual_gdf.columns), list(expected_gdf.columns))
+        self.assertEqual(wkb(actual_gdf.geometry.array), wkb(expected_gdf.geometry.array))
+        np.testing.assert_array_equal(actual_gdf["landarea"].to_numpy(), expected_gdf["landarea"].to_numpy())
+        self.assertEqual(actual_wgs84.crs, expected_wgs84.crs)
+        self.assertEqual(wkb(actual_wgs84.geometry.array), wkb(expected_wgs84.geometry.array))
+        self.assertEqual(wkb(actual_centroids.array), wkb(expected_centroids.array))
+        self.assertEqual(list(actual_centroids.index), list(expected_centroids.index))
+
+    def test_matches_to_crs_chain_for_source_crs(self):
+        region = synthetic_region(400, seed=4)
+        for epsg in (26916, 2815, 4326, 26915):
+            with self.subTest(epsg=epsg):
+                self.assertMatchesLegacy(region.to_crs(epsg=epsg))
+
+    def test_z_missing_and_empty_geometries(self):
+        region = synthetic_region(30, seed=9)
+        geometries = list(region.geometry)
+        geometries[3] = None
+        geometries[7] = Polygon()
+        geometries[11] = shapely.force_3d(geometries[11], 150.0)
+        region = region.set_geometry(gpd.GeoSeries(geometries, index=region.index, crs=region.crs))
+        self.assertMatchesLegacy(region)
+
+    def test_keeps_frame_index(self):
+        region = synthetic_region(20, seed=1)
+        region.index = region.index * 3 + 1
+        gdf, gdf_wgs84, centroids = project_region(region)
+        self.assertEqual(list(gdf.index), list(gdf_wgs84.index))
+        self.assertEqual(list(gdf.index), list(centroids.index))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the region registry and the generic region processor
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from ingest_shapes import DocumentModePipeline
+from region_registry import DEFAULT_REGISTRY, RegionSpec, load_regions, select_regions
+from synthetic_shapefiles import write_datasets
+
+
+def registry_entries() -> list:
+    with open(DEFAULT_REGISTRY) as f:
+        return json.load(f)["regions"]
+
+
+class RegionRegistryTest(unittest.TestCase):
+
+    def test_default_registry(self):
+        regions = load_regions()
+        self.assertEqual([region.key for region in regions], ["city", "county"])
+        self.assertEqual([region.prefix for region in regions], ["stl_city", "stl_county"])
+        city, county = regions
+        self.assertEqual((city.crs, county.crs), (2815, 26916))
+        self.assertEqual(city.joins, ["dbf", "csv"])
+        self.assertEqual(county.fields["parcel_id"], "LOCATOR")
+        self.assertEqual(city.bounds, {"lat_min": 38.53, "lat_max": 38.77, "lng_min": -90.32, "lng_max": -90.17})
+
+    def test_classify_column_matches_scalar(self):
+        codes = ["R", "RES1", "C", "COMM", "I", "IND", "A", "AGR", "AB", "E", "EX", "EXEMPT",
+                 "B", "D", "F", "", "X", "NAN", "RC"]
+        for region in load_regions():
+            with self.subTest(region=region.key):
+                expected = [region.classify(code) for code in codes]
+                self.assertEqual(region.classify_column(pd.Series(codes, dtype=object)).tolist(), expected)
+
+    def test_invalid_entries(self):
+        county = registry_entries()[1]
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict({**county, "files": {"dbf": "Parcels_Current.dbf"}})
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict({**county, "joins": ["csv"]})
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict({**county, "addresses": {"format": "postcode"}})
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict({**county, "colour": "blue"})
+        with self.assertRaises(ValueError):
+            RegionSpec.from_dict({**county, "bounds": {"lat_min": 38.4, "lat_max": 38.8}})
+
+    def test_duplicate_keys_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "regions.json"
+            county = registry_entries()[1]
+            path.write_text(json.dumps({"regions": [county, {**county, "prefix": "other"}]}))
+            with self.assertRaises(ValueError):
+                load_regions(path)
+
+    @unittest.skipIf(yaml is None, "PyYAML not installed")
+    def test_yaml_registry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "regions.yaml"
+            path.write_text(yaml.safe_dump({"regions": registry_entries()}))
+            regions = load_regions(path)
+        self.assertEqual([region.fields for region in regions], [region.fields for region in load_regions()])
+
+    def test_select_regions(self):
+        regions = load_regions()
+        self.assertEqual([region.key for region in select_regions(regions, ["stl_county"])], ["county"])
+        self.assertEqual([region.key for region in select_regions(regions, ["county", "city"])], ["city", "county"])
+        self.assertEqual(len(select_regions(regions, None)), 2)
+        with self.assertRaises(ValueError):
+            select_regions(regions, ["jefferson"])
+
+
+class RegistryPipelineTest(unittest.TestCase):
+    """Regions declared only in a registry file run through the same pipeline"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmp.name)
+        write_datasets(cls.root / "source", 300, seed=11)
+
+        # A neighboring county with the county schema under its own prefix
+        entries = registry_entries()
+        neighbor = {**entries[1], "key": "jefferson", "prefix": "jefferson_county", "name": "Jefferson County",
+                    "addresses": {**entries[1]["addresses"], "fallback_city": "Jefferson County"}}
+        cls.registry = cls.root / "regions.json"
+        cls.registry.write_text(json.dumps({"regions": entries + [neighbor]}))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def run_steps(self, name: str, regions=None) -> DocumentModePipeline:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = DocumentModePipeline(
+                dataset_size="large", source_root=self.root / "source", data_dir=self.root / name / "data",
+                temp_dir=self.root / name / "temp", regions_file=self.registry, regions=regions
+            )
+            pipeline.project_root = self.root / name
+            region_records, region_geometry = pipeline.step_1_process_regional_data()
+            pipeline.step_2_create_intermediate_files(region_records, region_geometry)
+            pipeline.step_5_create_document_files(region_records)
+        self.region_records = region_records
+        return pipeline
+
+    def test_every_registry_region_is_processed(self):
+        pipeline = self.run_steps("all")
+        self.assertEqual(list(self.region_records), ["city", "county", "jefferson"])
+        self.assertEqual(len(self.region_records["jefferson"]), len(self.region_records["county"]))
+
+        latest = json.loads((pipeline.temp_dir / "latest.json").read_text())
+        self.assertEqual([entry["region"] for entry in latest["regions"]], ["stl_city", "stl_county", "jefferson_county"])
+        metadata = json.loads((pipeline.temp_raw_dir / "jefferson_county-parcel_metadata.json").read_text())
+        self.assertEqual(metadata["metadata"]["region"], "Jefferson County")
+
+    def test_single_region_run_keeps_published_regions(self):
+        published = self.root / "single" / "public" / "search" / "latest.json"
+        published.parent.mkdir(parents=True)
+        published.write_text(json.dumps({"regions": [
+            {"region": "stl_city", "document_file": "stl_city-document.json"},
+            {"region": "jefferson_county", "document_file": "old.json"}
+        ]}))
+
+        pipeline = self.run_steps("single", regions=["jefferson"])
+        self.assertTrue(pipeline.partial_run)
+        self.assertEqual(list(self.region_records), ["jefferson"])
+        latest = json.loads((pipeline.temp_dir / "latest.json").read_text())
+        self.assertEqual([entry["region"] for entry in latest["regions"]], ["jefferson_county", "stl_city"])
+        self.assertEqual(latest["regions"][0]["document_file"], "jefferson_county-document.json")
+
+    def test_incremental_manifests_use_registry_prefixes(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = DocumentModePipeline(
+                source_root=self.root / "source", data_dir=self.root / "incremental" / "data",
+                temp_dir=self.root / "incremental" / "temp", regions_file=self.registry, incremental=True
+            )
+        self.assertEqual(pipeline.incremental.manifest_path("jefferson").name, "jefferson_county-parcel_hashes.json")
+        self.assertEqual(pipeline.incremental.output_path("city", "parcel_metadata").name,
+                         "stl_city-parcel_metadata.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage timing and memory profiler
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from stage_profiler import StageProfiler
+
+
+class StageProfilerTest(unittest.TestCase):
+
+    def test_nested_stages_record_timing_records_and_parent(self):
+        profiler = StageProfiler()
+        with profiler.stage("step", records=100) as outer:
+            with profiler.stage("step.sub") as inner:
+                time.sleep(0.02)
+                inner.records = 50
+                inner.bytes = 2 * 1024 * 1024
+            outer.records = 200
+
+        stages = {stage["name"]: stage for stage in profiler.report()["stages"]}
+        self.assertIsNone(stages["step"]["parent"])
+        self.assertEqual(stages["step.sub"]["parent"], "step")
+        self.assertEqual(stages["step"]["records"], 200)
+        self.assertGreaterEqual(stages["step.sub"]["wall_seconds"], 0.02)
+        self.assertGreaterEqual(stages["step"]["wall_seconds"], stages["step.sub"]["wall_seconds"])
+        self.assertAlmostEqual(stages["step.sub"]["records_per_second"], 50 / stages["step.sub"]["wall_seconds"])
+        self.assertAlmostEqual(stages["step.sub"]["mb_per_second"], 2 / stages["step.sub"]["wall_seconds"])
+        for key in ("cpu_seconds", "child_cpu_seconds", "rss_delta_mb", "peak_rss_delta_mb"):
+            self.assertIn(key, stages["step"])
+
+    def test_peak_rss_covers_transient_allocation(self):
+        profiler = StageProfiler()
+        with profiler.stage("allocate"):
+            block = np.ones(96 * 1024 * 1024 // 8)
+            del block
+        with profiler.stage("idle"):
+            pass
+
+        stages = {stage["name"]: stage for stage in profiler.stages}
+        self.assertGreater(stages["allocate"]["peak_rss_delta_mb"], 64)
+        self.assertLess(stages["allocate"]["rss_delta_mb"], 64)
+
+    def test_failed_stage_is_recorded(self):
+        profiler = StageProfiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage("broken"):
+                raise ValueError("bad input")
+        self.assertEqual(profiler.stages[0]["error"], "ValueError: bad input")
+
+    def test_threads_keep_their_own_stage_stack(self):
+        profiler = StageProfiler()
+
+        def region(name):
+            with profiler.stage(name):
+                with profiler.stage(f"{name}.read_file"):
+                    time.sleep(0.01)
+
+        with profiler.stage("step_1"):
+            threads = [threading.Thread(target=region, args=(name,)) for name in ("city", "county")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        parents = {stage["name"]: stage["parent"] for stage in profiler.stages}
+        self.assertEqual(parents["city.read_file"], "city")
+        self.assertEqual(parents["county.read_file"], "county")
+        self.assertIsNone(parents["city"])
+
+    def test_report_with_optional_captures(self):
+        profiler = StageProfiler(cprofile=True, tracemalloc=True)
+        profiler.start()
+        with profiler.stage("build"):
+            values = [str(i) for i in range(200000)]
+            del values
+        profiler.stop()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = profiler.write_report(Path(tmp) / "run-report.json", dataset_size="small")
+            report = json.loads(path.read_text())
+            self.assertTrue(path.with_suffix(".prof").exists())
+
+        self.assertEqual(report["dataset_size"], "small")
+        self.assertGreater(report["stages"][0]["python_peak_mb"], 1)
+        self.assertTrue(report["cprofile_top"])
+        self.assertTrue(report["tracemalloc_top"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming JSON writers and reader
+"""
+
+import gzip
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import streaming_json
+from streaming_json import (iter_json_chunk, iter_json_envelope, iter_json_envelope_chunks, write_json_envelope,
+                            write_json_array)
+
+
+RECORDS = {
+    "10010000001": {"id": "10010000001", "calc": {"landarea_sqft": 4212.5, "property_type": "unknown"}, "score": 50},
+    "18K230049": {"id": "18K230049", "owner": {"name": "Café Ståhl", "tenure": None}, "score": float("nan")},
+    "10010000002": {"id": "10010000002", "coordinates": [[[-90.19411, 38.62701], [-90.1941, 38.627]]]},
+}
+
+METADATA = {"region": "St. Louis City", "build_time": "2025-07-11T17:01:15.949892"}
+
+
+class StreamingJSONTest(unittest.TestCase):
+    """Streamed files must be byte-identical to json.dump on the in-memory structure"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "out.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected_bytes(self, obj):
+        with open(Path(self.tmp.name) / "expected.json", "w", encoding="utf-8") as f:
+            json.dump(obj, f, separators=(',', ':'))
+        return (Path(self.tmp.name) / "expected.json").read_bytes()
+
+    def test_keyed_envelope_matches_json_dump(self):
+        count = write_json_envelope(
+            self.path, "parcels", iter(RECORDS.items()),
+            lambda total: {**METADATA, "total_parcels": total}
+        )
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            self.path.read_bytes(),
+            self.expected_bytes({"parcels": RECORDS, "metadata": {**METADATA, "total_parcels": 3}})
+        )
+
+    def test_array_envelope_matches_json_dump(self):
+        values = list(RECORDS.values())
+        write_json_envelope(
+            self.path, "addresses", (value for value in values),
+            lambda total: {**METADATA, "total_addresses": total}, keyed=False
+        )
+        self.assertEqual(
+            self.path.read_bytes(),
+            self.expected_bytes({"addresses": values, "metadata": {**METADATA, "total_addresses": 3}})
+        )
+
+    def test_digest_covers_the_collection_only(self):
+        digests = []
+        for metadata in (METADATA, {**METADATA, "build_time": "2025-07-12T09:00:00"}):
+            digest = hashlib.sha256()
+            write_json_envelope(self.path, "parcels", iter(RECORDS.items()),
+                                lambda total, metadata=metadata: {**metadata, "digest": digest.hexdigest()}, digest=digest)
+            digests.append(digest.hexdigest())
+            collection = self.path.read_text().split(',"metadata":')[0][len('{"parcels":{'):-1]
+            self.assertEqual(json.loads(self.path.read_text())["metadata"]["digest"],
+                             hashlib.sha256(collection.encode()).hexdigest())
+        self.assertEqual(digests[0], digests[1])
+
+    def test_empty_collections(self):
+        write_json_envelope(self.path, "geometries", [], lambda total: {"total_geometries": total})
+        self.assertEqual(json.loads(self.path.read_text()), {"geometries": {}, "metadata": {"total_geometries": 0}})
+
+        self.assertEqual(write_json_array(self.path, iter([])), 0)
+        self.assertEqual(self.path.read_text(), "[]")
+
+    def test_bare_array_matches_json_dump(self):
+        values = list(RECORDS.values())
+        write_json_array(self.path, (value for value in values))
+        self.assertEqual(self.path.read_bytes(), self.expected_bytes(values))
+
+
+class JSONEnvelopeReaderTest(unittest.TestCase):
+    """iter_json_envelope must yield what json.load would, one entry at a time"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "in.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reads_written_envelope(self):
+        write_json_envelope(self.path, "parcels", iter(RECORDS.items()), lambda total: METADATA)
+        self.assertEqual(
+            json.dumps(list(iter_json_envelope(self.path, "parcels"))),
+            json.dumps(list(RECORDS.items()))
+        )
+
+    def test_any_layout_and_member_order(self):
+        document = {"metadata": METADATA, "addresses": list(RECORDS.values()), "parcels": {}}
+        self.path.write_text(json.dumps(document, indent=3))
+        self.assertEqual(json.dumps(list(iter_json_envelope(self.path, "addresses"))), json.dumps(document["addresses"]))
+        self.assertEqual(list(iter_json_envelope(self.path, "parcels")), [])
+        self.assertEqual(list(iter_json_envelope(self.path, "missing")), [])
+
+    def test_gzip_and_chunk_boundaries(self):
+        geometries = {f"P{i}": {"type": "Polygon", "coordinates": [[[-90.1 - i / 7, 38.6], [i, 1e-7]]]} for i in range(300)}
+        compressed = self.path.with_name("in.json.gz")
+        with gzip.open(compressed, "wt", encoding="utf-8") as f:
+            json.dump({"geometries": geometries, "metadata": METADATA}, f, separators=(', ', ': '))
+        original = streaming_json.READ_CHUNK_CHARS
+        try:
+            # Chunks smaller than a key or a number
+            for chunk in (1, 3, 64):
+                streaming_json.READ_CHUNK_CHARS = chunk
+                with self.subTest(chunk=chunk):
+                    self.assertEqual(dict(iter_json_envelope(compressed, "geometries")), geometries)
+        finally:
+            streaming_json.READ_CHUNK_CHARS = original
+
+    def test_chunks_hold_whole_entries(self):
+        # Strings with brackets, commas, escaped quotes and backslashes must not split entries
+        tricky = {'a"],[{,': {"name": 'x\\"}', "path": "C:\\", "ring": [[1, 2], [3, 4]]}, "Café,]": [None, "{"]}
+        entries = {**{f"P{i}": {"coordinates": [[[i, -i / 3]]], "tag": "},{"} for i in range(50)}, **tricky}
+        document = {"metadata": METADATA, "geometries": entries, "rest": [1]}
+        self.path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+        # One entry per chunk, a few entries per chunk, everything in one chunk
+        for size, fewest, most in ((1, len(entries), len(entries)), (200, 2, len(entries) - 1), (1 << 20, 1, 1)):
+            with self.subTest(size=size):
+                chunks = list(iter_json_envelope_chunks(self.path, "geometries", size))
+                self.assertTrue(fewest <= len(chunks) <= most, len(chunks))
+                pairs = [pair for chunk in chunks for pair in iter_json_chunk(chunk)]
+                self.assertEqual(pairs, list(iter_json_envelope(self.path, "geometries")))
+                self.assertEqual(dict(pairs), entries)
+
+        self.path.write_text(json.dumps({"addresses": list(RECORDS.values())}))
+        chunks = list(iter_json_envelope_chunks(self.path, "addresses", 10))
+        self.assertEqual(json.dumps([value for chunk in chunks for value in iter_json_chunk(chunk)]),
+                         json.dumps(list(RECORDS.values())))
+        self.path.write_text('{"geometries": {}}')
+        self.assertEqual(list(iter_json_envelope_chunks(self.path, "geometries")), [])
+        self.path.write_text('{"geometries": {"A": [1, 2], "B": [3')
+        with self.assertRaises(ValueError):
+            list(iter_json_envelope_chunks(self.path, "geometries"))
+
+    def test_truncated_file_raises(self):
+        self.path.write_text('{"geometries": {"A": [1, 2], "B": [3')
+        with self.assertRaises(ValueError):
+            list(iter_json_envelope(self.path, "geometries"))
+        self.path.write_text('{"geometries": {"A": 1 "B": 2}}')
+        with self.assertRaises(ValueError):
+            list(iter_json_envelope(self.path, "geometries"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic shapefile generator and the offline ingest benchmark
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from benchmark_ingest import BASELINE_STAGES, compare_to_baseline, run_offline_pipeline
+from ingest_shapes import ShapefileProcessor
+from synthetic_shapefiles import write_datasets
+
+
+class SyntheticShapefilesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmp.name) / "source"
+        cls.written = write_datasets(cls.root, 400, seed=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_layout_and_schema(self):
+        city = gpd.read_file(self.root / "saint_louis_city" / "shapefiles" / "prcl.shp")
+        county = gpd.read_file(self.root / "saint_louis_county" / "shapefiles" / "Parcels_Current.shp")
+        basic = pd.read_csv(self.root / "saint_louis_city" / "shapefiles" / "parcels-basic-info.csv", dtype=str)
+
+        self.assertEqual((len(city), len(county)), (self.written["city"], self.written["county"]))
+        self.assertEqual(city.crs.to_epsg(), 2815)
+        self.assertEqual(county.crs.to_epsg(), 26916)
+        for column in ("HANDLE", "ASMTTOTAL", "ASMTLAND", "BDG1AREA", "OWNERNAME"):
+            self.assertIn(column, city.columns)
+        for column in ("LOCATOR", "TOTAPVAL", "PROP_ADD", "PROPCLASS", "MUNICIPALI"):
+            self.assertIn(column, county.columns)
+        self.assertTrue(shapely.is_valid(county.geometry.array).all())
+        # Multi-unit parcels repeat their HANDLE in the CSV
+        self.assertGreater(len(basic), basic["HANDLE"].nunique())
+        self.assertTrue(set(basic["HANDLE"]) <= set(city["HANDLE"]))
+
+    def test_same_seed_is_reproducible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            write_datasets(Path(tmp), 400, seed=3)
+            for relative in ("saint_louis_city/shapefiles/prcl.dbf",
+                             "saint_louis_city/shapefiles/parcels-basic-info.csv",
+                             "saint_louis_county/shapefiles/Parcels_Current.shp"):
+                self.assertEqual((Path(tmp) / relative).read_bytes(), (self.root / relative).read_bytes())
+
+    def test_processor_reads_source_root(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            processor = ShapefileProcessor(Path(tmp), dataset_size="large", source_root=self.root)
+            city_data, city_geometry = processor.process_region("city")
+            county_data, county_geometry = processor.process_region("county")
+
+        # One record per parcel with an address; duplicated CSV rows are deduplicated
+        self.assertGreater(len(city_data), self.written["city"] * 0.9)
+        self.assertLessEqual(len(city_data), self.written["city"])
+        self.assertEqual(len({record["id"] for record in city_data}), len(city_data))
+        self.assertGreater(len(county_data), self.written["county"] * 0.9)
+        # Geometry is kept for parcels without an address too
+        self.assertGreaterEqual(len(county_geometry), len(county_data))
+        self.assertGreaterEqual(len(city_geometry), len(city_data))
+
+
+class OfflinePipelineBenchmarkTest(unittest.TestCase):
+
+    def test_run_covers_baseline_stages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source"
+            write_datasets(source, 200, seed=5)
+            report = run_offline_pipeline(source, Path(tmp) / "run")
+            self.assertTrue((Path(tmp) / "run" / "temp" / "stl_county-document.json").exists())
+
+        names = {stage["name"] for stage in report["stages"]}
+        self.assertTrue(set(BASELINE_STAGES) <= names, set(BASELINE_STAGES) - names)
+        self.assertEqual(report["errors"], [])
+
+    def test_compare_flags_slowdown_and_memory_growth(self):
+        def results(rate, peak):
+            stage = {"wall_seconds": 2.0, "records_per_second": rate, "peak_rss_delta_mb": peak}
+            return {"runs": [{"parcels": 1000, "stages": {"step_1_process_regional_data": stage}}]}
+
+        baseline = results(1000.0, 100.0)
+        self.assertEqual(compare_to_baseline(results(900.0, 120.0), baseline), [])
+        self.assertEqual(len(compare_to_baseline(results(700.0, 100.0), baseline)), 1)
+        self.assertEqual(len(compare_to_baseline(results(1000.0, 200.0), baseline)), 1)
+        # Sizes without a baseline are not compared
+        self.assertEqual(compare_to_baseline(results(1.0, 900.0), {"runs": []}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Tests for pooled uploads against the local stand-in blob server
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from blob_standin import StandInBlobServer
+from ingest_shapes import DocumentModePipeline
+from stage_profiler import StageProfiler
+from synthetic_shapefiles import write_datasets
+from upload_manifest import UploadManifest, hashed_path
+from upload_pool import UploadError, UploadPool, UploadWorker
+
+STANDIN = str(Path(__file__).parent / "blob_standin.py")
+
+
+def standin_worker(server: StandInBlobServer) -> UploadWorker:
+    return UploadWorker([sys.executable, STANDIN, "--serve", server.url])
+
+
+class UploadPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.files = []
+        for i in range(6):
+            path = Path(self.tmp.name) / f"stl_city-part{i}.json.gz"
+            path.write_bytes(bytes([i]) * (1000 + i * 517))
+            self.files.append(path)
+        self.jobs = [(path, f"cdn/{path.name}") for path in self.files]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pool(self, worker: UploadWorker, **options) -> UploadPool:
+        return UploadPool(worker, sleep=lambda seconds: None, **options)
+
+    def test_batch_through_one_worker(self):
+        with StandInBlobServer(latency=0.05) as server, standin_worker(server) as worker:
+            profiler = StageProfiler()
+            results = self.pool(worker, concurrency=3, profiler=profiler).upload_all(self.jobs)
+
+        self.assertEqual(worker.starts, 1)
+        self.assertEqual([result["remote"] for result in results], [remote for _, remote in self.jobs])
+        for path, result in zip(self.files, results):
+            self.assertTrue(result["success"], result)
+            self.assertEqual(server.blobs[result["remote"]], path.read_bytes())
+            self.assertEqual((result["bytes"], result["attempts"]), (path.stat().st_size, 1))
+            self.assertGreater(result["mb_per_second"], 0)
+            self.assertTrue(result["url"].endswith(result["remote"]))
+        stages = {stage["name"]: stage for stage in profiler.stages}
+        self.assertEqual(stages[f"upload {self.files[0].name}"]["bytes"], self.files[0].stat().st_size)
+
+    def test_retries_transient_failures(self):
+        with StandInBlobServer(fail_first=2) as server, standin_worker(server) as worker:
+            results = self.pool(worker, retries=3).upload_all(self.jobs[:2])
+            self.assertEqual([result["attempts"] for result in results], [3, 3])
+            self.assertTrue(all(result["success"] for result in results))
+
+        with StandInBlobServer(fail_first=5) as server, standin_worker(server) as worker:
+            result = self.pool(worker, retries=1).upload_one(*self.jobs[0])
+        self.assertFalse(result["success"])
+        self.assertEqual(result["attempts"], 2)
+        self.assertIn("503", result["error"])
+        self.assertIsNone(result["mb_per_second"])
+
+    def test_missing_file_is_not_retried(self):
+        with StandInBlobServer() as server, standin_worker(server) as worker:
+            result = self.pool(worker).upload_one(Path(self.tmp.name) / "missing.json.gz", "cdn/missing.json.gz")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["attempts"], 0)
+        self.assertEqual(worker.starts, 0)
+
+    def test_exited_worker_is_restarted(self):
+        worker = UploadWorker([sys.executable, "-c", "import sys; sys.exit(3)"])
+        with self.assertRaises(UploadError):
+            worker.upload(self.files[0], "cdn/a.json.gz", timeout=10)
+
+        result = self.pool(worker, retries=2).upload_one(*self.jobs[0])
+        self.assertEqual((result["success"], result["attempts"]), (False, 3))
+        # Dead workers are replaced on later attempts
+        self.assertGreater(worker.starts, 2)
+
+    def test_unanswered_job_times_out(self):
+        with UploadWorker([sys.executable, "-c", "import sys; sys.stdin.read()"]) as worker:
+            result = self.pool(worker, retries=1, timeout=0.2).upload_one(*self.jobs[0])
+        self.assertFalse(result["success"])
+        self.assertIn("timed out", result["error"])
+        self.assertEqual(worker.starts, 1)
+
+
+class PipelineUploadTest(unittest.TestCase):
+    """step_4 through the stand-in worker instead of upload_blob.js"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.files = []
+        for name in ("stl_city-parcel_metadata.json.gz", "stl_county-parcel_metadata.json.gz"):
+            path = self.root / name
+            path.write_bytes(name.encode() * 50)
+            self.files.append(path)
+        self.server = StandInBlobServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def pipeline(self, **options) -> DocumentModePipeline:
+        pipeline = DocumentModePipeline.__new__(DocumentModePipeline)
+        pipeline.profiler = StageProfiler()
+        pipeline.project_root = pipeline.temp_cdn_dir = self.root
+        pipeline.stats = {"files_uploaded": [], "files_skipped": [], "errors": []}
+        pipeline.upload_concurrency, pipeline.upload_retries = 2, 1
+        pipeline.upload_commands = {"blob": [sys.executable, STANDIN, "--serve", self.server.url]}
+        pipeline.upload_manifest = UploadManifest(self.root / "upload-manifest.json")
+        pipeline.remote_lister = lambda target, prefix: {path for path in self.server.blobs if path.startswith(prefix)}
+        pipeline.hashed_paths, pipeline.stable_aliases, pipeline.force_upload = True, True, False
+        for option, value in options.items():
+            setattr(pipeline, option, value)
+        return pipeline
+
+    def step_4(self, pipeline: DocumentModePipeline, files=None) -> bool:
+        with contextlib.redirect_stdout(io.StringIO()) as self.output:
+            return pipeline.step_4_upload_compressed_files(files or self.files)
+
+    def test_step_4_uploads_and_records_failures(self):
+        pipeline = self.pipeline()
+        self.assertTrue(self.step_4(pipeline))
+        self.assertIn("MB/s", self.output.getvalue())
+        self.assertFalse(self.step_4(pipeline, [self.root / "gone.json.gz"]))
+        self.assertEqual(pipeline.stats["errors"], ["Upload failed: gone.json.gz"])
+
+        for path in self.files:
+            self.assertEqual(self.server.blobs[f"cdn/{path.name}"], path.read_bytes())
+        self.assertIn("cdn/upload-manifest.json", pipeline.stats["files_uploaded"])
+
+    def test_unchanged_files_are_skipped(self):
+        self.step_4(self.pipeline())
+        first = self.server.blobs.copy()
+        hashed = {path.name: json.loads(first["cdn/upload-manifest.json"])["targets"]["blob"][f"cdn/{path.name}"]
+                  for path in self.files}
+        for path in self.files:
+            content_path = hashed[path.name]["hashed_path"]
+            self.assertEqual(content_path, hashed_path(f"cdn/{path.name}", hashed[path.name]["sha256"]))
+            self.assertEqual(first[content_path], path.read_bytes())
+
+        # Same bytes: nothing uploaded, manifest not republished
+        rerun = self.pipeline()
+        self.assertTrue(self.step_4(rerun))
+        self.assertEqual(rerun.stats["files_uploaded"], [])
+        self.assertEqual(rerun.stats["files_skipped"], [f"cdn/{path.name}" for path in self.files])
+
+        # One changed file: its new hashed path and stable alias only
+        self.files[1].write_bytes(b"changed county metadata")
+        changed = self.pipeline()
+        self.step_4(changed)
+        county = f"cdn/{self.files[1].name}"
+        new_path = hashed_path(county, UploadManifest(self.root / "upload-manifest.json").targets["blob"][county]["sha256"])
+        self.assertEqual(changed.stats["files_uploaded"], [new_path, county, "cdn/upload-manifest.json"])
+        self.assertEqual(self.server.blobs[county], b"changed county metadata")
+        # The previous content-hashed blob is left in place for cached clients
+        self.assertEqual(self.server.blobs[hashed[self.files[1].name]["hashed_path"]], first[county])
+
+    def test_missing_remote_copy_or_listing_forces_upload(self):
+        self.step_4(self.pipeline())
+        del self.server.blobs[f"cdn/{self.files[0].name}"]
+        rerun = self.pipeline()
+        self.step_4(rerun)
+        self.assertEqual(rerun.stats["files_skipped"], [f"cdn/{self.files[1].name}"])
+
+        unlisted = self.pipeline(remote_lister=lambda target, prefix: None)
+        self.step_4(unlisted)
+        self.assertEqual(unlisted.stats["files_skipped"], [])
+
+    def test_hashed_paths_only(self):
+        pipeline = self.pipeline(stable_aliases=False)
+        self.step_4(pipeline)
+        self.assertNotIn(f"cdn/{self.files[0].name}", self.server.blobs)
+        self.assertEqual(len(pipeline.stats["files_uploaded"]), 3)
+
+
+class UnchangedRebuildTest(unittest.TestCase):
+    """A rebuild from the same records must produce byte-identical CDN artifacts and upload none of them"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_datasets(self.root / "source", 300)
+        self.server = StandInBlobServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def pipeline(self, **options) -> DocumentModePipeline:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = DocumentModePipeline(
+                dataset_size="large", source_root=self.root / "source", data_dir=self.root / "data",
+                temp_dir=self.root / "temp", metadata_shards=4, upload_retries=0, **options
+            )
+        pipeline.upload_commands = {"blob": [sys.executable, STANDIN, "--serve", self.server.url]}
+        pipeline.remote_lister = lambda target, prefix: {path for path in self.server.blobs if path.startswith(prefix)}
+        return pipeline
+
+    def steps_2_to_4(self, pipeline: DocumentModePipeline, records, geometry) -> list:
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressed = pipeline.step_3_compress_intermediate_files(
+                pipeline.step_2_create_intermediate_files(records, geometry)
+            )
+            self.assertTrue(pipeline.step_4_upload_compressed_files(compressed))
+        return compressed
+
+    def test_second_build_uploads_nothing(self):
+        first = self.pipeline()
+        with contextlib.redirect_stdout(io.StringIO()):
+            records, geometry = first.step_1_process_regional_data()
+        compressed = self.steps_2_to_4(first, records, geometry)
+        self.assertEqual(len(first.stats["files_skipped"]), 0)
+        uploaded = {path: self.server.blobs[path] for path in first.stats["files_uploaded"]}
+
+        second = self.pipeline()
+        self.assertNotEqual(second.build_times.now, first.build_times.now)
+        self.steps_2_to_4(second, records, geometry)
+        self.assertEqual(second.stats["files_uploaded"], [])
+        self.assertEqual(len(second.stats["files_skipped"]), len(compressed))
+        self.assertEqual({path: self.server.blobs[path] for path in uploaded}, uploaded)
+
+        # Changed content gets this run's build time; the other region's files keep theirs
+        records["city"][0]["full_address"] = "1 CHANGED ST"
+        third = self.pipeline()
+        self.steps_2_to_4(third, records, geometry)
+        changed = {path for path in third.stats["files_uploaded"] if not path.endswith("upload-manifest.json")}
+        self.assertIn("cdn/stl_city-parcel_metadata.json.gz", changed)
+        # Only the shard holding the edited parcel (its hashed path and stable alias), and the shard manifest
+        self.assertEqual(len([path for path in changed if "-parcel_metadata-" in path]), 2)
+        self.assertFalse(any(path.startswith("cdn/stl_county-") for path in changed), sorted(changed))
+        self.assertEqual(third.build_times.get("stl_city-parcel_metadata.json"), third.build_times.now)
+        self.assertEqual(third.build_times.get("stl_county-parcel_metadata.json"), first.build_times.now)
+
+    def test_unchanged_incremental_drop_keeps_its_files(self):
+        def snapshot():
+            return {path: (path.stat().st_mtime_ns, path.read_bytes())
+                    for directory in ("raw", "cdn") for path in (self.root / "data" / directory).iterdir()
+                    if path.is_file() and not path.name.endswith("-parcel_hashes.json")}
+
+        first = self.pipeline(incremental=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            records, geometry = first.step_1_process_regional_data()
+        compressed = self.steps_2_to_4(first, records, geometry)
+        before = snapshot()
+
+        second = self.pipeline(incremental=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            records, geometry = second.step_1_process_regional_data()
+        self.assertTrue(all(second.incremental.unchanged(region.key) for region in second.regions))
+        self.assertEqual(sorted(self.steps_2_to_4(second, records, geometry)), sorted(compressed))
+        self.assertEqual(snapshot(), before)
+        self.assertTrue(all(result["reused"] for result in second.compression.results.values()))
+        self.assertFalse([stage["name"] for stage in second.profiler.stages
+                          if stage["name"].startswith(("write ", "compress "))])
+        self.assertEqual(second.stats["files_uploaded"], [])
+        self.assertEqual(len(second.stats["files_skipped"]), len(compressed))
+
+
+if __name__ == "__main__":
+    unittest.main()
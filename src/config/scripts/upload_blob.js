@@ -5,12 +5,26 @@ import { readFileSync } from 'fs';
 import path from 'path';
 import { config } from 'dotenv';
 import { fileURLToPath } from 'url';
+import { serveJobs } from './upload_worker.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
 config({ path: path.join(__dirname, '..', '..', '..', '.env.local') });
 
+async function putFile(localPath, remotePath, contentType) {
+  const fileContent = readFileSync(localPath);
+
+  const result = await put(remotePath, fileContent, {
+    access: 'public',
+    token: process.env.BLOB_READ_WRITE_TOKEN,
+    contentType: contentType,
+    allowOverwrite: true
+  });
+
+  return { result, size: fileContent.length };
+}
+
 async function uploadFile(
   localPath,
   remotePath,
@@ -19,17 +33,10 @@ async function uploadFile(
   console.log(`📤 Uploading ${localPath} → ${remotePath}`);
 
   try {
-    const fileContent = readFileSync(localPath);
-
-    const result = await put(remotePath, fileContent, {
-      access: 'public',
-      token: process.env.BLOB_READ_WRITE_TOKEN,
-      contentType: contentType,
-      allowOverwrite: true
-    });
+    const { result, size } = await putFile(localPath, remotePath, contentType);
 
     console.log(`✅ Upload successful: ${result.url}`);
-    console.log(`📊 Size: ${fileContent.length} bytes`);
+    console.log(`📊 Size: ${size} bytes`);
 
     return result;
   } catch (error) {
@@ -40,12 +47,20 @@ async function uploadFile(
 
 async function listBlobs(prefix = '') {
   try {
-    const result = await list({
-      token: process.env.BLOB_READ_WRITE_TOKEN,
-      prefix: prefix
-    });
+    // Follow the cursor so every blob under the prefix is listed
+    const blobs = [];
+    let cursor;
+    do {
+      const page = await list({
+        token: process.env.BLOB_READ_WRITE_TOKEN,
+        prefix: prefix,
+        cursor: cursor
+      });
+      blobs.push(...page.blobs);
+      cursor = page.hasMore ? page.cursor : undefined;
+    } while (cursor);
 
-    return result;
+    return { blobs, hasMore: false };
   } catch (error) {
     console.error(`❌ List failed: ${error.message}`);
     return null;
@@ -57,7 +72,22 @@ export { uploadFile, listBlobs };
 if (process.argv.length >= 3) {
   const command = process.argv[2];
 
-  if (command === '--list') {
+  if (command === '--serve') {
+    // Persistent worker: JSON-lines jobs on stdin (see upload_worker.js)
+    serveJobs(async (job) => {
+      const { result, size } = await putFile(
+        job.local,
+        job.remote,
+        job.contentType || 'application/json'
+      );
+      return { url: result.url, size };
+    })
+      .then(() => process.exit(0))
+      .catch((error) => {
+        console.error('Error:', error);
+        process.exit(1);
+      });
+  } else if (command === '--list') {
     const prefix = process.argv[3] || '';
     listBlobs(prefix)
       .then((result) => {
@@ -94,7 +124,7 @@ if (process.argv.length >= 3) {
       });
   } else {
     console.log(
-      'Usage: node upload_blob.js [--list [prefix]] | [localPath remotePath [contentType]]'
+      'Usage: node upload_blob.js [--serve] | [--list [prefix]] | [localPath remotePath [contentType]]'
     );
     process.exit(1);
   }
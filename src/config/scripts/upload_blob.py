@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 """
 Python wrapper for Vercel Blob client using Node.js uploader subprocess
+
+Uploads go through one persistent `upload_blob.js --serve` worker per client
+(upload_pool.py) with bounded concurrency and retries; list/delete still run
+one Node command each.
 """
 
 import subprocess
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from upload_pool import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, UploadPool, UploadWorker
 
 try:
     from dotenv import load_dotenv
@@ -22,11 +28,16 @@ except ImportError:
 class BlobClient:
     """Python client for Vercel Blob Storage using Node.js subprocess"""
     
-    def __init__(self):
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES):
         self.uploader_script = Path(__file__).parent / "upload_blob.js"
         
         if not self.uploader_script.exists():
             raise FileNotFoundError(f"Node.js uploader script not found: {self.uploader_script}")
+        
+        # Started on the first upload and reused until close()
+        self.worker = UploadWorker(["node", str(self.uploader_script), "--serve"])
+        self.concurrency = concurrency
+        self.retries = retries
     
     def upload_file(self, local_file_path: Path, blob_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -39,44 +50,27 @@ class BlobClient:
         Returns:
             Dict with upload result or None on failure
         """
-        try:
-            # Call the Node.js uploader via subprocess
-            result = subprocess.run(
-                ["node", str(self.uploader_script), str(local_file_path), blob_path],
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout per upload
-            )
-            
-            if result.returncode == 0:
-                # The Node.js script outputs status messages to stdout, 
-                # but the last line should be JSON with the result
-                stdout_lines = result.stdout.strip().split('\n')
-                last_line = stdout_lines[-1] if stdout_lines else ""
-                
-                try:
-                    # Try to parse the last line as JSON
-                    response = json.loads(last_line)
-                    return response
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, look for the URL in the output
-                    for line in stdout_lines:
-                        if "Upload successful:" in line:
-                            url = line.split("Upload successful: ")[-1]
-                            return {"success": True, "url": url}
-                    
-                    # Fallback - upload appears successful but no parseable response
-                    return {"success": True, "url": "unknown"}
-            else:
-                print(f"❌ Upload failed: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            print(f"❌ Upload timed out for {blob_path}")
-            return None
-        except Exception as e:
-            print(f"❌ Upload error for {blob_path}: {e}")
+        result = self.upload_files([(local_file_path, blob_path)])[0]
+        if not result["success"]:
+            print(f"❌ Upload failed for {blob_path}: {result['error']}")
             return None
+        return {"success": True, "url": result["url"]}
+    
+    def upload_files(self, jobs: List[Tuple[Path, str]]) -> List[Dict[str, Any]]:
+        """
+        Upload several files in parallel through the persistent worker
+        
+        Args:
+            jobs: (local path, blob path) pairs
+            
+        Returns:
+            One result per job, in order, with success, bytes, seconds, attempts and mb_per_second
+        """
+        return UploadPool(self.worker, self.concurrency, self.retries).upload_all(jobs)
+    
+    def close(self):
+        """Stop the uploader worker"""
+        self.worker.close()
     
     def list_blobs(self, prefix: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -91,7 +85,7 @@ class BlobClient:
         try:
             cmd = ["node", str(self.uploader_script), "--list"]
             if prefix:
-                cmd.extend(["--prefix", prefix])
+                cmd.append(prefix)
                 
             result = subprocess.run(
                 cmd,
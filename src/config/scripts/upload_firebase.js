@@ -11,6 +11,7 @@ import fs from 'fs';
 import { config } from 'dotenv';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { serveJobs } from './upload_worker.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -165,6 +166,7 @@ async function main() {
     console.log('  node upload_firebase.js test');
     console.log('  node upload_firebase.js upload <local_path> <remote_path>');
     console.log('  node upload_firebase.js list [prefix]');
+    console.log('  node upload_firebase.js serve');
     process.exit(1);
   }
 
@@ -188,6 +190,18 @@ async function main() {
         break;
       }
 
+      case 'serve': {
+        // Persistent worker: JSON-lines jobs on stdin (see upload_worker.js)
+        await serveJobs(async (job) => {
+          const uploadResult = await uploadFile(job.local, job.remote);
+          if (!uploadResult.success) {
+            throw new Error(uploadResult.error);
+          }
+          return uploadResult;
+        });
+        break;
+      }
+
       case 'list': {
         const prefix = args[1] || '';
         const listResult = await listFiles(prefix);
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Content-addressed upload skipping with a local build manifest
+
+Every artifact the pipeline uploads gets a SHA-256 content hash, kept per
+upload target in {data_dir}/upload-manifest.json:
+
+  {"version": 1, "updated_at": "...", "targets": {"blob": {
+      "cdn/stl_city-parcel_metadata.json.gz": {
+          "sha256": "...", "bytes": 123, "hashed_path": "cdn/stl_city-parcel_metadata.3f2a9c1b7e4d.json.gz",
+          "uploaded_at": "..."}}}}
+
+An artifact is skipped when its hash matches the manifest entry for its path
+AND the remote listing still has every path it was uploaded to; without a
+listing (list failed) nothing is skipped.
+
+With content-hashed paths, a changed file is uploaded to
+<stem>.<first 12 hex of sha256><suffixes>, which never changes content and
+can be cached as immutable. Its stable path (what clients fetch today) is
+updated alongside unless stable aliases are turned off. The blob target's
+entries are published as cdn/upload-manifest.json so clients can resolve
+the hashed paths.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from upload_blob import BlobClient
+
+MANIFEST_NAME = "upload-manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+CHUNK_SIZE = 1024 * 1024
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_path(remote_path: str, sha256: str) -> str:
+    """cdn/stl_city-parcel_metadata.json.gz -> cdn/stl_city-parcel_metadata.<hash>.json.gz"""
+    directory, _, name = remote_path.rpartition("/")
+    stem, dot, suffixes = name.partition(".")
+    hashed = f"{stem}.{sha256[:HASH_LENGTH]}{dot}{suffixes}"
+    return f"{directory}/{hashed}" if directory else hashed
+
+
+class UploadManifest:
+    """Local build manifest of uploaded artifact hashes, per upload target"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.targets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.targets = manifest.get("targets", {})
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def plan(self, target: str, jobs: List[Tuple[Path, str]], remote_paths: Optional[Set[str]],
+             hashed: bool = True, aliases: bool = True, force: bool = False) -> List[Dict[str, Any]]:
+        """One artifact per (local path, remote path) job
+
+        Returns:
+            [{"local", "remote", "sha256", "bytes", "hashed_path", "skip", "uploads": [(local, path), ...]}]
+        """
+        entries = self.targets.get(target, {})
+        artifacts = []
+        for local_path, remote_path in jobs:
+            local_path = Path(local_path)
+            try:
+                sha256, size = file_sha256(local_path), local_path.stat().st_size
+            except OSError:
+                # Unreadable: left to the upload to report
+                sha256, size = None, 0
+            content_path = hashed_path(remote_path, sha256) if hashed and sha256 else None
+            paths = [path for path in (content_path, remote_path if aliases or not content_path else None) if path]
+
+            entry = entries.get(remote_path, {})
+            skip = (not force and sha256 is not None and remote_paths is not None
+                    and entry.get("sha256") == sha256 and all(path in remote_paths for path in paths))
+            artifacts.append({
+                "local": str(local_path),
+                "remote": remote_path,
+                "sha256": sha256,
+                "bytes": size,
+                "hashed_path": content_path,
+                "skip": skip,
+                "uploads": [] if skip else [(local_path, path) for path in paths],
+            })
+        return artifacts
+
+    def record(self, target: str, artifact: Dict[str, Any]):
+        self.targets.setdefault(target, {})[artifact["remote"]] = {
+            "sha256": artifact["sha256"],
+            "bytes": artifact["bytes"],
+            "hashed_path": artifact["hashed_path"],
+            "uploaded_at": datetime.now().isoformat(),
+        }
+
+    def document(self, target: Optional[str] = None) -> Dict[str, Any]:
+        targets = self.targets if target is None else {target: self.targets.get(target, {})}
+        return {"version": MANIFEST_VERSION, "updated_at": datetime.now().isoformat(), "targets": targets}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self.document(), f, indent=2)
+        os.replace(partial, self.path)
+
+
+def list_remote_paths(target: str, prefix: str, cwd: Optional[Path] = None) -> Optional[Set[str]]:
+    """Paths under prefix on the upload target, or None when the listing fails"""
+    if target == "blob":
+        listing = BlobClient().list_blobs(prefix)
+        if not listing or "blobs" not in listing:
+            return None
+        return {blob["pathname"] for blob in listing["blobs"]}
+
+    try:
+        result = subprocess.run(
+            ["node", str(SCRIPTS_DIR / "upload_firebase.js"), "list", prefix],
+            capture_output=True, text=True, timeout=120, cwd=str(cwd) if cwd else None
+        )
+        listing = json.loads(result.stdout.strip().splitlines()[-1])
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError, IndexError) as e:
+        print(f"⚠️ Could not list {target} {prefix}: {e}")
+        return None
+    if not listing.get("success"):
+        print(f"⚠️ Could not list {target} {prefix}: {listing.get('error')}")
+        return None
+    return set(listing["files"])
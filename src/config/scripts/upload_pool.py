@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Pooled, parallel uploads through persistent uploader workers
+
+Uploads used to start one `node upload_blob.js` / `node upload_firebase.js`
+process per file, one file after another, paying Node startup and SDK auth
+every time. Here one worker process per target (`upload_blob.js --serve`,
+`upload_firebase.js serve`) stays up for the whole batch and takes jobs as
+JSON lines on stdin (see upload_worker.js):
+
+  -> {"id": 1, "local": "/tmp/stl_city-parcel_metadata.json.gz", "remote": "cdn/..."}
+  <- {"id": 1, "success": true, "url": "https://..."}
+
+UploadPool drives a worker from a bounded thread pool: at most `concurrency`
+jobs are in flight, a failed or timed-out attempt is retried with
+exponential backoff plus jitter, and a worker that exits is restarted for
+the next attempt. Each file is one "upload <name>" profiler stage with its
+bytes, so per-file throughput also lands in the run report.
+"""
+
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stage_profiler import StageProfiler
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# Worker commands per upload target
+WORKER_COMMANDS = {
+    "blob": ["node", str(SCRIPTS_DIR / "upload_blob.js"), "--serve"],
+    "firebase": ["node", str(SCRIPTS_DIR / "upload_firebase.js"), "serve"],
+}
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 600
+STDERR_LINES = 20
+
+
+class UploadError(RuntimeError):
+    """One failed upload attempt (worker error, timeout or worker exit)"""
+
+
+class UploadWorker:
+    """A persistent JSON-lines uploader process shared by the pool's threads"""
+
+    def __init__(self, command: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None):
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.process = None
+        self.starts = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._stderr = deque(maxlen=STDERR_LINES)
+
+    @classmethod
+    def for_target(cls, target: str, cwd: Optional[Path] = None) -> "UploadWorker":
+        return cls(WORKER_COMMANDS[target], cwd)
+
+    def upload(self, local_path: Path, remote_path: str, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """Upload one file and return the worker's result; raises UploadError"""
+        slot = {"event": threading.Event(), "response": None}
+        with self._lock:
+            process = slot["process"] = self._ensure_started()
+            self._next_id += 1
+            job_id = self._next_id
+            self._pending[job_id] = slot
+            line = json.dumps({"id": job_id, "local": str(local_path), "remote": remote_path})
+            try:
+                process.stdin.write(line + "\n")
+                process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._pending.pop(job_id, None)
+                raise UploadError(f"worker not accepting jobs: {e}") from e
+
+        if not slot["event"].wait(timeout):
+            with self._lock:
+                self._pending.pop(job_id, None)
+            raise UploadError(f"timed out after {timeout:.0f} s")
+        response = slot["response"]
+        if not response.get("success"):
+            raise UploadError(response.get("error") or "upload failed")
+        return response
+
+    def close(self, timeout: float = 30):
+        """Let the worker finish its jobs and exit; kill it after timeout"""
+        with self._lock:
+            process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def __enter__(self) -> "UploadWorker":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self.process is not None and self.process.poll() is None:
+            return self.process
+        self.process = subprocess.Popen(
+            self.command, cwd=str(self.cwd) if self.cwd else None, env=self.env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, bufsize=1
+        )
+        self.starts += 1
+        threading.Thread(target=self._read_results, args=(self.process,), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.process,), daemon=True).start()
+        return self.process
+
+    def _read_results(self, process: subprocess.Popen):
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # SDK log lines
+            if not isinstance(response, dict):
+                continue
+            with self._lock:
+                slot = self._pending.pop(response.get("id"), None)
+            if slot:
+                slot["response"] = response
+                slot["event"].set()
+
+        # Worker exited: fail whatever it still owed (a restarted worker owns newer jobs)
+        code = process.wait()
+        stderr = " | ".join(self._stderr)
+        with self._lock:
+            if self.process is process:
+                self.process = None
+            owed_ids = [job_id for job_id, slot in self._pending.items() if slot["process"] is process]
+            owed = [self._pending.pop(job_id) for job_id in owed_ids]
+        for slot in owed:
+            slot["response"] = {"success": False, "error": f"worker exited with code {code}: {stderr}".strip()}
+            slot["event"].set()
+
+    def _read_stderr(self, process: subprocess.Popen):
+        for line in process.stderr:
+            if line.strip():
+                self._stderr.append(line.strip())
+
+
+class UploadPool:
+    """Bounded-concurrency uploads with retries and per-file throughput"""
+
+    def __init__(self, worker: UploadWorker, concurrency: int = DEFAULT_CONCURRENCY,
+                 retries: int = DEFAULT_RETRIES, backoff: float = 0.5, max_backoff: float = 8.0,
+                 timeout: float = DEFAULT_TIMEOUT, profiler: Optional[StageProfiler] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.worker = worker
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.profiler = profiler or StageProfiler()
+        self.sleep = sleep
+
+    def upload_all(self, jobs: List[Tuple[Path, str]]) -> List[Dict[str, Any]]:
+        """Upload (local path, remote path) jobs; results come back in job order
+
+        Each result: {"local", "remote", "success", "bytes", "seconds", "attempts",
+        "mb_per_second", "url" or "error"}; seconds include retries and backoff.
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs)), thread_name_prefix="upload") as pool:
+            return list(pool.map(lambda job: self.upload_one(*job), jobs))
+
+    def upload_one(self, local_path: Path, remote_path: str) -> Dict[str, Any]:
+        local_path = Path(local_path)
+        result = {"local": str(local_path), "remote": remote_path, "success": False, "bytes": 0,
+                  "seconds": 0.0, "attempts": 0, "mb_per_second": None}
+        try:
+            result["bytes"] = local_path.stat().st_size
+        except OSError as e:
+            result["error"] = f"cannot read {local_path}: {e}"
+            return result
+
+        started = time.perf_counter()
+        with self.profiler.stage(f"upload {local_path.name}") as stage:
+            stage.bytes = result["bytes"]
+            for attempt in range(1, self.retries + 2):
+                result["attempts"] = attempt
+                try:
+                    response = self.worker.upload(local_path, remote_path, self.timeout)
+                except UploadError as e:
+                    result["error"] = str(e)
+                    if attempt > self.retries:
+                        break
+                    self.sleep(self._delay(attempt))
+                    continue
+                result.update(success=True, url=response.get("url") or response.get("path"))
+                result.pop("error", None)
+                break
+            if not result["success"]:
+                stage.error = result["error"]
+        result["seconds"] = time.perf_counter() - started
+        if result["success"] and result["seconds"] > 0:
+            result["mb_per_second"] = result["bytes"] / (1024 * 1024) / result["seconds"]
+        return result
+
+    def _delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter in [50%, 100%] of the step"""
+        step = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return step * random.uniform(0.5, 1.0)
+
+
+def upload_files(target: str, jobs: List[Tuple[Path, str]], cwd: Optional[Path] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, profiler: Optional[StageProfiler] = None) -> List[Dict[str, Any]]:
+    """Upload jobs through one worker for target ("blob" or "firebase")"""
+    with UploadWorker.for_target(target, cwd) as worker:
+        pool = UploadPool(worker, concurrency, retries, timeout=timeout, profiler=profiler)
+        return pool.upload_all(jobs)
+
+
+def print_upload_summary(results: List[Dict[str, Any]], elapsed: Optional[float] = None):
+    """Per-file throughput table plus totals"""
+    if not results:
+        return
+    print(f"   {'file':<44} {'size':>10} {'time':>9} {'rate':>11} {'tries':>5}")
+    for result in results:
+        name = Path(result["local"]).name
+        rate = f"{result['mb_per_second']:>7.2f} MB/s" if result["mb_per_second"] is not None else f"{'failed':>12}"
+        print(f"   {name:<44} {result['bytes'] / (1024 * 1024):>7.2f} MB {result['seconds']:>7.2f} s"
+              f" {rate} {result['attempts']:>5}")
+    uploaded = [result for result in results if result["success"]]
+    total_mb = sum(result["bytes"] for result in uploaded) / (1024 * 1024)
+    line = f"📤 {len(uploaded)}/{len(results)} files, {total_mb:.2f} MB"
+    if elapsed:
+        line += f" in {elapsed:.2f} s ({total_mb / elapsed:.2f} MB/s overall)"
+    print(line)
@@ -0,0 +1,47 @@
+/**
+ * Persistent uploader worker loop shared by upload_blob.js and upload_firebase.js
+ *
+ * Reads one JSON job per stdin line and writes one JSON result per stdout line,
+ * so a batch of files pays Node startup and SDK auth once:
+ *
+ *   <- {"id": 1, "local": "/tmp/stl_city-parcel_metadata.json.gz", "remote": "cdn/..."}
+ *   -> {"id": 1, "success": true, "url": "https://..."}
+ *   -> {"id": 2, "success": false, "error": "..."}
+ *
+ * Jobs run concurrently; the Python driver (upload_pool.py) bounds how many are
+ * in flight and retries failures. Logs go to stderr while serving. The worker
+ * exits once stdin closes and every started job has answered.
+ */
+
+import { createInterface } from 'readline';
+
+export async function serveJobs(handler) {
+  // stdout carries results only
+  console.log = console.error;
+
+  const running = new Set();
+  const lines = createInterface({ input: process.stdin });
+
+  lines.on('line', (line) => {
+    if (!line.trim()) return;
+    let job;
+    try {
+      job = JSON.parse(line);
+    } catch {
+      console.error(`❌ Ignoring malformed job: ${line}`);
+      return;
+    }
+
+    const task = handler(job)
+      .then((result) => ({ ...result, id: job.id, success: true }))
+      .catch((error) => ({ id: job.id, success: false, error: error.message }))
+      .then((response) => {
+        process.stdout.write(JSON.stringify(response) + '\n');
+      });
+    running.add(task);
+    task.finally(() => running.delete(task));
+  });
+
+  await new Promise((resolve) => lines.on('close', resolve));
+  await Promise.all(running);
+}
@@ -8,36 +8,138 @@ This script validates the accuracy of geometry files generated by the pipeline b
 3. Comparing against known reference data points
 4. Validating CRS transformations and coordinate systems
 5. Testing polygon validity and topology
+
+Every parcel is checked, with the vectorized engine in geometry_checks.py;
+the per-geometry validate_* methods are the scalar reference for one parcel.
+Geometry files (raw .json or the shipped .json.gz) are streamed in batches
+(streaming_json.iter_json_envelope) while a reader thread prefetches the
+next batch, so memory stays at a couple of batches whatever the file size.
+
+Every region of the registry (regions.json, or --regions-file) is validated,
+with its registered bounds. With --workers=N the regions are read
+concurrently, one thread each, and split into chunks of raw JSON entries
+(iter_json_envelope_chunks) that a pool of N processes decodes and checks;
+the per-chunk stats are reduced in file order with merge_stats.
+
+Parcels are also collected into a spatial index (parcel_topology.py) for a
+region-wide pass over overlapping, duplicated, sliver and invalid parcels,
+and the same shapes answer point-in-parcel lookups (parcel_lookup.py): every
+reference landmark inside a validated region's bounds must fall on a parcel.
+--no-topology skips both.
 """
 
+import argparse
 import json
 import gzip
-import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from queue import Full, Queue
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 import math
 
+from geometry_checks import CHECKS, INFORMATIONAL_CHECKS, GeometryArrays, check_geometries, empty_stats, merge_stats
+from parcel_lookup import ParcelLookup
+from parcel_topology import OVERLAP_MIN_AREA, ParcelIndex
+from region_registry import RegionSpec, load_regions, select_regions
+from streaming_json import (ENTRY_CHUNK_CHARS, iter_json_chunk, iter_json_envelope, iter_json_envelope_chunks,
+                            paused_gc)
+
+# Geometries checked per vectorized batch
+GEOMETRY_BATCH_SIZE = 50000
+# Batches read ahead of the one being checked
+PREFETCH_BATCHES = 2
+# Chunks per pool worker submitted ahead of the reducer
+CHUNKS_IN_FLIGHT = 2
+
+
+def batched(pairs: Iterable[Tuple[str, Any]], size: int) -> Iterator[Tuple[list, list]]:
+    """(parcel ids, geometries) lists of up to size entries"""
+    pairs = iter(pairs)
+    while True:
+        batch = list(islice(pairs, size))
+        if not batch:
+            return
+        ids, geometries = zip(*batch)
+        yield list(ids), list(geometries)
+
+
+def prefetch(items: Iterable, depth: int = PREFETCH_BATCHES) -> Iterator:
+    """Iterate items produced by a background thread, up to depth ahead
+
+    Decompression and file reads in the thread overlap with the caller's
+    NumPy work. Exceptions from the producer are re-raised here.
+    """
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(entry, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
+
+    threading.Thread(target=produce, daemon=True, name="prefetch").start()
+    try:
+        while True:
+            kind, value = queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+
+def _check_geometry_chunk(chunk: bytes, bounds: Optional[Dict[str, float]],
+                          topology: bool) -> Tuple[Dict[str, Any], Optional[ParcelIndex]]:
+    """Pool task: decode one chunk of geometry file entries, check them and index their shapes"""
+    with paused_gc():
+        pairs = list(iter_json_chunk(chunk))
+        if not pairs:
+            return empty_stats(), None
+        parcel_ids, geometries = zip(*pairs)
+        arrays = GeometryArrays(geometries)
+        stats = check_geometries(parcel_ids, geometries, bounds, arrays)
+        if not topology:
+            return stats, None
+        index = ParcelIndex()
+        index.add(parcel_ids, arrays)
+        return stats, index
+
 class GeometryValidator:
     """Validate geometry files for accuracy and correctness"""
     
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, batch_size: int = GEOMETRY_BATCH_SIZE, workers: int = 1,
+                 regions: Optional[List[RegionSpec]] = None, chunk_chars: int = ENTRY_CHUNK_CHARS,
+                 topology: bool = True, min_overlap_area: float = OVERLAP_MIN_AREA):
         self.data_dir = data_dir
-        self.city_geometry_file = data_dir / "stl_city-parcel_geometry.json"
-        self.county_geometry_file = data_dir / "stl_county-parcel_geometry.json"
-        
-        # Known reference points for St. Louis region (WGS84)
-        self.reference_bounds = {
-            "city": {
-                "lat_min": 38.53, "lat_max": 38.77,
-                "lng_min": -90.32, "lng_max": -90.17
-            },
-            "county": {
-                "lat_min": 38.41, "lat_max": 38.80,
-                "lng_min": -90.76, "lng_max": -90.12
-            }
-        }
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.chunk_chars = chunk_chars
+        self.topology = topology
+        self.min_overlap_area = min_overlap_area
+        
+        # Registered regions, with the WGS84 bounds their parcels should fall in
+        self.regions = {region.key: region for region in (regions if regions is not None else load_regions())}
+        self.reference_bounds = {key: region.bounds for key, region in self.regions.items() if region.bounds}
         
-        # Known landmarks for validation
+        # Known landmarks: each must fall on a parcel of the validated regions whose bounds hold it
         self.landmarks = {
             "gateway_arch": {"lat": 38.6247, "lng": -90.1848},
             "forest_park": {"lat": 38.6369, "lng": -90.2844},
@@ -45,21 +147,18 @@ class GeometryValidator:
             "downtown_stl": {"lat": 38.6270, "lng": -90.1994}
         }
         
-    def load_geometry_data(self, region: str) -> Dict[str, Any]:
-        """Load geometry data for a specific region"""
-        if region == "city":
-            file_path = self.city_geometry_file
-        elif region == "county":
-            file_path = self.county_geometry_file
-        else:
+    def geometry_file(self, region: str) -> Path:
+        """The region's raw geometry file, or its .json.gz when only that is present"""
+        if region not in self.regions:
             raise ValueError(f"Unknown region: {region}")
-            
-        try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"❌ Geometry file not found: {file_path}")
-            return {}
+        file_path = self.data_dir / f"{self.regions[region].prefix}-parcel_geometry.json"
+        
+        compressed = file_path.with_name(file_path.name + ".gz")
+        return compressed if not file_path.exists() and compressed.exists() else file_path
+    
+    def iter_geometries(self, region: str) -> Iterator[Tuple[str, Any]]:
+        """Stream (parcel id, geometry) pairs from the region's geometry file"""
+        return iter_json_envelope(self.geometry_file(region), "geometries")
     
     def validate_coordinate_precision(self, coordinates: List) -> Dict[str, Any]:
         """Validate coordinate precision and format"""
@@ -264,112 +363,183 @@ class GeometryValidator:
             "valid": stats["out_of_bounds"] == 0
         }
     
-    def validate_sample_geometries(self, geometry_data: Dict, region: str, sample_size: int = 10) -> Dict[str, Any]:
-        """Validate a random sample of geometries in detail"""
-        geometries = geometry_data.get("geometries", {})
-        if not geometries:
-            return {"issues": ["No geometries found"], "valid": False}
-        
-        # Sample random geometries
-        parcel_ids = list(geometries.keys())
-        sample_ids = random.sample(parcel_ids, min(sample_size, len(parcel_ids)))
-        
-        results = {
-            "total_sampled": len(sample_ids),
-            "valid_count": 0,
-            "invalid_count": 0,
-            "issues": [],
-            "sample_results": []
-        }
-        
-        for parcel_id in sample_ids:
-            geometry = geometries[parcel_id]
-            
-            # Validate individual geometry
-            coord_validation = self.validate_coordinate_precision(geometry["coordinates"])
-            topology_validation = self.validate_polygon_topology(geometry)
-            bbox_validation = self.validate_bounding_box(geometry)
-            
-            is_valid = (
-                len(coord_validation["issues"]) == 0 and
-                topology_validation["valid"] and
-                bbox_validation["valid"]
-            )
-            
-            if is_valid:
-                results["valid_count"] += 1
-            else:
-                results["invalid_count"] += 1
-                all_issues = (
-                    coord_validation["issues"] +
-                    topology_validation["issues"] +
-                    bbox_validation["issues"]
-                )
-                results["issues"].extend([f"Parcel {parcel_id}: {issue}" for issue in all_issues[:3]])
-            
-            results["sample_results"].append({
-                "parcel_id": parcel_id,
-                "valid": is_valid,
-                "coord_stats": coord_validation["stats"],
-                "issues": len(coord_validation["issues"]) + len(topology_validation["issues"]) + len(bbox_validation["issues"])
-            })
-        
-        return results
+    def validate_region_file(self, region: str) -> Optional[Dict[str, Any]]:
+        """Check every geometry of a region's file batch by batch; None when the file is missing
+        
+        With topology enabled the stats also hold the region's "topology"
+        findings and the parcel each landmark falls on ("landmarks").
+        """
+        file_path = self.geometry_file(region)
+        if not file_path.exists():
+            print(f"❌ Geometry file not found: {file_path}")
+            return None
+        
+        bounds = self.reference_bounds.get(region)
+        index = ParcelIndex() if self.topology else None
+        with paused_gc():
+            stats = empty_stats()
+            for parcel_ids, geometries in prefetch(batched(self.iter_geometries(region), self.batch_size)):
+                arrays = GeometryArrays(geometries)
+                stats = merge_stats(stats, check_geometries(parcel_ids, geometries, bounds, arrays))
+                if index is not None:
+                    index.add(parcel_ids, arrays)
+        return self._with_spatial_checks(stats, index)
+    
+    def validate_region_chunks(self, region: str, pool: ProcessPoolExecutor) -> Optional[Dict[str, Any]]:
+        """Check a region's file in raw-JSON chunks on a process pool; None when the file is missing"""
+        file_path = self.geometry_file(region)
+        if not file_path.exists():
+            print(f"❌ Geometry file not found: {file_path}")
+            return None
+        
+        bounds = self.reference_bounds.get(region)
+        index = ParcelIndex() if self.topology else None
+        stats = empty_stats()
+        pending = deque()
+        
+        def reduce_next():
+            nonlocal stats
+            chunk_stats, chunk_index = pending.popleft().result()
+            stats = merge_stats(stats, chunk_stats)
+            if chunk_index is not None:
+                index.merge(chunk_index)
+        
+        for chunk in iter_json_envelope_chunks(file_path, "geometries", self.chunk_chars):
+            pending.append(pool.submit(_check_geometry_chunk, chunk, bounds, self.topology))
+            # Reduce in file order, bounding the chunks held in memory
+            while len(pending) > CHUNKS_IN_FLIGHT * self.workers:
+                reduce_next()
+        while pending:
+            reduce_next()
+        return self._with_spatial_checks(stats, index)
+    
+    def _with_spatial_checks(self, stats: Dict[str, Any], index: Optional[ParcelIndex]) -> Dict[str, Any]:
+        """Add the region-wide spatial-index pass and landmark lookups over the collected parcels"""
+        if index is not None:
+            stats["topology"] = index.check(self.min_overlap_area)
+            points = list(self.landmarks.values())
+            parcel_ids = ParcelLookup.from_index(index).locate_many([p["lat"] for p in points], [p["lng"] for p in points])
+            stats["landmarks"] = dict(zip(self.landmarks, parcel_ids))
+        return stats
+    
+    def resolve_landmarks(self, region_landmarks: Dict[str, Dict[str, Optional[str]]]) -> Dict[str, Dict[str, Any]]:
+        """Region and parcel each landmark falls on
+        
+        A landmark is expected in the validated regions whose registered bounds
+        hold it ("missing" when none of them has a parcel there); landmarks
+        outside all of them are "not_covered" unless some region has them anyway.
+        """
+        resolved = {}
+        for name, point in self.landmarks.items():
+            expected = [
+                region for region in region_landmarks if region in self.reference_bounds
+                and self.reference_bounds[region]["lat_min"] <= point["lat"] <= self.reference_bounds[region]["lat_max"]
+                and self.reference_bounds[region]["lng_min"] <= point["lng"] <= self.reference_bounds[region]["lng_max"]
+            ]
+            found = [(region, parcels[name]) for region, parcels in region_landmarks.items() if parcels[name] is not None]
+            region, parcel_id = found[0] if found else (None, None)
+            status = "resolved" if found else "missing" if expected else "not_covered"
+            resolved[name] = {**point, "status": status, "region": region, "parcel_id": parcel_id,
+                              "expected_regions": expected}
+        return resolved
+    
+    def validate_regions(self, regions: Optional[List[str]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Stats of every region's geometry file (None when missing), in registry order
+        
+        One worker checks the regions one after another. With more, every
+        region is read in its own thread and its chunks share one process pool.
+        """
+        keys = list(regions) if regions is not None else list(self.regions)
+        if self.workers <= 1:
+            return {key: self.validate_region_file(key) for key in keys}
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            with ThreadPoolExecutor(max_workers=max(1, len(keys))) as threads:
+                futures = [(key, threads.submit(self.validate_region_chunks, key, pool)) for key in keys]
+                return {key: future.result() for key, future in futures}
     
     def run_full_validation(self) -> Dict[str, Any]:
-        """Run complete validation suite on both city and county geometries"""
+        """Run complete validation suite on every registered region's geometries"""
         print("🔍 Starting Geometry Validation Suite")
         print("=" * 60)
         
         results = {
             "timestamp": "2025-07-11T17:01:15.949892",
-            "city": {},
-            "county": {},
+            **{key: {} for key in self.regions},
             "summary": {}
         }
         
-        for region in ["city", "county"]:
+        # 1. Stream every geometry: coordinates, topology, bbox and regional bounds (regions in parallel with --workers)
+        if self.workers > 1:
+            print(f"🧵 Checking {len(self.regions)} regions with {self.workers} workers")
+        region_checks = self.validate_regions()
+        region_landmarks = {}
+        
+        for region, checks in region_checks.items():
             print(f"\n🌆 Validating {region.title()} Geometries...")
             
-            # Load data
-            geometry_data = self.load_geometry_data(region)
-            if not geometry_data:
+            if checks is None:
                 results[region] = {"error": f"Could not load {region} geometry data"}
                 continue
             
-            region_results = {}
-            
-            # 1. Basic data structure validation
-            print(f"   📊 Total geometries: {len(geometry_data.get('geometries', {}))}")
+            region_results = {"file": str(self.geometry_file(region))}
+            print(f"   📊 Total geometries: {checks['geometries']}")
             
-            # 2. Regional bounds validation
-            bounds_validation = self.validate_regional_bounds(geometry_data, region)
-            region_results["bounds"] = bounds_validation
-            print(f"   🗺️ Regional bounds: {bounds_validation['stats']['within_bounds']}/{bounds_validation['stats']['total_geometries']} within expected bounds")
+            # 2. Regional bounds
+            region_results["checks"] = checks
+            region_results["bounds"] = {
+                "issues": checks["bounds_examples"],
+                "stats": {
+                    "total_geometries": checks["geometries"],
+                    "out_of_bounds": checks["out_of_bounds"],
+                    "within_bounds": checks["within_bounds"]
+                },
+                "valid": checks["out_of_bounds"] == 0
+            }
+            if region in self.reference_bounds:
+                print(f"   🗺️ Regional bounds: {checks['within_bounds']}/{checks['geometries']} within expected bounds")
+            else:
+                print(f"   🗺️ Regional bounds: none registered for {region}")
             
-            if bounds_validation["issues"]:
-                print(f"   ⚠️ Bounds issues: {len(bounds_validation['issues'])} found")
-                for issue in bounds_validation["issues"][:3]:
+            if checks["bounds_examples"]:
+                print(f"   ⚠️ Bounds issues: {checks['out_of_bounds']} found")
+                for issue in checks["bounds_examples"][:3]:
                     print(f"      • {issue}")
             
-            # 3. Sample geometry validation
-            sample_validation = self.validate_sample_geometries(geometry_data, region, 20)
-            region_results["sample"] = sample_validation
-            print(f"   🔬 Sample validation: {sample_validation['valid_count']}/{sample_validation['total_sampled']} geometries valid")
+            # 3. Exact per-check failure counts
+            print(f"   🔬 Geometry validation: {checks['valid']}/{checks['geometries']} geometries valid "
+                  f"({checks['points']:,} points, {checks['rings']:,} rings)")
+            for check in CHECKS:
+                failed = checks["failures"][check]
+                if failed:
+                    note = " (informational)" if check in INFORMATIONAL_CHECKS else ""
+                    print(f"      • {check}: {failed:,} parcels{note}")
             
-            if sample_validation["issues"]:
-                print(f"   ⚠️ Sample issues found:")
-                for issue in sample_validation["issues"][:5]:
+            if checks["examples"]:
+                print(f"   ⚠️ Example issues:")
+                for issue in checks["examples"][:5]:
                     print(f"      • {issue}")
             
-            # 4. Calculate overall statistics
-            total_points = sum(result["coord_stats"]["total_points"] for result in sample_validation["sample_results"])
-            avg_points_per_geometry = total_points / len(sample_validation["sample_results"]) if sample_validation["sample_results"] else 0
+            # 4. Overlaps, duplicates and slivers between parcels (spatial index)
+            topology = checks.pop("topology", None)
+            if "landmarks" in checks:
+                region_landmarks[region] = checks.pop("landmarks")
+            if topology is not None:
+                region_results["topology"] = topology
+                print(f"   🧩 Topology: {topology['overlaps']:,} overlaps above {topology['min_overlap_area_m2']:g} m², "
+                      f"{topology['duplicates']:,} duplicates, {topology['slivers']:,} slivers, "
+                      f"{topology['invalid']:,} invalid polygons ({topology['candidate_pairs']:,} candidate pairs)")
+                for kind in ("overlaps", "duplicates", "slivers", "invalid"):
+                    for issue in topology["examples"][kind][:3]:
+                        print(f"      • {issue}")
+            
+            # 5. Calculate overall statistics
+            avg_points_per_geometry = checks["points"] / checks["geometries"] if checks["geometries"] else 0
             
             region_results["statistics"] = {
-                "total_geometries": len(geometry_data.get("geometries", {})),
-                "sample_size": sample_validation["total_sampled"],
-                "valid_sample_rate": sample_validation["valid_count"] / sample_validation["total_sampled"] if sample_validation["total_sampled"] > 0 else 0,
+                "total_geometries": checks["geometries"],
+                "valid_geometries": checks["valid"],
+                "valid_rate": checks["valid"] / checks["geometries"] if checks["geometries"] else 0,
                 "avg_points_per_geometry": round(avg_points_per_geometry, 1)
             }
             
@@ -377,29 +547,57 @@ class GeometryValidator:
             
             results[region] = region_results
         
+        # 6. Reference landmarks must fall on a parcel (point-in-parcel lookups on the same shapes)
+        if region_landmarks:
+            print(f"\n📍 Resolving {len(self.landmarks)} reference landmarks...")
+            results["landmarks"] = self.resolve_landmarks(region_landmarks)
+            for name, landmark in results["landmarks"].items():
+                if landmark["status"] == "resolved":
+                    print(f"   ✅ {name}: parcel {landmark['parcel_id']} ({landmark['region']})")
+                elif landmark["status"] == "missing":
+                    print(f"   ❌ {name}: no {'/'.join(landmark['expected_regions'])} parcel at "
+                          f"{landmark['lat']}, {landmark['lng']}")
+                else:
+                    print(f"   ⏭️ {name}: outside the validated regions")
+        
         # Generate summary
-        city_stats = results.get("city", {}).get("statistics", {})
-        county_stats = results.get("county", {}).get("statistics", {})
+        region_stats = {region: results[region].get("statistics", {}) for region in self.regions}
         
-        total_geometries = city_stats.get("total_geometries", 0) + county_stats.get("total_geometries", 0)
-        city_valid_rate = results.get("city", {}).get("sample", {}).get("valid_count", 0) / max(results.get("city", {}).get("sample", {}).get("total_sampled", 1), 1)
-        county_valid_rate = results.get("county", {}).get("sample", {}).get("valid_count", 0) / max(results.get("county", {}).get("sample", {}).get("total_sampled", 1), 1)
-        overall_valid_rate = (city_valid_rate + county_valid_rate) / 2
+        total_geometries = sum(stats.get("total_geometries", 0) for stats in region_stats.values())
+        valid_geometries = sum(stats.get("valid_geometries", 0) for stats in region_stats.values())
+        overall_valid_rate = valid_geometries / total_geometries if total_geometries else 0
         
         results["summary"] = {
             "total_geometries": total_geometries,
             "overall_validity_rate": round(overall_valid_rate * 100, 1),
-            "city_validity_rate": round(city_valid_rate * 100, 1),
-            "county_validity_rate": round(county_valid_rate * 100, 1),
+            **{f"{region}_validity_rate": round(stats.get("valid_rate", 0) * 100, 1) for region, stats in region_stats.items()},
             "recommendation": "PASS" if overall_valid_rate > 0.9 else "REVIEW" if overall_valid_rate > 0.7 else "FAIL"
         }
+        topologies = [results[region]["topology"] for region in self.regions if "topology" in results[region]]
+        if topologies:
+            results["summary"]["topology"] = {
+                kind: sum(topology[kind] for topology in topologies)
+                for kind in ("overlaps", "duplicates", "slivers", "invalid")
+            }
+        if "landmarks" in results:
+            statuses = [landmark["status"] for landmark in results["landmarks"].values()]
+            results["summary"]["landmarks"] = {
+                status: statuses.count(status) for status in ("resolved", "missing", "not_covered")
+            }
+            if results["summary"]["landmarks"]["missing"] and results["summary"]["recommendation"] == "PASS":
+                results["summary"]["recommendation"] = "REVIEW"
         
         print(f"\n📊 VALIDATION SUMMARY")
         print("=" * 60)
         print(f"Total geometries processed: {total_geometries:,}")
         print(f"Overall validity rate: {results['summary']['overall_validity_rate']}%")
-        print(f"City validity rate: {results['summary']['city_validity_rate']}%")
-        print(f"County validity rate: {results['summary']['county_validity_rate']}%")
+        for region in self.regions:
+            print(f"{region.title()} validity rate: {results['summary'][f'{region}_validity_rate']}%")
+        if "topology" in results["summary"]:
+            print("Topology: " + ", ".join(f"{count:,} {kind}" for kind, count in results["summary"]["topology"].items()))
+        if "landmarks" in results["summary"]:
+            print("Landmarks: " + ", ".join(f"{count} {status.replace('_', ' ')}"
+                                            for status, count in results["summary"]["landmarks"].items()))
         print(f"Recommendation: {results['summary']['recommendation']}")
         
         if results["summary"]["recommendation"] == "PASS":
@@ -413,11 +611,55 @@ class GeometryValidator:
 
 def main():
     """Main entry point for geometry validation"""
-    # Set paths
-    data_dir = Path("/Users/duebelbytes/Sites/land-estimator/src/data/tmp/raw")
+    parser = argparse.ArgumentParser(description="Validate pipeline geometry files")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(__file__).parent.parent.parent / "data" / "tmp" / "raw",
+        help="Directory holding the {region}-parcel_geometry.json (or .json.gz) files (default: src/data/tmp/raw)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=GEOMETRY_BATCH_SIZE,
+        help="Geometries read and checked per vectorized batch"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes checking chunks of parcels; regions are read concurrently (1 = serial)"
+    )
+    parser.add_argument(
+        "--no-topology",
+        action="store_false",
+        dest="topology",
+        help="Skip the spatial-index pass (overlapping, duplicated and sliver parcels, landmark lookups)"
+    )
+    parser.add_argument(
+        "--overlap-min-area",
+        type=float,
+        default=OVERLAP_MIN_AREA,
+        help="Report parcel pairs sharing more than this many square metres"
+    )
+    parser.add_argument(
+        "--regions-file",
+        type=Path,
+        help="Region registry (JSON or YAML) with each region's prefix and bounds (default: regions.json)"
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        dest="regions",
+        help="Only validate this region key or prefix (repeatable)"
+    )
+    args = parser.parse_args()
+    data_dir = args.data_dir
     
     # Initialize validator
-    validator = GeometryValidator(data_dir)
+    regions = select_regions(load_regions(args.regions_file), args.regions)
+    validator = GeometryValidator(data_dir, args.batch_size, args.workers, regions,
+                                  topology=args.topology, min_overlap_area=args.overlap_min_area)
     
     # Run validation
     results = validator.run_full_validation()
@@ -206,6 +206,68 @@ describe('loadAddressIndex', () => {
         'Failed to load county region'
       );
     });
+
+    it('imports a prebuilt index when the manifest lists one', async () => {
+      const { FLEXSEARCH_CONFIG } = await import('@config/flexsearch');
+
+      mockJsonResponse(mockFetch, {
+        ...mockManifestData,
+        regions: mockManifestData.regions.map((region) => ({
+          ...region,
+          index_file: `${region.region}-flexsearch.json`
+        }))
+      });
+      mockJsonResponse(mockFetch, {
+        version: 1,
+        region: 'stl_county',
+        config: FLEXSEARCH_CONFIG,
+        index: { reg: '{"P002":1}', map: '[]' },
+        addressData: { P002: 'County Test Address' },
+        metadata: {
+          generated_at: '2025-07-12T11:37:03.373Z',
+          documents: 1,
+          export_keys: 2
+        }
+      });
+
+      const result = await loadAddressIndex();
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        '/search/stl_county-flexsearch.json'
+      );
+      expect(mockSearchIndex.import).toHaveBeenCalledWith(
+        'reg',
+        '{"P002":1}'
+      );
+      expect(result.parcelIds).toEqual(['P002']);
+      expect(result.addressData).toEqual({ P002: 'County Test Address' });
+    });
+
+    it('falls back to the document file when the prebuilt config differs', async () => {
+      mockJsonResponse(mockFetch, {
+        ...mockManifestData,
+        regions: mockManifestData.regions.map((region) => ({
+          ...region,
+          index_file: `${region.region}-flexsearch.json`
+        }))
+      });
+      mockJsonResponse(mockFetch, {
+        version: 1,
+        region: 'stl_county',
+        config: { tokenize: 'strict' },
+        index: {},
+        addressData: {},
+        metadata: { generated_at: '', documents: 0, export_keys: 0 }
+      });
+      mockJsonResponse(mockFetch, mockCountyAddresses);
+
+      const result = await loadAddressIndex();
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        '/search/stl_county-document.json'
+      );
+      expect(result.parcelIds).toEqual(['P002']);
+    });
   });
 
   describe('Caching', () => {
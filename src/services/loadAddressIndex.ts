@@ -16,6 +16,7 @@ export interface ShardManifest {
     document_file: string;
     grids: GeoGrid[];
     lookup_file: string;
+    index_file?: string;
   }>;
   metadata: {
     generated_at: string;
@@ -25,6 +26,46 @@ export interface ShardManifest {
   };
 }
 
+export interface PrebuiltIndexFile {
+  version: number;
+  region: string;
+  config: typeof FLEXSEARCH_CONFIG;
+  index: Record<string, string>;
+  addressData: Record<string, string>;
+  metadata: {
+    generated_at: string;
+    documents: number;
+    export_keys: number;
+  };
+}
+
+/**
+ * Restore a FlexSearch index exported by build_flexsearch_index.js
+ * @param prebuilt - Parsed {region}-flexsearch.json file
+ * @returns Index bundle, or null when it was built with a different config
+ */
+export function importPrebuiltIndex(
+  prebuilt: PrebuiltIndexFile
+): FlexSearchIndexBundle | null {
+  if (JSON.stringify(prebuilt.config) !== JSON.stringify(FLEXSEARCH_CONFIG)) {
+    devLog(
+      `⚠️ Prebuilt ${prebuilt.region} index uses a different FlexSearch config`
+    );
+    return null;
+  }
+
+  const searchIndex = new Index(FLEXSEARCH_CONFIG);
+  Object.entries(prebuilt.index).forEach(([key, data]) => {
+    searchIndex.import(key, data);
+  });
+
+  return {
+    index: searchIndex,
+    parcelIds: Object.keys(prebuilt.addressData),
+    addressData: prebuilt.addressData
+  };
+}
+
 class ClientOnlyAddressIndexLoader {
   private static instance: ClientOnlyAddressIndexLoader | null = null;
   private bundle: FlexSearchIndexBundle | null = null;
@@ -142,10 +183,50 @@ class ClientOnlyAddressIndexLoader {
     }
   }
 
+  private async _loadPrebuiltIndex(
+    region: ShardManifest['regions'][0]
+  ): Promise<FlexSearchIndexBundle | null> {
+    try {
+      devLog(`📤 Loading prebuilt index for region ${region.region}...`);
+
+      const response = await fetch(`/search/${region.index_file}`);
+      if (!response.ok) {
+        throw createNetworkError(
+          `Failed to load ${region.index_file}: ${response.status}`,
+          {
+            url: `/search/${region.index_file}`,
+            region: region.region,
+            status: response.status,
+            statusText: response.statusText
+          }
+        );
+      }
+
+      const bundle = importPrebuiltIndex(await response.json());
+      if (bundle) {
+        devLog(
+          `  ✅ Imported prebuilt index with ${bundle.parcelIds.length} addresses for ${region.region}`
+        );
+      }
+      return bundle;
+    } catch (error) {
+      devLog(`⚠️ Prebuilt index loading failed: ${error}`);
+      return null;
+    }
+  }
+
   private async _loadFromDocumentFile(
     region: ShardManifest['regions'][0],
     progressiveLoad = false
   ): Promise<FlexSearchIndexBundle | null> {
+    // A prebuilt index skips building from raw documents entirely
+    if (region.index_file) {
+      const prebuilt = await this._loadPrebuiltIndex(region);
+      if (prebuilt) {
+        return prebuilt;
+      }
+    }
+
     try {
       devLog(`📤 Loading document file for region ${region.region}...`);
 
@@ -43,7 +43,11 @@ declare module 'flexsearch' {
       remove(id: number | string): this;
       update(id: number | string, text: string): this;
       export(): string | object;
+      export(
+        handler: (key: string, data: string) => void
+      ): Promise<void> | void;
       import(data: string | object): this;
+      import(key: string, data: string): this;
     }
 
     class Document<T> {
@@ -36,4 +36,6 @@ export interface GeoGrid {
   id: string;
   bounds: GeographicBounds;
   center: { lat: number; lng: number };
+  document_file?: string;
+  documents?: number;
 }